@@ -3,4 +3,7 @@ from django.apps import AppConfig
 class BookingsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'bookings'
-    verbose_name = 'Booking Management' 
\ No newline at end of file
+    verbose_name = 'Booking Management'
+
+    def ready(self):
+        import bookings.signals  # noqa: F401 - invalidate the calendar cache on Booking/Task writes
@@ -0,0 +1,169 @@
+"""
+Month/week calendar data for bookings and tasks in one request.
+
+    GET /api/calendar/?month=2026-11
+    GET /api/calendar/?start=2026-11-01&end=2026-11-30
+
+Per-day counts come from SQL: bookings are spread over the days they overlap
+with generate_series (using the GiST-indexed Booking.period), tasks are grouped
+by their due day with date_trunc. Compact event stubs for the window are
+returned alongside, capped at CALENDAR_MAX_EVENTS per kind.
+
+Responses are cached per industry, user and window. Every industry has a
+version counter in the shared cache; Booking/Task saves and deletes bump it
+(see bookings.signals), and bulk writers call bump_calendar_version().
+"""
+import logging
+import time
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Count
+from django.db.models.functions import TruncDay
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+MAX_DAYS = 62
+
+
+def _version_key(industry_id):
+    return f"calendar:{industry_id}:version"
+
+
+def get_calendar_version(industry_id):
+    key = _version_key(industry_id)
+    try:
+        version = cache.get(key)
+        if version is None:
+            # Seed with a timestamp so a flushed cache never reuses an old number
+            cache.add(key, int(time.time() * 1000), None)
+            version = cache.get(key)
+        return version
+    except Exception as e:
+        logger.warning(f"Calendar cache version lookup failed for {key}: {str(e)}")
+        return None
+
+
+def bump_calendar_version(*industry_ids):
+    """Invalidate cached calendars of these industries (call after bulk writes)."""
+    for industry_id in set(industry_ids):
+        if industry_id is None:
+            continue
+        key = _version_key(industry_id)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, int(time.time() * 1000), None)
+        except Exception as e:
+            logger.warning(f"Calendar cache version bump failed for {key}: {str(e)}")
+
+
+def _day_start(day):
+    return timezone.make_aware(datetime.combine(day, datetime.min.time()))
+
+
+def _day_counts(bookings, tasks, first_day, last_day):
+    """{day: {'bookings': {status: n}, 'tasks': {status: n}}} for days with events."""
+    counts = {}
+
+    booking_ids_sql, booking_ids_params = bookings.order_by().values('id').query.sql_with_params()
+    table = bookings.model._meta.db_table
+    sql = f'''
+        WITH days AS (
+            SELECT d::date AS day,
+                   tstzrange(d::timestamp AT TIME ZONE %s, (d + interval '1 day')::timestamp AT TIME ZONE %s, '[)') AS span
+            FROM generate_series(%s::date, %s::date, interval '1 day') AS d
+        )
+        SELECT days.day, b.status, COUNT(*)
+        FROM days
+        JOIN "{table}" b ON b.period && days.span
+        WHERE b.id IN ({booking_ids_sql})
+        GROUP BY days.day, b.status
+    '''
+    tz = timezone.get_current_timezone_name()
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [tz, tz, first_day, last_day, *booking_ids_params])
+        for day, status, n in cursor.fetchall():
+            counts.setdefault(day, {'bookings': {}, 'tasks': {}})['bookings'][status] = n
+
+    task_rows = (
+        tasks.filter(due_date__gte=_day_start(first_day), due_date__lt=_day_start(last_day + timedelta(days=1)))
+        .annotate(day=TruncDay('due_date'))
+        .order_by()
+        .values('day', 'status')
+        .annotate(n=Count('id'))
+    )
+    for row in task_rows:
+        day = timezone.localtime(row['day']).date()
+        counts.setdefault(day, {'bookings': {}, 'tasks': {}})['tasks'][row['status']] = row['n']
+    return counts
+
+
+def build_calendar(bookings, tasks, first_day, last_day):
+    """
+    Calendar payload for the inclusive day window, from already visibility-
+    filtered Booking and Task querysets.
+    """
+    from .services import BookingAvailabilityService
+
+    max_events = getattr(settings, 'CALENDAR_MAX_EVENTS', 500)
+    window_start, window_end = _day_start(first_day), _day_start(last_day + timedelta(days=1))
+    counts = _day_counts(bookings, tasks, first_day, last_day)
+
+    days = []
+    day = first_day
+    while day <= last_day:
+        day_counts = counts.get(day, {'bookings': {}, 'tasks': {}})
+        days.append({
+            'date': day.isoformat(),
+            'bookings': sum(day_counts['bookings'].values()),
+            'tasks': sum(day_counts['tasks'].values()),
+            'bookings_by_status': day_counts['bookings'],
+            'tasks_by_status': day_counts['tasks'],
+        })
+        day += timedelta(days=1)
+
+    booking_events = list(
+        bookings.filter(period__overlap=BookingAvailabilityService.window(window_start, window_end))
+        .order_by('start_date', 'id')
+        .values('id', 'title', 'item_name', 'status', 'booking_type', 'start_date', 'end_date')[:max_events + 1]
+    )
+    task_events = list(
+        tasks.filter(due_date__gte=window_start, due_date__lt=window_end)
+        .order_by('due_date', 'id')
+        .values('id', 'title', 'status', 'priority', 'due_date', 'assigned_to_id')[:max_events + 1]
+    )
+    for event in booking_events:
+        # Frontend reads the booked item as item_name (stored in title)
+        event['item_name'] = event.pop('title') or event['item_name']
+
+    return {
+        'start': first_day.isoformat(),
+        'end': last_day.isoformat(),
+        'days': days,
+        'bookings': booking_events[:max_events],
+        'tasks': task_events[:max_events],
+        'truncated': len(booking_events) > max_events or len(task_events) > max_events,
+    }
+
+
+def cached_calendar(user, industry_id, first_day, last_day, bookings, tasks):
+    """
+    build_calendar() through the per-industry versioned cache. Cross-industry
+    views (global admin without industry_id) have no single version to
+    follow and are built uncached.
+    """
+    version = get_calendar_version(industry_id) if industry_id is not None else None
+    key = None
+    if version is not None:
+        key = f"calendar:{industry_id}:{version}:{user.pk}:{first_day}:{last_day}"
+        payload = cache.get(key)
+        if payload is not None:
+            return payload
+    payload = build_calendar(bookings, tasks, first_day, last_day)
+    if key is not None:
+        cache.set(key, payload, getattr(settings, 'CALENDAR_CACHE_TTL', 300))
+    return payload
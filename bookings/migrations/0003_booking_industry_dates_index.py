@@ -0,0 +1,20 @@
+# Generated by Django 5.0.1 on 2026-10-19 13:00
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Build indexes without locking writes on these tables
+    atomic = False
+
+    dependencies = [
+        ('bookings', '0002_initial'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='booking',
+            index=models.Index(fields=['industry', 'start_date', 'end_date'], name='bookings_industry_dates_idx'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.0.1 on 2026-10-19 14:00
+
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.operations import AddIndexConcurrently, TrigramExtension
+from django.db import migrations
+from django.db.models.functions import Upper
+
+
+class Migration(migrations.Migration):
+    # Build indexes without locking writes on these tables
+    atomic = False
+
+    dependencies = [
+        ('bookings', '0003_booking_industry_dates_index'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        AddIndexConcurrently(
+            model_name='booking',
+            index=GinIndex(OpClass(Upper('title'), name='gin_trgm_ops'), name='bookings_title_trgm'),
+        ),
+        AddIndexConcurrently(
+            model_name='booking',
+            index=GinIndex(OpClass(Upper('item_name'), name='gin_trgm_ops'), name='bookings_item_name_trgm'),
+        ),
+        AddIndexConcurrently(
+            model_name='booking',
+            index=GinIndex(OpClass(Upper('description'), name='gin_trgm_ops'), name='bookings_description_trgm'),
+        ),
+    ]
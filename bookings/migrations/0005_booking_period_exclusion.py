@@ -0,0 +1,93 @@
+# Generated by Django 5.0.1 on 2026-10-19 17:00
+#
+# Requires PostgreSQL 14+: BookingAvailabilityService.availability builds on
+# Booking.period with range_agg() over ranges and multirange arithmetic.
+
+import logging
+
+import django.contrib.postgres.constraints
+import django.contrib.postgres.fields.ranges
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import BtreeGistExtension
+from django.db import migrations, models
+
+logger = logging.getLogger(__name__)
+
+BACKFILL_SQL = """
+UPDATE bookings_booking
+SET period = CASE WHEN end_date > start_date THEN tstzrange(start_date, end_date, '[)') END,
+    resource_key = left(lower(btrim(coalesce(nullif(item_name, ''), title, ''))), 200)
+"""
+
+DEMOTE_BATCH_SIZE = 1000
+
+
+def demote_conflicts(apps, schema_editor):
+    """
+    Existing confirmed bookings that overlap another confirmed booking of the
+    same item go back to 'pending' for review, so the constraint can be added.
+
+    Bookings of each (industry, item) are walked oldest first (by id; there is
+    no approval timestamp) and one is kept only if it overlaps none of the
+    bookings already kept, so a booking is never demoted because of one that
+    is demoted itself. Demoted ids are logged.
+    """
+    Booking = apps.get_model('bookings', 'Booking')
+    confirmed = (
+        Booking.objects.filter(status__in=('book', 'approved'), industry__isnull=False, period__isnull=False)
+        .exclude(resource_key='')
+        .order_by('industry_id', 'resource_key', 'id')
+        .values_list('id', 'industry_id', 'resource_key', 'period')
+    )
+    demoted, kept, group = [], [], None
+    for booking_id, industry_id, resource_key, period in confirmed.iterator(chunk_size=DEMOTE_BATCH_SIZE):
+        if (industry_id, resource_key) != group:
+            group, kept = (industry_id, resource_key), []
+        # Periods are '[)' ranges with both bounds set (end_date > start_date)
+        if any(period.lower < other.upper and other.lower < period.upper for other in kept):
+            demoted.append(booking_id)
+        else:
+            kept.append(period)
+
+    for start in range(0, len(demoted), DEMOTE_BATCH_SIZE):
+        Booking.objects.filter(id__in=demoted[start:start + DEMOTE_BATCH_SIZE]).update(status='pending')
+    if demoted:
+        logger.warning(
+            f"Demoted {len(demoted)} overlapping confirmed bookings to 'pending' for review: {demoted}"
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0004_booking_search_trgm_indexes'),
+    ]
+
+    operations = [
+        BtreeGistExtension(),
+        migrations.AddField(
+            model_name='booking',
+            name='period',
+            field=django.contrib.postgres.fields.ranges.DateTimeRangeField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='booking',
+            name='resource_key',
+            field=models.CharField(blank=True, default='', editable=False, max_length=200),
+        ),
+        migrations.RunSQL(BACKFILL_SQL, migrations.RunSQL.noop),
+        migrations.RunPython(demote_conflicts, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='booking',
+            index=django.contrib.postgres.indexes.GistIndex(fields=['industry', 'period'], name='bookings_industry_period_gist'),
+        ),
+        migrations.AddConstraint(
+            model_name='booking',
+            constraint=django.contrib.postgres.constraints.ExclusionConstraint(
+                condition=models.Q(('status__in', ('book', 'approved')), models.Q(('resource_key', ''), _negated=True)),
+                expressions=[('industry', '='), ('resource_key', '='), ('period', '&&')],
+                name='bookings_no_double_booking',
+                violation_error_message='This item is already booked for an overlapping period.',
+            ),
+        ),
+    ]
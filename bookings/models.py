@@ -1,8 +1,22 @@
+from django.contrib.postgres.constraints import ExclusionConstraint
+from django.contrib.postgres.fields import DateTimeRangeField, RangeOperators
+from django.contrib.postgres.indexes import GinIndex, GistIndex, OpClass
 from django.db import models
+from django.db.backends.postgresql.psycopg_any import DateTimeTZRange
+from django.db.models.functions import Upper
 from django.core.exceptions import ValidationError
 from django.conf import settings
 from django.utils import timezone
 
+# Statuses that hold the booked item; pending requests may overlap until one is approved
+BLOCKING_STATUSES = ('book', 'approved')
+
+
+def booking_resource_key(item_name, title):
+    """The bookable item a booking holds: its item name (the frontend sends it as title), normalized."""
+    return (item_name or title or '').strip().lower()[:200]
+
+
 class Booking(models.Model):
     BOOKING_TYPES = [
         ('meeting', 'Meeting'),
@@ -51,6 +65,9 @@ class Booking(models.Model):
     approved_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name='approved_bookings')
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # [start_date, end_date) and the normalized item, kept in sync by save()
+    period = DateTimeRangeField(null=True, editable=False)
+    resource_key = models.CharField(max_length=200, blank=True, default='', editable=False)
 
     class Meta:
         ordering = ['-created_at']
@@ -59,6 +76,26 @@ class Booking(models.Model):
             models.Index(fields=['booking_type']),
             models.Index(fields=['start_date']),
             models.Index(fields=['end_date']),
+            models.Index(fields=['industry', 'start_date', 'end_date'], name='bookings_industry_dates_idx'),
+            # Calendar windows: period && tstzrange(...) per industry
+            GistIndex(fields=['industry', 'period'], name='bookings_industry_period_gist'),
+            # Trigram indexes for ?q= search (users.search_utils)
+            GinIndex(OpClass(Upper('title'), name='gin_trgm_ops'), name='bookings_title_trgm'),
+            GinIndex(OpClass(Upper('item_name'), name='gin_trgm_ops'), name='bookings_item_name_trgm'),
+            GinIndex(OpClass(Upper('description'), name='gin_trgm_ops'), name='bookings_description_trgm'),
+        ]
+        constraints = [
+            # No two confirmed bookings of the same item overlap (btree_gist)
+            ExclusionConstraint(
+                name='bookings_no_double_booking',
+                expressions=[
+                    ('industry', RangeOperators.EQUAL),
+                    ('resource_key', RangeOperators.EQUAL),
+                    ('period', RangeOperators.OVERLAPS),
+                ],
+                condition=models.Q(status__in=BLOCKING_STATUSES) & ~models.Q(resource_key=''),
+                violation_error_message='This item is already booked for an overlapping period.',
+            ),
         ]
 
     def __str__(self):
@@ -72,6 +109,13 @@ class Booking(models.Model):
                 raise ValidationError('End date must be after start date')
 
     def save(self, *args, **kwargs):
+        # clean() rejects end <= start; leave the range empty rather than invalid until then
+        valid_dates = self.start_date and self.end_date and self.end_date > self.start_date
+        self.period = DateTimeTZRange(self.start_date, self.end_date, '[)') if valid_dates else None
+        self.resource_key = booking_resource_key(self.item_name, self.title)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = {*update_fields, 'period', 'resource_key'}
         self.full_clean()
         super().save(*args, **kwargs)
 
@@ -1,6 +1,7 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
 from .models import Booking, BookingComment, BookingAttachment
+from .services import booking_write_errors
 from users.serializers import IndustrySerializer
 from users.models import Industry, Role
 
@@ -130,7 +131,8 @@ class BookingCreateSerializer(serializers.ModelSerializer):
             )
         
         validated_data['user_role'] = role
-        return super().create(validated_data)
+        with booking_write_errors():
+            return super().create(validated_data)
 
 
 # PUT / PATCH
@@ -174,7 +176,8 @@ class BookingUpdateSerializer(serializers.ModelSerializer):
                     {'user_role': f'Role "{role_name}" does not exist in the system.'}
                 )
         
-        return super().update(instance, validated_data)
+        with booking_write_errors():
+            return super().update(instance, validated_data)
 
 
 # PATCH Status only
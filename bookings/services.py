@@ -0,0 +1,110 @@
+from django.db import connection
+from django.db.backends.postgresql.psycopg_any import DateTimeTZRange
+from rest_framework import serializers
+import logging
+
+from users.api_utils import constraint_write_errors
+from .models import BLOCKING_STATUSES, Booking, booking_resource_key
+
+logger = logging.getLogger(__name__)
+
+DOUBLE_BOOKING_CONSTRAINT = 'bookings_no_double_booking'
+
+
+def booking_write_errors():
+    """
+    Surface booking model validation (Booking.save() runs full_clean, which
+    checks the no-double-booking constraint) and the constraint itself, when
+    a concurrent request wins the race, as DRF 400s instead of 500s.
+    """
+    return constraint_write_errors(DOUBLE_BOOKING_CONSTRAINT, {
+        'non_field_errors': ['This item is already booked for an overlapping period.']
+    })
+
+
+class BookingAvailabilityService:
+    """
+    Availability of bookable items, answered from Booking.period.
+
+    period is a tstzrange with a GiST index per industry, and confirmed
+    bookings (BLOCKING_STATUSES) of one item cannot overlap thanks to the
+    bookings_no_double_booking exclusion constraint, so conflict checks are
+    index scans and free slots are a multirange difference in one query.
+    range_agg() and multiranges need PostgreSQL 14 or newer.
+    """
+
+    @staticmethod
+    def window(start, end) -> DateTimeTZRange:
+        if start is None or end is None or end <= start:
+            raise serializers.ValidationError("start and end are required and end must be after start")
+        return DateTimeTZRange(start, end, '[)')
+
+    @staticmethod
+    def conflicts(industry_id, item, start, end, exclude_id=None):
+        """Confirmed bookings of `item` overlapping [start, end)."""
+        queryset = Booking.objects.filter(
+            industry_id=industry_id,
+            resource_key=booking_resource_key(item, None),
+            status__in=BLOCKING_STATUSES,
+            period__overlap=BookingAvailabilityService.window(start, end),
+        )
+        if exclude_id:
+            queryset = queryset.exclude(pk=exclude_id)
+        return queryset.order_by('start_date')
+
+    @staticmethod
+    def availability(industry_id, start, end, item=None, min_minutes=0):
+        """
+        Busy periods and free slots within [start, end) per booked item
+        (or for `item` only).
+
+        Returns:
+            list of {'item', 'item_name', 'available', 'busy': [[from, to], ...], 'free': [[from, to], ...]};
+            free slots shorter than `min_minutes` are left out
+        """
+        BookingAvailabilityService.window(start, end)
+        table = Booking._meta.db_table
+        item_filter = ''
+        params = [start, end, industry_id, list(BLOCKING_STATUSES)]
+        if item:
+            item_filter = 'AND b.resource_key = %s'
+            params.append(booking_resource_key(item, None))
+        params.append(int(min_minutes or 0))
+        sql = f'''
+            WITH win AS (SELECT tstzrange(%s, %s, '[)') AS w),
+            busy AS (
+                SELECT b.resource_key,
+                       MAX(COALESCE(NULLIF(b.item_name, ''), b.title)) AS item_name,
+                       range_agg(b.period * win.w) AS ranges
+                FROM "{table}" b, win
+                WHERE b.industry_id = %s AND b.status = ANY(%s) AND b.resource_key <> ''
+                  AND b.period && win.w {item_filter}
+                GROUP BY b.resource_key
+            )
+            SELECT busy.resource_key, busy.item_name,
+                   COALESCE((SELECT json_agg(json_build_array(lower(r), upper(r)) ORDER BY lower(r))
+                             FROM unnest(busy.ranges) r), '[]'),
+                   COALESCE((SELECT json_agg(json_build_array(lower(f), upper(f)) ORDER BY lower(f))
+                             FROM unnest(tstzmultirange(win.w) - busy.ranges) f
+                             WHERE upper(f) - lower(f) >= make_interval(mins => %s)), '[]')
+            FROM busy, win
+            ORDER BY busy.resource_key
+        '''
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            rows = cursor.fetchall()
+
+        results = [
+            {'item': key, 'item_name': name, 'available': not busy, 'busy': busy, 'free': free}
+            for key, name, busy, free in rows
+        ]
+        if item and not results:
+            # Nothing booked in the window: the whole window is free
+            results.append({
+                'item': booking_resource_key(item, None),
+                'item_name': item,
+                'available': True,
+                'busy': [],
+                'free': [[start, end]],
+            })
+        return results
@@ -0,0 +1,21 @@
+"""
+Signals for bookings app.
+Invalidates the cached booking/task calendar (bookings.calendar) of an industry
+whenever one of its bookings or tasks is saved or deleted.
+"""
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from tasks.models import Task
+from .calendar import bump_calendar_version
+from .models import Booking
+
+
+@receiver(post_save, sender=Booking)
+@receiver(post_delete, sender=Booking)
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+def invalidate_calendar_cache(sender, instance, **kwargs):
+    industry_id = instance.industry_id
+    transaction.on_commit(lambda: bump_calendar_version(industry_id))
@@ -0,0 +1,162 @@
+from datetime import datetime, timedelta
+
+from django.test import TestCase
+from django.core.exceptions import ValidationError
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
+from django.db.backends.postgresql.psycopg_any import DateTimeTZRange
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework import status
+from users.models import Industry, Role
+from .models import Booking
+
+User = get_user_model()
+
+
+class BookingTestBase(TestCase):
+    """An owner booking items on 2 Nov 2026"""
+
+    def setUp(self):
+        self.industry = Industry.objects.create(name="Test Industry")
+        self.owner_role, _ = Role.objects.get_or_create(name='owner', defaults={'display_name': 'Owner'})
+        self.owner = User.objects.create_user(
+            username='owner1',
+            password='testpass123',
+            phone_number='9876543219',
+            role=self.owner_role,
+            industry=self.industry
+        )
+        self.day = timezone.make_aware(datetime(2026, 11, 2))
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.owner)
+
+    def _book(self, start_hour, end_hour, status='approved', title='Tractor'):
+        return Booking.objects.create(
+            industry=self.industry, title=title, status=status, created_by=self.owner,
+            start_date=self.day + timedelta(hours=start_hour), end_date=self.day + timedelta(hours=end_hour),
+        )
+
+
+class BookingAvailabilityTest(BookingTestBase):
+    """Confirmed bookings of one item cannot overlap; availability comes from the period range"""
+
+    def test_overlapping_confirmed_booking_is_rejected(self):
+        self._book(9, 12)
+        self._book(12, 14)               # touching is fine ([) ranges)
+        self._book(10, 11, status='pending')
+        self._book(10, 11, title='Sprayer')
+
+        with self.assertRaises(ValidationError):
+            self._book(11, 13, title=' tractor ')
+
+        # A concurrent writer that passed validation still hits the constraint
+        booking = Booking(
+            industry=self.industry, title='Tractor', status='book', created_by=self.owner,
+            start_date=self.day + timedelta(hours=11), end_date=self.day + timedelta(hours=13),
+            resource_key='tractor',
+            period=DateTimeTZRange(self.day + timedelta(hours=11), self.day + timedelta(hours=13)),
+        )
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            super(Booking, booking).save()
+
+    def test_api_create_conflict_is_a_400(self):
+        self._book(9, 12)
+        response = self.client.post('/api/bookings/', {
+            'item_name': 'Tractor',
+            'user_role': 'owner',
+            'status': 'approved',
+            'start_date': (self.day + timedelta(hours=11)).isoformat(),
+            'end_date': (self.day + timedelta(hours=13)).isoformat(),
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, response.data)
+
+    def test_availability_free_slots(self):
+        self._book(9, 12)
+        self._book(14, 15)
+        response = self.client.get('/api/bookings/availability/', {
+            'item': 'tractor',
+            'start': (self.day + timedelta(hours=8)).isoformat(),
+            'end': (self.day + timedelta(hours=18)).isoformat(),
+            'min_minutes': 90,
+        })
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        result = response.data['results'][0]
+        self.assertFalse(result['available'])
+        self.assertEqual(len(result['busy']), 2)
+        # 8-9 is shorter than 90 minutes; 12-14 and 15-18 remain
+        self.assertEqual(len(result['free']), 2)
+        self.assertEqual(len(response.data['conflicts']), 2)
+
+    def test_availability_industry_id_is_for_superusers_only(self):
+        self._book(9, 12)
+        window = {
+            'start': (self.day + timedelta(hours=8)).isoformat(),
+            'end': (self.day + timedelta(hours=18)).isoformat(),
+        }
+        no_industry = User.objects.create_user(
+            username='owner2', password='testpass123', phone_number='9876543218', role=self.owner_role
+        )
+        self.client.force_authenticate(user=no_industry)
+        response = self.client.get('/api/bookings/availability/', {**window, 'industry_id': self.industry.id})
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        self.assertEqual(response.data['results'], [])
+
+        admin = User.objects.create_superuser(username='admin1', password='testpass123', phone_number='9876543217')
+        self.client.force_authenticate(user=admin)
+        response = self.client.get('/api/bookings/availability/', {**window, 'industry_id': 'abc'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get('/api/bookings/availability/', {**window, 'industry_id': self.industry.id})
+        self.assertEqual(len(response.data['results']), 1)
+
+    def test_date_filter_uses_overlap(self):
+        self._book(22, 26)   # crosses midnight into the next day
+        next_day = (self.day + timedelta(days=1)).date().isoformat()
+        response = self.client.get('/api/bookings/', {'date': next_day})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 1)
+
+
+class CalendarTest(BookingTestBase):
+    """Per-day booking and task counts for a month, cached per industry"""
+
+    def test_month_counts_and_events(self):
+        from tasks.models import Task
+
+        self._book(22, 26)                          # Nov 2 and Nov 3
+        self._book(9, 10, status='pending', title='Sprayer')
+        Task.objects.create(
+            industry=self.industry, title='Prune', description='Prune rows',
+            created_by=self.owner, assigned_to=self.owner, due_date=self.day + timedelta(hours=15),
+        )
+
+        response = self.client.get('/api/calendar/', {'month': '2026-11'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        days = {day['date']: day for day in response.data['days']}
+        self.assertEqual(len(days), 30)
+        self.assertEqual(days['2026-11-02']['bookings'], 2)
+        self.assertEqual(days['2026-11-02']['bookings_by_status'], {'approved': 1, 'pending': 1})
+        self.assertEqual(days['2026-11-03']['bookings'], 1)
+        self.assertEqual(days['2026-11-02']['tasks'], 1)
+        self.assertEqual(len(response.data['bookings']), 2)
+        self.assertEqual(response.data['tasks'][0]['title'], 'Prune')
+        self.assertFalse(response.data['truncated'])
+
+    def test_api_task_appears_and_invalidates_cache(self):
+        self.client.get('/api/calendar/', {'month': '2026-11'})   # cached, no tasks yet
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/tasks/', {
+                'title': 'Spray', 'description': 'Spray block A', 'assigned_to_id': self.owner.id,
+                'due_date': (self.day + timedelta(hours=10)).isoformat(),
+            }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED, response.data)
+
+        response = self.client.get('/api/calendar/', {'month': '2026-11'})
+        days = {day['date']: day for day in response.data['days']}
+        self.assertEqual(days['2026-11-02']['tasks'], 1)
+
+    def test_window_is_validated(self):
+        response = self.client.get('/api/calendar/', {'start': '2026-01-01', 'end': '2026-06-01'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -1,7 +1,7 @@
 from django.urls import path, include
 from rest_framework_nested import routers
 from rest_framework.routers import DefaultRouter
-from .views import BookingViewSet, BookingCommentViewSet, BookingAttachmentViewSet
+from .views import BookingViewSet, BookingCommentViewSet, BookingAttachmentViewSet, CalendarView
 
 router = DefaultRouter()
 router.register(r'bookings', BookingViewSet, basename='booking')
@@ -11,6 +11,7 @@ booking_router.register(r'comments', BookingCommentViewSet, basename='booking-co
 booking_router.register(r'attachments', BookingAttachmentViewSet, basename='booking-attachment')
 
 urlpatterns = [
+    path('calendar/', CalendarView.as_view(), name='booking-task-calendar'),
     path('', include(router.urls)),
     path('', include(booking_router.urls)),
 ] 
\ No newline at end of file
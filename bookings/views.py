@@ -1,8 +1,11 @@
 from rest_framework import viewsets, status, permissions
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from rest_framework.views import APIView
+from datetime import datetime, timedelta
 from django.shortcuts import get_object_or_404
-from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_date
 from .models import Booking, BookingComment, BookingAttachment
 from .serializers import (
     BookingSerializer,
@@ -15,7 +18,19 @@ from .serializers import (
     BookingAttachmentCreateSerializer
 )
 from .permissions import CanManageBookings, CanViewBookings
+from .services import BookingAvailabilityService, booking_write_errors
+from .calendar import MAX_DAYS, cached_calendar
+from users.api_utils import parse_moment
 from users.multi_tenant_utils import filter_by_industry, get_user_industry
+from users.search_utils import get_search_query, ranked_search
+
+def visible_bookings(user):
+    """Bookings `user` may see: their industry's (filter_by_industry), only their own for regular users."""
+    qs = filter_by_industry(Booking.objects.all(), user)
+    if not (user.is_superuser or user.has_role('owner') or user.has_role('manager') or user.has_role('fieldofficer')):
+        qs = qs.filter(created_by=user)
+    return qs
+
 
 class BookingViewSet(viewsets.ModelViewSet):
     serializer_class = BookingSerializer
@@ -45,11 +60,8 @@ class BookingViewSet(viewsets.ModelViewSet):
         return [CanViewBookings()]
 
     def get_queryset(self):
-        qs = Booking.objects.all()
-        user = self.request.user
-        
-        # Apply multi-tenant filtering by industry
-        qs = filter_by_industry(qs, user)
+        # Multi-tenant filtering by industry; regular users only see their own bookings
+        qs = visible_bookings(self.request.user)
         
         # Filter by status
         status_param = self.request.query_params.get('status')
@@ -71,27 +83,17 @@ class BookingViewSet(viewsets.ModelViewSet):
         if end_date:
             qs = qs.filter(end_date__lte=end_date)
         
-        # Filter by date (for bookings on a specific date)
-        date = self.request.query_params.get('date')
+        # Filter by date (bookings overlapping that day), as a range overlap on the GiST-indexed period
+        try:
+            date = parse_date(self.request.query_params.get('date') or '')
+        except ValueError:
+            date = None
         if date:
-            qs = qs.filter(
-                start_date__date__lte=date,
-                end_date__date__gte=date
-            )
+            day_start = timezone.make_aware(datetime.combine(date, datetime.min.time()))
+            qs = qs.filter(period__overlap=BookingAvailabilityService.window(day_start, day_start + timedelta(days=1)))
         
-        # Search parameter
-        search = self.request.query_params.get('search')
-        if search:
-            qs = qs.filter(
-                Q(title__icontains=search) |
-                Q(item_name__icontains=search) |
-                Q(description__icontains=search)
-            )
-        
-        # Additional filtering for non-admin/manager/field officer users
-        if not (user.is_superuser or user.has_role('owner') or user.has_role('manager') or user.has_role('fieldofficer')):
-            # Regular users can only see their own bookings
-            qs = qs.filter(created_by=user)
+        # Search parameter (?q=, or legacy ?search=), best match first
+        qs = ranked_search(qs, get_search_query(self.request), self.search_fields)
         
         return qs.select_related('created_by', 'approved_by', 'industry')
 
@@ -138,10 +140,56 @@ class BookingViewSet(viewsets.ModelViewSet):
             booking.status = serializer.validated_data['status']
             if booking.status in ['approved', 'rejected']:
                 booking.approved_by = request.user
-            booking.save()
+            with booking_write_errors():
+                booking.save()
             return Response(BookingSerializer(booking).data)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+    @action(detail=False, methods=['get'])
+    def availability(self, request):
+        """
+        Busy periods and free slots per bookable item in a window:
+        ?start=<ISO datetime>&end=<ISO datetime> [&item=Tractor] [&min_minutes=30]
+        Only confirmed bookings (book/approved) block an item. Superusers pass ?industry_id=.
+        """
+        start = parse_moment(request.query_params.get('start'))
+        end = parse_moment(request.query_params.get('end'))
+        if start is None or end is None or end <= start:
+            return Response(
+                {'detail': 'start and end (ISO date or datetime) are required, end after start'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if end - start > timedelta(days=366):
+            return Response({'detail': 'Window must be at most 366 days'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        industry = get_user_industry(request.user)
+        industry_id = industry.id if industry else None
+        if request.user.is_superuser:
+            try:
+                industry_id = int(request.query_params.get('industry_id') or 0) or industry_id
+            except ValueError:
+                return Response({'detail': 'industry_id must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+            if industry_id is None:
+                return Response({'detail': 'industry_id is required'}, status=status.HTTP_400_BAD_REQUEST)
+        elif industry_id is None:
+            # Users without an industry see no one's bookings
+            return Response({'start': start, 'end': end, 'results': []})
+        try:
+            min_minutes = max(int(request.query_params.get('min_minutes', 0)), 0)
+        except ValueError:
+            return Response({'detail': 'min_minutes must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        item = (request.query_params.get('item') or '').strip()
+        results = BookingAvailabilityService.availability(industry_id, start, end, item=item or None, min_minutes=min_minutes)
+        data = {'start': start, 'end': end, 'results': results}
+        if item:
+            conflicts = BookingAvailabilityService.conflicts(industry_id, item, start, end)
+            data['conflicts'] = [
+                {'id': booking.id, 'status': booking.status, 'start_date': booking.start_date, 'end_date': booking.end_date}
+                for booking in conflicts
+            ]
+        return Response(data)
+
 class BookingCommentViewSet(viewsets.ModelViewSet):
     serializer_class = BookingCommentSerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -162,4 +210,64 @@ class BookingAttachmentViewSet(viewsets.ModelViewSet):
 
     def perform_create(self, serializer):
         booking = get_object_or_404(Booking, pk=self.kwargs['booking_pk'])
-        serializer.save(booking=booking, uploaded_by=self.request.user) 
\ No newline at end of file
+        serializer.save(booking=booking, uploaded_by=self.request.user) 
+
+
+class CalendarView(APIView):
+    """
+    GET per-day booking and task counts plus compact event stubs for a window.
+
+    ?month=YYYY-MM, or ?start=YYYY-MM-DD&end=YYYY-MM-DD (inclusive, at most
+    MAX_DAYS days). Global admins may pass ?industry_id=.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        from tasks.views import visible_tasks
+
+        first_day, last_day = self._parse_window(request.query_params)
+        if first_day is None:
+            return Response(
+                {'error': 'Pass month=YYYY-MM or start and end dates (YYYY-MM-DD)'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if last_day < first_day or (last_day - first_day).days >= MAX_DAYS:
+            return Response(
+                {'error': f'end must not be before start and the window is limited to {MAX_DAYS} days'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        user = request.user
+        bookings = visible_bookings(user)
+        tasks = visible_tasks(user)
+        industry = get_user_industry(user)
+        industry_id = industry.id if industry else None
+        if user.is_superuser and request.query_params.get('industry_id'):
+            try:
+                industry_id = int(request.query_params['industry_id'])
+            except ValueError:
+                return Response({'error': 'industry_id must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+        if industry_id is not None:
+            bookings = bookings.filter(industry_id=industry_id)
+            tasks = tasks.filter(industry_id=industry_id)
+
+        return Response(cached_calendar(user, industry_id, first_day, last_day, bookings, tasks))
+
+    @staticmethod
+    def _parse_window(params):
+        month = params.get('month')
+        if month:
+            try:
+                first_day = datetime.strptime(month, '%Y-%m').date()
+            except ValueError:
+                return None, None
+            next_month = (first_day + timedelta(days=32)).replace(day=1)
+            return first_day, next_month - timedelta(days=1)
+        try:
+            first_day = parse_date(params.get('start') or '')
+            last_day = parse_date(params.get('end') or '')
+        except ValueError:
+            return None, None
+        if first_day is None or last_day is None:
+            return None, None
+        return first_day, last_day
@@ -1,6 +1,8 @@
 import requests
 import logging
 
+from farm_management import http_client
+
 logger = logging.getLogger(__name__)
 
 OLLAMA_API_URL = "http://localhost:11434/api/generate"
@@ -30,7 +32,7 @@ def generate_chatbot_response(message: str) -> str:
             "stream": False
         }
         
-        response = requests.post(
+        response = http_client.post(
             OLLAMA_API_URL,
             json=payload,
             timeout=30
@@ -0,0 +1,36 @@
+"""
+Management command to fill equipment next maintenance dates and notify due maintenance.
+Run: python manage.py schedule_equipment_maintenance [--days 7] [--schedule]
+
+Equipment with a maintenance_interval_days gets next_maintenance_date =
+last_maintenance_date + interval where it is missing (one UPDATE). Equipment
+due within --days (or overdue) is read in one range scan of
+equipment_maint_due_idx and its assignee is notified once per due date.
+--schedule instead queues the recurring background job (every
+MAINTENANCE_SCHEDULER_INTERVAL seconds, picked up by run_workers); it is safe
+to run on every deploy.
+"""
+from django.core.management.base import BaseCommand
+
+from equipment.services import MaintenanceScheduleService, run_maintenance_scheduler_job
+
+
+class Command(BaseCommand):
+    help = "Fill next maintenance dates and notify due equipment, or schedule the recurring job"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, help='Days ahead that count as due (default MAINTENANCE_DUE_SOON_DAYS)')
+        parser.add_argument('--schedule', action='store_true', help='Queue the recurring job instead of running now')
+
+    def handle(self, *args, **options):
+        if options['schedule']:
+            from jobs.runner import enqueue_once
+
+            job = enqueue_once(run_maintenance_scheduler_job, queue='maintenance')
+            self.stdout.write(self.style.SUCCESS(f"Maintenance scheduler scheduled (job {job.pk}, due {job.run_at})"))
+            return
+
+        filled, notified = MaintenanceScheduleService.run(options.get('days'))
+        self.stdout.write(self.style.SUCCESS(
+            f"Maintenance scheduled: {filled} next dates filled, {notified} notifications sent"
+        ))
@@ -0,0 +1,51 @@
+# Generated by Django 5.0.1 on 2026-10-19 18:00
+
+import django.contrib.postgres.constraints
+import django.contrib.postgres.fields.ranges
+from django.contrib.postgres.operations import BtreeGistExtension
+from django.db import migrations
+
+# Legacy rows could overlap (start_usage had no lock). Close every usage that
+# runs past the next checkout of the same equipment at that checkout, so the
+# ledger is a sequence of non-overlapping periods before the constraint lands.
+TRIM_OVERLAPS_SQL = """
+UPDATE equipment_equipmentusage u
+SET end_date = n.next_start
+FROM (
+    SELECT id, LEAD(start_date) OVER (PARTITION BY equipment_id ORDER BY start_date, id) AS next_start
+    FROM equipment_equipmentusage
+) n
+WHERE u.id = n.id
+  AND n.next_start IS NOT NULL
+  AND (u.end_date IS NULL OR u.end_date > n.next_start)
+"""
+
+BACKFILL_SQL = """
+UPDATE equipment_equipmentusage
+SET period = CASE
+    WHEN end_date IS NULL THEN tstzrange(start_date, NULL, '[)')
+    WHEN end_date > start_date THEN tstzrange(start_date, end_date, '[)')
+END
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('equipment', '0002_initial'),
+    ]
+
+    operations = [
+        BtreeGistExtension(),
+        migrations.AddField(
+            model_name='equipmentusage',
+            name='period',
+            field=django.contrib.postgres.fields.ranges.DateTimeRangeField(blank=True, editable=False, help_text='[start_date, end_date) - maintained on save, unbounded while in use', null=True),
+        ),
+        migrations.RunSQL(TRIM_OVERLAPS_SQL, migrations.RunSQL.noop),
+        migrations.RunSQL(BACKFILL_SQL, migrations.RunSQL.noop),
+        migrations.AddConstraint(
+            model_name='equipmentusage',
+            constraint=django.contrib.postgres.constraints.ExclusionConstraint(expressions=[('equipment', '='), ('period', '&&')], name='equipment_usage_no_overlap'),
+        ),
+    ]
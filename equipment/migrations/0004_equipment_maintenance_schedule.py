@@ -0,0 +1,30 @@
+# Generated by Django 5.0.1 on 2026-10-19 19:00
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Build the index without locking writes on equipment
+    atomic = False
+
+    dependencies = [
+        ('equipment', '0003_equipmentusage_period_no_overlap'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='equipment',
+            name='maintenance_interval_days',
+            field=models.PositiveIntegerField(blank=True, help_text='Service interval; the scheduler fills next_maintenance_date from last_maintenance_date', null=True),
+        ),
+        migrations.AddField(
+            model_name='equipment',
+            name='maintenance_notified_for',
+            field=models.DateField(blank=True, editable=False, help_text='next_maintenance_date the last due-maintenance notification was sent for', null=True),
+        ),
+        AddIndexConcurrently(
+            model_name='equipment',
+            index=models.Index(fields=['status', 'next_maintenance_date'], name='equipment_maint_due_idx'),
+        ),
+    ]
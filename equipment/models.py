@@ -1,5 +1,9 @@
-from django.db import models
+from django.db import models, transaction
 from django.conf import settings
+from django.contrib.postgres.constraints import ExclusionConstraint
+from django.contrib.postgres.fields import DateTimeRangeField, RangeOperators
+from django.db.backends.postgresql.psycopg_any import DateTimeTZRange
+from django.utils import timezone
 
 class Equipment(models.Model):
     STATUS_CHOICES = (
@@ -18,15 +22,28 @@ class Equipment(models.Model):
     assigned_to = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True)
     last_maintenance_date = models.DateField(null=True, blank=True)
     next_maintenance_date = models.DateField(null=True, blank=True)
+    maintenance_interval_days = models.PositiveIntegerField(
+        null=True, blank=True,
+        help_text="Service interval; the scheduler fills next_maintenance_date from last_maintenance_date"
+    )
+    maintenance_notified_for = models.DateField(
+        null=True, blank=True, editable=False,
+        help_text="next_maintenance_date the last due-maintenance notification was sent for"
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Statuses that still need servicing (retired equipment drops out of the schedule)
+    MAINTAINED_STATUSES = ('available', 'in_use', 'maintenance')
+
     class Meta:
         ordering = ['-created_at']
         indexes = [
             models.Index(fields=['status']),
             models.Index(fields=['assigned_to']),
             models.Index(fields=['location']),
+            # Due/overdue maintenance scans (equipment.services.MaintenanceScheduleService)
+            models.Index(fields=['status', 'next_maintenance_date'], name='equipment_maint_due_idx'),
         ]
 
     def __str__(self):
@@ -48,35 +65,65 @@ class MaintenanceRecord(models.Model):
         return f"Maintenance for {self.equipment.name} on {self.maintenance_date}"
 
     def save(self, *args, **kwargs):
-        super().save(*args, **kwargs)
-        # Update equipment's last and next maintenance dates
-        self.equipment.last_maintenance_date = self.maintenance_date
-        self.equipment.next_maintenance_date = self.next_maintenance_date
-        self.equipment.save()
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            # Update equipment's last and next maintenance dates
+            Equipment.objects.filter(pk=self.equipment_id).update(
+                last_maintenance_date=self.maintenance_date,
+                next_maintenance_date=self.next_maintenance_date,
+                updated_at=timezone.now(),
+            )
 
 class EquipmentUsage(models.Model):
+    """
+    Usage ledger: one row per checkout of a piece of equipment. A row with no
+    end_date is the current checkout. period mirrors [start_date, end_date)
+    (unbounded while open) so usages of one equipment cannot overlap
+    (equipment_usage_no_overlap) and utilisation is computed from it in SQL.
+    """
     equipment = models.ForeignKey(Equipment, on_delete=models.CASCADE, related_name='usage_records')
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
     start_date = models.DateTimeField()
     end_date = models.DateTimeField(null=True, blank=True)
+    period = DateTimeRangeField(
+        null=True, blank=True, editable=False,
+        help_text="[start_date, end_date) - maintained on save, unbounded while in use"
+    )
     purpose = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         ordering = ['-start_date']
+        constraints = [
+            ExclusionConstraint(
+                name='equipment_usage_no_overlap',
+                expressions=[
+                    ('equipment', RangeOperators.EQUAL),
+                    ('period', RangeOperators.OVERLAPS),
+                ],
+            ),
+        ]
 
     def __str__(self):
         return f"{self.equipment.name} used by {self.user.username} from {self.start_date}"
 
     def save(self, *args, **kwargs):
-        if not self.end_date:
-            # Update equipment status to 'in_use' when usage starts
-            self.equipment.status = 'in_use'
-            self.equipment.assigned_to = self.user
-            self.equipment.save()
+        if self.end_date is None or self.end_date > self.start_date:
+            self.period = DateTimeTZRange(self.start_date, self.end_date, '[)')
         else:
-            # Update equipment status to 'available' when usage ends
-            self.equipment.status = 'available'
-            self.equipment.assigned_to = None
-            self.equipment.save()
-        super().save(*args, **kwargs) 
\ No newline at end of file
+            self.period = None
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = {*update_fields, 'period'}
+
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            # Keep the equipment's status in step with its open usage (single
+            # UPDATE, so a stale Equipment instance cannot overwrite other fields)
+            equipment = Equipment.objects.filter(pk=self.equipment_id)
+            if not self.end_date:
+                equipment.update(status='in_use', assigned_to=self.user_id, updated_at=timezone.now())
+            else:
+                equipment.filter(status='in_use', assigned_to=self.user_id).exclude(
+                    usage_records__end_date__isnull=True
+                ).update(status='available', assigned_to=None, updated_at=timezone.now())
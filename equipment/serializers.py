@@ -35,7 +35,7 @@ class EquipmentSerializer(serializers.ModelSerializer):
         model = Equipment
         fields = ('id', 'name', 'description', 'status', 'purchase_date',
                  'purchase_price', 'location', 'assigned_to',
-                 'last_maintenance_date', 'next_maintenance_date',
+                 'last_maintenance_date', 'next_maintenance_date', 'maintenance_interval_days',
                  'created_at', 'updated_at', 'maintenance_records', 'usage_records')
         read_only_fields = ('created_at', 'updated_at', 'last_maintenance_date',
                           'next_maintenance_date')
@@ -51,12 +51,30 @@ class EquipmentCreateSerializer(serializers.ModelSerializer):
     class Meta:
         model = Equipment
         fields = ('name', 'description', 'status', 'purchase_date',
-                 'purchase_price', 'location', 'assigned_to_id')
+                 'purchase_price', 'location', 'assigned_to_id', 'maintenance_interval_days')
 
 class EquipmentUpdateSerializer(serializers.ModelSerializer):
     class Meta:
         model = Equipment
-        fields = ('name', 'description', 'status', 'location', 'assigned_to')
+        fields = ('name', 'description', 'status', 'location', 'assigned_to', 'maintenance_interval_days')
+
+class EquipmentMaintenanceDueSerializer(serializers.ModelSerializer):
+    """Compact row for the due-maintenance feed."""
+    days_until_due = serializers.SerializerMethodField()
+    overdue = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Equipment
+        fields = ('id', 'name', 'status', 'location', 'assigned_to',
+                 'last_maintenance_date', 'next_maintenance_date', 'maintenance_interval_days',
+                 'days_until_due', 'overdue')
+        read_only_fields = fields
+
+    def get_days_until_due(self, obj):
+        return (obj.next_maintenance_date - self.context['today']).days
+
+    def get_overdue(self, obj):
+        return obj.next_maintenance_date < self.context['today']
 
 class MaintenanceRecordCreateSerializer(serializers.ModelSerializer):
     class Meta:
@@ -0,0 +1,235 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import DateField, ExpressionWrapper, F, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from rest_framework import serializers
+import logging
+
+from users.api_utils import constraint_write_errors
+from .models import Equipment, EquipmentUsage, MaintenanceRecord
+
+logger = logging.getLogger(__name__)
+
+USAGE_OVERLAP_CONSTRAINT = 'equipment_usage_no_overlap'
+
+
+def usage_write_errors():
+    """
+    Run a usage write atomically and surface model validation and the
+    equipment_usage_no_overlap constraint as DRF 400s instead of 500s.
+    """
+    return constraint_write_errors(USAGE_OVERLAP_CONSTRAINT, {
+        'error': 'Equipment is already in use during this period.'
+    })
+
+
+class EquipmentUsageService:
+    """
+    Checkout/return of equipment against the EquipmentUsage ledger.
+
+    Status transitions lock the equipment row (SELECT ... FOR UPDATE), so two
+    clients checking out the same tractor are serialised: the second one sees
+    status 'in_use' and gets a 400. The ledger's exclusion constraint backs
+    this up for writes that bypass the service.
+    """
+
+    @staticmethod
+    def start_usage(equipment_id, user, purpose, start_date=None):
+        with usage_write_errors():
+            equipment = Equipment.objects.select_for_update().get(pk=equipment_id)
+            if equipment.status != 'available':
+                raise serializers.ValidationError({'error': 'Equipment is not available for use.'})
+            usage = EquipmentUsage.objects.create(
+                equipment=equipment,
+                user=user,
+                purpose=purpose,
+                start_date=start_date or timezone.now(),
+            )
+        logger.info(f"Equipment {equipment_id} checked out by user {user.id} (usage {usage.id})")
+        return usage
+
+    @staticmethod
+    def end_usage(equipment_id, user, end_date=None):
+        with usage_write_errors():
+            equipment = Equipment.objects.select_for_update().get(pk=equipment_id)
+            if equipment.status != 'in_use' or equipment.assigned_to_id != user.id:
+                raise serializers.ValidationError({'error': 'Equipment is not in use by this user.'})
+            usage = EquipmentUsage.objects.select_for_update().filter(
+                equipment=equipment,
+                user=user,
+                end_date__isnull=True
+            ).first()
+            if not usage:
+                raise serializers.ValidationError({'error': 'No active usage record found.'})
+            end_date = end_date or timezone.now()
+            if end_date < usage.start_date:
+                raise serializers.ValidationError({'end_date': 'end_date cannot be before the usage start.'})
+            usage.end_date = end_date
+            usage.save()
+        logger.info(f"Equipment {equipment_id} returned by user {user.id} (usage {usage.id})")
+        return usage
+
+    @staticmethod
+    def utilisation(equipment_queryset, start, end):
+        """
+        In-use time of each equipment in `equipment_queryset` within [start, end),
+        computed in SQL from the usage ledger periods (open usages count up to now).
+
+        Returns:
+            list of {'equipment_id', 'name', 'status', 'sessions', 'users',
+            'busy_hours', 'window_hours', 'utilisation'} ordered by busy time;
+            utilisation is busy / window (None for a window in the future)
+        """
+        if end <= start:
+            raise serializers.ValidationError("end must be after start")
+        ids_sql, ids_params = equipment_queryset.order_by().values('id').query.sql_with_params()
+        sql = f'''
+            WITH win AS (SELECT tstzrange(%s, %s, '[)') * tstzrange(NULL, now(), '[)') AS w),
+            used AS (
+                SELECT u.equipment_id, u.user_id, u.period * win.w AS r
+                FROM "{EquipmentUsage._meta.db_table}" u, win
+                WHERE u.period && win.w AND u.equipment_id IN ({ids_sql})
+            )
+            SELECT e.id, e.name, e.status,
+                   COUNT(used.r),
+                   COUNT(DISTINCT used.user_id),
+                   COALESCE(EXTRACT(EPOCH FROM SUM(upper(used.r) - lower(used.r))), 0),
+                   EXTRACT(EPOCH FROM upper(win.w) - lower(win.w))
+            FROM "{Equipment._meta.db_table}" e
+            CROSS JOIN win
+            LEFT JOIN used ON used.equipment_id = e.id
+            WHERE e.id IN ({ids_sql})
+            GROUP BY e.id, e.name, e.status, win.w
+            ORDER BY 6 DESC, e.id
+        '''
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [start, end, *ids_params, *ids_params])
+            rows = cursor.fetchall()
+
+        results = []
+        for equipment_id, name, status, sessions, users, busy_seconds, window_seconds in rows:
+            busy_seconds = float(busy_seconds)
+            window_seconds = float(window_seconds) if window_seconds else None
+            results.append({
+                'equipment_id': equipment_id,
+                'name': name,
+                'status': status,
+                'sessions': sessions,
+                'users': users,
+                'busy_hours': round(busy_seconds / 3600, 2),
+                'window_hours': round(window_seconds / 3600, 2) if window_seconds else None,
+                'utilisation': round(busy_seconds / window_seconds, 4) if window_seconds else None,
+            })
+        return results
+
+
+class MaintenanceScheduleService:
+    """
+    Upcoming and overdue equipment maintenance.
+
+    Due lists are range scans of equipment_maint_due_idx (status,
+    next_maintenance_date); next dates for equipment with a service interval
+    are filled in bulk and each due date is notified once
+    (maintenance_notified_for).
+    """
+
+    @staticmethod
+    def due_soon_days():
+        return getattr(settings, 'MAINTENANCE_DUE_SOON_DAYS', 7)
+
+    @staticmethod
+    def fill_next_dates():
+        """
+        Set next_maintenance_date = last_maintenance_date + maintenance_interval_days
+        where it is missing, in one UPDATE. Hand-set dates are left alone.
+        """
+        return Equipment.objects.filter(
+            next_maintenance_date__isnull=True,
+            last_maintenance_date__isnull=False,
+            maintenance_interval_days__isnull=False,
+        ).update(
+            next_maintenance_date=ExpressionWrapper(
+                F('last_maintenance_date') + F('maintenance_interval_days'), output_field=DateField()
+            ),
+            updated_at=timezone.now(),
+        )
+
+    @staticmethod
+    def due(queryset=None, days=None):
+        """Maintained equipment whose next maintenance is on or before today + days (overdue first)."""
+        if days is None:
+            days = MaintenanceScheduleService.due_soon_days()
+        queryset = Equipment.objects.all() if queryset is None else queryset
+        return queryset.filter(
+            status__in=Equipment.MAINTAINED_STATUSES,
+            next_maintenance_date__lte=timezone.localdate() + timedelta(days=days),
+        ).order_by('next_maintenance_date', 'id')
+
+    @staticmethod
+    def notify_due(days=None):
+        """
+        One Notification per due equipment not yet notified for its current
+        next_maintenance_date, to the assignee (else whoever performed the
+        latest maintenance). Returns the number of notifications created.
+        """
+        from tasks.models import Notification
+
+        today = timezone.localdate()
+        last_performer = MaintenanceRecord.objects.filter(
+            equipment=OuterRef('pk')
+        ).order_by('-maintenance_date', '-id').values('performed_by')[:1]
+        rows = list(
+            MaintenanceScheduleService.due(days=days)
+            .filter(Q(maintenance_notified_for__isnull=True) | ~Q(maintenance_notified_for=F('next_maintenance_date')))
+            .annotate(recipient=Coalesce('assigned_to', Subquery(last_performer)))
+            .values('id', 'name', 'next_maintenance_date', 'recipient')
+        )
+        if not rows:
+            return 0
+
+        notifications = []
+        for row in rows:
+            if not row['recipient']:
+                continue
+            due_date = row['next_maintenance_date']
+            if due_date < today:
+                message = f"Maintenance overdue: {row['name']} (due {due_date.isoformat()})"
+            else:
+                message = f"Maintenance due: {row['name']} on {due_date.isoformat()}"
+            notifications.append(Notification(user_id=row['recipient'], message=message))
+
+        with transaction.atomic():
+            Notification.objects.bulk_create(notifications)
+            # Also marks equipment nobody could be told about, so it is not retried every run
+            Equipment.objects.filter(pk__in=[row['id'] for row in rows]).update(
+                maintenance_notified_for=F('next_maintenance_date')
+            )
+        return len(notifications)
+
+    @staticmethod
+    def run(days=None):
+        filled = MaintenanceScheduleService.fill_next_dates()
+        notified = MaintenanceScheduleService.notify_due(days)
+        logger.info(f"Maintenance scheduler: {filled} next dates filled, {notified} notifications sent")
+        return filled, notified
+
+
+def run_maintenance_scheduler_job():
+    """
+    Background job: fill next maintenance dates and notify due equipment, then
+    schedule the next run after MAINTENANCE_SCHEDULER_INTERVAL seconds (start
+    with schedule_equipment_maintenance --schedule).
+    """
+    from jobs.runner import enqueue_once
+
+    interval = getattr(settings, 'MAINTENANCE_SCHEDULER_INTERVAL', 86400)
+    if interval:
+        # Scheduled first so a failing run does not end the chain
+        enqueue_once(
+            run_maintenance_scheduler_job, queue='maintenance',
+            run_at=timezone.now() + timedelta(seconds=interval),
+        )
+    MaintenanceScheduleService.run()
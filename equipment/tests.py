@@ -0,0 +1,134 @@
+from datetime import timedelta
+
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework import status
+from users.models import Industry, Role
+from tasks.models import Notification
+from .models import Equipment, EquipmentUsage
+from .services import MaintenanceScheduleService
+
+User = get_user_model()
+
+
+class EquipmentTestBase(TestCase):
+    """Two owners and a tractor"""
+
+    def setUp(self):
+        self.industry = Industry.objects.create(name="Test Industry")
+        owner_role, _ = Role.objects.get_or_create(name='owner', defaults={'display_name': 'Owner'})
+        self.owner = User.objects.create_user(
+            username='owner1',
+            password='testpass123',
+            phone_number='9876543219',
+            role=owner_role,
+            industry=self.industry
+        )
+        self.other = User.objects.create_user(
+            username='owner2',
+            password='testpass123',
+            phone_number='9876543218',
+            role=owner_role,
+            industry=self.industry
+        )
+        self.tractor = Equipment.objects.create(
+            name='Tractor', description='45 HP', purchase_date=timezone.localdate(),
+            purchase_price=500000, location='Shed 1'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.owner)
+
+
+class EquipmentUsageTest(EquipmentTestBase):
+    """Checkouts go through a locked status transition and land in the usage ledger"""
+
+    def test_second_checkout_is_rejected(self):
+        url = f'/api/equipment/{self.tractor.id}/start_usage/'
+        payload = {'purpose': 'Ploughing', 'start_date': timezone.now().isoformat()}
+        response = self.client.post(url, payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED, response.data)
+        self.tractor.refresh_from_db()
+        self.assertEqual((self.tractor.status, self.tractor.assigned_to_id), ('in_use', self.owner.id))
+
+        other_client = APIClient()
+        other_client.force_authenticate(user=self.other)
+        response = other_client.post(url, payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(EquipmentUsage.objects.count(), 1)
+
+        response = self.client.post(f'/api/equipment/{self.tractor.id}/end_usage/', {}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        self.tractor.refresh_from_db()
+        self.assertEqual((self.tractor.status, self.tractor.assigned_to_id), ('available', None))
+
+    def test_ledger_rejects_overlapping_usage(self):
+        start = timezone.now() - timedelta(hours=5)
+        EquipmentUsage.objects.create(
+            equipment=self.tractor, user=self.owner, purpose='Spraying',
+            start_date=start, end_date=start + timedelta(hours=2)
+        )
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            EquipmentUsage.objects.create(
+                equipment=self.tractor, user=self.other, purpose='Hauling',
+                start_date=start + timedelta(hours=1), end_date=start + timedelta(hours=3)
+            )
+
+    def test_utilisation_from_ledger(self):
+        day_start = timezone.now() - timedelta(days=2)
+        EquipmentUsage.objects.create(
+            equipment=self.tractor, user=self.owner, purpose='Spraying',
+            start_date=day_start, end_date=day_start + timedelta(hours=6)
+        )
+        EquipmentUsage.objects.create(
+            equipment=self.tractor, user=self.other, purpose='Hauling',
+            start_date=day_start + timedelta(hours=8), end_date=day_start + timedelta(hours=10)
+        )
+        Equipment.objects.create(
+            name='Sprayer', description='Boom', purchase_date=timezone.localdate(),
+            purchase_price=80000, location='Shed 2'
+        )
+
+        response = self.client.get('/api/equipment/utilisation/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        self.assertEqual(response.data['count'], 2)
+        tractor = response.data['results'][0]
+        self.assertEqual(tractor['equipment_id'], self.tractor.id)
+        self.assertEqual((tractor['sessions'], tractor['users'], tractor['busy_hours']), (2, 2, 8.0))
+        self.assertEqual(response.data['results'][1]['busy_hours'], 0)
+
+
+class MaintenanceScheduleTest(EquipmentTestBase):
+    """Next dates come from the service interval; due equipment is listed and notified once"""
+
+    def test_fill_due_feed_and_notify_once(self):
+        today = timezone.localdate()
+        Equipment.objects.filter(pk=self.tractor.pk).update(
+            assigned_to=self.owner, last_maintenance_date=today - timedelta(days=95), maintenance_interval_days=90
+        )
+        Equipment.objects.create(
+            name='Sprayer', description='Boom', purchase_date=today, purchase_price=80000,
+            location='Shed 2', next_maintenance_date=today + timedelta(days=30)
+        )
+        Equipment.objects.create(
+            name='Old pump', description='Retired', purchase_date=today, purchase_price=1000,
+            location='Shed 3', status='retired', next_maintenance_date=today - timedelta(days=10)
+        )
+
+        self.assertEqual(MaintenanceScheduleService.fill_next_dates(), 1)
+        self.tractor.refresh_from_db()
+        self.assertEqual(self.tractor.next_maintenance_date, today - timedelta(days=5))
+
+        response = self.client.get('/api/equipment/due-maintenance/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        self.assertEqual(response.data['count'], 1)
+        row = response.data['results'][0]
+        self.assertEqual((row['id'], row['overdue'], row['days_until_due']), (self.tractor.id, True, -5))
+        response = self.client.get('/api/equipment/due-maintenance/', {'days': 60})
+        self.assertEqual(response.data['count'], 2)
+
+        self.assertEqual(MaintenanceScheduleService.notify_due(), 1)
+        self.assertEqual(MaintenanceScheduleService.notify_due(), 0)
+        self.assertEqual(Notification.objects.get().user, self.owner)
@@ -1,19 +1,27 @@
 from rest_framework import viewsets, status, permissions
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from datetime import datetime, timedelta
 from django.shortcuts import get_object_or_404
 from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_date
 from .models import Equipment, MaintenanceRecord, EquipmentUsage
 from .serializers import (
     EquipmentSerializer,
     EquipmentCreateSerializer,
     EquipmentUpdateSerializer,
+    EquipmentMaintenanceDueSerializer,
     MaintenanceRecordSerializer,
     MaintenanceRecordCreateSerializer,
     EquipmentUsageSerializer,
     EquipmentUsageCreateSerializer
 )
 from .permissions import CanManageEquipment, CanViewEquipment
+from .services import EquipmentUsageService, MaintenanceScheduleService, usage_write_errors
+from users.api_utils import parse_moment
+
+UTILISATION_MAX_DAYS = 366
 
 class EquipmentViewSet(viewsets.ModelViewSet):
     serializer_class = EquipmentSerializer
@@ -53,42 +61,87 @@ class EquipmentViewSet(viewsets.ModelViewSet):
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+    @action(detail=False, methods=['get'], url_path='due-maintenance')
+    def due_maintenance(self, request):
+        """
+        GET /api/equipment/due-maintenance/?days=14
+        Paginated equipment whose maintenance is overdue or due within `days`
+        (default MAINTENANCE_DUE_SOON_DAYS), soonest first.
+        """
+        try:
+            days = int(request.query_params.get('days', MaintenanceScheduleService.due_soon_days()))
+        except ValueError:
+            return Response({'error': 'days must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+        if not 0 <= days <= 365:
+            return Response({'error': 'days must be between 0 and 365'}, status=status.HTTP_400_BAD_REQUEST)
+
+        queryset = MaintenanceScheduleService.due(self.get_queryset(), days)
+        context = {**self.get_serializer_context(), 'today': timezone.localdate()}
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = EquipmentMaintenanceDueSerializer(page, many=True, context=context)
+            return self.get_paginated_response(serializer.data)
+        serializer = EquipmentMaintenanceDueSerializer(queryset, many=True, context=context)
+        return Response(serializer.data)
+
     @action(detail=True, methods=['post'])
     def start_usage(self, request, pk=None):
         equipment = self.get_object()
-        if equipment.status != 'available':
-            return Response(
-                {'error': 'Equipment is not available for use.'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
         serializer = EquipmentUsageCreateSerializer(data=request.data)
         if serializer.is_valid():
-            serializer.save(equipment=equipment, user=request.user)
-            return Response(serializer.data, status=status.HTTP_201_CREATED)
+            # Locks the equipment row: concurrent checkouts of the same item are serialised
+            usage = EquipmentUsageService.start_usage(
+                equipment.pk,
+                request.user,
+                serializer.validated_data['purpose'],
+                serializer.validated_data.get('start_date'),
+            )
+            return Response(EquipmentUsageSerializer(usage).data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
     @action(detail=True, methods=['post'])
     def end_usage(self, request, pk=None):
         equipment = self.get_object()
-        if equipment.status != 'in_use' or equipment.assigned_to != request.user:
-            return Response(
-                {'error': 'Equipment is not in use by this user.'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-        usage = EquipmentUsage.objects.filter(
-            equipment=equipment,
-            user=request.user,
-            end_date__isnull=True
-        ).first()
-        if not usage:
+        end_date = request.data.get('end_date')
+        if end_date:
+            end_date = parse_moment(end_date)
+            if end_date is None:
+                return Response(
+                    {'end_date': 'Use an ISO datetime or YYYY-MM-DD.'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+        usage = EquipmentUsageService.end_usage(equipment.pk, request.user, end_date)
+        serializer = EquipmentUsageSerializer(usage)
+        return Response(serializer.data)
+
+    @action(detail=False, methods=['get'])
+    def utilisation(self, request):
+        """
+        GET /api/equipment/utilisation/?from=YYYY-MM-DD&to=YYYY-MM-DD
+        In-use hours and utilisation per visible equipment over the inclusive
+        date range (default: the last 30 days), computed from the usage ledger.
+        """
+        today = timezone.localdate()
+        try:
+            first_day = parse_date(request.query_params.get('from') or '') or today - timedelta(days=29)
+            last_day = parse_date(request.query_params.get('to') or '') or today
+        except ValueError:
+            return Response({'error': 'from and to must be dates (YYYY-MM-DD)'}, status=status.HTTP_400_BAD_REQUEST)
+        if last_day < first_day or (last_day - first_day).days >= UTILISATION_MAX_DAYS:
             return Response(
-                {'error': 'No active usage record found.'},
+                {'error': f'to must not be before from and the range is limited to {UTILISATION_MAX_DAYS} days'},
                 status=status.HTTP_400_BAD_REQUEST
             )
-        usage.end_date = request.data.get('end_date')
-        usage.save()
-        serializer = EquipmentUsageSerializer(usage)
-        return Response(serializer.data)
+
+        start = timezone.make_aware(datetime.combine(first_day, datetime.min.time()))
+        end = timezone.make_aware(datetime.combine(last_day + timedelta(days=1), datetime.min.time()))
+        results = EquipmentUsageService.utilisation(self.get_queryset(), start, end)
+        return Response({
+            'from': first_day.isoformat(),
+            'to': last_day.isoformat(),
+            'count': len(results),
+            'results': results,
+        })
 
 class MaintenanceRecordViewSet(viewsets.ModelViewSet):
     serializer_class = MaintenanceRecordSerializer
@@ -110,4 +163,18 @@ class EquipmentUsageViewSet(viewsets.ModelViewSet):
 
     def perform_create(self, serializer):
         equipment = get_object_or_404(Equipment, pk=self.kwargs['equipment_pk'])
-        serializer.save(equipment=equipment, user=self.request.user) 
\ No newline at end of file
+        if not serializer.validated_data.get('end_date'):
+            # An open record is a checkout: go through the locked status transition
+            serializer.instance = EquipmentUsageService.start_usage(
+                equipment.pk,
+                self.request.user,
+                serializer.validated_data.get('purpose', ''),
+                serializer.validated_data.get('start_date'),
+            )
+            return
+        with usage_write_errors():
+            serializer.save(equipment=equipment, user=self.request.user)
+
+    def perform_update(self, serializer):
+        with usage_write_errors():
+            serializer.save() 
\ No newline at end of file
@@ -0,0 +1,162 @@
+"""
+Instrumented HTTP client for all outbound calls (FastAPI sync services, Mailgun,
+Twilio, Gupshup, Ollama).
+
+Every call goes through one pooled requests.Session and records, per target host:
+    outbound_http_request_duration_seconds  latency histogram
+    outbound_http_requests_total            outcome counter (status code, timeout, connection_error, error)
+    outbound_http_retries_total             retry counter
+The metrics live on the default prometheus_client registry, so they show up on
+/metrics next to the django_prometheus ones. Call time is also added to the
+'http' phase of the Server-Timing header (see request_timing).
+
+Exceptions from requests are re-raised unchanged, so callers keep catching
+requests.exceptions.* as before.
+"""
+import logging
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .request_timing import record_phase
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT = 10
+RETRY_STATUSES = (502, 503, 504)
+IDEMPOTENT_METHODS = ('GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE')
+
+_session = None
+_session_lock = threading.Lock()
+_metrics = None
+
+
+def _get_metrics():
+    global _metrics
+    if _metrics is None:
+        from prometheus_client import Counter, Histogram
+
+        _metrics = {
+            'duration': Histogram(
+                'outbound_http_request_duration_seconds',
+                'Latency of outbound HTTP calls, by target host.',
+                ['host', 'method'],
+                buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, float('inf')),
+            ),
+            'requests': Counter(
+                'outbound_http_requests_total',
+                'Outbound HTTP calls by target host and outcome (status code or error kind).',
+                ['host', 'method', 'outcome'],
+            ),
+            'retries': Counter(
+                'outbound_http_retries_total',
+                'Outbound HTTP retries by target host.',
+                ['host', 'method'],
+            ),
+        }
+    return _metrics
+
+
+def get_session():
+    """Process-wide pooled session, sized by OUTBOUND_HTTP_POOL_MAXSIZE."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                from django.conf import settings
+
+                pool_maxsize = getattr(settings, 'OUTBOUND_HTTP_POOL_MAXSIZE', 10)
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=10, pool_maxsize=pool_maxsize)
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                _session = session
+    return _session
+
+
+def _host_label(url):
+    parts = urlsplit(url)
+    return parts.netloc or 'unknown'
+
+
+def request(method, url, retries=None, backoff=0.5, **kwargs):
+    """
+    Send an HTTP request through the shared session.
+
+    Args:
+        method: HTTP method
+        url: Absolute URL
+        retries: Extra attempts on timeouts, connection errors and 502/503/504.
+                 Defaults to OUTBOUND_HTTP_RETRIES for idempotent methods and 0
+                 otherwise, so POSTs are never replayed unless asked for.
+        backoff: Base delay in seconds, doubled after each retry
+        **kwargs: Passed to requests.Session.request (json, data, headers, auth, ...).
+                  timeout defaults to OUTBOUND_HTTP_TIMEOUT.
+
+    Returns:
+        requests.Response
+    """
+    from django.conf import settings
+
+    method = method.upper()
+    if retries is None:
+        retries = getattr(settings, 'OUTBOUND_HTTP_RETRIES', 2) if method in IDEMPOTENT_METHODS else 0
+    kwargs.setdefault('timeout', getattr(settings, 'OUTBOUND_HTTP_TIMEOUT', DEFAULT_TIMEOUT))
+
+    host = _host_label(url)
+    metrics = _get_metrics()
+    session = get_session()
+
+    attempt = 0
+    while True:
+        response, exc = None, None
+        start = time.perf_counter()
+        try:
+            response = session.request(method, url, **kwargs)
+            outcome = str(response.status_code)
+        except requests.exceptions.Timeout as e:
+            exc, outcome = e, 'timeout'
+        except requests.exceptions.ConnectionError as e:
+            exc, outcome = e, 'connection_error'
+        except requests.exceptions.RequestException as e:
+            exc, outcome = e, 'error'
+        finally:
+            elapsed = time.perf_counter() - start
+            metrics['duration'].labels(host=host, method=method).observe(elapsed)
+            record_phase('http', elapsed)
+
+        metrics['requests'].labels(host=host, method=method, outcome=outcome).inc()
+
+        if exc is not None:
+            retryable = outcome in ('timeout', 'connection_error')
+        else:
+            retryable = response.status_code in RETRY_STATUSES
+
+        if not retryable or attempt >= retries:
+            if exc is not None:
+                raise exc
+            return response
+
+        attempt += 1
+        metrics['retries'].labels(host=host, method=method).inc()
+        logger.warning(f"Retrying {method} {host} after {outcome} (attempt {attempt + 1}/{retries + 1})")
+        time.sleep(backoff * (2 ** (attempt - 1)))
+
+
+def get(url, **kwargs):
+    return request('GET', url, **kwargs)
+
+
+def post(url, **kwargs):
+    return request('POST', url, **kwargs)
+
+
+def put(url, **kwargs):
+    return request('PUT', url, **kwargs)
+
+
+def delete(url, **kwargs):
+    return request('DELETE', url, **kwargs)
@@ -1,8 +1,14 @@
 """
-Custom middleware to filter health check requests from access logs.
+Custom middleware: health check log filtering, per-view query budgets and
+request timing / profiling.
 """
 import logging
+import os
+import random
 import re
+import time
+from collections import Counter
+from contextlib import ExitStack
 
 logger = logging.getLogger(__name__)
 
@@ -20,15 +26,15 @@ class HealthCheckLogFilter:
             r'/health/',
         ]
     
-    def __call__(self, request):
-        # Check if this is a health check request
-        is_health_check = any(
+    def is_health_check(self, request):
+        return any(
             re.search(pattern, request.path, re.IGNORECASE)
             for pattern in self.health_check_patterns
         )
-        
+    
+    def __call__(self, request):
         # Store flag in request for use in logging
-        request._suppress_access_log = is_health_check
+        request._suppress_access_log = self.is_health_check(request)
         
         # Process the request
         response = self.get_response(request)
@@ -39,3 +45,305 @@ class HealthCheckLogFilter:
         # Don't suppress error logs, even for health checks
         return None
 
+
+class QueryBudgetExceeded(Exception):
+    """Raised when a view exceeds its query budget and QUERY_BUDGET_RAISE is on."""
+    pass
+
+
+_QUERY_METRICS = None
+
+
+def _query_metrics():
+    """
+    Create the per-view query histograms once per process.
+    prometheus_client registers them on the default registry, which is the one
+    django_prometheus already serves at /metrics.
+    """
+    global _QUERY_METRICS
+    if _QUERY_METRICS is None:
+        from prometheus_client import Counter as PrometheusCounter, Histogram
+
+        _QUERY_METRICS = {
+            'queries': Histogram(
+                'django_view_queries_per_request',
+                'Number of SQL queries executed per request, by view.',
+                ['view'],
+                buckets=(1, 2, 5, 10, 20, 35, 50, 75, 100, 200, 500, float('inf')),
+            ),
+            'db_time': Histogram(
+                'django_view_db_time_seconds',
+                'Total time spent in SQL per request, by view.',
+                ['view'],
+                buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, float('inf')),
+            ),
+            'duplicates': Histogram(
+                'django_view_duplicate_queries_per_request',
+                'Number of repeated SQL fingerprints per request (N+1 indicator), by view.',
+                ['view'],
+                buckets=(0, 1, 2, 5, 10, 20, 50, 100, float('inf')),
+            ),
+            'exceeded': PrometheusCounter(
+                'django_view_query_budget_exceeded_total',
+                'Requests that exceeded the configured query budget, by view.',
+                ['view', 'reason'],
+            ),
+        }
+    return _QUERY_METRICS
+
+# Collapse literal values and IN-lists so that "same query, different id"
+# lands on one fingerprint.
+_FINGERPRINT_SUBS = [
+    (re.compile(r"'(?:[^']|'')*'"), '?'),
+    (re.compile(r'\b\d+(?:\.\d+)?\b'), '?'),
+    (re.compile(r'%s'), '?'),
+    (re.compile(r'\(\s*\?(?:\s*,\s*\?)*\s*\)'), '(?+)'),
+    (re.compile(r'\s+'), ' '),
+]
+
+
+def sql_fingerprint(sql):
+    """Normalize a SQL statement so repeated queries share one fingerprint."""
+    fingerprint = sql
+    for pattern, replacement in _FINGERPRINT_SUBS:
+        fingerprint = pattern.sub(replacement, fingerprint)
+    return fingerprint.strip()
+
+
+class QueryStats:
+    """
+    Per-request SQL statistics collected through connection.execute_wrapper().
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.fingerprints = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+            self.fingerprints[sql_fingerprint(sql)] += 1
+
+    @property
+    def duplicates(self):
+        """Number of executions beyond the first for every repeated fingerprint."""
+        return sum(n - 1 for n in self.fingerprints.values() if n > 1)
+
+    def top_duplicates(self, limit=3):
+        return [(sql, n) for sql, n in self.fingerprints.most_common(limit) if n > 1]
+
+
+class QueryBudgetMiddleware:
+    """
+    Record query count, DB time and duplicate-SQL fingerprints for every request,
+    export them as Prometheus histograms labelled by view name, and log (or raise,
+    when QUERY_BUDGET_RAISE is on) if a view goes over its budget.
+
+    Settings:
+        QUERY_BUDGET_ENABLED         turn the middleware off entirely
+        QUERY_BUDGET_MAX_QUERIES     default max queries per request
+        QUERY_BUDGET_MAX_DUPLICATES  default max repeated queries per request
+        QUERY_BUDGET_OVERRIDES       {view_name: {'max_queries': .., 'max_duplicates': ..}}
+        QUERY_BUDGET_RAISE           raise QueryBudgetExceeded instead of logging
+    """
+
+    def __init__(self, get_response):
+        from django.conf import settings
+        from django.core.exceptions import MiddlewareNotUsed
+
+        if not getattr(settings, 'QUERY_BUDGET_ENABLED', True):
+            raise MiddlewareNotUsed()
+
+        self.get_response = get_response
+        self.max_queries = getattr(settings, 'QUERY_BUDGET_MAX_QUERIES', 50)
+        self.max_duplicates = getattr(settings, 'QUERY_BUDGET_MAX_DUPLICATES', 10)
+        self.overrides = getattr(settings, 'QUERY_BUDGET_OVERRIDES', {})
+        self.raise_on_exceed = getattr(settings, 'QUERY_BUDGET_RAISE', False)
+        self.metrics = _query_metrics()
+
+    def __call__(self, request):
+        from django.db import connections
+
+        stats = QueryStats()
+        request._query_stats = stats
+
+        with ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(connections[alias].execute_wrapper(stats))
+            response = self.get_response(request)
+
+        view_name = self._view_name(request)
+        if view_name is None:
+            return response
+
+        self.metrics['queries'].labels(view=view_name).observe(stats.count)
+        self.metrics['db_time'].labels(view=view_name).observe(stats.duration)
+        self.metrics['duplicates'].labels(view=view_name).observe(stats.duplicates)
+
+        self._check_budget(request, view_name, stats)
+        return response
+
+    @staticmethod
+    def _view_name(request):
+        # Unresolved paths (404s, static files) would explode label cardinality.
+        match = getattr(request, 'resolver_match', None)
+        if match is None:
+            return None
+        return match.view_name or match.url_name or '<unnamed view>'
+
+    def _check_budget(self, request, view_name, stats):
+        budget = self.overrides.get(view_name, {})
+        max_queries = budget.get('max_queries', self.max_queries)
+        max_duplicates = budget.get('max_duplicates', self.max_duplicates)
+
+        reasons = []
+        if max_queries and stats.count > max_queries:
+            reasons.append('queries')
+        if max_duplicates and stats.duplicates > max_duplicates:
+            reasons.append('duplicates')
+        if not reasons:
+            return
+
+        for reason in reasons:
+            self.metrics['exceeded'].labels(view=view_name, reason=reason).inc()
+
+        message = (
+            f"Query budget exceeded for {view_name} ({request.method} {request.path}): "
+            f"{stats.count} queries (max {max_queries}), "
+            f"{stats.duplicates} duplicates (max {max_duplicates}), "
+            f"{stats.duration * 1000:.1f}ms in DB"
+        )
+        top = stats.top_duplicates()
+        if top:
+            message += '; most repeated: ' + ' | '.join(
+                f"{n}x {sql[:200]}" for sql, n in top
+            )
+
+        if self.raise_on_exceed:
+            raise QueryBudgetExceeded(message)
+        logger.warning(message)
+
+
+class RequestTimingMiddleware(HealthCheckLogFilter):
+    """
+    Request latency breakdown and sampling profiler hook.
+
+    Server-Timing: when SERVER_TIMING_ENABLED is on (or a trusted caller sends
+    ``X-Server-Timing: 1``) the response carries a ``Server-Timing`` header with
+    db, serializer, http (outbound calls) and total phases.
+
+    Profiling: when PROFILER_ENABLED is on and pyinstrument is installed, a
+    request is profiled if a trusted caller sends ``X-Profile: 1`` or it is
+    picked by PROFILER_SAMPLE_RATE. Sampled requests are only kept when slower
+    than PROFILER_SLOW_REQUEST_MS; explicit ones are always kept. The HTML
+    flamegraph is written to PROFILER_OUTPUT_DIR and its file name returned in
+    ``X-Profile-Id``.
+
+    A caller is trusted when it is a staff user (session auth) or sends
+    ``X-Profile-Token`` matching PROFILER_TOKEN. Health checks are never timed.
+    """
+
+    PHASES = ('db', 'serializer', 'http')
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        from django.conf import settings
+
+        self.server_timing_enabled = getattr(settings, 'SERVER_TIMING_ENABLED', False)
+        self.profiler_enabled = getattr(settings, 'PROFILER_ENABLED', False)
+        self.sample_rate = getattr(settings, 'PROFILER_SAMPLE_RATE', 0.0)
+        self.slow_request_ms = getattr(settings, 'PROFILER_SLOW_REQUEST_MS', 1000)
+        self.profiler_token = getattr(settings, 'PROFILER_TOKEN', '')
+        self.output_dir = getattr(settings, 'PROFILER_OUTPUT_DIR', None)
+
+        if self.profiler_enabled:
+            try:
+                import pyinstrument  # noqa: F401
+            except ImportError:
+                logger.warning("PROFILER_ENABLED is set but pyinstrument is not installed; profiling disabled")
+                self.profiler_enabled = False
+
+        from .request_timing import install_serializer_timing
+        install_serializer_timing()
+
+    def __call__(self, request):
+        from django.db import connections
+        from .request_timing import db_timing_wrapper, start_timer, stop_timer
+
+        if self.is_health_check(request):
+            request._suppress_access_log = True
+            return self.get_response(request)
+
+        trusted = self._is_trusted(request)
+        emit_header = self.server_timing_enabled or (
+            trusted and request.headers.get('X-Server-Timing') == '1'
+        )
+        explicit_profile = trusted and request.headers.get('X-Profile') == '1'
+        profiler = self._start_profiler(explicit_profile)
+
+        if not emit_header and profiler is None:
+            return self.get_response(request)
+
+        timer, token = start_timer()
+        try:
+            with ExitStack() as stack:
+                for alias in connections:
+                    stack.enter_context(connections[alias].execute_wrapper(db_timing_wrapper))
+                response = self.get_response(request)
+        finally:
+            stop_timer(token)
+            if profiler is not None:
+                profiler.stop()
+
+        if emit_header:
+            response['Server-Timing'] = timer.server_timing_header(self.PHASES)
+
+        if profiler is not None:
+            elapsed_ms = timer.elapsed * 1000
+            if explicit_profile or elapsed_ms >= self.slow_request_ms:
+                profile_id = self._save_profile(profiler, request, elapsed_ms)
+                if profile_id and explicit_profile:
+                    response['X-Profile-Id'] = profile_id
+
+        return response
+
+    def _is_trusted(self, request):
+        if self.profiler_token and request.headers.get('X-Profile-Token') == self.profiler_token:
+            return True
+        user = getattr(request, 'user', None)
+        return bool(user is not None and user.is_authenticated and user.is_staff)
+
+    def _start_profiler(self, explicit):
+        if not self.profiler_enabled:
+            return None
+        if not explicit and (self.sample_rate <= 0 or random.random() >= self.sample_rate):
+            return None
+
+        from pyinstrument import Profiler
+
+        profiler = Profiler(async_mode='disabled')
+        profiler.start()
+        return profiler
+
+    def _save_profile(self, profiler, request, elapsed_ms):
+        view_name = 'unresolved'
+        match = getattr(request, 'resolver_match', None)
+        if match is not None and match.view_name:
+            view_name = re.sub(r'[^A-Za-z0-9_.-]+', '_', match.view_name)
+
+        profile_id = f"{time.strftime('%Y%m%d-%H%M%S')}_{view_name}_{elapsed_ms:.0f}ms.html"
+        try:
+            os.makedirs(self.output_dir, exist_ok=True)
+            with open(os.path.join(self.output_dir, profile_id), 'w', encoding='utf-8') as fh:
+                fh.write(profiler.output_html())
+        except Exception as e:
+            logger.error(f"Failed to store profile for {request.path}: {str(e)}")
+            return None
+
+        logger.info(f"Stored profile {profile_id} for {request.method} {request.path} ({elapsed_ms:.0f}ms)")
+        return profile_id
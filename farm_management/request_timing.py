@@ -0,0 +1,117 @@
+"""
+Per-request phase timing shared by the timing middleware and the code it measures.
+
+The active timer lives in a context variable, so any layer (DB wrapper, DRF
+serializers, outbound HTTP) can add time to a phase without passing the request
+around. Outside a timed request every helper is a no-op.
+"""
+import contextvars
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+_current_timer = contextvars.ContextVar('request_timer', default=None)
+
+
+class RequestTimer:
+    """Accumulates wall time and call counts per named phase."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.durations = defaultdict(float)
+        self.counts = defaultdict(int)
+        self._active = set()
+
+    def add(self, phase, seconds):
+        self.durations[phase] += seconds
+        self.counts[phase] += 1
+
+    @property
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    def server_timing_header(self, phases):
+        """Build a Server-Timing value (durations in milliseconds)."""
+        entries = []
+        for phase in phases:
+            entry = f"{phase};dur={self.durations.get(phase, 0.0) * 1000:.1f}"
+            if self.counts.get(phase):
+                entry += f';desc="{self.counts[phase]} calls"'
+            entries.append(entry)
+        entries.append(f"total;dur={self.elapsed * 1000:.1f}")
+        return ', '.join(entries)
+
+
+def start_timer():
+    """Activate a new timer for the current request. Returns (timer, token)."""
+    timer = RequestTimer()
+    return timer, _current_timer.set(timer)
+
+
+def stop_timer(token):
+    _current_timer.reset(token)
+
+
+def current_timer():
+    return _current_timer.get()
+
+
+def record_phase(phase, seconds):
+    """Add time to a phase of the current request, if one is being timed."""
+    timer = _current_timer.get()
+    if timer is not None:
+        timer.add(phase, seconds)
+
+
+@contextmanager
+def timed_phase(phase):
+    """
+    Time a block as part of `phase`. Nested blocks of the same phase are
+    counted once (e.g. a serializer whose fields use other serializers).
+    """
+    timer = _current_timer.get()
+    if timer is None or phase in timer._active:
+        yield
+        return
+
+    timer._active.add(phase)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timer._active.discard(phase)
+        timer.add(phase, time.perf_counter() - start)
+
+
+def db_timing_wrapper(execute, sql, params, many, context):
+    """connection.execute_wrapper() hook that records the 'db' phase."""
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        record_phase('db', time.perf_counter() - start)
+
+
+_serializer_timing_installed = False
+
+
+def install_serializer_timing():
+    """
+    Route DRF's BaseSerializer.data through timed_phase('serializer').
+    Serializer.data and ListSerializer.data both go through BaseSerializer.data,
+    so this covers every top-level serialization. Safe to call more than once.
+    """
+    global _serializer_timing_installed
+    if _serializer_timing_installed:
+        return
+
+    from rest_framework.serializers import BaseSerializer
+
+    original = BaseSerializer.data.fget
+
+    def data(self):
+        with timed_phase('serializer'):
+            return original(self)
+
+    BaseSerializer.data = property(data)
+    _serializer_timing_installed = True
@@ -96,10 +96,12 @@ INSTALLED_APPS = [
     'messaging',  # Two-way communication system
     'chatbot',
     'industries',
+    'jobs',  # Postgres-backed background jobs (run_workers)
 ]
 
 MIDDLEWARE = [
     'django_prometheus.middleware.PrometheusBeforeMiddleware',
+    'farm_management.middleware.QueryBudgetMiddleware',  # Per-view query count / N+1 metrics
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',  # For static files in production
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -107,6 +109,7 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'farm_management.middleware.RequestTimingMiddleware',  # Server-Timing header / profiler hook
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'django_prometheus.middleware.PrometheusAfterMiddleware',
@@ -309,6 +312,54 @@ TWILIO_WHATSAPP_NUMBER = os.environ.get('TWILIO_WHATSAPP_NUMBER', '')
 WHATSAPP_OTP_ENABLED = os.environ.get('WHATSAPP_OTP_ENABLED', 'True').lower() == 'true'
 EMAIL_OTP_FALLBACK = os.environ.get('EMAIL_OTP_FALLBACK', 'True').lower() == 'true'
 
+# Background OTP delivery (users.otp_delivery, runs on the 'otp' job queue)
+OTP_DELIVERY_ASYNC = os.environ.get('OTP_DELIVERY_ASYNC', 'True').lower() == 'true'
+OTP_DELIVERY_MAX_ATTEMPTS = int(os.environ.get('OTP_DELIVERY_MAX_ATTEMPTS', '3'))
+
+# Bulk farmer registration (farms.farmer_registration_service.BulkFarmerRegistrationService)
+BULK_REGISTRATION_MAX_FARMERS = int(os.environ.get('BULK_REGISTRATION_MAX_FARMERS', '200'))
+# Batched plot sync to the FastAPI services (farms.plot_sync, runs on the 'sync' job queue)
+PLOT_SYNC_ASYNC = os.environ.get('PLOT_SYNC_ASYNC', 'True').lower() == 'true'
+
+# In-process lookup table cache (farms.reference_cache); versioned through CACHES['default']
+REFERENCE_CACHE_TTL = int(os.environ.get('REFERENCE_CACHE_TTL', '300'))
+# Per-field-officer "last created farmer" pointer for plot auto-assignment (seconds)
+AUTO_ASSIGN_POINTER_TTL = int(os.environ.get('AUTO_ASSIGN_POINTER_TTL', '3600'))
+# Reject plot boundaries overlapping an existing plot of the industry by more than this share
+PLOT_OVERLAP_CHECK = os.environ.get('PLOT_OVERLAP_CHECK', 'True').lower() == 'true'
+PLOT_OVERLAP_MAX_RATIO = float(os.environ.get('PLOT_OVERLAP_MAX_RATIO', '0.05'))
+# Douglas-Peucker tolerance (degrees) applied to plot boundaries on write; 0 keeps every vertex
+PLOT_BOUNDARY_SIMPLIFY_TOLERANCE = float(os.environ.get('PLOT_BOUNDARY_SIMPLIFY_TOLERANCE', '0'))
+# Maximum movement lines per POST /transactions/bulk/ (inventory.services.InventoryLedgerService)
+INVENTORY_BULK_MAX_LINES = int(os.environ.get('INVENTORY_BULK_MAX_LINES', '1000'))
+# Maximum lines per POST /purchase-orders/{id}/add-items/ (vendors.services.PurchaseOrderService)
+PURCHASE_ORDER_BULK_MAX_ITEMS = int(os.environ.get('PURCHASE_ORDER_BULK_MAX_ITEMS', '1000'))
+# Max assignees per bulk task assignment (POST /api/tasks/bulk-assign/)
+TASK_BULK_MAX_ASSIGNEES = int(os.environ.get('TASK_BULK_MAX_ASSIGNEES', '1000'))
+# Booking/task calendar (bookings.calendar): response cache TTL (seconds) and event stubs per kind
+CALENDAR_CACHE_TTL = int(os.environ.get('CALENDAR_CACHE_TTL', '300'))
+CALENDAR_MAX_EVENTS = int(os.environ.get('CALENDAR_MAX_EVENTS', '500'))
+
+# Per-view query budget (farm_management.middleware.QueryBudgetMiddleware)
+QUERY_BUDGET_ENABLED = os.environ.get('QUERY_BUDGET_ENABLED', 'True').lower() == 'true'
+QUERY_BUDGET_MAX_QUERIES = int(os.environ.get('QUERY_BUDGET_MAX_QUERIES', '50'))
+QUERY_BUDGET_MAX_DUPLICATES = int(os.environ.get('QUERY_BUDGET_MAX_DUPLICATES', '10'))
+QUERY_BUDGET_RAISE = os.environ.get('QUERY_BUDGET_RAISE', 'False').lower() == 'true'
+QUERY_BUDGET_OVERRIDES = {}
+
+# Request timing / sampling profiler (farm_management.middleware.RequestTimingMiddleware)
+SERVER_TIMING_ENABLED = os.environ.get('SERVER_TIMING_ENABLED', 'False').lower() == 'true'
+PROFILER_ENABLED = os.environ.get('PROFILER_ENABLED', 'False').lower() == 'true'  # needs pyinstrument
+PROFILER_SAMPLE_RATE = float(os.environ.get('PROFILER_SAMPLE_RATE', '0'))
+PROFILER_SLOW_REQUEST_MS = int(os.environ.get('PROFILER_SLOW_REQUEST_MS', '1000'))
+PROFILER_TOKEN = os.environ.get('PROFILER_TOKEN', '')
+PROFILER_OUTPUT_DIR = os.environ.get('PROFILER_OUTPUT_DIR', os.path.join(BASE_DIR, 'profiles'))
+
+# Outbound HTTP client (farm_management.http_client)
+OUTBOUND_HTTP_TIMEOUT = float(os.environ.get('OUTBOUND_HTTP_TIMEOUT', '10'))
+OUTBOUND_HTTP_RETRIES = int(os.environ.get('OUTBOUND_HTTP_RETRIES', '2'))  # idempotent methods only
+OUTBOUND_HTTP_POOL_MAXSIZE = int(os.environ.get('OUTBOUND_HTTP_POOL_MAXSIZE', '10'))
+
 # Security settings for production
 SECURE_BROWSER_XSS_FILTER = True
 SECURE_CONTENT_TYPE_NOSNIFF = True
@@ -386,4 +437,32 @@ else:
 
 # Celery configuration (if using background tasks)
 CELERY_BROKER_URL = os.environ.get('CELERY_BROKER_URL', 'redis://127.0.0.1:6379/0')
-CELERY_RESULT_BACKEND = os.environ.get('CELERY_RESULT_BACKEND', 'redis://127.0.0.1:6379/0')
\ No newline at end of file
+CELERY_RESULT_BACKEND = os.environ.get('CELERY_RESULT_BACKEND', 'redis://127.0.0.1:6379/0')
+
+# Background jobs (jobs app, `python manage.py run_workers`)
+JOBS_WORKER_THREADS = int(os.environ.get('JOBS_WORKER_THREADS', '2'))
+JOBS_POLL_INTERVAL = float(os.environ.get('JOBS_POLL_INTERVAL', '2'))
+JOBS_MAX_ATTEMPTS = int(os.environ.get('JOBS_MAX_ATTEMPTS', '3'))
+JOBS_RETRY_BACKOFF = int(os.environ.get('JOBS_RETRY_BACKOFF', '10'))  # seconds, doubled per attempt
+JOBS_RETRY_BACKOFF_MAX = int(os.environ.get('JOBS_RETRY_BACKOFF_MAX', '3600'))
+JOBS_LOCK_TIMEOUT = int(os.environ.get('JOBS_LOCK_TIMEOUT', '900'))
+JOBS_KEEP_SUCCEEDED_DAYS = int(os.environ.get('JOBS_KEEP_SUCCEEDED_DAYS', '7'))
+# Periodic inventory status/expiry recompute (inventory.services.refresh_inventory_status_job); 0 disables
+INVENTORY_STATUS_REFRESH_INTERVAL = int(os.environ.get('INVENTORY_STATUS_REFRESH_INTERVAL', '3600'))
+# Periodic per-item balance snapshots for as-of stock queries (inventory.services.snapshot_inventory_balances_job); 0 disables
+INVENTORY_SNAPSHOT_INTERVAL = int(os.environ.get('INVENTORY_SNAPSHOT_INTERVAL', '86400'))
+# Equipment maintenance scheduler (equipment.services.run_maintenance_scheduler_job); 0 disables
+MAINTENANCE_SCHEDULER_INTERVAL = int(os.environ.get('MAINTENANCE_SCHEDULER_INTERVAL', '86400'))
+# Days ahead that count as "due soon" for the maintenance feed and notifications
+MAINTENANCE_DUE_SOON_DAYS = int(os.environ.get('MAINTENANCE_DUE_SOON_DAYS', '7'))
+# Notification/message retention (archive_notifications / archive_messages commands):
+# rows move to archive tables after these ages (days)
+NOTIFICATION_RETENTION_DAYS = int(os.environ.get('NOTIFICATION_RETENTION_DAYS', '30'))
+NOTIFICATION_UNREAD_RETENTION_DAYS = int(os.environ.get('NOTIFICATION_UNREAD_RETENTION_DAYS', '180'))
+MESSAGE_RETENTION_DAYS = int(os.environ.get('MESSAGE_RETENTION_DAYS', '180'))
+MESSAGE_UNREAD_RETENTION_DAYS = int(os.environ.get('MESSAGE_UNREAD_RETENTION_DAYS', '365'))
+# Archived rows are deleted after this many days; 0 keeps them
+ARCHIVE_RETENTION_DAYS = int(os.environ.get('ARCHIVE_RETENTION_DAYS', '730'))
+# Rows per retention transaction, and seconds between runs of the retention job (0 disables)
+RETENTION_BATCH_SIZE = int(os.environ.get('RETENTION_BATCH_SIZE', '5000'))
+RETENTION_INTERVAL = int(os.environ.get('RETENTION_INTERVAL', '86400'))
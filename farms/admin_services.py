@@ -1,5 +1,5 @@
 import json
-import requests
+from farm_management import http_client
 from requests.auth import HTTPBasicAuth
 from django.conf import settings
 from typing import Dict, Any, Optional
@@ -33,7 +33,7 @@ class AdminSyncService:
             plot_data = self._prepare_plot_data(plot_instance)
             
             # Send to Admin.py API
-            response = requests.post(
+            response = http_client.post(
                 f"{self.admin_api_url}/sync/plot",
                 json=plot_data,
                 headers={'Content-Type': 'application/json'},
@@ -107,9 +107,12 @@ class AdminSyncService:
         else:
             return f"plot_{plot_instance.id}"
     
-    def sync_all_plots(self) -> bool:
+    def sync_all_plots(self, plots=None) -> bool:
         """
-        Sync all plots to Admin.py service
+        Sync all plots (or only the given plots) to Admin.py service in one request
+        
+        Args:
+            plots: Optional iterable of Plot instances; defaults to every plot
         
         Returns:
             bool: True if sync successful, False otherwise
@@ -117,7 +120,8 @@ class AdminSyncService:
         try:
             from .models import Plot
             
-            plots = Plot.objects.all()
+            if plots is None:
+                plots = Plot.objects.all()
             plot_list = []
             
             for plot in plots:
@@ -125,7 +129,7 @@ class AdminSyncService:
                 plot_list.append(plot_data)
             
             # Send to Admin.py API
-            response = requests.post(
+            response = http_client.post(
                 f"{self.admin_api_url}/sync/plots",
                 json={"plots": plot_list},
                 headers={'Content-Type': 'application/json'},
@@ -155,7 +159,7 @@ class AdminSyncService:
             bool: True if deletion successful, False otherwise
         """
         try:
-            response = requests.delete(
+            response = http_client.delete(
                 f"{self.admin_api_url}/sync/plot/{plot_id}",
                 auth=self.auth,
                 timeout=10
@@ -191,7 +195,7 @@ class AdminSyncService:
             if end_date:
                 params["end_date"] = end_date
                 
-            response = requests.post(
+            response = http_client.post(
                 f"{self.admin_api_url}/analyze",
                 params=params,
                 auth=self.auth,
@@ -1,4 +1,7 @@
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
 from django.utils import timezone
 from datetime import timedelta
 from typing import Optional
@@ -13,6 +16,82 @@ class AutoAssignmentService:
     created by field officers in the enrollment workflow.
     """
     
+    @staticmethod
+    def _pointer_key(field_officer_id) -> str:
+        return f"autoassign:last_farmer:{field_officer_id}"
+
+    @staticmethod
+    def remember_farmer(farmer: User) -> None:
+        """
+        Record `farmer` as the last farmer created by its field officer once the
+        current transaction commits (so a rolled-back farmer is never pointed at).
+        Called when a farmer is created (post_save, or explicitly after bulk_create).
+        """
+        if not farmer.created_by_id:
+            return
+        key = AutoAssignmentService._pointer_key(farmer.created_by_id)
+        pointer = (farmer.id, farmer.date_joined.timestamp())
+
+        def store():
+            try:
+                cache.set(key, pointer, getattr(settings, 'AUTO_ASSIGN_POINTER_TTL', 3600))
+            except Exception as e:
+                logger.warning(f"Could not cache last farmer for field officer {farmer.created_by_id}: {str(e)}")
+
+        transaction.on_commit(store)
+
+    @staticmethod
+    def forget_farmer(farmer: User) -> None:
+        """Drop the pointer if it refers to `farmer` (called when a farmer is deleted)."""
+        if not farmer.created_by_id:
+            return
+        key = AutoAssignmentService._pointer_key(farmer.created_by_id)
+        try:
+            pointer = cache.get(key)
+            if pointer and pointer[0] == farmer.id:
+                cache.delete(key)
+        except Exception as e:
+            logger.warning(f"Could not clear last farmer pointer for field officer {farmer.created_by_id}: {str(e)}")
+
+    @staticmethod
+    def get_most_recent_farmer_id_by_field_officer(field_officer: User, within_minutes: int = 30) -> Optional[int]:
+        """
+        Id of the most recent farmer created by this field officer within the
+        window, or None.
+
+        Served from the per-officer pointer cached at farmer creation; on a miss
+        one query on the (created_by, role, date_joined) index fills it. A miss
+        with no farmer is not cached, so a farmer created meanwhile is found on
+        the next call.
+        """
+        time_threshold = timezone.now() - timedelta(minutes=within_minutes)
+        key = AutoAssignmentService._pointer_key(field_officer.id)
+
+        try:
+            pointer = cache.get(key)
+        except Exception as e:
+            logger.warning(f"Could not read last farmer pointer for field officer {field_officer.id}: {str(e)}")
+            pointer = None
+
+        if pointer is None:
+            row = User.objects.filter(
+                created_by=field_officer,
+                role__name='farmer',
+                date_joined__gte=time_threshold,
+            ).order_by('-date_joined').values_list('id', 'date_joined').first()
+            if not row:
+                return None
+            pointer = (row[0], row[1].timestamp())
+            try:
+                cache.set(key, pointer, getattr(settings, 'AUTO_ASSIGN_POINTER_TTL', 3600))
+            except Exception:
+                pass
+
+        farmer_id, joined_at = pointer
+        if farmer_id is None or joined_at < time_threshold.timestamp():
+            return None
+        return farmer_id
+
     @staticmethod
     def get_most_recent_farmer_by_field_officer(field_officer: User, within_minutes: int = 30) -> Optional[User]:
         """
@@ -26,27 +105,12 @@ class AutoAssignmentService:
             User: Most recent farmer or None if not found
         """
         try:
-            # Calculate the time threshold
-            time_threshold = timezone.now() - timedelta(minutes=within_minutes)
-            
-            # Find the most recent farmer created by this field officer
-            recent_farmer = User.objects.filter(
-                # Farmer role
-                role__name='farmer',
-                # Created by this field officer (assuming there's a created_by field)
-                # If there's no created_by field, we'll use a different approach
-                date_joined__gte=time_threshold
-            ).order_by('-date_joined').first()
-            
-            # If no direct created_by relationship, find farmers created around the same time
-            # This is a fallback approach - we look for farmers created recently
-            if not recent_farmer:
-                recent_farmer = User.objects.filter(
-                    role__name='farmer',
-                    date_joined__gte=time_threshold
-                ).order_by('-date_joined').first()
-            
-            return recent_farmer
+            farmer_id = AutoAssignmentService.get_most_recent_farmer_id_by_field_officer(
+                field_officer, within_minutes
+            )
+            if farmer_id is None:
+                return None
+            return User.objects.filter(pk=farmer_id).first()
             
         except Exception as e:
             logger.error(f"Error getting recent farmer for field officer {field_officer.id}: {str(e)}")
@@ -67,6 +131,7 @@ class AutoAssignmentService:
             today_start = timezone.now().replace(hour=0, minute=0, second=0, microsecond=0)
             
             return User.objects.filter(
+                created_by=field_officer,
                 role__name='farmer',
                 date_joined__gte=today_start
             ).order_by('-date_joined')
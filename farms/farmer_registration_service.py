@@ -8,6 +8,9 @@ from rest_framework import status
 from rest_framework.exceptions import ValidationError
 from .models import Farm, Plot, SoilType, CropType, IrrigationType, SoilReport
 from users.multi_tenant_utils import get_user_industry
+from . import reference_cache
+from .geometry import geometry_from_geojson, prepare_plot_geometry
+from .spatial_service import PlotSpatialService
 import logging
 
 logger = logging.getLogger(__name__)
@@ -93,6 +96,17 @@ def prepare_register_farmer_request_data(request):
     except Exception:
         return dict(raw)
 
+def hash_passwords(passwords):
+    """Hash a batch of passwords in a thread pool (PBKDF2 releases the GIL)."""
+    from concurrent.futures import ThreadPoolExecutor
+    from django.contrib.auth.hashers import make_password
+
+    if len(passwords) < 4:
+        return [make_password(password) for password in passwords]
+    with ThreadPoolExecutor(max_workers=min(8, len(passwords))) as pool:
+        return list(pool.map(make_password, passwords))
+
+
 class CompleteFarmerRegistrationService:
     """
     Unified service for complete farmer registration including:
@@ -128,19 +142,9 @@ class CompleteFarmerRegistrationService:
             farmer = CompleteFarmerRegistrationService._create_farmer(data.get('farmer', {}), field_officer)
 
             created_entities = []
-            plots_data = data.get('plots', [])
-
-            if 'plot' in data and not plots_data:
-                plot_data_dict = data.get('plot', {})
-                plots_data.append({
-                    'plot': plot_data_dict,
-                    'farm': data.get('farm'),
-                    'soil_report': data.get('soil_report'),
-                    'irrigation': data.get('irrigation'),
-                    'plantation': data.get('plantation'),
-                })
-
-            for idx, entity_data in enumerate(plots_data):
+            entities = CompleteFarmerRegistrationService._collect_entities(data, industry_slug)
+
+            for idx, entity_data in enumerate(entities):
                 plot = None
                 if entity_data.get('plot'):
                     plot_data_to_create = entity_data['plot']
@@ -149,60 +153,8 @@ class CompleteFarmerRegistrationService:
                     )
 
                 farm = None
-                farm_data = {}
-                if entity_data.get('farm') and plot:
-                    farm_data = entity_data['farm'].copy() if entity_data.get('farm') else {}
-                    
-                    if not farm_data.get('plantation_date') and data.get('farm', {}).get('plantation_date'):
-                        farm_data['plantation_date'] = data['farm']['plantation_date']
-                    if not farm_data.get('address') and data.get('farm', {}).get('address'):
-                        farm_data['address'] = data['farm']['address']
-                    if not farm_data.get('area_size') and data.get('farm', {}).get('area_size'):
-                        farm_data['area_size'] = data['farm']['area_size']
-                    if not farm_data.get('soil_type_name') and data.get('farm', {}).get('soil_type_name'):
-                        farm_data['soil_type_name'] = data['farm']['soil_type_name']
-                    if not farm_data.get('crop_type_name') and data.get('farm', {}).get('crop_type_name'):
-                        farm_data['crop_type_name'] = data['farm']['crop_type_name']
-                    if 'plantation_type_id' not in farm_data and 'plantation_type' not in farm_data:
-                        if data.get('farm', {}).get('plantation_type_id'):
-                            farm_data['plantation_type_id'] = data['farm']['plantation_type_id']
-                        elif data.get('farm', {}).get('plantation_type'):
-                            plantation_type_str = data['farm']['plantation_type']
-                            if isinstance(plantation_type_str, str) and plantation_type_str.isdigit():
-                                farm_data['plantation_type_id'] = int(plantation_type_str)
-                            else:
-                                farm_data['plantation_type'] = plantation_type_str
-                    if 'planting_method_id' not in farm_data and 'planting_method' not in farm_data:
-                        if data.get('farm', {}).get('planting_method_id'):
-                            farm_data['planting_method_id'] = data['farm']['planting_method_id']
-                        elif data.get('farm', {}).get('planting_method'):
-                            pm = data['farm']['planting_method']
-                            if isinstance(pm, str) and pm.isdigit():
-                                farm_data['planting_method_id'] = int(pm)
-                            else:
-                                farm_data['planting_method'] = pm
-                    if not farm_data.get('spacing_a') and data.get('farm', {}).get('spacing_a'):
-                        farm_data['spacing_a'] = data['farm']['spacing_a']
-                    if not farm_data.get('spacing_b') and data.get('farm', {}).get('spacing_b'):
-                        farm_data['spacing_b'] = data['farm']['spacing_b']
-                    if not farm_data.get('sugarcane_type') and data.get('farm', {}).get('sugarcane_type'):
-                        farm_data['sugarcane_type'] = data['farm']['sugarcane_type']
-                    if farm_data.get('sugarcane_yield') is None and data.get('farm', {}).get('sugarcane_yield') is not None:
-                        farm_data['sugarcane_yield'] = data['farm']['sugarcane_yield']
-                    if not farm_data.get('farm_document') and data.get('farm', {}).get('farm_document'):
-                        farm_data['farm_document'] = data['farm']['farm_document']
-
-                    if industry_slug:
-                        expected_crop = industry_slug.lower().strip()
-                        given_crop = (farm_data.get('crop_type_name') or '').strip().lower()
-                        if given_crop and given_crop != expected_crop:
-                            raise serializers.ValidationError(
-                                f"This endpoint is for {expected_crop} registration only. "
-                                f"Received crop_type_name '{farm_data.get('crop_type_name')}'. "
-                                f"Use /api/farms/register-farmer/{given_crop}/ for that crop."
-                            )
-                        farm_data['crop_type_name'] = expected_crop.capitalize() if expected_crop == 'sugarcane' else 'Grapes'
-
+                farm_data = entity_data.get('farm') or {}
+                if farm_data and plot:
                     farm = CompleteFarmerRegistrationService._create_farm(
                         farm_data, farmer, field_officer, plot, industry_slug=industry_slug
                     )
@@ -241,6 +193,97 @@ class CompleteFarmerRegistrationService:
             logger.error(f"Farmer registration failed: {str(e)}")
             raise serializers.ValidationError(f"Registration failed: {str(e)}")
     
+    @staticmethod
+    def _collect_entities(data, industry_slug=None):
+        """
+        Normalize a registration payload into a list of per-plot entity dicts
+        ({'plot', 'farm', 'soil_report', 'irrigation', 'plantation'}).
+
+        Accepts the single-plot format (plot/farm/irrigation at the top level) or
+        the multi-plot format (plots list). Top-level farm values fill in fields a
+        plot's farm leaves empty, and industry_slug pins crop_type_name.
+        """
+        plots_data = list(data.get('plots') or [])
+
+        if 'plot' in data and not plots_data:
+            plots_data.append({
+                'plot': data.get('plot', {}),
+                'farm': data.get('farm'),
+                'soil_report': data.get('soil_report'),
+                'irrigation': data.get('irrigation'),
+                'plantation': data.get('plantation'),
+            })
+
+        defaults = data.get('farm') or {}
+        entities = []
+        for entity_data in plots_data:
+            entity = dict(entity_data)
+            if entity_data.get('farm') and entity_data.get('plot'):
+                entity['farm'] = CompleteFarmerRegistrationService._merge_farm_defaults(
+                    entity_data['farm'], defaults, industry_slug
+                )
+            entities.append(entity)
+        return entities
+
+    @staticmethod
+    def _merge_farm_defaults(entity_farm, defaults, industry_slug=None):
+        """Fill empty per-plot farm fields from the top-level farm payload."""
+        farm_data = entity_farm.copy()
+
+        for key in ('plantation_date', 'address', 'area_size', 'soil_type_name', 'crop_type_name',
+                    'spacing_a', 'spacing_b', 'sugarcane_type', 'farm_document'):
+            if not farm_data.get(key) and defaults.get(key):
+                farm_data[key] = defaults[key]
+        if farm_data.get('sugarcane_yield') is None and defaults.get('sugarcane_yield') is not None:
+            farm_data['sugarcane_yield'] = defaults['sugarcane_yield']
+
+        if 'plantation_type_id' not in farm_data and 'plantation_type' not in farm_data:
+            if defaults.get('plantation_type_id'):
+                farm_data['plantation_type_id'] = defaults['plantation_type_id']
+            elif defaults.get('plantation_type'):
+                plantation_type_str = defaults['plantation_type']
+                if isinstance(plantation_type_str, str) and plantation_type_str.isdigit():
+                    farm_data['plantation_type_id'] = int(plantation_type_str)
+                else:
+                    farm_data['plantation_type'] = plantation_type_str
+        if 'planting_method_id' not in farm_data and 'planting_method' not in farm_data:
+            if defaults.get('planting_method_id'):
+                farm_data['planting_method_id'] = defaults['planting_method_id']
+            elif defaults.get('planting_method'):
+                pm = defaults['planting_method']
+                if isinstance(pm, str) and pm.isdigit():
+                    farm_data['planting_method_id'] = int(pm)
+                else:
+                    farm_data['planting_method'] = pm
+
+        if industry_slug:
+            expected_crop = industry_slug.lower().strip()
+            given_crop = (farm_data.get('crop_type_name') or '').strip().lower()
+            if given_crop and given_crop != expected_crop:
+                raise serializers.ValidationError(
+                    f"This endpoint is for {expected_crop} registration only. "
+                    f"Received crop_type_name '{farm_data.get('crop_type_name')}'. "
+                    f"Use /api/farms/register-farmer/{given_crop}/ for that crop."
+                )
+            farm_data['crop_type_name'] = expected_crop.capitalize() if expected_crop == 'sugarcane' else 'Grapes'
+
+        return farm_data
+
+    @staticmethod
+    def _clean_phone_number(phone_number):
+        """Return the 10-digit form of a phone number (strips +91), or None if empty."""
+        phone_number = phone_number.strip() if phone_number else ''
+        if not phone_number:
+            return None
+        import re
+        cleaned_phone = re.sub(r'\D', '', phone_number)
+        # If starts with 91 (country code), remove it to get 10 digits
+        if cleaned_phone.startswith('91') and len(cleaned_phone) == 12:
+            cleaned_phone = cleaned_phone[2:]
+        if len(cleaned_phone) != 10:
+            raise serializers.ValidationError(f"Phone number must be 10 digits (provided: {phone_number})")
+        return cleaned_phone
+
     @staticmethod
     def _create_farmer(farmer_data, field_officer=None):
         """Create farmer user"""
@@ -262,28 +305,10 @@ class CompleteFarmerRegistrationService:
             raise serializers.ValidationError(f"Email '{farmer_data['email']}' already exists")
         
         # Check if phone_number already exists (if provided)
-        phone_number = farmer_data.get('phone_number', '').strip() if farmer_data.get('phone_number') else ''
-        if phone_number:
-            # Clean phone number (remove non-digits, handle country code)
-            import re
-            cleaned_phone = re.sub(r'\D', '', phone_number)
-            # If starts with 91 (country code), remove it to get 10 digits
-            if cleaned_phone.startswith('91') and len(cleaned_phone) == 12:
-                cleaned_phone = cleaned_phone[2:]
-            
-            # Validate it's exactly 10 digits after cleaning
-            if len(cleaned_phone) != 10:
-                raise serializers.ValidationError(f"Phone number must be 10 digits (provided: {phone_number})")
-            
-            # Check for duplicate with cleaned phone number
-            if User.objects.filter(phone_number=cleaned_phone).exists():
-                raise serializers.ValidationError(f"User with phone number '{phone_number}' already exists")
-            
-            # Use cleaned phone number for creation
-            farmer_data['phone_number'] = cleaned_phone
-        else:
-            # Set to None if not provided (since phone_number is nullable)
-            farmer_data['phone_number'] = None
+        cleaned_phone = CompleteFarmerRegistrationService._clean_phone_number(farmer_data.get('phone_number'))
+        if cleaned_phone and User.objects.filter(phone_number=cleaned_phone).exists():
+            raise serializers.ValidationError(f"User with phone number '{farmer_data.get('phone_number')}' already exists")
+        farmer_data['phone_number'] = cleaned_phone
 
         aadhaar_raw = farmer_data.pop('aadhaar_number', None)
         try:
@@ -339,37 +364,14 @@ class CompleteFarmerRegistrationService:
         return farmer
     
     @staticmethod
-    def _create_plot(plot_data, farmer, field_officer):
-        """Create plot and assign to farmer"""
-        if not plot_data:
-            return None
-        
-        # Debug: Log what plot_data contains at the start of _create_plot
-        logger.info(f"_create_plot called - plot_data keys: {list(plot_data.keys())}")
-        logger.info(f"Boundary in plot_data: {'boundary' in plot_data}, value type: {type(plot_data.get('boundary'))}, value: {plot_data.get('boundary')}")
-        
+    def _build_plot(plot_data, farmer, field_officer, industry):
+        """Validate plot data and return an unsaved Plot with geometry set (FastAPI sync skipped)."""
         # Validate required fields
         required_fields = ['gat_number', 'village', 'district', 'state']
         for field in required_fields:
             if not plot_data.get(field):
                 raise serializers.ValidationError(f"Plot {field} is required")
         
-        # Check for duplicate plot
-        existing_plot = Plot.objects.filter(
-            gat_number=plot_data['gat_number'],
-            plot_number=plot_data.get('plot_number', ''),
-            village=plot_data['village'],
-            district=plot_data['district']
-        ).first()
-        
-        if existing_plot:
-            raise serializers.ValidationError(
-                "GAT number and plot number already exist for this village and district."
-            )
-        
-        # Get industry from field officer
-        industry = get_user_industry(field_officer) if field_officer else None
-        
         # Create plot (skip FastAPI sync during unified registration)
         plot = Plot(
             gat_number=plot_data['gat_number'],
@@ -415,7 +417,9 @@ class CompleteFarmerRegistrationService:
                         raise ValueError(f"Boundary must be a Polygon, got {boundary_geom.geom_type}")
                     
                     plot.boundary = boundary_geom
-                    logger.info(f"Set plot boundary: {boundary_geom.geom_type} with {len(boundary_geom.coords[0])} points")
+                    # Validate, repair, orient and derive area/centroid/bbox once, here
+                    prepare_plot_geometry(plot)
+                    logger.info(f"Set plot boundary: {plot.boundary.geom_type} with {len(plot.boundary.coords[0])} points")
                 else:
                     # Explicitly set to None if conversion returned None
                     plot.boundary = None
@@ -428,6 +432,38 @@ class CompleteFarmerRegistrationService:
         else:
             logger.info(f"Boundary not provided in plot_data (boundary key present: {'boundary' in plot_data}, value: {plot_data.get('boundary')})")
         # If boundary is not in plot_data at all, leave it as None (don't create default)
+        return plot
+
+    @staticmethod
+    def _create_plot(plot_data, farmer, field_officer):
+        """Create plot and assign to farmer"""
+        if not plot_data:
+            return None
+        
+        # Debug: Log what plot_data contains at the start of _create_plot
+        logger.info(f"_create_plot called - plot_data keys: {list(plot_data.keys())}")
+        logger.info(f"Boundary in plot_data: {'boundary' in plot_data}, value type: {type(plot_data.get('boundary'))}, value: {plot_data.get('boundary')}")
+        
+        # Get industry from field officer
+        industry = get_user_industry(field_officer) if field_officer else None
+        
+        plot = CompleteFarmerRegistrationService._build_plot(plot_data, farmer, field_officer, industry)
+        
+        # Check for duplicate plot
+        existing_plot = Plot.objects.filter(
+            gat_number=plot_data['gat_number'],
+            plot_number=plot_data.get('plot_number', ''),
+            village=plot_data['village'],
+            district=plot_data['district']
+        ).first()
+        
+        if existing_plot:
+            raise serializers.ValidationError(
+                "GAT number and plot number already exist for this village and district."
+            )
+
+        if plot.boundary:
+            PlotSpatialService.check_overlaps(plot.boundary, industry)
         
         plot.save()
         
@@ -441,157 +477,102 @@ class CompleteFarmerRegistrationService:
         return plot
     
     @staticmethod
-    def _create_farm(farm_data, farmer, field_officer, plot=None, industry_slug=None):
-        """Create farm and assign to farmer. industry_slug is for validation only (sugarcane/grapes)."""
-        if not farm_data:
-            return None
-        
-        # Validate required fields
-        if not farm_data.get('address'):
-            raise serializers.ValidationError("Farm address is required")
-        
-        if not farm_data.get('area_size'):
-            raise serializers.ValidationError("Farm area_size is required")
-        
-        # Get soil type if provided
-        soil_type = None
-        if farm_data.get('soil_type_id'):
-            try:
-                soil_type = SoilType.objects.get(id=farm_data['soil_type_id'])
-            except SoilType.DoesNotExist:
-                raise serializers.ValidationError(f"Soil type ID {farm_data['soil_type_id']} not found")
-        elif farm_data.get('soil_type_name'):
-            soil_type, _ = SoilType.objects.get_or_create(
-                name=farm_data['soil_type_name'],
-                defaults={'description': f"Auto-created: {farm_data['soil_type_name']}"}
-            )
-        
-        
-        # Get crop type if provided
-        crop_type = None
-        if farm_data.get('crop_type_id'):
-            try:
-                crop_type = CropType.objects.get(id=farm_data['crop_type_id'])
-            except CropType.DoesNotExist:
-                raise serializers.ValidationError(f"Crop type ID {farm_data['crop_type_id']} not found")
-        elif farm_data.get('crop_type_name') or farm_data.get('crop_type'):
-         
-            if not farm_data.get('crop_type_name') and farm_data.get('crop_type'):
-                farm_data = dict(farm_data)
-                farm_data['crop_type_name'] = farm_data['crop_type']
-            # Get plantation_type and planting_method as strings (choice values)
-            # Support both direct string values and backward compatibility with IDs
-            plantation_type_str = farm_data.get('plantation_type') or ''
-            planting_method_str = farm_data.get('planting_method') or ''
-            
-            # Debug logging
-            logger.info(f"Received plantation_type: {farm_data.get('plantation_type')}, planting_method: {farm_data.get('planting_method')}")
-            logger.info(f"Initial values - plantation_type_str: '{plantation_type_str}', planting_method_str: '{planting_method_str}'")
-            
-            # If IDs are provided (backward compatibility), try to get the code/name
-            if farm_data.get('plantation_type_id'):
-                try:
-                    from .models import PlantationType
-                    pt_obj = PlantationType.objects.get(id=farm_data['plantation_type_id'])
-                    plantation_type_str = pt_obj.code if pt_obj.code else pt_obj.name
-                    logger.info(f"Resolved plantation_type from ID: '{plantation_type_str}'")
-                except PlantationType.DoesNotExist:
-                    logger.warning(f"Plantation type ID {farm_data['plantation_type_id']} not found")
-                    plantation_type_str = ''
-            
-            if farm_data.get('planting_method_id'):
-                try:
-                    from .models import PlantingMethod
-                    pm_obj = PlantingMethod.objects.get(id=farm_data['planting_method_id'])
-                    planting_method_str = pm_obj.code if pm_obj.code else pm_obj.name
-                    logger.info(f"Resolved planting_method from ID: '{planting_method_str}'")
-                except PlantingMethod.DoesNotExist:
-                    logger.warning(f"Planting method ID {farm_data['planting_method_id']} not found")
-                    planting_method_str = ''
-            
-            # Normalize choice values
-            # Map common variations to standard choice values
-            plantation_type_mapping = {
-                'adsali': 'adsali',
-                'suru': 'suru',
-                'ratoon': 'ratoon',
-                'pre-seasonal': 'pre-seasonal',
-                'pre_seasonal': 'pre_seasonal',
-                'post-seasonal': 'post-seasonal',
-                'post_seasonal': 'post-seasonal',
-            }
-            
-            planting_method_mapping = {
-                '3_bud': '3_bud',
-                '2_bud': '2_bud',
-                '1_bud': '1_bud',
-                '1_bud_stip_method': '1_bud_stip_Method',
-                '1_bud_stip_Method': '1_bud_stip_Method',
-                'other': 'other',
-            }
-            
-            # Normalize plantation_type
-            if plantation_type_str:
-                plantation_type_str = str(plantation_type_str).lower().strip()
-                plantation_type_str = plantation_type_mapping.get(plantation_type_str, plantation_type_str)
-                # Validate against choices
-                valid_plantation_types = ['adsali', 'suru', 'ratoon', 'pre-seasonal', 'pre_seasonal', 'post-seasonal', 'other']
-                if plantation_type_str not in valid_plantation_types:
-                    logger.warning(f"Invalid plantation_type '{plantation_type_str}', defaulting to 'other'")
-                    plantation_type_str = 'other'
-            else:
-                plantation_type_str = ''  # Empty string for blank=True CharField
-            
-            # Normalize planting_method
-            if planting_method_str:
-                planting_method_str = str(planting_method_str).lower().strip()
-                planting_method_str = planting_method_mapping.get(planting_method_str, planting_method_str)
-                # Validate against choices
-                valid_planting_methods = ['3_bud', '2_bud', '1_bud', '1_bud_stip_Method', 'other']
-                if planting_method_str not in valid_planting_methods:
-                    logger.warning(f"Invalid planting_method '{planting_method_str}', defaulting to 'other'")
-                    planting_method_str = 'other'
+    def _normalize_crop_choices(farm_data):
+        """
+        Resolve crop name, plantation_type and planting_method from a farm payload
+        and normalize them to CropType choice values.
+
+        Returns:
+            (crop_type_name, plantation_type, planting_method)
+        """
+        if not farm_data.get('crop_type_name') and farm_data.get('crop_type'):
+            farm_data = dict(farm_data)
+            farm_data['crop_type_name'] = farm_data['crop_type']
+        # Get plantation_type and planting_method as strings (choice values)
+        # Support both direct string values and backward compatibility with IDs
+        plantation_type_str = farm_data.get('plantation_type') or ''
+        planting_method_str = farm_data.get('planting_method') or ''
+
+        # Debug logging
+        logger.info(f"Received plantation_type: {farm_data.get('plantation_type')}, planting_method: {farm_data.get('planting_method')}")
+        logger.info(f"Initial values - plantation_type_str: '{plantation_type_str}', planting_method_str: '{planting_method_str}'")
+
+        # If IDs are provided (backward compatibility), try to get the code/name
+        if farm_data.get('plantation_type_id'):
+            from .models import PlantationType
+            pt_obj = reference_cache.get_by_id(PlantationType, farm_data['plantation_type_id'])
+            if pt_obj:
+                plantation_type_str = pt_obj.code if pt_obj.code else pt_obj.name
+                logger.info(f"Resolved plantation_type from ID: '{plantation_type_str}'")
             else:
-                planting_method_str = ''  # Empty string for blank=True CharField
-            
-            logger.info(f"Final normalized values - plantation_type: '{plantation_type_str}', planting_method: '{planting_method_str}'")
-            
-            # Find or create CropType that matches BOTH crop name AND plantation data
-            crop_type_name = farm_data['crop_type_name']
-            
-            # Get industry from field officer
-            industry = get_user_industry(field_officer) if field_officer else None
-            
-            # Use get_or_create with all fields to ensure uniqueness (including industry)
-            crop_type, created = CropType.objects.get_or_create(
-                crop_type=crop_type_name,
-                plantation_type=plantation_type_str if plantation_type_str else '',
-                planting_method=planting_method_str if planting_method_str else '',
-                industry=industry,
-                defaults={}
-            )
-            
-            if created:
-                logger.info(f"Created CropType '{crop_type_name}' with plantation_type={plantation_type_str}, planting_method={planting_method_str}, industry={industry}")
+                logger.warning(f"Plantation type ID {farm_data['plantation_type_id']} not found")
+                plantation_type_str = ''
+
+        if farm_data.get('planting_method_id'):
+            from .models import PlantingMethod
+            pm_obj = reference_cache.get_by_id(PlantingMethod, farm_data['planting_method_id'])
+            if pm_obj:
+                planting_method_str = pm_obj.code if pm_obj.code else pm_obj.name
+                logger.info(f"Resolved planting_method from ID: '{planting_method_str}'")
             else:
-                # Ensure plantation data and industry are set (in case they were None before)
-                needs_update = False
-                if crop_type.plantation_type != plantation_type_str or crop_type.planting_method != planting_method_str:
-                    crop_type.plantation_type = plantation_type_str if plantation_type_str else ''
-                    crop_type.planting_method = planting_method_str if planting_method_str else ''
-                    needs_update = True
-                if crop_type.industry != industry:
-                    crop_type.industry = industry
-                    needs_update = True
-                if needs_update:
-                    crop_type.save()
-                    logger.info(f"Updated CropType '{crop_type_name}' with plantation data and industry")
-        
-        # Parse plantation_date if provided
+                logger.warning(f"Planting method ID {farm_data['planting_method_id']} not found")
+                planting_method_str = ''
+
+        # Normalize choice values
+        # Map common variations to standard choice values
+        plantation_type_mapping = {
+            'adsali': 'adsali',
+            'suru': 'suru',
+            'ratoon': 'ratoon',
+            'pre-seasonal': 'pre-seasonal',
+            'pre_seasonal': 'pre_seasonal',
+            'post-seasonal': 'post-seasonal',
+            'post_seasonal': 'post-seasonal',
+        }
+
+        planting_method_mapping = {
+            '3_bud': '3_bud',
+            '2_bud': '2_bud',
+            '1_bud': '1_bud',
+            '1_bud_stip_method': '1_bud_stip_Method',
+            '1_bud_stip_Method': '1_bud_stip_Method',
+            'other': 'other',
+        }
+
+        # Normalize plantation_type
+        if plantation_type_str:
+            plantation_type_str = str(plantation_type_str).lower().strip()
+            plantation_type_str = plantation_type_mapping.get(plantation_type_str, plantation_type_str)
+            # Validate against choices
+            valid_plantation_types = ['adsali', 'suru', 'ratoon', 'pre-seasonal', 'pre_seasonal', 'post-seasonal', 'other']
+            if plantation_type_str not in valid_plantation_types:
+                logger.warning(f"Invalid plantation_type '{plantation_type_str}', defaulting to 'other'")
+                plantation_type_str = 'other'
+        else:
+            plantation_type_str = ''  # Empty string for blank=True CharField
+
+        # Normalize planting_method
+        if planting_method_str:
+            planting_method_str = str(planting_method_str).lower().strip()
+            planting_method_str = planting_method_mapping.get(planting_method_str, planting_method_str)
+            # Validate against choices
+            valid_planting_methods = ['3_bud', '2_bud', '1_bud', '1_bud_stip_Method', 'other']
+            if planting_method_str not in valid_planting_methods:
+                logger.warning(f"Invalid planting_method '{planting_method_str}', defaulting to 'other'")
+                planting_method_str = 'other'
+        else:
+            planting_method_str = ''  # Empty string for blank=True CharField
+
+        logger.info(f"Final normalized values - plantation_type: '{plantation_type_str}', planting_method: '{planting_method_str}'")
+
+        return farm_data['crop_type_name'], plantation_type_str, planting_method_str
+
+    @staticmethod
+    def _parse_plantation_date(plantation_date_input):
+        """Parse plantation_date from a string (several formats), date or datetime."""
         plantation_date = None
-        plantation_date_input = farm_data.get('plantation_date')
         logger.info(f"Received plantation_date: {plantation_date_input} (type: {type(plantation_date_input)})")
-        
+
         if plantation_date_input:
             try:
                 from datetime import datetime
@@ -607,7 +588,7 @@ class CompleteFarmerRegistrationService:
                             break
                         except ValueError:
                             continue
-                    
+
                     if plantation_date is None:
                         raise ValueError(f"Could not parse date '{plantation_date_input}' with any known format")
                 elif hasattr(plantation_date_input, 'date'):  # datetime object
@@ -623,14 +604,14 @@ class CompleteFarmerRegistrationService:
                 plantation_date = None
         else:
             logger.info("No plantation_date provided in farm_data")
-        # Sync CropType's plantation_date with Farm's plantation_date
-        if crop_type and plantation_date:
-           if crop_type.plantation_date != plantation_date:
-              crop_type.plantation_date = plantation_date
-              crop_type.save()
-              logger.info(f"Updated CropType '{crop_type.crop_type}' with plantation_date '{crop_type.plantation_date}' to match Farm")
-
+        return plantation_date
 
+    @staticmethod
+    def _farm_attributes(farm_data, crop_type, plantation_date):
+        """
+        Non-relation Farm fields from a registration payload, with sugarcane
+        yield validation and variety_subtype normalization applied.
+        """
         # Get crop_variety if provided
         crop_variety = farm_data.get('crop_variety', '').strip() if farm_data.get('crop_variety') else None
         if crop_variety == '':
@@ -649,13 +630,6 @@ class CompleteFarmerRegistrationService:
             elif sugarcane_type_val == 'new':
                 sugarcane_yield_val = None
 
-        # Get industry from field officer
-        industry = get_user_industry(field_officer) if field_officer else None
-
-        farm_document = farm_data.get('farm_document')
-        if farm_document is not None and not hasattr(farm_document, 'read'):
-            farm_document = None
-
         _variety_subtype_map = {
             'wine': 'wine_grapes',
             'Wine': 'wine_grapes',
@@ -670,18 +644,12 @@ class CompleteFarmerRegistrationService:
         normalized_variety_subtype = _variety_subtype_map.get(raw_variety_subtype, raw_variety_subtype)
         logger.info(f"variety_subtype: '{raw_variety_subtype}' -> '{normalized_variety_subtype}'")
 
-        create_kwargs = dict(
+        return dict(
             address=farm_data['address'],
             area_size=farm_data['area_size'],
-            farm_owner=farmer,
-            created_by=field_officer,
-            plot=plot,
-            soil_type=soil_type,
-            crop_type=crop_type,
             spacing_a=farm_data.get('spacing_a'),
             spacing_b=farm_data.get('spacing_b'),
             crop_variety=crop_variety,
-            industry=industry,
             plantation_date=plantation_date,
             variety_type=farm_data.get('variety_type'),
             variety_subtype=normalized_variety_subtype,
@@ -698,36 +666,116 @@ class CompleteFarmerRegistrationService:
             sugarcane_type=sugarcane_type_val,
             sugarcane_yield=sugarcane_yield_val,
         )
+
+    @staticmethod
+    def _create_farm(farm_data, farmer, field_officer, plot=None, industry_slug=None):
+        """Create farm and assign to farmer. industry_slug is for validation only (sugarcane/grapes)."""
+        if not farm_data:
+            return None
+        
+        # Validate required fields
+        if not farm_data.get('address'):
+            raise serializers.ValidationError("Farm address is required")
+        
+        if not farm_data.get('area_size'):
+            raise serializers.ValidationError("Farm area_size is required")
+        
+        # Get soil type if provided
+        soil_type = None
+        if farm_data.get('soil_type_id'):
+            soil_type = reference_cache.get_by_id(SoilType, farm_data['soil_type_id'])
+            if soil_type is None:
+                raise serializers.ValidationError(f"Soil type ID {farm_data['soil_type_id']} not found")
+        elif farm_data.get('soil_type_name'):
+            soil_type, _ = reference_cache.get_or_create(
+                SoilType,
+                name=farm_data['soil_type_name'],
+                defaults={'description': f"Auto-created: {farm_data['soil_type_name']}"}
+            )
+        
+        
+        # Get crop type if provided
+        crop_type = None
+        if farm_data.get('crop_type_id'):
+            crop_type = reference_cache.get_by_id(CropType, farm_data['crop_type_id'])
+            if crop_type is None:
+                raise serializers.ValidationError(f"Crop type ID {farm_data['crop_type_id']} not found")
+        elif farm_data.get('crop_type_name') or farm_data.get('crop_type'):
+            crop_type_name, plantation_type_str, planting_method_str = (
+                CompleteFarmerRegistrationService._normalize_crop_choices(farm_data)
+            )
+
+            # Find or create CropType that matches BOTH crop name AND plantation data
+            
+            # Get industry from field officer
+            industry = get_user_industry(field_officer) if field_officer else None
+            
+            # Use get_or_create with all fields to ensure uniqueness (including industry)
+            crop_type, created = reference_cache.get_or_create(
+                CropType,
+                crop_type=crop_type_name,
+                plantation_type=plantation_type_str if plantation_type_str else '',
+                planting_method=planting_method_str if planting_method_str else '',
+                industry=industry,
+                defaults={}
+            )
+            
+            if created:
+                logger.info(f"Created CropType '{crop_type_name}' with plantation_type={plantation_type_str}, planting_method={planting_method_str}, industry={industry}")
+            else:
+                # Ensure plantation data and industry are set (in case they were None before)
+                needs_update = False
+                if crop_type.plantation_type != plantation_type_str or crop_type.planting_method != planting_method_str:
+                    crop_type.plantation_type = plantation_type_str if plantation_type_str else ''
+                    crop_type.planting_method = planting_method_str if planting_method_str else ''
+                    needs_update = True
+                if crop_type.industry != industry:
+                    crop_type.industry = industry
+                    needs_update = True
+                if needs_update:
+                    crop_type.save()
+                    logger.info(f"Updated CropType '{crop_type_name}' with plantation data and industry")
+        
+        # Parse plantation_date if provided
+        plantation_date = CompleteFarmerRegistrationService._parse_plantation_date(farm_data.get('plantation_date'))
+        # Sync CropType's plantation_date with Farm's plantation_date
+        if crop_type and plantation_date:
+           if crop_type.plantation_date != plantation_date:
+              crop_type.plantation_date = plantation_date
+              crop_type.save()
+              logger.info(f"Updated CropType '{crop_type.crop_type}' with plantation_date '{crop_type.plantation_date}' to match Farm")
+
+        # Get industry from field officer
+        industry = get_user_industry(field_officer) if field_officer else None
+
+        farm_document = farm_data.get('farm_document')
+        if farm_document is not None and not hasattr(farm_document, 'read'):
+            farm_document = None
+
+        create_kwargs = dict(
+            farm_owner=farmer,
+            created_by=field_officer,
+            plot=plot,
+            soil_type=soil_type,
+            crop_type=crop_type,
+            industry=industry,
+            **CompleteFarmerRegistrationService._farm_attributes(farm_data, crop_type, plantation_date),
+        )
         if farm_document is not None:
             create_kwargs['farm_document'] = farm_document
 
         farm = Farm.objects.create(**create_kwargs)
 
         
-        logger.info(f"Created farm: {farm.farm_uid} (ID: {farm.id}) for farmer {farmer.username} , crop_variety: {crop_variety}")
+        logger.info(f"Created farm: {farm.farm_uid} (ID: {farm.id}) for farmer {farmer.username} , crop_variety: {farm.crop_variety}")
         return farm
     
     @staticmethod
-    def _create_farm_irrigation(irrigation_data, farm, field_officer, farm_data=None):
-        """Create farm irrigation system"""
-        if not irrigation_data:
-            return None
-        
-        from .models import FarmIrrigation
-        
-        # Get irrigation type
-        irrigation_type = None
-        if irrigation_data.get('irrigation_type_id'):
-            try:
-                irrigation_type = IrrigationType.objects.get(id=irrigation_data['irrigation_type_id'])
-            except IrrigationType.DoesNotExist:
-                raise serializers.ValidationError(f"Irrigation type ID {irrigation_data['irrigation_type_id']} not found")
-        elif irrigation_data.get('irrigation_type_name'):
-            irrigation_type, _ = IrrigationType.objects.get_or_create(
-                name=irrigation_data['irrigation_type_name'],
-                defaults={'description': f"Auto-created: {irrigation_data['irrigation_type_name']}"}
-            )
-
+    def _irrigation_attributes(irrigation_data, irrigation_type, farm, farm_data=None):
+        """
+        FarmIrrigation fields (other than farm/type) from a registration payload:
+        plants_per_acre derived from spacing for drip, location defaulting to the plot's.
+        """
         # Calculate plants_per_acre for drip irrigation if spacing is available
         plants_per_acre_val = irrigation_data.get('plants_per_acre')
         if irrigation_type and irrigation_type.name.lower() == 'drip' and not plants_per_acre_val:
@@ -758,10 +806,8 @@ class CompleteFarmerRegistrationService:
             # Default location (center of farm area or a generic point)
             from django.contrib.gis.geos import Point
             irrigation_location = Point(0, 0)  # Default to 0,0 if no location available
-        
-        irrigation = FarmIrrigation.objects.create(
-            farm=farm,
-            irrigation_type=irrigation_type,
+
+        return dict(
             location=irrigation_location,
             status=irrigation_data.get('status', True),
             # Irrigation-specific fields
@@ -772,6 +818,35 @@ class CompleteFarmerRegistrationService:
             flow_rate_lph=irrigation_data.get('flow_rate_lph'),
             emitters_count=irrigation_data.get('emitters_count')
         )
+
+    @staticmethod
+    def _create_farm_irrigation(irrigation_data, farm, field_officer, farm_data=None):
+        """Create farm irrigation system"""
+        if not irrigation_data:
+            return None
+        
+        from .models import FarmIrrigation
+        
+        # Get irrigation type
+        irrigation_type = None
+        if irrigation_data.get('irrigation_type_id'):
+            irrigation_type = reference_cache.get_by_id(IrrigationType, irrigation_data['irrigation_type_id'])
+            if irrigation_type is None:
+                raise serializers.ValidationError(f"Irrigation type ID {irrigation_data['irrigation_type_id']} not found")
+        elif irrigation_data.get('irrigation_type_name'):
+            irrigation_type, _ = reference_cache.get_or_create(
+                IrrigationType,
+                name=irrigation_data['irrigation_type_name'],
+                defaults={'description': f"Auto-created: {irrigation_data['irrigation_type_name']}"}
+            )
+
+        irrigation = FarmIrrigation.objects.create(
+            farm=farm,
+            irrigation_type=irrigation_type,
+            **CompleteFarmerRegistrationService._irrigation_attributes(
+                irrigation_data, irrigation_type, farm, farm_data
+            )
+        )
         
         logger.info(f"Created irrigation: {irrigation.id} for farm {farm.farm_uid}")
         return irrigation
@@ -880,99 +955,11 @@ class CompleteFarmerRegistrationService:
             geojson_data: Dictionary with GeoJSON format or string
             
         Returns:
-            Django GIS geometry object (Point, Polygon, etc.)
+            Django GIS geometry object (Point, Polygon, etc.); polygon rings are
+            closed, validity and orientation are handled by farms.geometry on write
         """
         try:
-            from django.contrib.gis.geos import GEOSGeometry, Point, Polygon
-            import json
-            
-            if geojson_data is None:
-                return None
-            
-            # Handle string input (JSON string)
-            if isinstance(geojson_data, str):
-                try:
-                    # Try to parse as JSON first
-                    geojson_data = json.loads(geojson_data)
-                except json.JSONDecodeError:
-                    # If not valid JSON, try direct GEOSGeometry creation
-                    return GEOSGeometry(geojson_data)
-            
-            # Handle dict input (GeoJSON format)
-            if isinstance(geojson_data, dict):
-                # Validate basic GeoJSON structure
-                if 'type' not in geojson_data:
-                    raise ValueError("GeoJSON must have 'type' field")
-                if 'coordinates' not in geojson_data:
-                    raise ValueError("GeoJSON must have 'coordinates' field")
-                
-                geom_type = geojson_data.get('type', '').lower()
-                coordinates = geojson_data.get('coordinates')
-                
-                # Validate coordinates based on type
-                if geom_type == 'point':
-                    if not isinstance(coordinates, list) or len(coordinates) < 2:
-                        raise ValueError("Point coordinates must be [longitude, latitude] or [lng, lat, elevation]")
-                    # Ensure coordinates are in correct order: [longitude, latitude]
-                    lng, lat = float(coordinates[0]), float(coordinates[1])
-                    return Point(lng, lat, srid=4326)
-                
-                elif geom_type == 'polygon':
-                    if not isinstance(coordinates, list) or len(coordinates) == 0:
-                        raise ValueError("Polygon coordinates must be a list of rings")
-                    
-                    # Validate polygon ring structure
-                    # Polygon coordinates should be: [[[lng, lat], [lng, lat], ...]]
-                    if not isinstance(coordinates[0], list) or len(coordinates[0]) < 3:
-                        raise ValueError("Polygon must have at least 3 points")
-                    
-                    # Create a copy of the coordinates to avoid modifying the original
-                    coordinates_copy = json.loads(json.dumps(coordinates))
-                    
-                    # Ensure first and last points are the same (closed ring)
-                    first_ring = coordinates_copy[0]
-                    if len(first_ring) > 0:
-                        # Compare coordinate values (lists), not references
-                        first_point = first_ring[0]
-                        last_point = first_ring[-1]
-                        # Check if first and last points are different
-                        if (isinstance(first_point, list) and isinstance(last_point, list) and
-                            len(first_point) >= 2 and len(last_point) >= 2 and
-                            (first_point[0] != last_point[0] or first_point[1] != last_point[1])):
-                            # Auto-close the polygon by adding a copy of the first point at the end
-                            first_ring.append(first_point[:])  # Create a copy of the first point
-                            logger.info("Auto-closed polygon ring (first and last points were different)")
-                    
-                    # Create a new GeoJSON dict with the modified coordinates
-                    polygon_geojson = {
-                        'type': 'Polygon',
-                        'coordinates': coordinates_copy
-                    }
-                    
-                    # Convert to GEOSGeometry
-                    geojson_string = json.dumps(polygon_geojson)
-                    geometry = GEOSGeometry(geojson_string, srid=4326)
-                    
-                    # Validate the geometry
-                    if not geometry.valid:
-                        logger.warning(f"Invalid geometry detected, attempting to fix: {geometry.valid_reason}")
-                        # Try to fix invalid geometry
-                        try:
-                            geometry = geometry.buffer(0)  # Buffer(0) can fix some invalid geometries
-                        except Exception as fix_error:
-                            logger.error(f"Could not fix invalid geometry: {str(fix_error)}")
-                            raise ValueError(f"Invalid polygon geometry: {geometry.valid_reason}")
-                    
-                    return geometry
-                
-                else:
-                    # For other geometry types (LineString, MultiPoint, etc.), use generic conversion
-                    geojson_string = json.dumps(geojson_data)
-                    return GEOSGeometry(geojson_string, srid=4326)
-            
-            else:
-                raise ValueError(f"Invalid geometry data type: {type(geojson_data)}. Expected dict or str.")
-                
+            return geometry_from_geojson(geojson_data)
         except json.JSONDecodeError as e:
             logger.error(f"JSON decode error converting GeoJSON: {str(e)}")
             raise serializers.ValidationError(f"Invalid JSON format in geometry data: {str(e)}")
@@ -1039,3 +1026,530 @@ class CompleteFarmerRegistrationService:
             logger.warning(f"❌ Failed syncs: {', '.join(sync_results['failed'])}")
         
         return sync_results
+
+
+class BulkFarmerRegistrationService:
+    """
+    Register many farmers (each with their plots, farms, irrigation, soil report
+    and plantation record) in one transaction with set-based queries:
+    - uniqueness of usernames, emails, phone numbers and Aadhaar numbers is
+      checked in the batch and against the database with one query per field
+    - soil, irrigation and crop types are resolved through lookup maps and the
+      missing ones created with bulk_create
+    - farmers, farms and irrigation are built and validated (model clean(),
+      sugarcane yield rules, lookup ids) for every entry before any write
+    - users, plots, farms and related rows are inserted with bulk_create
+    - plot sync to the FastAPI services is pushed once for the whole batch
+
+    Validation errors are collected per entry index; nothing is written unless
+    every entry is valid.
+    """
+
+    FARMER_REQUIRED_FIELDS = ['username', 'email', 'password', 'first_name', 'last_name']
+
+    @staticmethod
+    def register_farmers(entries, field_officer, industry_slug=None):
+        """
+        Args:
+            entries: List of per-farmer payloads, each in the register_farmer
+                     format ({'farmer': {...}, 'plots': [...]} or plot/farm/irrigation)
+            field_officer: Field officer creating the farmers
+            industry_slug: Optional 'sugarcane' or 'grapes' to enforce crop segregation
+
+        Returns:
+            Dictionary with created farmers and per-farmer created entities
+        """
+        from django.conf import settings
+
+        max_farmers = getattr(settings, 'BULK_REGISTRATION_MAX_FARMERS', 200)
+        if not isinstance(entries, list) or not entries:
+            raise serializers.ValidationError({'farmers': 'A non-empty list of farmers is required'})
+        if len(entries) > max_farmers:
+            raise serializers.ValidationError(
+                {'farmers': f'At most {max_farmers} farmers can be registered per request (got {len(entries)})'}
+            )
+        if not field_officer.industry:
+            raise serializers.ValidationError(
+                f'Field officer "{field_officer.username}" must be assigned to an industry before creating farmers. '
+                'Please contact administrator to assign an industry to this field officer account.'
+            )
+        industry = get_user_industry(field_officer)
+
+        errors = {}
+        prepared = {}
+        for idx, entry in enumerate(entries):
+            try:
+                prepared[idx] = BulkFarmerRegistrationService._prepare_entry(
+                    entry, field_officer, industry, industry_slug
+                )
+            except serializers.ValidationError as e:
+                errors[idx] = e.detail
+
+        BulkFarmerRegistrationService._check_farmer_uniqueness(prepared, errors)
+        BulkFarmerRegistrationService._check_plot_duplicates(prepared, errors)
+        BulkFarmerRegistrationService._check_plot_overlaps(prepared, industry, errors)
+        lookups = BulkFarmerRegistrationService._resolve_lookups(prepared, industry, errors)
+        BulkFarmerRegistrationService._build_objects(prepared, field_officer, industry, lookups, errors)
+        if errors:
+            raise serializers.ValidationError({'errors': {str(idx): errors[idx] for idx in sorted(errors)}})
+
+        with transaction.atomic():
+            result = BulkFarmerRegistrationService._create_all(
+                [prepared[idx] for idx in sorted(prepared)], field_officer, industry, lookups
+            )
+            plot_ids = [plot.id for plot in result['plots']]
+            if plot_ids:
+                from .plot_sync import enqueue_plot_sync
+                transaction.on_commit(lambda: enqueue_plot_sync(plot_ids))
+
+        logger.info(
+            f"Bulk registration by {field_officer.email}: {len(result['farmers'])} farmers, "
+            f"{len(result['plots'])} plots, {len(result['farms'])} farms"
+        )
+        return result
+
+    @staticmethod
+    def _prepare_entry(entry, field_officer, industry, industry_slug=None):
+        """Validate one payload entry and build its unsaved objects (no writes)."""
+        if not isinstance(entry, dict):
+            raise serializers.ValidationError('Each entry must be an object')
+
+        farmer_data = dict(entry.get('farmer') or {})
+        if not farmer_data:
+            raise serializers.ValidationError("Farmer data is required")
+        for field in BulkFarmerRegistrationService.FARMER_REQUIRED_FIELDS:
+            if not farmer_data.get(field):
+                raise serializers.ValidationError(f"Farmer {field} is required")
+        farmer_data['phone_number'] = CompleteFarmerRegistrationService._clean_phone_number(
+            farmer_data.get('phone_number')
+        )
+        try:
+            from users.validators import normalize_optional_aadhaar
+            farmer_data['aadhaar_number'] = normalize_optional_aadhaar(farmer_data.get('aadhaar_number'))
+        except ValueError as e:
+            raise serializers.ValidationError({'aadhaar_number': str(e)})
+
+        entities = []
+        for entity_data in CompleteFarmerRegistrationService._collect_entities(entry, industry_slug):
+            if not entity_data.get('plot'):
+                continue
+            plot = CompleteFarmerRegistrationService._build_plot(
+                entity_data['plot'], None, field_officer, industry
+            )
+            farm_data = entity_data.get('farm') or {}
+            if farm_data:
+                if not farm_data.get('address'):
+                    raise serializers.ValidationError("Farm address is required")
+                if not farm_data.get('area_size'):
+                    raise serializers.ValidationError("Farm area_size is required")
+                crop_key = None
+                if not farm_data.get('crop_type_id') and (farm_data.get('crop_type_name') or farm_data.get('crop_type')):
+                    crop_key = CompleteFarmerRegistrationService._normalize_crop_choices(farm_data)
+                farm_data = dict(
+                    farm_data,
+                    _crop_key=crop_key,
+                    _plantation_date=CompleteFarmerRegistrationService._parse_plantation_date(
+                        farm_data.get('plantation_date')
+                    ),
+                )
+            entities.append({
+                'plot': plot,
+                'farm': farm_data,
+                'irrigation': entity_data.get('irrigation') or {},
+                'soil_report': entity_data.get('soil_report') or {},
+                'plantation': entity_data.get('plantation') or {},
+            })
+
+        return {'farmer': farmer_data, 'entities': entities}
+
+    @staticmethod
+    def _check_farmer_uniqueness(prepared, errors):
+        """Flag duplicates inside the batch, then against the database with one query per field."""
+        for field, label in (('username', 'Username'), ('email', 'Email'),
+                             ('phone_number', 'Phone number'), ('aadhaar_number', 'Aadhaar number')):
+            first_seen = {}
+            for idx, item in prepared.items():
+                value = item['farmer'].get(field)
+                if not value:
+                    continue
+                if value in first_seen:
+                    errors.setdefault(idx, {})
+                    if isinstance(errors[idx], dict):
+                        errors[idx][field] = f"{label} '{value}' is repeated in this batch (entry {first_seen[value]})"
+                else:
+                    first_seen[value] = idx
+
+            if not first_seen:
+                continue
+            existing = set(
+                User.objects.filter(**{f'{field}__in': list(first_seen)}).values_list(field, flat=True)
+            )
+            for value in existing:
+                idx = first_seen[value]
+                errors.setdefault(idx, {})
+                if isinstance(errors[idx], dict):
+                    errors[idx][field] = f"{label} '{value}' already exists"
+
+    @staticmethod
+    def _check_plot_duplicates(prepared, errors):
+        """
+        Reject plots whose (gat_number, plot_number, village, district) already
+        exists or repeats in the batch. Existing plots are fetched with one query
+        on the candidate gat numbers and villages and matched in Python.
+        """
+        def plot_key(plot):
+            return (plot.gat_number, plot.plot_number or '', plot.village, plot.district)
+
+        first_seen = {}
+        for idx, item in prepared.items():
+            for entity in item['entities']:
+                key = plot_key(entity['plot'])
+                if key in first_seen and first_seen[key] != idx:
+                    errors.setdefault(idx, {})
+                    if isinstance(errors[idx], dict):
+                        errors[idx]['plot'] = f"GAT {key[0]} / plot '{key[1]}' is repeated in this batch"
+                first_seen.setdefault(key, idx)
+
+        if not first_seen:
+            return
+        existing = Plot.objects.filter(
+            gat_number__in={key[0] for key in first_seen},
+            village__in={key[2] for key in first_seen},
+        ).values_list('gat_number', 'plot_number', 'village', 'district')
+        for row in existing:
+            key = (row[0], row[1] or '', row[2], row[3])
+            if key in first_seen:
+                idx = first_seen[key]
+                errors.setdefault(idx, {})
+                if isinstance(errors[idx], dict):
+                    errors[idx]['plot'] = "GAT number and plot number already exist for this village and district."
+
+    @staticmethod
+    def _check_plot_overlaps(prepared, industry, errors):
+        """
+        Reject boundaries that overlap an existing plot of the industry, or an
+        earlier boundary in the batch, by more than PLOT_OVERLAP_MAX_RATIO.
+        Each boundary is one index-driven ST_Intersects query.
+        """
+        from django.conf import settings
+
+        if not getattr(settings, 'PLOT_OVERLAP_CHECK', True):
+            return
+        max_ratio = getattr(settings, 'PLOT_OVERLAP_MAX_RATIO', 0.05)
+
+        def add_error(idx, message):
+            errors.setdefault(idx, {})
+            if isinstance(errors[idx], dict):
+                errors[idx].setdefault('boundary', []).append(message)
+
+        seen = []
+        for idx, item in prepared.items():
+            for entity in item['entities']:
+                boundary = entity['plot'].boundary
+                if not boundary:
+                    continue
+                try:
+                    PlotSpatialService.check_overlaps(boundary, industry)
+                except serializers.ValidationError as e:
+                    for message in e.detail['boundary']:
+                        add_error(idx, str(message))
+                for other_idx, other in seen:
+                    ratio = PlotSpatialService.overlap_ratio(boundary, other)
+                    if ratio > max_ratio:
+                        add_error(idx, f"Boundary overlaps a plot of entry {other_idx} in this batch by {ratio:.0%}")
+                seen.append((idx, boundary))
+
+    @staticmethod
+    def _add_errors(errors, idx, detail, key='non_field_errors'):
+        """Merge a validation error detail into the entry's errors (a dict keyed by field)."""
+        errors.setdefault(idx, {})
+        if not isinstance(errors[idx], dict):
+            return
+        if isinstance(detail, dict):
+            for field, messages in detail.items():
+                errors[idx].setdefault(field, [])
+                errors[idx][field] += messages if isinstance(messages, list) else [messages]
+        else:
+            errors[idx].setdefault(key, [])
+            errors[idx][key] += detail if isinstance(detail, list) else [detail]
+
+    @staticmethod
+    def _validate_unsaved(obj, idx, errors, exclude=()):
+        """
+        full_clean() without the per-row queries: relation fields (one existence
+        query each) and unique checks (done set-based above) are skipped.
+        Errors are added to the entry's errors; returns whether `obj` is valid.
+        """
+        from django.core.exceptions import ValidationError as DjangoValidationError
+
+        relation_fields = [f.name for f in obj._meta.concrete_fields if f.is_relation]
+        try:
+            obj.clean_fields(exclude=relation_fields + list(exclude))
+            obj.clean()
+        except DjangoValidationError as e:
+            detail = e.message_dict if hasattr(e, 'error_dict') else e.messages
+            BulkFarmerRegistrationService._add_errors(errors, idx, detail)
+            return False
+        return True
+
+    @staticmethod
+    def _resolve_lookups(prepared, industry, errors):
+        """
+        Resolve soil, irrigation and crop types for every farm in the batch from
+        the reference cache, without writing. Unknown ids are reported against
+        each entry using them; names not found yet resolve to unsaved instances
+        that _create_missing_lookups() inserts before the farms.
+        """
+        farms = [(idx, entity['farm']) for idx, item in prepared.items()
+                 for entity in item['entities'] if entity['farm']]
+        irrigations = [(idx, entity['irrigation']) for idx, item in prepared.items()
+                       for entity in item['entities'] if entity['farm'] and entity['irrigation']]
+        missing = []
+
+        def by_ids(model, rows, id_field, label, scope=reference_cache.ALL):
+            found = {}
+            for idx, data in rows:
+                pk = data.get(id_field)
+                if not pk or pk in found:
+                    continue
+                obj = reference_cache.get_by_id(model, pk, industry=scope)
+                if obj is None:
+                    BulkFarmerRegistrationService._add_errors(errors, idx, {id_field: f"{label} ID {pk} not found"})
+                    continue
+                found[pk] = obj
+            return found
+
+        def by_names(model, names, field='name'):
+            table = reference_cache.get_table(model)
+            found = {}
+            for name in names:
+                obj = table.find(**{field: name})
+                found[name] = obj if obj is not None else model(**{field: name, 'description': f"Auto-created: {name}"})
+            missing.extend(obj for obj in found.values() if obj.pk is None)
+            return found
+
+        soil_by_id = by_ids(SoilType, farms, 'soil_type_id', 'Soil type')
+        soil_by_name = by_names(
+            SoilType, sorted({f['soil_type_name'] for _, f in farms if not f.get('soil_type_id') and f.get('soil_type_name')})
+        )
+        irrigation_by_id = by_ids(IrrigationType, irrigations, 'irrigation_type_id', 'Irrigation type')
+        irrigation_by_name = by_names(
+            IrrigationType,
+            sorted({i['irrigation_type_name'] for _, i in irrigations
+                    if not i.get('irrigation_type_id') and i.get('irrigation_type_name')}),
+        )
+        crop_by_id = by_ids(CropType, farms, 'crop_type_id', 'Crop type')
+
+        crop_keys = {f['_crop_key'] for _, f in farms if f.get('_crop_key')}
+        crop_by_key = {}
+        if crop_keys:
+            table = reference_cache.get_table(CropType, industry)
+            for key in sorted(crop_keys):
+                crop = table.find(crop_type=key[0], plantation_type=key[1] or '', planting_method=key[2] or '')
+                if crop is not None:
+                    crop_by_key[key] = copy.copy(crop)
+                else:
+                    crop_by_key[key] = CropType(
+                        crop_type=key[0], plantation_type=key[1] or '', planting_method=key[2] or '', industry=industry
+                    )
+                    missing.append(crop_by_key[key])
+
+        return {
+            'soil': lambda f: soil_by_id.get(f.get('soil_type_id')) or soil_by_name.get(f.get('soil_type_name')),
+            'irrigation': lambda i: (irrigation_by_id.get(i.get('irrigation_type_id'))
+                                     or irrigation_by_name.get(i.get('irrigation_type_name'))),
+            'crop': lambda f: crop_by_id.get(f.get('crop_type_id')) or crop_by_key.get(f.get('_crop_key')),
+            'missing': missing,
+        }
+
+    @staticmethod
+    def _build_objects(prepared, field_officer, industry, lookups, errors):
+        """
+        Build and validate every entry's unsaved farmer, farm and irrigation
+        (model clean(), sugarcane yield rules) before anything is written, so
+        every invalid entry is reported. Objects are stored on the prepared
+        entries for _create_all().
+        """
+        from users.models import Role
+        from .models import FarmIrrigation
+
+        try:
+            farmer_role = Role.objects.get(name='farmer')
+        except Role.DoesNotExist:
+            raise serializers.ValidationError("Farmer role not found in system")
+
+        validate = BulkFarmerRegistrationService._validate_unsaved
+        for idx, item in prepared.items():
+            data = item['farmer']
+            farmer = User(
+                username=data['username'],
+                email=data['email'],
+                first_name=data['first_name'],
+                last_name=data['last_name'],
+                phone_number=data.get('phone_number'),
+                aadhaar_number=data.get('aadhaar_number'),
+                address=data.get('address', ''),
+                village=data.get('village', ''),
+                state=data.get('state', ''),
+                district=data.get('district', ''),
+                taluka=data.get('taluka', ''),
+                role=farmer_role,
+                created_by=field_officer,
+                industry=industry,
+            )
+            validate(farmer, idx, errors, exclude=['password'])
+            item['farmer_obj'] = farmer
+
+            for entity in item['entities']:
+                entity['plot'].farmer = farmer
+                entity['farm_obj'] = entity['irrigation_obj'] = None
+                farm_data = entity['farm']
+                if not farm_data:
+                    continue
+                crop_type = lookups['crop'](farm_data)
+                try:
+                    attributes = CompleteFarmerRegistrationService._farm_attributes(
+                        farm_data, crop_type, farm_data['_plantation_date']
+                    )
+                except serializers.ValidationError as e:
+                    BulkFarmerRegistrationService._add_errors(errors, idx, e.detail, key='farm')
+                    continue
+                farm = Farm(
+                    farm_owner=farmer,
+                    created_by=field_officer,
+                    plot=entity['plot'],
+                    soil_type=lookups['soil'](farm_data),
+                    crop_type=crop_type,
+                    industry=industry,
+                    **attributes,
+                )
+                if not validate(farm, idx, errors):
+                    continue
+                farm.plants_count = farm.compute_plants_count()
+                entity['farm_obj'] = farm
+
+                if entity['irrigation']:
+                    irrigation_type = lookups['irrigation'](entity['irrigation'])
+                    irrigation = FarmIrrigation(
+                        farm=farm,
+                        irrigation_type=irrigation_type,
+                        **CompleteFarmerRegistrationService._irrigation_attributes(
+                            entity['irrigation'], irrigation_type, farm, farm_data
+                        )
+                    )
+                    if validate(irrigation, idx, errors):
+                        entity['irrigation_obj'] = irrigation
+
+    @staticmethod
+    def _create_missing_lookups(lookups, industry):
+        """Insert the soil, irrigation and crop types the batch named but that do not exist yet."""
+        by_model = {}
+        for obj in lookups['missing']:
+            by_model.setdefault(type(obj), []).append(obj)
+        for model, objs in by_model.items():
+            model.objects.bulk_create(objs)
+            transaction.on_commit(lambda model=model: reference_cache.bump_version(model))
+            if model is CropType:
+                logger.info(f"Bulk-created {len(objs)} crop types for industry {industry}")
+
+    @staticmethod
+    def _create_all(items, field_officer, industry, lookups):
+        """Insert the batch built and validated by _build_objects() (no validation here)."""
+        from .models import FarmIrrigation, PlantationRecord
+
+        BulkFarmerRegistrationService._create_missing_lookups(lookups, industry)
+
+        # Farmers
+        farmers = [item['farmer_obj'] for item in items]
+        hashed = hash_passwords([item['farmer']['password'] for item in items])
+        for farmer, password in zip(farmers, hashed):
+            farmer.password = password
+        farmers = User.objects.bulk_create(farmers)
+        # bulk_create skips post_save; keep the officer's auto-assignment pointer current
+        from .auto_assignment_service import AutoAssignmentService
+        AutoAssignmentService.remember_farmer(farmers[-1])
+
+        # Plots
+        plots = Plot.objects.bulk_create([entity['plot'] for item in items for entity in item['entities']])
+
+        # Farms (CropType.plantation_date follows the last farm planted with it)
+        farms, crop_dates = [], {}
+        for item in items:
+            for entity in item['entities']:
+                farm = entity['farm_obj']
+                if farm is None:
+                    continue
+                if farm.crop_type and farm.plantation_date:
+                    crop_dates[farm.crop_type.pk] = (farm.crop_type, farm.plantation_date)
+                farms.append(farm)
+        farms = Farm.objects.bulk_create(farms)
+
+        changed_crops = []
+        for crop_type, plantation_date in crop_dates.values():
+            if crop_type.plantation_date != plantation_date:
+                crop_type.plantation_date = plantation_date
+                changed_crops.append(crop_type)
+        if changed_crops:
+            CropType.objects.bulk_update(changed_crops, ['plantation_date'])
+            transaction.on_commit(lambda: reference_cache.bump_version(CropType))
+
+        # Irrigation, soil reports and plantation records
+        irrigations, soil_reports, plantations = [], [], []
+        soil_fields = ['nitrogen', 'phosphorus', 'potassium', 'soil_ph', 'cec', 'organic_carbon',
+                       'bulk_density', 'fe', 'soil_organic_carbon']
+        for item in items:
+            for entity in item['entities']:
+                farm = entity['farm_obj']
+                if farm is None:
+                    continue
+                if entity['irrigation_obj'] is not None:
+                    irrigations.append(entity['irrigation_obj'])
+                if entity['soil_report']:
+                    soil_data = entity['soil_report'].get('soil_report', entity['soil_report'])
+                    soil_reports.append(SoilReport(farm=farm, **{f: soil_data.get(f) for f in soil_fields}))
+                if entity['plantation']:
+                    plantation_data = entity['plantation']
+                    record_fields = {
+                        'plantation_date': plantation_data.get('plantation_date'),
+                        'foundation_pruning_date': plantation_data.get('foundation_pruning_date'),
+                        'fruit_pruning_date': plantation_data.get('fruit_pruning_date'),
+                        'grafted_variety': plantation_data.get('grafted_variety'),
+                        'soil_type': plantation_data.get('soil_type'),
+                    }
+                    if farm.plant_age in ['0_1', '0_2', '0_3', '1_2']:
+                        record_fields.update(
+                            rootstock=plantation_data.get('rootstock'),
+                            grafting_date=plantation_data.get('grafting_date'),
+                        )
+                    else:
+                        record_fields.update(
+                            irrigation_type=plantation_data.get('irrigation_type'),
+                            last_harvesting_date=plantation_data.get('last_harvesting_date'),
+                            intercropping=plantation_data.get('intercropping'),
+                            intercropping_crop_name=plantation_data.get('intercropping_crop_name'),
+                        )
+                    plantations.append(PlantationRecord(farm=farm, **record_fields))
+
+        FarmIrrigation.objects.bulk_create(irrigations)
+        SoilReport.objects.bulk_create(soil_reports)
+        PlantationRecord.objects.bulk_create(plantations)
+
+        return {
+            'success': True,
+            'farmers': farmers,
+            'plots': plots,
+            'farms': farms,
+            'created_entities': [
+                [{'plot': entity['plot'], 'farm': entity['farm_obj']} for entity in item['entities']]
+                for item in items
+            ],
+            'counts': {
+                'farmers': len(farmers),
+                'plots': len(plots),
+                'farms': len(farms),
+                'irrigations': len(irrigations),
+                'soil_reports': len(soil_reports),
+                'plantations': len(plantations),
+            },
+            'message': 'Bulk farmer registration completed successfully',
+        }
@@ -0,0 +1,235 @@
+"""
+Plot geometry ingest: parse, validate, close, orient and optionally simplify
+boundaries once at write time, and derive area, perimeter, centroid and bbox
+from them.
+
+    from farms.geometry import geometry_from_geojson, prepare_plot_geometry
+    plot.boundary = geometry_from_geojson(payload['boundary'])
+    prepare_plot_geometry(plot)   # normalizes boundary, sets derived columns
+
+Plot.save() calls prepare_plot_geometry() when the boundary changed; bulk
+writers (bulk registration, CSV import) call it themselves since bulk_create
+skips save(). Reads use the stored columns and never recompute them.
+"""
+import json
+import logging
+import math
+
+from django.conf import settings
+from django.contrib.gis.geos import GEOSGeometry, LinearRing, Point, Polygon
+from django.core.exceptions import ValidationError
+
+logger = logging.getLogger(__name__)
+
+SRID = 4326
+# WGS84 equatorial radius, as used for spherical polygon area (Chamberlain & Duquette)
+EARTH_RADIUS_M = 6378137.0
+# Mean earth radius for great-circle (haversine) lengths
+MEAN_EARTH_RADIUS_M = 6371008.8
+ACRE_M2 = 4046.8564224
+
+
+def geometry_from_geojson(data):
+    """
+    Build a Point or Polygon (EPSG:4326) from a GeoJSON dict or string, or
+    WKT/HEXEWKB text. Polygon rings are closed here; the rest of the cleanup
+    is normalize_boundary().
+    """
+    if data is None:
+        return None
+    if isinstance(data, str):
+        try:
+            data = json.loads(data)
+        except json.JSONDecodeError:
+            geometry = GEOSGeometry(data)
+            if geometry.srid is None:
+                geometry.srid = SRID
+            return geometry
+    if not isinstance(data, dict):
+        raise ValueError(f"Invalid geometry data type: {type(data)}. Expected dict or str.")
+    if 'type' not in data:
+        raise ValueError("GeoJSON must have 'type' field")
+    if 'coordinates' not in data:
+        raise ValueError("GeoJSON must have 'coordinates' field")
+
+    geom_type = data['type'].lower()
+    coordinates = data['coordinates']
+    if geom_type == 'point':
+        if not isinstance(coordinates, list) or len(coordinates) < 2:
+            raise ValueError("Point coordinates must be [longitude, latitude] or [lng, lat, elevation]")
+        return Point(float(coordinates[0]), float(coordinates[1]), srid=SRID)
+    if geom_type == 'polygon':
+        if not isinstance(coordinates, list) or not coordinates:
+            raise ValueError("Polygon coordinates must be a list of rings")
+        rings = [_ring(ring) for ring in coordinates]
+        return Polygon(*rings, srid=SRID)
+
+    geometry = GEOSGeometry(json.dumps(data))
+    geometry.srid = geometry.srid or SRID
+    return geometry
+
+
+def _ring(coordinates):
+    """[[lng, lat(, z)], ...] -> closed 2D LinearRing without repeated vertices."""
+    if not isinstance(coordinates, list):
+        raise ValueError("Polygon ring must be a list of [lng, lat] positions")
+    points = []
+    for position in coordinates:
+        if not isinstance(position, (list, tuple)) or len(position) < 2:
+            raise ValueError("Polygon positions must be [longitude, latitude]")
+        point = (float(position[0]), float(position[1]))
+        if not points or points[-1] != point:
+            points.append(point)
+    if len(points) > 1 and points[0] == points[-1]:
+        points.pop()
+    if len(points) < 3:
+        raise ValueError("Polygon must have at least 3 points")
+    return LinearRing(points + [points[0]])
+
+
+def normalize_boundary(geometry, simplify_tolerance=None):
+    """
+    Validated, canonical plot boundary: 2D Polygon in EPSG:4326, repaired if
+    self-intersecting, exterior ring counter-clockwise and holes clockwise
+    (RFC 7946), optionally simplified (PLOT_BOUNDARY_SIMPLIFY_TOLERANCE, degrees).
+
+    Raises:
+        ValidationError: not a polygon, out of range, or empty after repair
+    """
+    if geometry is None:
+        return None
+    if geometry.srid is None:
+        geometry.srid = SRID
+    elif geometry.srid != SRID:
+        geometry = geometry.transform(SRID, clone=True)
+
+    if geometry.geom_type == 'MultiPolygon' and len(geometry) == 1:
+        geometry = geometry[0]
+    if geometry.geom_type != 'Polygon':
+        raise ValidationError(f"Boundary must be a Polygon, got {geometry.geom_type}")
+
+    if geometry.hasz:
+        geometry = Polygon(*[_ring(list(ring.coords)) for ring in geometry], srid=SRID)
+
+    min_lng, min_lat, max_lng, max_lat = geometry.extent
+    if min_lng < -180 or max_lng > 180 or min_lat < -90 or max_lat > 90:
+        raise ValidationError("Boundary coordinates must be [longitude, latitude] in degrees")
+
+    if not geometry.valid:
+        reason = geometry.valid_reason
+        geometry = _largest_polygon(geometry.make_valid())
+        if geometry is None:
+            raise ValidationError(f"Invalid polygon geometry: {reason}")
+        logger.info(f"Repaired invalid plot boundary ({reason})")
+
+    if simplify_tolerance is None:
+        simplify_tolerance = getattr(settings, 'PLOT_BOUNDARY_SIMPLIFY_TOLERANCE', 0)
+    if simplify_tolerance:
+        simplified = geometry.simplify(simplify_tolerance, preserve_topology=True)
+        if simplified.geom_type == 'Polygon' and not simplified.empty and simplified.valid:
+            geometry = simplified
+
+    geometry = _oriented(geometry)
+    geometry.srid = SRID
+    return geometry
+
+
+def _largest_polygon(geometry):
+    """The polygon of a repaired geometry (the largest one if it split), or None."""
+    if geometry.geom_type == 'Polygon':
+        return None if geometry.empty else geometry
+    polygons = []
+    for part in geometry:
+        if part.geom_type == 'Polygon':
+            polygons.append(part)
+        elif part.geom_type == 'MultiPolygon':
+            polygons.extend(part)
+    polygons = [polygon for polygon in polygons if not polygon.empty]
+    if not polygons:
+        return None
+    if len(polygons) > 1:
+        logger.warning(f"Repaired plot boundary split into {len(polygons)} polygons; keeping the largest")
+    return max(polygons, key=lambda polygon: polygon.area)
+
+
+def _oriented(polygon):
+    rings = []
+    for index, ring in enumerate(polygon):
+        coords = list(ring.coords)
+        # Exterior counter-clockwise, holes clockwise
+        if ring.is_counterclockwise != (index == 0):
+            coords.reverse()
+        rings.append(LinearRing(coords))
+    return Polygon(*rings, srid=SRID)
+
+
+def geodesic_area_m2(polygon):
+    """Area of a lng/lat polygon on the sphere, in square metres (holes subtracted)."""
+    if polygon is None or polygon.empty:
+        return 0.0
+    area = abs(_ring_area(polygon[0].coords))
+    for hole in list(polygon)[1:]:
+        area -= abs(_ring_area(hole.coords))
+    return max(area, 0.0)
+
+
+def _ring_area(coords):
+    points = [(c[0], c[1]) for c in coords]
+    total = 0.0
+    for (lng1, lat1), (lng2, lat2) in zip(points, points[1:]):
+        total += math.radians(lng2 - lng1) * (2 + math.sin(math.radians(lat1)) + math.sin(math.radians(lat2)))
+    return total * EARTH_RADIUS_M * EARTH_RADIUS_M / 2.0
+
+
+def geodesic_perimeter_m(polygon):
+    """Great-circle length of the exterior ring of a lng/lat polygon, in metres."""
+    if polygon is None or polygon.empty:
+        return 0.0
+    points = [(c[0], c[1]) for c in polygon[0].coords]
+    total = 0.0
+    for (lng1, lat1), (lng2, lat2) in zip(points, points[1:]):
+        phi1, phi2 = math.radians(lat1), math.radians(lat2)
+        d_phi, d_lambda = phi2 - phi1, math.radians(lng2 - lng1)
+        a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+        total += 2 * MEAN_EARTH_RADIUS_M * math.asin(math.sqrt(min(a, 1.0)))
+    return total
+
+
+def prepare_plot_geometry(plot, normalize=True):
+    """
+    Normalize plot.boundary in place and fill the derived columns
+    (boundary_area_m2, boundary_perimeter_m, centroid, bbox; location inside the
+    boundary when unset).
+    Idempotent; records the prepared boundary so Plot.save() can skip it.
+    Pass normalize=False when the boundary already went through normalize_boundary().
+    """
+    if plot.boundary is None:
+        plot.boundary_area_m2 = None
+        plot.boundary_perimeter_m = None
+        plot.centroid = None
+        plot.bbox = None
+    else:
+        if normalize:
+            plot.boundary = normalize_boundary(plot.boundary)
+        centroid = plot.boundary.centroid
+        plot.boundary_area_m2 = round(geodesic_area_m2(plot.boundary), 2)
+        plot.boundary_perimeter_m = round(geodesic_perimeter_m(plot.boundary), 2)
+        plot.centroid = Point(centroid.x, centroid.y, srid=SRID)
+        plot.bbox = list(plot.boundary.extent)
+        if plot.location is None:
+            # Unlike the centroid, point_on_surface is always inside concave plots
+            inside = plot.boundary.point_on_surface
+            plot.location = Point(inside.x, inside.y, srid=SRID)
+    plot._prepared_boundary = plot.boundary
+    return plot
+
+
+def needs_preparation(plot):
+    """
+    True when plot.boundary was assigned since it was loaded or last prepared
+    (Plot.from_db marks loaded boundaries as prepared), or when a stored
+    boundary still lacks its derived columns.
+    """
+    if plot.boundary is not None and plot.boundary_area_m2 is None:
+        return True
+    return plot.boundary is not getattr(plot, '_prepared_boundary', False)
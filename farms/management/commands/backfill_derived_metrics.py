@@ -0,0 +1,92 @@
+"""
+Management command to backfill the derived plot and farm columns.
+Run: python manage.py backfill_derived_metrics [--all] [--normalize] [--batch-size 500]
+
+Plots: boundary_area_m2, boundary_perimeter_m, centroid and bbox (farms.geometry),
+computed in id-ordered batches and written with bulk_update.
+Farms: plants_count, recomputed with one UPDATE per id window.
+
+Safe to re-run; by default only rows still missing their derived values are touched.
+"""
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import F, IntegerField, Q
+from django.db.models.functions import Cast, Floor
+
+from farms.geometry import prepare_plot_geometry
+from farms.models import Farm, Plot
+
+PLOT_FIELDS = ['boundary', 'location', 'boundary_area_m2', 'boundary_perimeter_m', 'centroid', 'bbox']
+
+
+class Command(BaseCommand):
+    help = "Backfill derived plot geometry metrics and farm plants_count"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help='Rows per batch (default: 500)')
+        parser.add_argument('--all', action='store_true', help='Recompute every row, not only missing values')
+        parser.add_argument(
+            '--normalize', action='store_true',
+            help='Also validate/repair/orient stored boundaries (rewrites boundary)',
+        )
+        parser.add_argument('--skip-plots', action='store_true')
+        parser.add_argument('--skip-farms', action='store_true')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        if not options['skip_plots']:
+            self._backfill_plots(batch_size, options['all'], options['normalize'])
+        if not options['skip_farms']:
+            self._backfill_farms(batch_size * 10, options['all'])
+
+    def _backfill_plots(self, batch_size, recompute_all, normalize):
+        queryset = Plot.objects.filter(boundary__isnull=False)
+        if not recompute_all:
+            queryset = queryset.filter(Q(boundary_area_m2__isnull=True) | Q(boundary_perimeter_m__isnull=True))
+        fields = PLOT_FIELDS if normalize else PLOT_FIELDS[1:]
+
+        updated = skipped = 0
+        last_id = 0
+        while True:
+            plots = list(queryset.filter(id__gt=last_id).order_by('id').only('id', *PLOT_FIELDS)[:batch_size])
+            if not plots:
+                break
+            last_id = plots[-1].id
+            ready = []
+            for plot in plots:
+                try:
+                    prepare_plot_geometry(plot, normalize=normalize)
+                except ValidationError as e:
+                    skipped += 1
+                    self.stdout.write(self.style.WARNING(f"Plot {plot.id}: {'; '.join(e.messages)}"))
+                    continue
+                ready.append(plot)
+            with transaction.atomic():
+                Plot.objects.bulk_update(ready, fields)
+            updated += len(ready)
+            self.stdout.write(f"Plots: {updated} updated (through id {last_id})")
+
+        self.stdout.write(self.style.SUCCESS(f"Plots done: {updated} updated, {skipped} skipped"))
+
+    def _backfill_farms(self, window, recompute_all):
+        # Same formula as Farm.compute_plants_count: acres * 43560 sq ft / (spacing A x B), truncated
+        computable = Q(spacing_a__gt=0, spacing_b__gt=0, area_size__gt=0)
+        plants = Cast(Floor(F('area_size') * 43560 / (F('spacing_a') * F('spacing_b'))), IntegerField())
+
+        bounds = Farm.objects.order_by('id').values_list('id', flat=True)
+        first, last = bounds.first(), bounds.last()
+        if first is None:
+            self.stdout.write(self.style.SUCCESS("Farms done: nothing to backfill"))
+            return
+
+        updated = cleared = 0
+        for start in range(first, last + 1, window):
+            in_window = Farm.objects.filter(id__gte=start, id__lt=start + window)
+            targets = in_window.filter(computable)
+            if not recompute_all:
+                targets = targets.filter(plants_count__isnull=True)
+            updated += targets.update(plants_count=plants)
+            cleared += in_window.exclude(computable).filter(plants_count__isnull=False).update(plants_count=None)
+
+        self.stdout.write(self.style.SUCCESS(f"Farms done: {updated} plants_count set, {cleared} cleared"))
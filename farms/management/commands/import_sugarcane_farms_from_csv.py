@@ -1,15 +1,132 @@
 import csv
+import json
+import os
+import re
 from datetime import datetime
-from decimal import Decimal
-from typing import Optional
+from decimal import Decimal, InvalidOperation
+from itertools import islice
 
 from django.contrib.auth import get_user_model
 from django.contrib.gis.geos import GEOSGeometry
+from django.core.exceptions import ValidationError
 from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError, transaction
 
+from farms import reference_cache
+from farms.geometry import geodesic_area_m2, normalize_boundary, prepare_plot_geometry
 from farms.models import Farm, Plot, CropType
 from users.models import Role
 
+ACRE_M2 = Decimal("4046.8564224")
+
+USER_UPDATE_FIELDS = [
+    "phone_number", "email", "first_name", "last_name", "address",
+    "village", "taluka", "state", "district", "industry", "role",
+]
+PLOT_UPDATE_FIELDS = [
+    "gat_number", "plot_number", "village", "taluka", "district", "state",
+    "pin_code", "industry", "farmer", "created_by", "boundary", "location",
+    "boundary_area_m2", "boundary_perimeter_m", "centroid", "bbox",
+]
+FARM_UPDATE_FIELDS = ["address", "area_size", "plantation_date", "plants_count"]
+
+
+def _normalize_key(key):
+    return (key or "").strip().lower().replace(" ", "_")
+
+
+def _parse_date_safe(value):
+    """
+    Try multiple formats for plantation_date. Returns a date or None.
+    CSV often has DD-MM-YYYY (e.g. 15-02-2025).
+    """
+    value = (value or "").strip()
+    if not value:
+        return None
+    # Date-only formats (use first 10 chars)
+    for fmt in ("%d-%m-%Y", "%d/%m/%Y", "%Y-%m-%d"):
+        try:
+            return datetime.strptime(value[:10], fmt).date()
+        except ValueError:
+            continue
+    # ISO with time (use first 19 chars)
+    for fmt in ("%Y-%m-%dT%H:%M:%S", "%Y-%m-%dT%H:%M:%S.%fZ"):
+        try:
+            return datetime.strptime(value[:19], fmt).date()
+        except ValueError:
+            continue
+    return None
+
+
+def boundary_area_acres(boundary):
+    """Geodesic area of a WGS84 polygon in acres, or None."""
+    try:
+        return (Decimal(str(geodesic_area_m2(boundary))) / ACRE_M2).quantize(Decimal("0.0001"))
+    except Exception:  # noqa: BLE001
+        return None
+
+
+def parse_row(item):
+    """
+    Normalize one CSV row and decode its geometry.
+
+    Pure function of (row_number, raw row) so it can run in a worker process
+    (--workers); GEOS geometries pickle back to the parent as EWKB.
+    """
+    row_number, row = item
+    norm = {_normalize_key(k): (v or "").strip() for k, v in row.items()}
+    warnings = []
+    label = (
+        f"row {row_number} (user {norm.get('username', '') or norm.get('phone_number', '')}, "
+        f"gat {norm.get('gat_number', '')}, plot {norm.get('plot_number', '')})"
+    )
+
+    # geometry: boundary hex -> Polygon
+    boundary = None
+    boundary_hex = norm.get("boundary", "") or norm.get("boundary_hex", "")
+    if boundary_hex:
+        try:
+            # GEOSGeometry accepts HEXEWKB strings directly (SRID 4326 for lat/long).
+            boundary = GEOSGeometry(boundary_hex, srid=4326)
+        except Exception as ge_exc:  # noqa: BLE001
+            warnings.append(f"Plot boundary decode failed for {label}: {ge_exc}")
+    if boundary is not None:
+        # Validate/repair/orient here so the work runs in the --workers processes
+        try:
+            boundary = normalize_boundary(boundary)
+        except ValidationError as ge_exc:
+            warnings.append(f"Plot boundary rejected for {label}: {'; '.join(ge_exc.messages)}")
+            boundary = None
+
+    # geometry: location hex -> Point (optional)
+    location = None
+    location_hex = norm.get("location", "")
+    if location_hex:
+        try:
+            location = GEOSGeometry(location_hex, srid=4326)
+        except Exception as ge_exc:  # noqa: BLE001
+            warnings.append(f"Plot location decode failed for {label}: {ge_exc}")
+
+    area_size = None
+    area_size_raw = norm.get("area_size", "")
+    if area_size_raw:
+        try:
+            area_size = Decimal(area_size_raw)
+        except (InvalidOperation, ValueError):
+            warnings.append(f"Invalid area_size '{area_size_raw}' for {label}; will attempt to compute from boundary.")
+    if area_size is None and boundary is not None:
+        area_size = boundary_area_acres(boundary)
+
+    return {
+        "row_number": row_number,
+        "norm": norm,
+        "boundary": boundary,
+        "location": location,
+        "area_size": area_size,
+        "plantation_date": _parse_date_safe(norm.get("plantation_date", "")),
+        "warnings": warnings,
+    }
+
 
 class Command(BaseCommand):
     """
@@ -36,6 +153,15 @@ class Command(BaseCommand):
 
     All 700 entries are assumed to be sugarcane; we will attach them
     to a `CropType` called "sugarcane" (creating it per-industry if needed).
+
+    Rows are imported in chunks (--chunk-size): users, plots and farms for a
+    chunk are looked up with one query each and written with bulk_create /
+    bulk_update in one transaction. Per-plot FastAPI sync is not triggered
+    during the import; all touched plots are queued for one batched sync at
+    the end (farms.plot_sync). After each committed chunk a checkpoint file
+    records progress, so re-running the same command resumes after the last
+    committed row (--restart ignores it). --workers N parses rows and decodes
+    geometry in N processes.
     """
 
     help = "Import sugarcane farms (farmer + plot + farm + boundary) from a CSV file."
@@ -67,14 +193,46 @@ class Command(BaseCommand):
             action="store_true",
             help="Create farmer users from CSV when they do not already exist.",
         )
+        parser.add_argument(
+            "--chunk-size",
+            dest="chunk_size",
+            type=int,
+            default=200,
+            help="Rows per chunk/transaction (default: 200).",
+        )
+        parser.add_argument(
+            "--workers",
+            dest="workers",
+            type=int,
+            default=1,
+            help="Processes for row parsing and geometry decoding (default: 1, in-process).",
+        )
+        parser.add_argument(
+            "--checkpoint",
+            dest="checkpoint",
+            default=None,
+            help="Checkpoint file (default: <file>.checkpoint.json).",
+        )
+        parser.add_argument(
+            "--restart",
+            dest="restart",
+            action="store_true",
+            help="Ignore an existing checkpoint and import from the first row.",
+        )
+        parser.add_argument(
+            "--no-sync",
+            dest="no_sync",
+            action="store_true",
+            help="Do not queue the FastAPI plot sync after the import.",
+        )
 
     def handle(self, *args, **options):
         file_path = options["file_path"]
         industry_id = options["industry_id"]
         dry_run: bool = options["dry_run"]
-        create_users: bool = options["create_users"]
-
-        User = get_user_model()
+        chunk_size = max(options["chunk_size"], 1)
+        workers = max(options["workers"], 1)
+        checkpoint_path = options["checkpoint"] or f"{file_path}.checkpoint.json"
 
         try:
             f = open(file_path, newline="", encoding="utf-8")
@@ -83,374 +241,495 @@ class Command(BaseCommand):
 
         self.stdout.write(self.style.NOTICE(f"Reading CSV: {file_path}"))
 
-        created_farms = 0
-        updated_farms = 0
-        created_plots = 0
-        updated_plots = 0
-        skipped_rows = 0
-
-        with f:
-            reader = csv.DictReader(f)
-            # Normalize headers once: "Username" -> "username", "Gat number" -> "gat_number", etc.
-            normalized_headers = {
-                (h or "").strip().lower().replace(" ", "_") for h in (reader.fieldnames or [])
-            }
-            # We need either username or phone_number, plus basic plot keys
-            required_cols = {"gat_number", "village", "district"}
-            missing = required_cols - normalized_headers
-            if missing:
-                raise CommandError(
-                    f"CSV is missing required columns (after normalization): "
-                    f"{', '.join(sorted(missing))}"
-                )
-
-            for row in reader:
-                # Normalize this row's keys similarly
-                norm = {
-                    (k or "").strip().lower().replace(" ", "_"): (v or "").strip()
-                    for k, v in row.items()
-                }
-                username_raw = norm.get("username", "")
-                phone_raw = norm.get("phone_number", "")
-
-                if not username_raw and not phone_raw:
-                    skipped_rows += 1
-                    continue
-
-                # Prefer matching by phone number if present
-                user = None
-                if phone_raw:
-                    user = User.objects.filter(phone_number=phone_raw).first()
-                if user is None and username_raw:
-                    user = User.objects.filter(username=username_raw).first()
-
-                created_user = False
-                if user is None:
-                    if not create_users:
-                        self.stdout.write(
-                            self.style.WARNING(
-                                f"Skipping row for username '{username_raw}' / "
-                                f"phone '{phone_raw}': user not found."
-                            )
-                        )
-                        skipped_rows += 1
-                        continue
-
-                    # Create a new Farmer user
-                    farmer_role = Role.objects.filter(name__iexact="farmer").first()
-                    username_for_new = phone_raw or username_raw.replace(" ", "_")
-                    if not username_for_new:
-                        self.stdout.write(
-                            self.style.WARNING(
-                                "Skipping row with no usable username/phone to create user."
-                            )
-                        )
-                        skipped_rows += 1
-                        continue
-
-                    user = User(username=username_for_new)
-                    created_user = True
-
-                # For both new and existing users, overwrite profile data from CSV
-                if phone_raw:
-                    user.phone_number = phone_raw
-                email_val = norm.get("email_address", "") or norm.get("email", "")
-                if email_val:
-                    user.email = email_val
-                first_name_val = norm.get("first_name", "")
-                if first_name_val:
-                    user.first_name = first_name_val
-                last_name_val = norm.get("last_name", "")
-                if last_name_val:
-                    user.last_name = last_name_val
-                addr_val = norm.get("address", "")
-                if addr_val:
-                    user.address = addr_val
-                vill_val = norm.get("village", "")
-                if vill_val:
-                    user.village = vill_val
-                taluka_val = norm.get("taluka", "")
-                if taluka_val:
-                    user.taluka = taluka_val
-                state_val = norm.get("state", "")
-                if state_val:
-                    user.state = state_val
-                district_val = norm.get("district", "")
-                if district_val:
-                    user.district = district_val
-                user.industry_id = industry_id
-
-                farmer_role = Role.objects.filter(name__iexact="farmer").first()
-                if farmer_role:
-                    user.role = farmer_role
-
-                # Only set/override password when we are creating the user
-                if created_user:
-                    password_raw = norm.get("password", "") or "farm@123"
-                    user.set_password(password_raw)
-
-                if dry_run:
-                    self.stdout.write(
-                        self.style.NOTICE(
-                            f"[DRY-RUN] Would {'create' if created_user else 'update'} "
-                            f"User '{user.username}' (phone={user.phone_number})."
-                        )
-                    )
-                else:
-                    user.save()
-                    if created_user:
-                        self.stdout.write(
-                            self.style.SUCCESS(
-                                f"Created farmer user '{user.username}' "
-                                f"(phone={user.phone_number})."
-                            )
-                        )
-                    else:
-                        self.stdout.write(
-                            self.style.SUCCESS(
-                                f"Updated farmer user '{user.username}' "
-                                f"(phone={user.phone_number})."
-                            )
-                        )
-
-                # Resolve / create (or fully replace) Plot
-                gat_number = norm.get("gat_number", "")
-                plot_number = norm.get("plot_number", "")
-                village = norm.get("village", "")
-                taluka = norm.get("taluka", "")
-                district = norm.get("district", "")
-                state = norm.get("state", "")
-                pin_code = norm.get("pin_code", "")
-
-                plot_id_raw = norm.get("plot_id", "")
-                plot: Optional[Plot] = None
-
-                if plot_id_raw:
-                    try:
-                        plot = Plot.objects.get(pk=int(plot_id_raw))
-                    except (ValueError, Plot.DoesNotExist):
-                        plot = None
+        fingerprint = {"file": os.path.abspath(file_path), "size": os.path.getsize(file_path)}
+        state = {
+            "rows_done": 0,
+            "plot_ids": [],
+            "counts": {
+                "created_users": 0, "updated_users": 0,
+                "created_plots": 0, "updated_plots": 0,
+                "created_farms": 0, "updated_farms": 0,
+                "skipped_rows": 0,
+            },
+        }
+        if not dry_run and not options["restart"]:
+            saved = self._load_checkpoint(checkpoint_path, fingerprint)
+            if saved:
+                state.update(rows_done=saved["rows_done"], plot_ids=saved["plot_ids"], counts=saved["counts"])
+                self.stdout.write(self.style.WARNING(
+                    f"Resuming from checkpoint {checkpoint_path}: {state['rows_done']} rows already imported."
+                ))
+
+        self.industry_id = industry_id
+        self.dry_run = dry_run
+        self.create_users = options["create_users"]
+        self.farmer_role = Role.objects.filter(name__iexact="farmer").first()
+        self.crop_types = {}
+        plot_ids = set(state["plot_ids"])
+
+        pool = None
+        if workers > 1:
+            from concurrent.futures import ProcessPoolExecutor
+            pool = ProcessPoolExecutor(max_workers=workers)
 
-                if plot is None:
-                    # match by unique-together key if possible
-                    try:
-                        plot = Plot.objects.get(
-                            gat_number=gat_number,
-                            plot_number=plot_number,
-                            village=village,
-                            taluka=taluka,
-                            district=district,
-                        )
-                        action = "replace"  # user requested to replace old plot with new data
-                    except Plot.DoesNotExist:
-                        plot = Plot()
-                        action = "create"
-                else:
-                    action = "replace"
-
-                # In both create and replace, overwrite plot fields from CSV
-                plot.gat_number = gat_number
-                plot.plot_number = plot_number
-                plot.village = village
-                plot.taluka = taluka
-                plot.district = district
-                if state:
-                    plot.state = state
-                if pin_code:
-                    plot.pin_code = pin_code
-                plot.industry_id = industry_id
-                plot.farmer = user
-                plot.created_by = user
-
-                # geometry: boundary hex -> Polygon
-                boundary_hex = norm.get("boundary", "") or norm.get("boundary_hex", "")
-                if boundary_hex:
-                    try:
-                        # GEOSGeometry accepts HEXEWKB strings directly (SRID 4326 for lat/long).
-                        plot.boundary = GEOSGeometry(boundary_hex, srid=4326)
-                    except Exception as ge_exc:  # noqa: BLE001
-                        self.stdout.write(
-                            self.style.WARNING(
-                                f"Plot boundary decode failed for user {username_raw}, "
-                                f"gat {gat_number}, plot {plot_number}: {ge_exc}"
-                            )
-                        )
-
-                # geometry: location hex -> Point (optional)
-                location_hex = norm.get("location", "")
-                if location_hex:
-                    try:
-                        plot.location = GEOSGeometry(location_hex, srid=4326)
-                    except Exception as ge_exc:  # noqa: BLE001
-                        self.stdout.write(
-                            self.style.WARNING(
-                                f"Plot location decode failed for user {username_raw}, "
-                                f"gat {gat_number}, plot {plot_number}: {ge_exc}"
-                            )
-                        )
-
-                if dry_run:
-                    self.stdout.write(
-                        self.style.NOTICE(
-                            f"[DRY-RUN] Would {action} Plot for user {user.username} "
-                            f"(gat={gat_number}, plot={plot_number}, village={village})"
-                        )
-                    )
-                else:
-                    plot.save()
-                    if action == "create":
-                        created_plots += 1
-                    else:
-                        updated_plots += 1
-
-                # Get or create a sugarcane CropType with this row's plantation_type and planting_method
-                plantation_type_val = norm.get("plantation_type", "") or ""
-                planting_method_val = norm.get("planting_method", "") or ""
-                crop_type = CropType.objects.filter(
-                    industry_id=industry_id,
-                    crop_type__iexact="sugarcane",
-                    plantation_type=plantation_type_val,
-                    planting_method=planting_method_val,
-                ).first()
-                if crop_type is None and not dry_run:
-                    crop_type = CropType.objects.create(
-                        industry_id=industry_id,
-                        crop_type="sugarcane",
-                        plantation_type=plantation_type_val,
-                        planting_method=planting_method_val,
-                    )
-                    self.stdout.write(
-                        self.style.SUCCESS(
-                            f"Created sugarcane CropType (plantation_type={plantation_type_val}, "
-                            f"planting_method={planting_method_val}) for industry {industry_id}."
-                        )
-                    )
-                elif crop_type is None and dry_run:
-                    # In dry-run we don't create CropType; use any sugarcane CropType for display
-                    crop_type = CropType.objects.filter(
-                        industry_id=industry_id, crop_type__iexact="sugarcane"
-                    ).first()
-
-                # Resolve / create Farm
-                farm_id_raw = norm.get("farm_id", "")
-                farm: Optional[Farm] = None
-                if farm_id_raw:
-                    try:
-                        farm = Farm.objects.get(pk=int(farm_id_raw))
-                    except (ValueError, Farm.DoesNotExist):
-                        farm = None
-
-                if farm is None:
-                    farm = Farm(
-                        farm_owner=user,
-                        created_by=user,
-                        plot=plot,
-                        industry_id=industry_id,
-                        soil_type_id=None,
-                        crop_type=crop_type,
-                        address=norm.get("address", "") or "",
+        try:
+            with f:
+                reader = csv.DictReader(f)
+                # Normalize headers once: "Username" -> "username", "Gat number" -> "gat_number", etc.
+                normalized_headers = {_normalize_key(h) for h in (reader.fieldnames or [])}
+                # We need either username or phone_number, plus basic plot keys
+                required_cols = {"gat_number", "village", "district"}
+                missing = required_cols - normalized_headers
+                if missing:
+                    raise CommandError(
+                        f"CSV is missing required columns (after normalization): "
+                        f"{', '.join(sorted(missing))}"
                     )
-                    farm_action = "create"
-                else:
-                    farm_action = "update"
-
-                # address (required by model)
-                if norm.get("address", ""):
-                    farm.address = norm.get("address", "")
-
-                # area_size (required by DB)
-                # 1. Prefer explicit CSV value if provided
-                area_size_raw = norm.get("area_size", "")
-                if area_size_raw:
-                    try:
-                        farm.area_size = Decimal(area_size_raw)
-                    except (ValueError, Exception):
-                        farm.area_size = None
-                        self.stdout.write(
-                            self.style.WARNING(
-                                f"Invalid area_size '{area_size_raw}' for user {user.username}; "
-                                f"will attempt to compute from boundary."
-                            )
-                        )
-                else:
-                    farm.area_size = None
-
-                # 2. If still missing, try to compute from plot boundary (in acres)
-                if farm.area_size is None and plot and plot.boundary:
-                    try:
-                        geom = plot.boundary.clone()
-                        # Transform from WGS84 (4326) to Web Mercator (3857) for area in m²
-                        if geom.srid != 3857:
-                            geom.transform(3857)
-                        area_m2 = Decimal(str(geom.area))
-                        farm.area_size = (area_m2 / Decimal("4046.8564224")).quantize(
-                            Decimal("0.0001")
-                        )
-                    except Exception:
-                        self.stdout.write(
-                            self.style.WARNING(
-                                f"Could not compute area_size from boundary for user {user.username}; "
-                                f"defaulting to 0."
-                            )
-                        )
-                        farm.area_size = Decimal("0")
-
-                # 3. Absolute fallback: never leave it null
-                if farm.area_size is None:
-                    farm.area_size = Decimal("0")
 
-                # plantation_date on Farm
-                plantation_date_str = norm.get("plantation_date", "")
-                if plantation_date_str:
-                    farm.plantation_date = self._parse_date_safe(
-                        plantation_date_str, username=user.username
-                    )
+                rows = enumerate(reader, start=1)
+                for _ in islice(rows, state["rows_done"]):
+                    pass
 
-                if dry_run:
-                    self.stdout.write(
-                        self.style.NOTICE(
-                            f"[DRY-RUN] Would {farm_action} Farm for user {user.username} "
-                            f"(plot_id={plot.id if plot else 'None'}, area_size={farm.area_size}, "
-                            f"plantation_date={farm.plantation_date}, "
-                            f"plantation_type={plantation_type_val or 'None'}, "
-                            f"planting_method={planting_method_val or 'None'})"
-                        )
-                    )
-                else:
-                    farm.save()
-                    if farm_action == "create":
-                        created_farms += 1
+                while True:
+                    chunk = list(islice(rows, chunk_size))
+                    if not chunk:
+                        break
+                    if pool is not None:
+                        parsed = list(pool.map(parse_row, chunk, chunksize=max(len(chunk) // (workers * 4), 1)))
                     else:
-                        updated_farms += 1
+                        parsed = [parse_row(item) for item in chunk]
 
+                    first, last = chunk[0][0], chunk[-1][0]
+                    try:
+                        if dry_run:
+                            chunk_counts, chunk_plot_ids = self._import_chunk(parsed)
+                        else:
+                            with transaction.atomic():
+                                chunk_counts, chunk_plot_ids = self._import_chunk(parsed)
+                    except (IntegrityError, ValidationError) as exc:
+                        raise CommandError(
+                            f"Rows {first}-{last} failed and were rolled back: {exc}. "
+                            f"Fix the CSV and re-run the same command to resume from row {first}."
+                        ) from exc
+
+                    for key, value in chunk_counts.items():
+                        state["counts"][key] += value
+                    plot_ids.update(chunk_plot_ids)
+                    state["rows_done"] = last
+                    if not dry_run:
+                        state["plot_ids"] = sorted(plot_ids)
+                        self._save_checkpoint(checkpoint_path, fingerprint, state)
+                    self.stdout.write(f"Rows {first}-{last} done ({state['rows_done']} total).")
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+        if not dry_run:
+            if plot_ids and not options["no_sync"]:
+                from farms.plot_sync import enqueue_plot_sync
+
+                ids = sorted(plot_ids)
+                for start in range(0, len(ids), 500):
+                    enqueue_plot_sync(ids[start:start + 500])
+                self.stdout.write(self.style.SUCCESS(f"Queued FastAPI sync for {len(ids)} plots."))
+            if os.path.exists(checkpoint_path):
+                os.remove(checkpoint_path)
+
+        counts = state["counts"]
         self.stdout.write(
             self.style.SUCCESS(
-                f"Done. Created {created_plots} plots, updated {updated_plots} plots; "
-                f"created {created_farms} farms, updated {updated_farms} farms; "
-                f"skipped {skipped_rows} rows."
+                f"Done. Created {counts['created_users']} users, updated {counts['updated_users']} users; "
+                f"created {counts['created_plots']} plots, updated {counts['updated_plots']} plots; "
+                f"created {counts['created_farms']} farms, updated {counts['updated_farms']} farms; "
+                f"skipped {counts['skipped_rows']} rows."
             )
         )
 
-    @staticmethod
-    def _parse_date_safe(value: str, *, username: str = ""):
-        """
-        Try multiple formats for plantation_date. Returns a date or None.
-        CSV often has DD-MM-YYYY (e.g. 15-02-2025).
-        """
-        value = (value or "").strip()
-        if not value:
-            return None
-        # Date-only formats (use first 10 chars)
-        for fmt in ("%d-%m-%Y", "%d/%m/%Y", "%Y-%m-%d"):
+    # ------------------------------------------------------------------
+    # Chunk import
+    # ------------------------------------------------------------------
+
+    def _import_chunk(self, parsed):
+        """Import one chunk of parsed rows. Returns (counts, touched plot ids)."""
+        counts = dict.fromkeys(
+            ["created_users", "updated_users", "created_plots", "updated_plots",
+             "created_farms", "updated_farms", "skipped_rows"], 0
+        )
+        for item in parsed:
+            for warning in item["warnings"]:
+                self.stdout.write(self.style.WARNING(warning))
+
+        rows = self._resolve_users(parsed, counts)
+        rows = self._resolve_plots(rows, counts)
+        self._resolve_farms(rows, counts)
+
+        plot_ids = [row["plot"].pk for row in rows if row["plot"].pk]
+        return counts, plot_ids
+
+    def _skip(self, counts, message):
+        self.stdout.write(self.style.WARNING(message))
+        counts["skipped_rows"] += 1
+
+    def _resolve_users(self, parsed, counts):
+        User = get_user_model()
+
+        phones, usernames = set(), set()
+        for item in parsed:
+            norm = item["norm"]
+            if norm.get("phone_number"):
+                phones.add(norm["phone_number"])
+                phones.add(self._clean_phone(norm["phone_number"]))
+            if norm.get("username"):
+                usernames.add(norm["username"])
+                usernames.add(norm["username"].replace(" ", "_"))
+
+        by_phone, by_username = {}, {}
+        if phones or usernames:
+            from django.db.models import Q
+
+            for user in User.objects.filter(Q(phone_number__in=phones) | Q(username__in=usernames)):
+                if user.phone_number:
+                    by_phone[user.phone_number] = user
+                by_username[user.username] = user
+
+        new_users, existing_users, rows = {}, {}, []
+        for item in parsed:
+            norm = item["norm"]
+            username_raw = norm.get("username", "")
+            phone_raw = norm.get("phone_number", "")
+
+            if not username_raw and not phone_raw:
+                counts["skipped_rows"] += 1
+                continue
+
+            # Prefer matching by phone number if present
+            user = None
+            if phone_raw:
+                user = by_phone.get(phone_raw) or by_phone.get(self._clean_phone(phone_raw))
+            if user is None and username_raw:
+                user = by_username.get(username_raw)
+
+            if user is None:
+                if not self.create_users:
+                    self._skip(
+                        counts,
+                        f"Skipping row for username '{username_raw}' / phone '{phone_raw}': user not found.",
+                    )
+                    continue
+                username_for_new = phone_raw or username_raw.replace(" ", "_")
+                user = User(username=username_for_new)
+                # Only set the password when we are creating the user
+                user._import_password = norm.get("password", "") or "farm@123"
+                new_users[id(user)] = user
+                by_username[user.username] = user
+            elif user.pk:
+                existing_users[user.pk] = user
+
+            # For both new and existing users, overwrite profile data from CSV
+            if phone_raw:
+                user.phone_number = phone_raw
+            email_val = norm.get("email_address", "") or norm.get("email", "")
+            if email_val:
+                user.email = email_val
+            for field in ("first_name", "last_name", "address", "village", "taluka", "state", "district"):
+                if norm.get(field, ""):
+                    setattr(user, field, norm[field])
+            user.industry_id = self.industry_id
+            if self.farmer_role:
+                user.role = self.farmer_role
+            if phone_raw:
+                by_phone[phone_raw] = user
+            rows.append(dict(item, user=user))
+
+        # User.save() runs full_clean(); run the field checks and clean() here,
+        # without the per-row FK and unique queries.
+        invalid = set()
+        relation_fields = [f.name for f in User._meta.concrete_fields if f.is_relation]
+        for user in list(new_users.values()) + list(existing_users.values()):
+            try:
+                user.clean_fields(exclude=relation_fields + ["password"])
+                user.clean()
+            except ValidationError as exc:
+                invalid.add(id(user))
+                self.stdout.write(self.style.WARNING(f"Invalid user '{user.username}': {exc}"))
+
+        valid_rows = []
+        for row in rows:
+            if id(row["user"]) in invalid:
+                counts["skipped_rows"] += 1
+            else:
+                valid_rows.append(row)
+        new_users = [u for key, u in new_users.items() if key not in invalid]
+        existing_users = [u for u in existing_users.values() if id(u) not in invalid]
+
+        if self.dry_run:
+            for user in new_users:
+                self.stdout.write(self.style.NOTICE(
+                    f"[DRY-RUN] Would create User '{user.username}' (phone={user.phone_number})."
+                ))
+            for user in existing_users:
+                self.stdout.write(self.style.NOTICE(
+                    f"[DRY-RUN] Would update User '{user.username}' (phone={user.phone_number})."
+                ))
+        else:
+            if new_users:
+                from farms.farmer_registration_service import hash_passwords
+
+                for user, hashed in zip(new_users, hash_passwords([u._import_password for u in new_users])):
+                    user.password = hashed
+                User.objects.bulk_create(new_users)
+            if existing_users:
+                User.objects.bulk_update(existing_users, USER_UPDATE_FIELDS)
+
+        counts["created_users"] += len(new_users)
+        counts["updated_users"] += len(existing_users)
+        return valid_rows
+
+    def _resolve_plots(self, rows, counts):
+        def natural_key(norm):
+            return (
+                norm.get("gat_number", ""), norm.get("plot_number", ""), norm.get("village", ""),
+                norm.get("taluka", ""), norm.get("district", ""),
+            )
+
+        plot_pks = set()
+        for row in rows:
             try:
-                return datetime.strptime(value[:10], fmt).date()
+                plot_pks.add(int(row["norm"].get("plot_id", "")))
             except ValueError:
-                continue
-        # ISO with time (use first 19 chars)
-        for fmt in ("%Y-%m-%dT%H:%M:%S", "%Y-%m-%dT%H:%M:%S.%fZ"):
+                pass
+        by_pk = Plot.objects.in_bulk(plot_pks) if plot_pks else {}
+
+        keys = {natural_key(row["norm"]) for row in rows}
+        by_key = {}
+        if keys:
+            for plot in Plot.objects.filter(
+                gat_number__in={key[0] for key in keys},
+                village__in={key[2] for key in keys},
+            ):
+                by_key[(plot.gat_number, plot.plot_number, plot.village, plot.taluka, plot.district)] = plot
+
+        new_plots, existing_plots = {}, {}
+        for row in rows:
+            norm, user = row["norm"], row["user"]
+            key = natural_key(norm)
+
+            plot = None
+            plot_id_raw = norm.get("plot_id", "")
+            if plot_id_raw:
+                try:
+                    plot = by_pk.get(int(plot_id_raw))
+                except ValueError:
+                    plot = None
+            if plot is None:
+                # match by unique-together key; the plot is replaced with the CSV data
+                plot = by_key.get(key)
+            if plot is None:
+                plot = Plot()
+                new_plots[id(plot)] = plot
+            elif plot.pk:
+                existing_plots[plot.pk] = plot
+            by_key[key] = plot
+
+            # In both create and replace, overwrite plot fields from CSV
+            plot.gat_number, plot.plot_number, plot.village, plot.taluka, plot.district = key
+            if norm.get("state", ""):
+                plot.state = norm["state"]
+            if norm.get("pin_code", ""):
+                plot.pin_code = norm["pin_code"]
+            plot.industry_id = self.industry_id
+            plot.farmer = user
+            plot.created_by = user
+            if row["boundary"] is not None:
+                plot.boundary = row["boundary"]
+            if row["location"] is not None:
+                plot.location = row["location"]
+            # bulk writes skip Plot.save(), so fill the derived geometry columns here
+            prepare_plot_geometry(plot, normalize=False)
+            row["plot"] = plot
+
+            if self.dry_run:
+                self.stdout.write(self.style.NOTICE(
+                    f"[DRY-RUN] Would {'create' if plot.pk is None else 'replace'} Plot for user {user.username} "
+                    f"(gat={plot.gat_number}, plot={plot.plot_number}, village={plot.village})"
+                ))
+
+        if not self.dry_run:
+            # bulk writes bypass Plot.save(), so no per-plot FastAPI sync happens here
+            if new_plots:
+                Plot.objects.bulk_create(list(new_plots.values()))
+            if existing_plots:
+                Plot.objects.bulk_update(list(existing_plots.values()), PLOT_UPDATE_FIELDS)
+
+        counts["created_plots"] += len(new_plots)
+        counts["updated_plots"] += len(existing_plots)
+        return rows
+
+    def _get_crop_types(self, rows):
+        """Sugarcane CropType per (plantation_type, planting_method), cached across chunks."""
+        wanted = {
+            (row["norm"].get("plantation_type", "") or "", row["norm"].get("planting_method", "") or "")
+            for row in rows
+        }
+        missing = wanted - set(self.crop_types)
+        if not missing:
+            return self.crop_types
+
+        for crop_type in CropType.objects.filter(
+            industry_id=self.industry_id,
+            crop_type__iexact="sugarcane",
+            plantation_type__in={key[0] for key in missing},
+            planting_method__in={key[1] for key in missing},
+        ).order_by("id"):
+            self.crop_types.setdefault((crop_type.plantation_type, crop_type.planting_method), crop_type)
+
+        missing = sorted(wanted - set(self.crop_types))
+        if missing and not self.dry_run:
+            created = CropType.objects.bulk_create([
+                CropType(
+                    industry_id=self.industry_id,
+                    crop_type="sugarcane",
+                    plantation_type=plantation_type,
+                    planting_method=planting_method,
+                )
+                for plantation_type, planting_method in missing
+            ])
+            transaction.on_commit(lambda: reference_cache.bump_version(CropType))
+            for crop_type in created:
+                self.crop_types[(crop_type.plantation_type, crop_type.planting_method)] = crop_type
+                self.stdout.write(self.style.SUCCESS(
+                    f"Created sugarcane CropType (plantation_type={crop_type.plantation_type}, "
+                    f"planting_method={crop_type.planting_method}) for industry {self.industry_id}."
+                ))
+        elif missing:
+            # In dry-run we don't create CropType; use any sugarcane CropType for display
+            fallback = CropType.objects.filter(industry_id=self.industry_id, crop_type__iexact="sugarcane").first()
+            for key in missing:
+                self.crop_types[key] = fallback
+        return self.crop_types
+
+    def _resolve_farms(self, rows, counts):
+        crop_types = self._get_crop_types(rows)
+
+        farm_pks = set()
+        for row in rows:
             try:
-                return datetime.strptime(value[:19], fmt).date()
+                farm_pks.add(int(row["norm"].get("farm_id", "")))
             except ValueError:
+                pass
+        by_pk = Farm.objects.in_bulk(farm_pks) if farm_pks else {}
+
+        new_farms, existing_farms = [], {}
+        relation_fields = [f.name for f in Farm._meta.concrete_fields if f.is_relation]
+        for row in rows:
+            norm, user, plot = row["norm"], row["user"], row["plot"]
+            crop_type = crop_types.get(
+                (norm.get("plantation_type", "") or "", norm.get("planting_method", "") or "")
+            )
+
+            farm = None
+            farm_id_raw = norm.get("farm_id", "")
+            if farm_id_raw:
+                try:
+                    farm = by_pk.get(int(farm_id_raw))
+                except ValueError:
+                    farm = None
+
+            if farm is None:
+                farm = Farm(
+                    farm_owner=user,
+                    created_by=user,
+                    plot=plot,
+                    industry_id=self.industry_id,
+                    soil_type_id=None,
+                    crop_type=crop_type,
+                    address=norm.get("address", "") or "",
+                )
+                farm_action = "create"
+            else:
+                farm_action = "update"
+
+            # address (required by model)
+            if norm.get("address", ""):
+                farm.address = norm["address"]
+
+            # area_size (required by DB): CSV value, else computed from the plot
+            # boundary (in acres), else 0
+            farm.area_size = row["area_size"]
+            if farm.area_size is None and plot.boundary:
+                farm.area_size = boundary_area_acres(plot.boundary)
+                if farm.area_size is None:
+                    self.stdout.write(self.style.WARNING(
+                        f"Could not compute area_size from boundary for user {user.username}; defaulting to 0."
+                    ))
+            if farm.area_size is None:
+                farm.area_size = Decimal("0")
+
+            # plantation_date on Farm
+            if row["plantation_date"]:
+                farm.plantation_date = row["plantation_date"]
+
+            if self.dry_run:
+                self.stdout.write(self.style.NOTICE(
+                    f"[DRY-RUN] Would {farm_action} Farm for user {user.username} "
+                    f"(plot_id={plot.id if plot else 'None'}, area_size={farm.area_size}, "
+                    f"plantation_date={farm.plantation_date}, "
+                    f"plantation_type={norm.get('plantation_type', '') or 'None'}, "
+                    f"planting_method={norm.get('planting_method', '') or 'None'})"
+                ))
                 continue
-        return None
 
+            # Farm.save() runs full_clean(); keep the checks without per-row queries
+            try:
+                farm.clean_fields(exclude=relation_fields)
+                farm.clean()
+            except ValidationError as exc:
+                self._skip(counts, f"Invalid farm for row {row['row_number']} (user {user.username}): {exc}")
+                continue
+
+            # bulk writes skip Farm.save(), which maintains plants_count
+            farm.plants_count = farm.compute_plants_count()
+            if farm.pk:
+                existing_farms[farm.pk] = farm
+            else:
+                new_farms.append(farm)
+
+        if not self.dry_run:
+            if new_farms:
+                Farm.objects.bulk_create(new_farms)
+            if existing_farms:
+                Farm.objects.bulk_update(list(existing_farms.values()), FARM_UPDATE_FIELDS)
+
+        counts["created_farms"] += len(new_farms)
+        counts["updated_farms"] += len(existing_farms)
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _clean_phone(phone):
+        cleaned = re.sub(r"\D", "", phone or "")
+        if cleaned.startswith("91") and len(cleaned) == 12:
+            cleaned = cleaned[2:]
+        return cleaned
+
+    @staticmethod
+    def _load_checkpoint(path, fingerprint):
+        if not os.path.exists(path):
+            return None
+        with open(path, encoding="utf-8") as fh:
+            saved = json.load(fh)
+        if saved.get("fingerprint") != fingerprint:
+            raise CommandError(
+                f"Checkpoint {path} was written for a different version of the CSV. "
+                f"Use --restart to import from the first row."
+            )
+        return saved
+
+    @staticmethod
+    def _save_checkpoint(path, fingerprint, state):
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as fh:
+            json.dump(dict(state, fingerprint=fingerprint), fh)
+        os.replace(tmp_path, path)
@@ -0,0 +1,24 @@
+# Generated by Django 5.0.1 on 2026-10-19 13:00
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Build indexes without locking writes on these tables
+    atomic = False
+
+    dependencies = [
+        ('farms', '0017_alter_plantationrecord_grafted_variety'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='plot',
+            index=models.Index(fields=['industry', 'farmer'], name='farms_plot_industry_farmer_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='farm',
+            index=models.Index(fields=['industry', 'farm_owner', 'created_at'], name='farms_farm_industry_owner_idx'),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.0.1 on 2026-10-19 14:00
+
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.operations import AddIndexConcurrently, TrigramExtension
+from django.db import migrations
+from django.db.models.functions import Upper
+
+
+class Migration(migrations.Migration):
+    # Build indexes without locking writes on these tables
+    atomic = False
+
+    dependencies = [
+        ('farms', '0018_plot_farm_industry_indexes'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        AddIndexConcurrently(
+            model_name='plot',
+            index=GinIndex(OpClass(Upper('gat_number'), name='gin_trgm_ops'), name='farms_plot_gat_trgm'),
+        ),
+        AddIndexConcurrently(
+            model_name='plot',
+            index=GinIndex(OpClass(Upper('plot_number'), name='gin_trgm_ops'), name='farms_plot_number_trgm'),
+        ),
+        AddIndexConcurrently(
+            model_name='plot',
+            index=GinIndex(OpClass(Upper('village'), name='gin_trgm_ops'), name='farms_plot_village_trgm'),
+        ),
+        AddIndexConcurrently(
+            model_name='plot',
+            index=GinIndex(OpClass(Upper('district'), name='gin_trgm_ops'), name='farms_plot_district_trgm'),
+        ),
+        AddIndexConcurrently(
+            model_name='farm',
+            index=GinIndex(OpClass(Upper('address'), name='gin_trgm_ops'), name='farms_farm_address_trgm'),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.0.1 on 2026-10-19 15:00
+
+import django.contrib.gis.db.models.fields
+import django.contrib.postgres.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('farms', '0019_plot_farm_search_trgm_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='plot',
+            name='boundary_area_m2',
+            field=models.FloatField(blank=True, editable=False, help_text='Geodesic boundary area in m²', null=True),
+        ),
+        migrations.AddField(
+            model_name='plot',
+            name='centroid',
+            field=django.contrib.gis.db.models.fields.PointField(blank=True, editable=False, null=True, spatial_index=False, srid=4326),
+        ),
+        migrations.AddField(
+            model_name='plot',
+            name='bbox',
+            field=django.contrib.postgres.fields.ArrayField(base_field=models.FloatField(), blank=True, editable=False, help_text='[min_lng, min_lat, max_lng, max_lat]', null=True, size=4),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.0.1 on 2026-10-19 16:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('farms', '0020_plot_derived_geometry'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='plot',
+            name='boundary_perimeter_m',
+            field=models.FloatField(blank=True, editable=False, help_text='Geodesic boundary perimeter in m', null=True),
+        ),
+        migrations.AddField(
+            model_name='farm',
+            name='plants_count',
+            field=models.IntegerField(blank=True, editable=False, null=True),
+        ),
+    ]
@@ -4,6 +4,9 @@ from django.core.exceptions import ValidationError
 from django.db import models
 from django.utils import timezone
 from django.contrib.gis.db import models as gis_models
+from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.db.models.functions import Upper
 
 
 class SoilType(models.Model):
@@ -237,6 +240,13 @@ class Plot(models.Model):
 
     location    = gis_models.PointField(geography=True, null=True, blank=True, db_index=True)
     boundary    = gis_models.PolygonField(geography=True, null=True, blank=True, db_index=True)
+
+    # Derived from boundary on write (farms.geometry.prepare_plot_geometry)
+    boundary_area_m2 = models.FloatField(null=True, blank=True, editable=False, help_text="Geodesic boundary area in m²")
+    boundary_perimeter_m = models.FloatField(null=True, blank=True, editable=False, help_text="Geodesic boundary perimeter in m")
+    centroid    = gis_models.PointField(srid=4326, null=True, blank=True, spatial_index=False, editable=False)
+    bbox        = ArrayField(models.FloatField(), size=4, null=True, blank=True, editable=False,
+                             help_text="[min_lng, min_lat, max_lng, max_lat]")
     
     created_at  = models.DateTimeField(auto_now_add=True)
     updated_at  = models.DateTimeField(auto_now=True)
@@ -245,22 +255,48 @@ class Plot(models.Model):
         unique_together = ('gat_number', 'plot_number', 'village', 'taluka', 'district')
         indexes = [
             models.Index(fields=['gat_number', 'plot_number']),
+            # filter_by_industry: plots of an industry's farmers
+            models.Index(fields=['industry', 'farmer'], name='farms_plot_industry_farmer_idx'),
+            # Trigram indexes for ?q= search (users.search_utils)
+            GinIndex(OpClass(Upper('gat_number'), name='gin_trgm_ops'), name='farms_plot_gat_trgm'),
+            GinIndex(OpClass(Upper('plot_number'), name='gin_trgm_ops'), name='farms_plot_number_trgm'),
+            GinIndex(OpClass(Upper('village'), name='gin_trgm_ops'), name='farms_plot_village_trgm'),
+            GinIndex(OpClass(Upper('district'), name='gin_trgm_ops'), name='farms_plot_district_trgm'),
         ]
 
     def __str__(self):
         return f"Gat {self.gat_number} / Plot {self.plot_number or 'N/A'} – {self.village or 'Unknown'}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Stored boundaries were normalized on write; only re-run the ingest when reassigned
+        if 'boundary' in field_names:
+            instance._prepared_boundary = instance.boundary
+        return instance
+
     def save(self, *args, **kwargs):
         """Override save to auto-assign farmer and sync with all FastAPI services"""
         is_new = self.pk is None
+
+        # Validate/normalize the boundary and refresh derived columns once per change
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'boundary' in update_fields:
+            from .geometry import needs_preparation, prepare_plot_geometry
+            if needs_preparation(self):
+                prepare_plot_geometry(self)
+                if update_fields is not None:
+                    kwargs['update_fields'] = set(update_fields) | {
+                        'boundary_area_m2', 'boundary_perimeter_m', 'centroid', 'bbox', 'location'
+                    }
         
         # Auto-assign farmer if this is a new plot and no farmer is assigned
-        if is_new and not self.farmer and self.created_by:
+        if is_new and not self.farmer_id and self.created_by_id:
             try:
                 from .auto_assignment_service import AutoAssignmentService
-                recent_farmer = AutoAssignmentService.get_most_recent_farmer_by_field_officer(self.created_by)
-                if recent_farmer:
-                    self.farmer = recent_farmer
+                recent_farmer_id = AutoAssignmentService.get_most_recent_farmer_id_by_field_officer(self.created_by)
+                if recent_farmer_id:
+                    self.farmer_id = recent_farmer_id
             except Exception as e:
                 import logging
                 logger = logging.getLogger(__name__)
@@ -524,12 +560,20 @@ class Farm(models.Model):
 
     # =====================================
 
+    # Derived from area_size and spacing on save (see compute_plants_count)
+    plants_count = models.IntegerField(null=True, blank=True, editable=False)
 
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # filter_by_industry: farms of an industry's farmers, newest first
+            models.Index(fields=['industry', 'farm_owner', 'created_at'], name='farms_farm_industry_owner_idx'),
+            # Trigram index for ?q= search (users.search_utils)
+            GinIndex(OpClass(Upper('address'), name='gin_trgm_ops'), name='farms_farm_address_trgm'),
+        ]
 
     def __str__(self):
         return f"{self.farm_owner.username} – {self.farm_uid}"
@@ -540,8 +584,8 @@ class Farm(models.Model):
             return f"{self.farm_owner.username}-{self.plot.gat_number}-{self.plot.plot_number}-{uid}"
         return f"{self.farm_owner.username}-{uid}"
 
-    @property
-    def plants_in_field(self):
+    def compute_plants_count(self):
+        """Plants from area (acres, 43560 sq ft each) and spacing A x B, or None."""
         if not self.spacing_a or not self.spacing_b or not self.area_size:
             return None
         try:
@@ -550,6 +594,12 @@ class Farm(models.Model):
             return int(plants)
         except (ValueError, ZeroDivisionError, TypeError):
             return None
+
+    @property
+    def plants_in_field(self):
+        if self.plants_count is not None:
+            return self.plants_count
+        return self.compute_plants_count()
     def clean(self):
         if self.crop_type and self.crop_type.crop_type.lower() == "grapes":
 
@@ -579,6 +629,10 @@ class Farm(models.Model):
 
     def save(self, *args, **kwargs):
         self.full_clean()
+        self.plants_count = self.compute_plants_count()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = set(update_fields) | {'plants_count'}
         super().save(*args, **kwargs)
     
 
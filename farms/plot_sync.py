@@ -0,0 +1,82 @@
+"""
+Batched plot sync to the FastAPI services (events.py, soil.py, Admin.py, ET.py,
+field.py).
+
+Bulk writers (bulk registration, CSV import) create plots with
+_skip_fastapi_sync and call enqueue_plot_sync() once with all new plot ids.
+A job worker then pushes the whole batch to each service through its
+sync_all_plots() endpoint: one request per service instead of five per plot.
+The services upsert by plot id, so a retried job simply re-sends the batch.
+"""
+import logging
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+SYNC_SERVICES = [
+    ('events.py', 'services', 'EventsSyncService'),
+    ('soil.py/main.py', 'soil_services', 'SoilSyncService'),
+    ('Admin.py', 'admin_services', 'AdminSyncService'),
+    ('ET.py', 'et_services', 'ETSyncService'),
+    ('field.py', 'field_services', 'FieldSyncService'),
+]
+
+
+def sync_plots_batch(plot_ids):
+    """
+    Background job (jobs.runner): push the given plots to every FastAPI service
+    in one request per service. Raises when any service fails so the job is
+    retried with backoff.
+
+    Returns:
+        dict: {'successful': [service names], 'failed': [service names]}
+    """
+    from importlib import import_module
+
+    from .models import Plot
+
+    plots = list(Plot.objects.filter(id__in=plot_ids).select_related('farmer'))
+    results = {'successful': [], 'failed': []}
+    if not plots:
+        return results
+
+    for service_name, module_name, class_name in SYNC_SERVICES:
+        try:
+            service_class = getattr(import_module(f'farms.{module_name}'), class_name)
+            if service_class().sync_all_plots(plots=plots):
+                results['successful'].append(service_name)
+            else:
+                results['failed'].append(service_name)
+        except Exception as e:
+            logger.error(f"Batch sync of {len(plots)} plots to {service_name} failed: {str(e)}")
+            results['failed'].append(service_name)
+
+    logger.info(
+        f"Batch plot sync: {len(plots)} plots, "
+        f"{len(results['successful'])} services ok, {len(results['failed'])} failed"
+    )
+    if results['failed']:
+        raise RuntimeError(f"Plot sync failed for: {', '.join(results['failed'])}")
+    return results
+
+
+def enqueue_plot_sync(plot_ids):
+    """
+    Queue one batched sync for the given plot ids on the 'sync' job queue.
+    With PLOT_SYNC_ASYNC off the batch is pushed inline (failures are logged).
+    """
+    plot_ids = [plot_id for plot_id in plot_ids if plot_id]
+    if not plot_ids:
+        return None
+
+    if not getattr(settings, 'PLOT_SYNC_ASYNC', True):
+        try:
+            return sync_plots_batch(plot_ids)
+        except RuntimeError as e:
+            logger.error(str(e))
+            return None
+
+    from jobs.runner import enqueue
+
+    return enqueue(sync_plots_batch, queue='sync', plot_ids=plot_ids)
@@ -0,0 +1,174 @@
+"""
+In-process cache of the small lookup tables: SoilType, IrrigationType, CropType,
+PlantationType and PlantingMethod.
+
+Each process keeps one snapshot per (model, industry). Snapshots are tagged with
+the model's version counter in the shared Django cache (Redis in production);
+writes bump the counter (post_save/post_delete signals, or bump_version() after
+bulk writes), so every worker reloads on its next lookup. Snapshots also expire
+after REFERENCE_CACHE_TTL seconds, which bounds staleness when no shared cache
+is configured.
+
+Lookups return copies, so callers may modify and save what they get back.
+
+    from farms import reference_cache
+    soil_type = reference_cache.get_by_id(SoilType, soil_type_id)
+    crop_type, created = reference_cache.get_or_create(
+        CropType, industry=industry, crop_type='Sugarcane', plantation_type='adsali', planting_method='3_bud'
+    )
+"""
+import copy
+import hashlib
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+ALL = '*'
+INDUSTRY_SCOPED = {'farms.CropType', 'farms.PlantationType', 'farms.PlantingMethod'}
+
+_tables = {}
+_lock = threading.Lock()
+
+
+class ReferenceTable:
+    """Snapshot of one lookup table scope, indexed by primary key."""
+
+    def __init__(self, rows, version):
+        self.rows = rows
+        self.by_id = {row.pk: row for row in rows}
+        self.version = version
+        self.loaded_at = time.monotonic()
+
+    def find(self, **lookup):
+        """First row (lowest id) matching all exact or __iexact lookups, or None."""
+        for row in self.rows:
+            if all(_matches(row, key, value) for key, value in lookup.items()):
+                return row
+        return None
+
+
+def _matches(row, key, value):
+    if key.endswith('__iexact'):
+        actual = getattr(row, key[:-len('__iexact')])
+        return (actual or '').lower() == (value or '').lower()
+    field = row._meta.get_field(key)
+    if field.is_relation:
+        return getattr(row, field.attname) == getattr(value, 'pk', value)
+    return getattr(row, key) == value
+
+
+def _label(model):
+    return model._meta.label
+
+
+def _version_key(label):
+    return f"refdata:{label}:version"
+
+
+def _scope(model, industry):
+    if _label(model) not in INDUSTRY_SCOPED or industry is ALL:
+        return ALL
+    return getattr(industry, 'pk', industry)
+
+
+def get_version(model):
+    """Shared version counter for a model, or None when the shared cache is unavailable."""
+    key = _version_key(_label(model))
+    try:
+        version = cache.get(key)
+        if version is None:
+            # Seed with a timestamp so a flushed cache never reuses an old number
+            cache.add(key, int(time.time() * 1000), None)
+            version = cache.get(key)
+        return version
+    except Exception as e:
+        logger.warning(f"Reference cache version lookup failed for {key}: {str(e)}")
+        return None
+
+
+def bump_version(*models):
+    """Invalidate every process's snapshots of these models."""
+    for model in models:
+        label = _label(model)
+        key = _version_key(label)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, int(time.time() * 1000), None)
+        except Exception as e:
+            logger.warning(f"Reference cache version bump failed for {key}: {str(e)}")
+        with _lock:
+            for table_key in [k for k in _tables if k[0] == label]:
+                del _tables[table_key]
+
+
+def get_table(model, industry=ALL):
+    """
+    Current snapshot of a lookup table. For industry-scoped models pass an
+    Industry (or id, or None for rows without industry) to load only that
+    industry's rows; ALL loads every row.
+    """
+    label = _label(model)
+    scope = _scope(model, industry)
+    version = get_version(model)
+    ttl = getattr(settings, 'REFERENCE_CACHE_TTL', 300)
+
+    table = _tables.get((label, scope))
+    if table is not None and table.version == version and time.monotonic() - table.loaded_at < ttl:
+        return table
+
+    queryset = model._default_manager.order_by('pk')
+    if scope is not ALL:
+        queryset = queryset.filter(industry_id=scope) if scope is not None else queryset.filter(industry__isnull=True)
+    table = ReferenceTable(list(queryset), version)
+    with _lock:
+        _tables[(label, scope)] = table
+    return table
+
+
+def get_by_id(model, pk, industry=ALL):
+    """Row by primary key (copy), or None."""
+    try:
+        pk = int(pk)
+    except (TypeError, ValueError):
+        return None
+    row = get_table(model, industry).by_id.get(pk)
+    return copy.copy(row) if row is not None else None
+
+
+def find(model, industry=ALL, **lookup):
+    """First row matching the lookups (copy), or None. Supports field__iexact."""
+    row = get_table(model, industry).find(**lookup)
+    return copy.copy(row) if row is not None else None
+
+
+def get_or_create(model, defaults=None, **lookup):
+    """
+    Cached equivalent of Model.objects.get_or_create(**lookup). An `industry`
+    lookup also selects the snapshot scope. Falls through to the database
+    when the row is not in the snapshot.
+    """
+    industry = lookup.get('industry', ALL) if _label(model) in INDUSTRY_SCOPED else ALL
+    row = get_table(model, industry).find(**lookup)
+    if row is not None:
+        return copy.copy(row), False
+    return model._default_manager.get_or_create(defaults=defaults or {}, **lookup)
+
+
+def list_etag(model, request):
+    """
+    ETag for a list response of a lookup table: changes whenever the table's
+    version changes, and differs per user and query string. None when the
+    shared cache is unavailable (no reliable version to validate against).
+    """
+    version = get_version(model)
+    if version is None:
+        return None
+    user = request.user
+    raw = f"{_label(model)}:{version}:{getattr(user, 'pk', '')}:{request.get_full_path()}:{request.accepted_media_type}"
+    return f'"{hashlib.md5(raw.encode()).hexdigest()}"'
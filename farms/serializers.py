@@ -22,6 +22,7 @@ from .models import (
     PlantationRecord
 
 )
+from . import reference_cache
 
 User = get_user_model()
 
@@ -98,6 +99,8 @@ class PlotSerializer(serializers.ModelSerializer):
         allow_null=True,
         help_text="Polygon geometry as GeoJSON: {\"type\": \"Polygon\", \"coordinates\": [[[lng, lat], [lng, lat], ...]]}"
     )
+    # Derived on write from the boundary (farms.geometry)
+    centroid = GeometryField(read_only=True)
     
     # Include farmer and created_by relationships
     farmer = UserSerializer(read_only=True)
@@ -124,13 +127,16 @@ class PlotSerializer(serializers.ModelSerializer):
             'pin_code',
             'location',
             'boundary',
+            'boundary_area_m2',
+            'centroid',
+            'bbox',
             'farmer',
             'farmer_id',
             'created_by',
             'created_at',
             'updated_at',
         ]
-        read_only_fields = ['farmer', 'created_by', 'created_at', 'updated_at']
+        read_only_fields = ['farmer', 'created_by', 'boundary_area_m2', 'centroid', 'bbox', 'created_at', 'updated_at']
     
     def validate_boundary(self, value):
         """Validate that boundary is a Polygon if provided"""
@@ -158,6 +164,27 @@ class PlotSerializer(serializers.ModelSerializer):
                     raise serializers.ValidationError(f"Invalid boundary geometry: {str(e)}")
         return value
 
+    def validate(self, attrs):
+        boundary = attrs.get('boundary')
+        if boundary is not None and hasattr(boundary, 'geom_type'):
+            from django.core.exceptions import ValidationError as DjangoValidationError
+            from users.multi_tenant_utils import get_user_industry
+            from .geometry import normalize_boundary
+            from .spatial_service import PlotSpatialService
+
+            try:
+                boundary = attrs['boundary'] = normalize_boundary(boundary)
+            except DjangoValidationError as e:
+                raise serializers.ValidationError({'boundary': e.messages})
+
+            request = self.context.get('request')
+            industry = self.instance.industry if self.instance else (
+                get_user_industry(request.user) if request else None
+            )
+            exclude_ids = [self.instance.pk] if self.instance else []
+            PlotSpatialService.check_overlaps(boundary, industry, exclude_ids)
+        return attrs
+
 
 class FarmImageSerializer(serializers.ModelSerializer):
     uploaded_by = UserSerializer(read_only=True)
@@ -399,13 +426,12 @@ class FarmWithIrrigationSerializer(serializers.ModelSerializer):
         crop_type_name = validated_data.pop('crop_type_name', None)
         if crop_type_name:
             # Case-insensitive match
-            crop_qs = CropType.objects.filter(crop_type__iexact=crop_type_name)
-            if not crop_qs.exists():
+            crop_type_obj = reference_cache.find(CropType, crop_type__iexact=crop_type_name)
+            if crop_type_obj is None:
                 raise serializers.ValidationError({
                     'crop_type_name': f"CropType with name '{crop_type_name}' does not exist. "
                                     f"Available options: sugarcane, grapse."
                 })
-            crop_type_obj = crop_qs.first()  # pick the first match
             validated_data['crop_type'] = crop_type_obj
 
 
@@ -418,7 +444,11 @@ class FarmWithIrrigationSerializer(serializers.ModelSerializer):
 
             # 4. Create Irrigation
             if irrigation_type_id:
-                irrig_type_obj = IrrigationType.objects.get(id=irrigation_type_id)
+                irrig_type_obj = reference_cache.get_by_id(IrrigationType, irrigation_type_id)
+                if irrig_type_obj is None:
+                    raise serializers.ValidationError({
+                        'irrigation_type_id': f"Irrigation type ID {irrigation_type_id} not found"
+                    })
                 irrig_loc = Point(location_lng, location_lat, srid=4326) if location_lat else None
                 
                 FarmIrrigation.objects.create(
@@ -1,7 +1,8 @@
-from django.db.models.signals import pre_delete, post_delete
+from django.db import transaction
+from django.db.models.signals import pre_delete, post_delete, post_save
 from django.dispatch import receiver
 from django.contrib.auth import get_user_model
-from .models import Plot, Farm, FarmIrrigation
+from .models import Plot, Farm, FarmIrrigation, SoilType, CropType, IrrigationType, PlantationType, PlantingMethod
 import logging
 
 logger = logging.getLogger(__name__)
@@ -129,3 +130,43 @@ def log_irrigation_deletion(sender, instance, **kwargs):
         pass
     
     logger.info(f"Irrigation system {instance.id} deleted (farm: {farm_info})")
+
+
+@receiver(post_save, sender=User)
+def remember_last_created_farmer(sender, instance, created, **kwargs):
+    """Point the creating field officer's auto-assignment at a newly created farmer."""
+    if not created or not instance.created_by_id:
+        return
+    if not instance.has_role('farmer'):
+        return
+    from .auto_assignment_service import AutoAssignmentService
+
+    AutoAssignmentService.remember_farmer(instance)
+
+
+@receiver(post_delete, sender=User)
+def forget_deleted_farmer(sender, instance, **kwargs):
+    """Stop auto-assigning plots to a farmer that no longer exists."""
+    from .auto_assignment_service import AutoAssignmentService
+
+    AutoAssignmentService.forget_farmer(instance)
+
+
+@receiver(post_save, sender=SoilType)
+@receiver(post_save, sender=CropType)
+@receiver(post_save, sender=IrrigationType)
+@receiver(post_save, sender=PlantationType)
+@receiver(post_save, sender=PlantingMethod)
+@receiver(post_delete, sender=SoilType)
+@receiver(post_delete, sender=CropType)
+@receiver(post_delete, sender=IrrigationType)
+@receiver(post_delete, sender=PlantationType)
+@receiver(post_delete, sender=PlantingMethod)
+def invalidate_reference_cache(sender, instance, **kwargs):
+    """
+    Bump the lookup table's version once the write commits so every worker
+    reloads its reference_cache snapshot (and list ETags change).
+    """
+    from .reference_cache import bump_version
+
+    transaction.on_commit(lambda: bump_version(sender))
@@ -1,5 +1,5 @@
 import json
-import requests
+from farm_management import http_client
 from django.conf import settings
 from typing import Dict, Any, Optional
 import logging
@@ -29,7 +29,7 @@ class SoilSyncService:
             plot_data = self._prepare_plot_data(plot_instance)
             
             # Send to soil.py API
-            response = requests.post(
+            response = http_client.post(
                 f"{self.soil_api_url}/sync/plot",
                 json=plot_data,
                 headers={'Content-Type': 'application/json'},
@@ -102,9 +102,12 @@ class SoilSyncService:
         else:
             return f"plot_{plot_instance.id}"
     
-    def sync_all_plots(self) -> bool:
+    def sync_all_plots(self, plots=None) -> bool:
         """
-        Sync all plots to soil.py service
+        Sync all plots (or only the given plots) to soil.py service in one request
+        
+        Args:
+            plots: Optional iterable of Plot instances; defaults to every plot
         
         Returns:
             bool: True if sync successful, False otherwise
@@ -112,7 +115,8 @@ class SoilSyncService:
         try:
             from .models import Plot
             
-            plots = Plot.objects.all()
+            if plots is None:
+                plots = Plot.objects.all()
             plot_list = []
             
             for plot in plots:
@@ -120,7 +124,7 @@ class SoilSyncService:
                 plot_list.append(plot_data)
             
             # Send to soil.py API
-            response = requests.post(
+            response = http_client.post(
                 f"{self.soil_api_url}/sync/plots",
                 json={"plots": plot_list},
                 headers={'Content-Type': 'application/json'},
@@ -149,7 +153,7 @@ class SoilSyncService:
             bool: True if deletion successful, False otherwise
         """
         try:
-            response = requests.delete(
+            response = http_client.delete(
                 f"{self.soil_api_url}/sync/plot/{plot_id}",
                 timeout=10
             )
@@ -176,7 +180,7 @@ class SoilSyncService:
             Dict with soil analysis data or None if failed
         """
         try:
-            response = requests.post(
+            response = http_client.post(
                 f"{self.soil_api_url}/analyze",
                 params={"plot_name": plot_name},
                 timeout=30
@@ -0,0 +1,175 @@
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.contrib.gis.geos import GEOSGeometry, Point, Polygon
+from django.contrib.gis.measure import D
+from django.db.models import FloatField, Q
+from django.db.models.expressions import RawSQL
+from rest_framework import serializers
+import logging
+
+from .geometry import normalize_boundary
+from .models import Plot
+
+logger = logging.getLogger(__name__)
+
+
+class PlotSpatialService:
+    """
+    Index-driven spatial queries over plots.
+
+    Plot.location and Plot.boundary are geography columns with GiST indexes:
+    - nearest(): ORDER BY location <-> point LIMIT k, answered by a KNN index scan
+    - within(): ST_Intersects on boundary (or location for plots without one)
+    - find_overlaps(): ST_Intersects candidates from the boundary index, then
+      the overlap share is measured on that short list only
+    """
+
+    MAX_NEAREST = 100
+
+    @staticmethod
+    def parse_point(lat, lng) -> Point:
+        try:
+            lat, lng = float(lat), float(lng)
+        except (TypeError, ValueError):
+            raise serializers.ValidationError("lat and lng must be numbers")
+        if not (-90 <= lat <= 90 and -180 <= lng <= 180):
+            raise serializers.ValidationError("lat/lng out of range")
+        return Point(lng, lat, srid=4326)
+
+    @staticmethod
+    def parse_bbox(bbox) -> Polygon:
+        """'min_lng,min_lat,max_lng,max_lat' -> Polygon"""
+        try:
+            min_lng, min_lat, max_lng, max_lat = (float(part) for part in bbox.split(','))
+        except (AttributeError, TypeError, ValueError):
+            raise serializers.ValidationError("bbox must be 'min_lng,min_lat,max_lng,max_lat'")
+        if min_lng >= max_lng or min_lat >= max_lat:
+            raise serializers.ValidationError("bbox min values must be below max values")
+        area = Polygon.from_bbox((min_lng, min_lat, max_lng, max_lat))
+        area.srid = 4326
+        return area
+
+    @staticmethod
+    def parse_polygon(geojson) -> GEOSGeometry:
+        """GeoJSON Polygon/MultiPolygon (dict or string) -> valid geometry in EPSG:4326"""
+        from .farmer_registration_service import CompleteFarmerRegistrationService
+
+        area = CompleteFarmerRegistrationService._convert_geojson_to_geometry(geojson)
+        if area is None or area.geom_type not in ('Polygon', 'MultiPolygon'):
+            raise serializers.ValidationError("polygon must be a GeoJSON Polygon or MultiPolygon")
+        if area.srid is None:
+            area.srid = 4326
+        if area.geom_type == 'Polygon':
+            try:
+                area = normalize_boundary(area, simplify_tolerance=0)
+            except DjangoValidationError as e:
+                raise serializers.ValidationError({'polygon': e.messages})
+        return area
+
+    @staticmethod
+    def nearest(queryset, point: Point, limit=10, radius_km=None):
+        """
+        The `limit` plots closest to `point`, annotated with distance_m.
+        Ordering uses the geography <-> operator so Postgres walks the
+        location GiST index instead of computing every distance and sorting.
+        """
+        limit = max(1, min(int(limit), PlotSpatialService.MAX_NEAREST))
+        queryset = queryset.filter(location__isnull=False)
+        if radius_km is not None:
+            queryset = queryset.filter(location__dwithin=(point, D(km=float(radius_km))))
+        distance = RawSQL(
+            f'"{Plot._meta.db_table}"."location" <-> %s::geography',
+            (point.ewkt,),
+            output_field=FloatField(),
+        )
+        return queryset.annotate(distance_m=distance).order_by('distance_m')[:limit]
+
+    @staticmethod
+    def within(queryset, area: GEOSGeometry):
+        """Plots whose boundary (or, lacking one, location) intersects `area`."""
+        return queryset.filter(
+            Q(boundary__intersects=area) | Q(boundary__isnull=True, location__intersects=area)
+        )
+
+    @staticmethod
+    def find_overlaps(boundary: GEOSGeometry, industry=None, exclude_ids=()):
+        """
+        Existing plots whose boundary overlaps `boundary`, largest overlap first.
+
+        Returns:
+            list of (plot, overlap_ratio) where overlap_ratio is the shared area
+            as a share of the smaller of the two boundaries (shared edges give 0
+            and are skipped)
+        """
+        if boundary is None or boundary.empty or not boundary.area:
+            return []
+        candidates = Plot.objects.filter(boundary__intersects=boundary).only(
+            'id', 'gat_number', 'plot_number', 'village', 'district', 'boundary', 'industry_id', 'farmer_id'
+        )
+        if industry is not None:
+            candidates = candidates.filter(industry=industry)
+        if exclude_ids:
+            candidates = candidates.exclude(id__in=exclude_ids)
+
+        overlaps = []
+        for plot in candidates:
+            ratio = PlotSpatialService.overlap_ratio(boundary, plot.boundary)
+            if ratio > 0:
+                overlaps.append((plot, ratio))
+        overlaps.sort(key=lambda pair: pair[1], reverse=True)
+        return overlaps
+
+    @staticmethod
+    def overlap_ratio(boundary: GEOSGeometry, other: GEOSGeometry) -> float:
+        """
+        Shared area as a share of either boundary, whichever is larger (planar,
+        fine at plot scale), so a small plot inside a large one, or a large one
+        drawn over a small one, is reported as a full overlap.
+        """
+        if other is None or not boundary.envelope.intersects(other.envelope):
+            return 0.0
+        try:
+            shared = boundary.intersection(other).area
+            return max(shared / boundary.area, shared / other.area if other.area else 0.0)
+        except Exception as e:
+            logger.warning(f"Could not measure boundary overlap: {str(e)}")
+            return 0.0
+
+    @staticmethod
+    def check_overlaps(boundary: GEOSGeometry, industry=None, exclude_ids=()):
+        """
+        Raise ValidationError when `boundary` overlaps an existing plot of the
+        industry by more than PLOT_OVERLAP_MAX_RATIO. No-op when
+        PLOT_OVERLAP_CHECK is off.
+        """
+        if not getattr(settings, 'PLOT_OVERLAP_CHECK', True):
+            return
+        max_ratio = getattr(settings, 'PLOT_OVERLAP_MAX_RATIO', 0.05)
+        conflicts = [
+            (plot, ratio)
+            for plot, ratio in PlotSpatialService.find_overlaps(boundary, industry, exclude_ids)
+            if ratio > max_ratio
+        ]
+        if conflicts:
+            raise serializers.ValidationError({
+                'boundary': [
+                    f"Boundary overlaps plot {plot.id} (GAT {plot.gat_number} / plot '{plot.plot_number}', "
+                    f"{plot.village}) by {ratio:.0%}"
+                    for plot, ratio in conflicts[:5]
+                ]
+            })
+
+    @staticmethod
+    def overlap_payload(overlaps):
+        return [
+            {
+                'id': plot.id,
+                'gat_number': plot.gat_number,
+                'plot_number': plot.plot_number,
+                'village': plot.village,
+                'district': plot.district,
+                'farmer_id': plot.farmer_id,
+                'overlap_ratio': round(ratio, 4),
+            }
+            for plot, ratio in overlaps
+        ]
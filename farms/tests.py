@@ -3,14 +3,14 @@ from django.contrib.auth import get_user_model
 from rest_framework.test import APIClient
 from rest_framework import status
 from .models import Farm, Plot, CropType, SoilType, Industry, Irrigation
-from .farmer_registration_service import CompleteFarmerRegistrationService
+from .farmer_registration_service import CompleteFarmerRegistrationService, BulkFarmerRegistrationService
 from users.models import Role
 
 User = get_user_model()
 
 
-class MultiplePlotsRegistrationTest(TestCase):
-    """Test that multiple plots can be registered without CropType duplicate errors"""
+class FieldOfficerTestBase(TestCase):
+    """An industry with a field officer and the farmer role (no tests of its own)"""
     
     def setUp(self):
         """Set up test data"""
@@ -41,7 +41,11 @@ class MultiplePlotsRegistrationTest(TestCase):
             name='farmer',
             defaults={'display_name': 'Farmer'}
         )
-    
+
+
+class MultiplePlotsRegistrationTest(FieldOfficerTestBase):
+    """Test that multiple plots can be registered without CropType duplicate errors"""
+
     def test_multiple_plots_same_crop_type_name(self):
         """Test registering multiple plots with same crop type name doesn't cause duplicate error"""
         
@@ -309,4 +313,271 @@ class MultiplePlotsRegistrationTest(TestCase):
             planting_method="3_bud",
             industry=self.industry
         )
-        self.assertEqual(crop_types.count(), 1)
\ No newline at end of file
+        self.assertEqual(crop_types.count(), 1)
+
+class BulkFarmerRegistrationTest(FieldOfficerTestBase):
+    """Bulk registration validates the whole batch before writing anything"""
+
+    def _entry(self, n, **farmer_overrides):
+        farmer = {
+            "username": f"bulk_farmer_{n}",
+            "email": f"bulk{n}@example.com",
+            "password": "farm@123",
+            "first_name": "Bulk",
+            "last_name": f"Farmer{n}",
+            "phone_number": f"90000000{n:02d}",
+        }
+        farmer.update(farmer_overrides)
+        return {
+            "farmer": farmer,
+            "plots": [{
+                "plot": {
+                    "gat_number": f"B{n}",
+                    "village": "Bulk Village",
+                    "district": "Bulk District",
+                    "state": "Maharashtra",
+                },
+                "farm": {"address": f"Bulk Farm {n}", "area_size": "1.5", "crop_type_name": "Wheat"},
+            }],
+        }
+
+    def test_bulk_registration_creates_all_entries(self):
+        result = BulkFarmerRegistrationService.register_farmers(
+            [self._entry(1), self._entry(2), self._entry(3)],
+            self.field_officer
+        )
+
+        self.assertEqual(result['counts']['farmers'], 3)
+        self.assertEqual(result['counts']['farms'], 3)
+        self.assertEqual(Plot.objects.filter(village="Bulk Village").count(), 3)
+        self.assertEqual(
+            CropType.objects.filter(crop_type="Wheat", industry=self.industry).count(), 1
+        )
+
+    def test_bulk_registration_reports_errors_per_entry(self):
+        from rest_framework.exceptions import ValidationError
+
+        entries = [
+            self._entry(1),
+            self._entry(2, username="bulk_farmer_1"),
+            self._entry(3, username="fieldofficer1"),
+        ]
+        with self.assertRaises(ValidationError) as ctx:
+            BulkFarmerRegistrationService.register_farmers(entries, self.field_officer)
+
+        errors = ctx.exception.detail['errors']
+        self.assertEqual(sorted(errors.keys()), ['1', '2'])
+        self.assertFalse(User.objects.filter(username__startswith="bulk_farmer_").exists())
+
+    def test_bulk_registration_reports_every_invalid_farm(self):
+        from rest_framework.exceptions import ValidationError
+
+        entries = [self._entry(1), self._entry(2), self._entry(3)]
+        entries[1]['plots'][0]['farm'].update(crop_type_name='Sugarcane', sugarcane_type='old')
+        entries[2]['plots'][0]['farm'].update(soil_type_id=999999)
+        with self.assertRaises(ValidationError) as ctx:
+            BulkFarmerRegistrationService.register_farmers(entries, self.field_officer)
+
+        errors = ctx.exception.detail['errors']
+        self.assertEqual(sorted(errors.keys()), ['1', '2'])
+        self.assertIn('soil_type_id', errors['2'])
+        self.assertFalse(User.objects.filter(username__startswith="bulk_farmer_").exists())
+        self.assertFalse(CropType.objects.filter(crop_type__iexact="Sugarcane").exists())
+
+
+class ReferenceCacheTest(TestCase):
+    """Lookup tables are served from the in-process cache until a write bumps the version"""
+
+    def test_lookup_is_cached_until_write(self):
+        from . import reference_cache
+
+        soil = SoilType.objects.create(name="Black")
+        self.assertEqual(reference_cache.get_by_id(SoilType, soil.id).name, "Black")
+
+        with self.assertNumQueries(0):
+            self.assertEqual(reference_cache.find(SoilType, name="Black").id, soil.id)
+
+        SoilType.objects.filter(id=soil.id).update(name="Red")
+        reference_cache.bump_version(SoilType)
+        self.assertEqual(reference_cache.get_by_id(SoilType, soil.id).name, "Red")
+
+    def test_lookup_returns_copies(self):
+        from . import reference_cache
+
+        soil = SoilType.objects.create(name="Loam")
+        reference_cache.get_by_id(SoilType, soil.id).name = "Changed"
+        self.assertEqual(reference_cache.get_by_id(SoilType, soil.id).name, "Loam")
+
+
+class AutoAssignmentTest(FieldOfficerTestBase):
+    """New plots are assigned to the field officer's own most recent farmer"""
+
+    def test_plot_assigned_to_officers_latest_farmer(self):
+        from django.core.cache import cache
+        from .auto_assignment_service import AutoAssignmentService
+
+        other_officer = User.objects.create_user(
+            username='fieldofficer2',
+            email='fieldofficer2@test.com',
+            password='testpass123',
+            role=self.field_officer_role,
+            industry=self.industry
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            own_farmer = User.objects.create_user(
+                username='own_farmer', email='own@test.com', password='farm@123',
+                role=self.farmer_role, created_by=self.field_officer, industry=self.industry
+            )
+        # post_save pointed the officer's auto-assignment at the new farmer
+        self.assertEqual(
+            cache.get(AutoAssignmentService._pointer_key(self.field_officer.id))[0], own_farmer.id
+        )
+        User.objects.create_user(
+            username='other_farmer', email='other@test.com', password='farm@123',
+            role=self.farmer_role, created_by=other_officer, industry=self.industry
+        )
+
+        plot = Plot(gat_number='AA1', village='V', district='D', state='S', created_by=self.field_officer)
+        plot._skip_fastapi_sync = True
+        plot.save()
+
+        self.assertEqual(plot.farmer_id, own_farmer.id)
+
+
+class PlotSpatialTest(FieldOfficerTestBase):
+    """Nearest, within-area and overlap queries over plot geometry"""
+
+    def _plot(self, gat, lng, lat, size=0.001):
+        from django.contrib.gis.geos import Point, Polygon
+
+        plot = Plot(
+            gat_number=gat, village='Geo Village', district='D', state='S', industry=self.industry,
+            location=Point(lng, lat, srid=4326),
+            boundary=Polygon.from_bbox((lng, lat, lng + size, lat + size)),
+        )
+        plot.boundary.srid = 4326
+        plot._skip_fastapi_sync = True
+        plot.save()
+        return plot
+
+    def test_nearest_orders_by_distance(self):
+        from .spatial_service import PlotSpatialService
+
+        far = self._plot('G1', 74.10, 18.10)
+        near = self._plot('G2', 74.001, 18.001)
+        point = PlotSpatialService.parse_point(18.0, 74.0)
+
+        plots = list(PlotSpatialService.nearest(Plot.objects.all(), point, limit=2))
+        self.assertEqual([p.id for p in plots], [near.id, far.id])
+        self.assertLess(plots[0].distance_m, plots[1].distance_m)
+
+    def test_within_bbox(self):
+        from .spatial_service import PlotSpatialService
+
+        inside = self._plot('G3', 74.0, 18.0)
+        self._plot('G4', 75.0, 19.0)
+
+        area = PlotSpatialService.parse_bbox('73.99,17.99,74.01,18.01')
+        self.assertEqual(list(PlotSpatialService.within(Plot.objects.all(), area)), [inside])
+
+    def test_overlapping_boundary_is_rejected(self):
+        from django.contrib.gis.geos import Polygon
+        from rest_framework.exceptions import ValidationError
+        from .spatial_service import PlotSpatialService
+
+        existing = self._plot('G5', 74.0, 18.0, size=0.002)
+        overlapping = Polygon.from_bbox((74.001, 18.0, 74.003, 18.002))
+        overlapping.srid = 4326
+        touching = Polygon.from_bbox((74.002, 18.0, 74.004, 18.002))
+        touching.srid = 4326
+
+        overlaps = PlotSpatialService.find_overlaps(overlapping, self.industry)
+        self.assertEqual([plot.id for plot, _ in overlaps], [existing.id])
+        self.assertAlmostEqual(overlaps[0][1], 0.5, places=3)
+        with self.assertRaises(ValidationError):
+            PlotSpatialService.check_overlaps(overlapping, self.industry)
+        PlotSpatialService.check_overlaps(touching, self.industry)
+
+    def test_small_boundary_inside_existing_plot_is_a_full_overlap(self):
+        from .spatial_service import PlotSpatialService
+
+        large = self._plot('G6', 74.0, 18.0, size=0.01)
+        small = self._plot('G7', 74.004, 18.004, size=0.001)
+
+        self.assertAlmostEqual(PlotSpatialService.overlap_ratio(large.boundary, small.boundary), 1.0, places=3)
+        self.assertAlmostEqual(PlotSpatialService.overlap_ratio(small.boundary, large.boundary), 1.0, places=3)
+
+    def test_overlaps_rejects_non_numeric_exclude_id(self):
+        boundary = {
+            'type': 'Polygon',
+            'coordinates': [[[74.0, 18.0], [74.001, 18.0], [74.001, 18.001], [74.0, 18.001], [74.0, 18.0]]],
+        }
+        client = APIClient()
+        client.force_authenticate(user=self.field_officer)
+        response = client.post('/api/plots/overlaps/', {'boundary': boundary, 'exclude_id': 'abc'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class PlotGeometryIngestTest(TestCase):
+    """Boundaries are normalized once on write and derived columns stored"""
+
+    def test_boundary_is_closed_oriented_and_measured(self):
+        from .geometry import geometry_from_geojson
+
+        # Clockwise, unclosed ring of a ~111 m x ~105 m square near 18°N
+        boundary = geometry_from_geojson({
+            'type': 'Polygon',
+            'coordinates': [[[74.0, 18.0], [74.0, 18.001], [74.001, 18.001], [74.001, 18.0]]],
+        })
+        plot = Plot(gat_number='GI1', village='V', district='D', state='S', boundary=boundary)
+        plot._skip_fastapi_sync = True
+        plot.save()
+
+        plot = Plot.objects.get(pk=plot.pk)
+        self.assertTrue(plot.boundary[0].is_counterclockwise)
+        self.assertEqual(plot.bbox, [74.0, 18.0, 74.001, 18.001])
+        self.assertAlmostEqual(plot.boundary_area_m2, 11700, delta=200)
+        self.assertAlmostEqual(plot.centroid.x, 74.0005, places=6)
+        self.assertIsNotNone(plot.location)
+
+    def test_self_intersecting_boundary_is_repaired(self):
+        from .geometry import geometry_from_geojson, normalize_boundary
+
+        bowtie = geometry_from_geojson({
+            'type': 'Polygon',
+            'coordinates': [[[74.0, 18.0], [74.002, 18.002], [74.002, 18.0], [74.0, 18.002]]],
+        })
+        self.assertFalse(bowtie.valid)
+        repaired = normalize_boundary(bowtie)
+        self.assertTrue(repaired.valid)
+        self.assertEqual(repaired.geom_type, 'Polygon')
+
+
+class DerivedMetricsTest(FieldOfficerTestBase):
+    """Perimeter and plants_count are stored on save and summed in SQL"""
+
+    def test_plants_count_and_perimeter_are_stored(self):
+        from django.contrib.gis.geos import Polygon
+        from users.serializers import FarmerDetailSerializer
+
+        farmer = User.objects.create_user(
+            username='metrics_farmer', email='metrics@test.com', password='farm@123',
+            role=self.farmer_role, industry=self.industry
+        )
+        boundary = Polygon.from_bbox((74.0, 18.0, 74.001, 18.001))
+        boundary.srid = 4326
+        plot = Plot(gat_number='DM1', village='V', district='D', state='S', boundary=boundary, farmer=farmer)
+        plot._skip_fastapi_sync = True
+        plot.save()
+        Farm.objects.create(
+            farm_owner=farmer, plot=plot, address='A', area_size='1.0', spacing_a='5', spacing_b='4'
+        )
+
+        plot.refresh_from_db()
+        self.assertAlmostEqual(plot.boundary_perimeter_m, 434, delta=5)
+        self.assertEqual(Farm.objects.get(plot=plot).plants_count, 2178)
+
+        summary = FarmerDetailSerializer(farmer).data['agricultural_summary']
+        self.assertEqual(summary['total_plants'], 2178)
+        self.assertEqual(summary['total_farms'], 1)
+        self.assertAlmostEqual(summary['mapped_area_acres'], 2.91, delta=0.05)
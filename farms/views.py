@@ -1,5 +1,5 @@
+from django.conf import settings
 from django.contrib.gis.geos import Point
-from django.db.models import Q
 from django.contrib.gis.db.models.functions import Distance
 from django.contrib.gis.measure import D
 from django.db import models
@@ -10,9 +10,11 @@ from rest_framework.response import Response
 from rest_framework.exceptions import ValidationError
 from django.db.models import Prefetch
 from users.multi_tenant_utils import filter_by_industry, get_user_industry
+from users.search_utils import get_search_query, ranked_search
 from rest_framework.viewsets import ModelViewSet
 from rest_framework import status
 from rest_framework.parsers import JSONParser, MultiPartParser, FormParser
+from rest_framework_gis.pagination import GeoJsonPagination
 from .models import (
     SoilType,
     CropType,
@@ -48,6 +50,7 @@ from .serializers import (
 
    
 )
+from .spatial_service import PlotSpatialService
 
 
 class IsOwnerOrAdminOrManager(permissions.BasePermission):
@@ -73,7 +76,28 @@ class IsOwnerOrAdminOrManager(permissions.BasePermission):
         return False
 
 
-class SoilTypeViewSet(viewsets.ModelViewSet):
+class ReferenceDataETagMixin:
+    """
+    Conditional GET for lookup-table list endpoints. The ETag is derived from
+    the table's version in the shared cache (see farms.reference_cache), so a
+    matching If-None-Match gets a 304 without touching the database.
+    """
+
+    def list(self, request, *args, **kwargs):
+        from .reference_cache import list_etag
+
+        etag = list_etag(self.queryset.model, request)
+        if etag and etag in [tag.strip() for tag in request.headers.get('If-None-Match', '').split(',')]:
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+
+        response = super().list(request, *args, **kwargs)
+        if etag:
+            response['ETag'] = etag
+            response['Cache-Control'] = 'private, no-cache'
+        return response
+
+
+class SoilTypeViewSet(ReferenceDataETagMixin, viewsets.ModelViewSet):
     queryset = SoilType.objects.all()
     serializer_class = SoilTypeSerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -84,8 +108,8 @@ class SoilTypeViewSet(viewsets.ModelViewSet):
         return [permissions.IsAuthenticated()]
 
 
-class PlantationTypeViewSet(viewsets.ModelViewSet):
-    queryset = PlantationType.objects.all()
+class PlantationTypeViewSet(ReferenceDataETagMixin, viewsets.ModelViewSet):
+    queryset = PlantationType.objects.select_related('industry')
     serializer_class = PlantationTypeSerializer
     permission_classes = [permissions.IsAuthenticated]
 
@@ -114,8 +138,8 @@ class PlantationTypeViewSet(viewsets.ModelViewSet):
         serializer.save(industry=user_industry)
 
 
-class PlantingMethodViewSet(viewsets.ModelViewSet):
-    queryset = PlantingMethod.objects.all()
+class PlantingMethodViewSet(ReferenceDataETagMixin, viewsets.ModelViewSet):
+    queryset = PlantingMethod.objects.select_related('industry')
     serializer_class = PlantingMethodSerializer
     permission_classes = [permissions.IsAuthenticated]
 
@@ -144,8 +168,8 @@ class PlantingMethodViewSet(viewsets.ModelViewSet):
         serializer.save(industry=user_industry)
 
 
-class CropTypeViewSet(viewsets.ModelViewSet):
-    queryset = CropType.objects.all()
+class CropTypeViewSet(ReferenceDataETagMixin, viewsets.ModelViewSet):
+    queryset = CropType.objects.select_related('industry')
     serializer_class = CropTypeSerializer
     permission_classes = [permissions.IsAuthenticated]
     filterset_fields = ['industry', 'plantation_type', 'planting_method']
@@ -223,11 +247,8 @@ class FarmViewSet(viewsets.ModelViewSet):
             except ValueError:
                 pass
 
-        # text search
-        if search := self.request.query_params.get('search'):
-            qs = qs.filter(
-                Q(address__icontains=search) | Q(farm_owner__username__icontains=search)
-            )
+        # text search (?q=, or legacy ?search=), best match first
+        qs = ranked_search(qs, get_search_query(self.request), self.search_fields)
 
         return qs
 
@@ -530,6 +551,83 @@ class FarmViewSet(viewsets.ModelViewSet):
                 'error': str(e)
             }, status=400)
 
+    @action(detail=False, methods=['post'], url_path='register-farmers/bulk')
+    def register_farmers_bulk(self, request):
+        """
+        Register many farmers in one request (JSON only).
+          POST /api/farms/register-farmers/bulk/
+          {"farmers": [{"farmer": {...}, "plots": [...]}, ...]}
+        Each entry uses the register-farmer payload format; the crop is taken from
+        the field officer's industry. All entries are validated first and errors
+        are returned per entry index; nothing is created unless every entry is valid.
+        Plots are pushed to the FastAPI services in one background batch.
+        """
+        user = request.user
+
+        if not user.has_role('fieldofficer'):
+            return Response(
+                {'error': 'Only field officers can register farmers'},
+                status=403
+            )
+
+        if not getattr(user, 'industry', None):
+            return Response(
+                {'error': 'Field officer must be assigned to an industry before registering farmers.'},
+                status=403
+            )
+
+        industry_slug = (user.industry.crop_type or '').lower().strip() or None
+
+        try:
+            from .farmer_registration_service import BulkFarmerRegistrationService
+
+            result = BulkFarmerRegistrationService.register_farmers(
+                request.data.get('farmers'),
+                user,
+                industry_slug=industry_slug
+            )
+
+            ids = []
+            for farmer, entities in zip(result['farmers'], result['created_entities']):
+                ids.append({
+                    'farmer_id': farmer.id,
+                    'username': farmer.username,
+                    'plots': [
+                        {
+                            'plot_id': entity['plot'].id if entity.get('plot') else None,
+                            'farm_id': entity['farm'].id if entity.get('farm') else None,
+                        }
+                        for entity in entities
+                    ],
+                })
+
+            return Response({
+                'success': True,
+                'message': result['message'],
+                'industry': industry_slug,
+                'counts': result['counts'],
+                'ids': ids
+            }, status=201)
+
+        except ValidationError as e:
+            error_detail = e.detail if hasattr(e, 'detail') else str(e)
+            if isinstance(error_detail, dict) and 'errors' in error_detail:
+                return Response({
+                    'success': False,
+                    'error': f"{len(error_detail['errors'])} farmer entries failed validation",
+                    'errors': error_detail['errors'],
+                }, status=400)
+            return Response({
+                'success': False,
+                'error': 'Validation failed',
+                'details': error_detail,
+            }, status=400)
+        except Exception as e:
+            return Response({
+                'success': False,
+                'error': str(e)
+            }, status=400)
+
     @action(detail=False, methods=['post'], url_path='quick-farmer-registration')
     def quick_farmer_registration(self, request):
         """
@@ -1061,6 +1159,12 @@ class FarmViewSet(viewsets.ModelViewSet):
             }, status=400)
 
 
+class PlotGeoPagination(GeoJsonPagination):
+    """Pages of plot features for map viewports (?page=, ?page_size= up to 500)."""
+    page_size = 100
+    max_page_size = 500
+
+
 class PlotViewSet(viewsets.ModelViewSet):
     queryset = Plot.objects.all()
     serializer_class = PlotSerializer
@@ -1090,6 +1194,9 @@ class PlotViewSet(viewsets.ModelViewSet):
         if self.request.query_params.get('has_boundary') == 'true':
             qs = qs.filter(boundary__isnull=False)
 
+        # text search (?q=, or legacy ?search=), best match first
+        qs = ranked_search(qs, get_search_query(self.request), self.search_fields)
+
         return qs
 
     def perform_create(self, serializer):
@@ -1111,7 +1218,69 @@ class PlotViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer_class()(queryset, many=True)
         return Response(serializer.data)
 
-    
+    @action(detail=False, methods=['get'])
+    def nearest(self, request):
+        """
+        GET /api/plots/nearest/?lat=..&lng=..&limit=10&radius_km=5
+        The closest plots to a point (KNN on the location index), nearest first.
+        """
+        point = PlotSpatialService.parse_point(request.query_params.get('lat'), request.query_params.get('lng'))
+        try:
+            limit = int(request.query_params.get('limit', 10))
+            radius_km = request.query_params.get('radius_km')
+            radius_km = float(radius_km) if radius_km else None
+        except ValueError:
+            raise ValidationError("limit and radius_km must be numbers")
+
+        plots = PlotSpatialService.nearest(
+            self.get_queryset().select_related('farmer', 'created_by'), point, limit, radius_km
+        )
+        results = []
+        for plot in plots:
+            data = PlotSerializer(plot, context={'request': request}).data
+            data['distance_m'] = round(plot.distance_m, 1)
+            results.append(data)
+        return Response({'count': len(results), 'results': results})
+
+    @action(detail=False, methods=['get', 'post'])
+    def within(self, request):
+        """
+        Plots intersecting an area, as a paginated GeoJSON FeatureCollection.
+        GET  /api/plots/within/?bbox=min_lng,min_lat,max_lng,max_lat [&page=2&page_size=200]
+        POST /api/plots/within/ {"polygon": <GeoJSON Polygon>}
+        """
+        if request.method == 'POST':
+            area = PlotSpatialService.parse_polygon(request.data.get('polygon'))
+        else:
+            area = PlotSpatialService.parse_bbox(request.query_params.get('bbox'))
+        queryset = PlotSpatialService.within(self.get_queryset(), area).order_by('id')
+        paginator = PlotGeoPagination()
+        page = paginator.paginate_queryset(queryset, request, view=self)
+        return paginator.get_paginated_response(PlotGeoSerializer(page, many=True).data)
+
+    @action(detail=False, methods=['post'])
+    def overlaps(self, request):
+        """
+        POST /api/plots/overlaps/ {"boundary": <GeoJSON Polygon>, "exclude_id": 12}
+        Pre-registration check: plots of the user's industry overlapping the boundary.
+        """
+        boundary = PlotSpatialService.parse_polygon(request.data.get('boundary'))
+        exclude_id = request.data.get('exclude_id')
+        if exclude_id not in (None, ''):
+            try:
+                exclude_id = int(exclude_id)
+            except (TypeError, ValueError):
+                raise ValidationError({'exclude_id': 'Must be a plot id.'})
+        overlaps = PlotSpatialService.find_overlaps(
+            boundary,
+            industry=get_user_industry(request.user),
+            exclude_ids=[exclude_id] if exclude_id else (),
+        )
+        return Response({
+            'overlaps': PlotSpatialService.overlap_payload(overlaps),
+            'max_allowed_ratio': getattr(settings, 'PLOT_OVERLAP_MAX_RATIO', 0.05),
+        })
+
 
     @action(detail=False, methods=['get'], permission_classes=[permissions.AllowAny])
     def public(self, request):
@@ -0,0 +1,33 @@
+"""
+Management command to recompute InventoryItem.status (in_stock, low_stock, out_of_stock, expired).
+Run: python manage.py refresh_inventory_status [--industry-id 1] [--schedule]
+
+Statuses are otherwise only set when an item is saved or moved, so items that
+pass their expiry_date stay "in_stock" until edited. This runs a few set-based
+UPDATE ... CASE statements that change only stale rows. --schedule instead
+queues the recurring background job (every INVENTORY_STATUS_REFRESH_INTERVAL
+seconds, picked up by run_workers); it is safe to run on every deploy.
+"""
+from django.core.management.base import BaseCommand
+
+from inventory.services import InventoryStatusService, refresh_inventory_status_job
+
+
+class Command(BaseCommand):
+    help = "Recompute inventory item statuses in bulk, or schedule the recurring refresh job"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--industry-id', type=int, help='Only refresh this industry')
+        parser.add_argument('--window', type=int, default=InventoryStatusService.WINDOW, help='Item ids per UPDATE')
+        parser.add_argument('--schedule', action='store_true', help='Queue the recurring job instead of running now')
+
+    def handle(self, *args, **options):
+        if options['schedule']:
+            from jobs.runner import enqueue_once
+
+            job = enqueue_once(refresh_inventory_status_job, queue='maintenance')
+            self.stdout.write(self.style.SUCCESS(f"Inventory status refresh scheduled (job {job.pk}, due {job.run_at})"))
+            return
+
+        changed = InventoryStatusService.refresh_statuses(options.get('industry_id'), options['window'])
+        self.stdout.write(self.style.SUCCESS(f"Inventory status refreshed: {changed} items changed"))
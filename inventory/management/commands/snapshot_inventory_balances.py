@@ -0,0 +1,32 @@
+"""
+Management command to snapshot every inventory item's current quantity.
+Run: python manage.py snapshot_inventory_balances [--industry-id 1] [--schedule]
+
+Snapshots are the starting points of "as of" balance queries
+(/api/inventory/as-of/, /api/inventory/movement-report/), which then replay
+only the transactions after the nearest one. --schedule instead queues the
+recurring background job (every INVENTORY_SNAPSHOT_INTERVAL seconds, picked up
+by run_workers); it is safe to run on every deploy.
+"""
+from django.core.management.base import BaseCommand
+
+from inventory.services import InventoryBalanceService, snapshot_inventory_balances_job
+
+
+class Command(BaseCommand):
+    help = "Snapshot inventory balances now, or schedule the recurring snapshot job"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--industry-id', type=int, help='Only snapshot this industry')
+        parser.add_argument('--schedule', action='store_true', help='Queue the recurring job instead of running now')
+
+    def handle(self, *args, **options):
+        if options['schedule']:
+            from jobs.runner import enqueue_once
+
+            job = enqueue_once(snapshot_inventory_balances_job, queue='maintenance')
+            self.stdout.write(self.style.SUCCESS(f"Inventory snapshots scheduled (job {job.pk}, due {job.run_at})"))
+            return
+
+        written = InventoryBalanceService.take_snapshots(options.get('industry_id'))
+        self.stdout.write(self.style.SUCCESS(f"Inventory balances snapshotted: {written} items"))
@@ -0,0 +1,32 @@
+# Generated by Django 5.0.1 on 2026-10-19 15:00
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Build indexes without locking writes on inventory items
+    atomic = False
+
+    dependencies = [
+        ('inventory', '0002_initial'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='inventoryitem',
+            index=models.Index(
+                condition=models.Q(('status__in', ['low_stock', 'out_of_stock', 'expired'])),
+                fields=['industry', 'status'],
+                name='inventory_item_alert_idx',
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name='inventoryitem',
+            index=models.Index(
+                condition=models.Q(('expiry_date__isnull', False)),
+                fields=['industry', 'expiry_date'],
+                name='inventory_item_expiry_idx',
+            ),
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.0.1 on 2026-10-19 16:00
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def opening_snapshots(apps, schema_editor):
+    """Seed one snapshot per existing item so as-of queries have a starting point."""
+    InventoryItem = apps.get_model('inventory', 'InventoryItem')
+    InventoryBalanceSnapshot = apps.get_model('inventory', 'InventoryBalanceSnapshot')
+    now = django.utils.timezone.now()
+    batch = []
+    for item_id, industry_id, quantity in InventoryItem.objects.values_list('id', 'industry_id', 'quantity').iterator():
+        batch.append(InventoryBalanceSnapshot(
+            inventory_item_id=item_id, industry_id=industry_id, quantity=quantity, taken_at=now, source='opening',
+        ))
+        if len(batch) >= 1000:
+            InventoryBalanceSnapshot.objects.bulk_create(batch)
+            batch = []
+    InventoryBalanceSnapshot.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0003_inventoryitem_alert_indexes'),
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='InventoryBalanceSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('quantity', models.IntegerField()),
+                ('taken_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('source', models.CharField(choices=[('scheduled', 'Scheduled'), ('opening', 'Opening balance'), ('edit', 'Direct edit')], default='scheduled', max_length=20)),
+                ('industry', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='inventory_snapshots', to='users.industry')),
+                ('inventory_item', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='balance_snapshots', to='inventory.inventoryitem')),
+            ],
+            options={
+                'ordering': ['-taken_at'],
+                'indexes': [models.Index(fields=['inventory_item', '-taken_at'], name='inventory_snapshot_item_idx')],
+            },
+        ),
+        migrations.RunPython(opening_snapshots, migrations.RunPython.noop),
+    ]
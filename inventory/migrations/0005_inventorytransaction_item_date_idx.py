@@ -0,0 +1,20 @@
+# Generated by Django 5.0.1 on 2026-10-19 16:05
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Build the transaction index without locking writes
+    atomic = False
+
+    dependencies = [
+        ('inventory', '0004_inventory_balance_snapshots'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='inventorytransaction',
+            index=models.Index(fields=['inventory_item', 'transaction_date'], name='inventory_txn_item_date_idx'),
+        ),
+    ]
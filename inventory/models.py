@@ -1,7 +1,26 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Case, F, Q, Value, When
+from django.db.models.lookups import LessThanOrEqual
 from django.conf import settings
 from django.utils import timezone
 
+
+def inventory_status_case(quantity=None):
+    """
+    SQL equivalent of InventoryItem.save()'s status rules, for UPDATE statements.
+    Pass `quantity` to evaluate against a new quantity expression in the same UPDATE.
+    Statuses also change with time (expiry), see refresh_inventory_status.
+    """
+    quantity = quantity if quantity is not None else F('quantity')
+    return Case(
+        When(expiry_date__lt=timezone.localdate(), then=Value('expired')),
+        When(LessThanOrEqual(quantity, Value(0)), then=Value('out_of_stock')),
+        When(LessThanOrEqual(quantity, F('reorder_level')), then=Value('low_stock')),
+        default=Value('in_stock'),
+        output_field=models.CharField(),
+    )
+
+
 class InventoryItem(models.Model):
     CATEGORY_CHOICES = [
         ('seeds', 'Seeds'),
@@ -48,11 +67,36 @@ class InventoryItem(models.Model):
         indexes = [
             models.Index(fields=['category']),
             models.Index(fields=['status']),
+            # low_stock alert feed (expired kept for the show_expired listing)
+            models.Index(
+                fields=['industry', 'status'],
+                name='inventory_item_alert_idx',
+                condition=Q(status__in=['low_stock', 'out_of_stock', 'expired']),
+            ),
+            # expiring_soon feed and the expiry pass of refresh_inventory_status
+            models.Index(
+                fields=['industry', 'expiry_date'],
+                name='inventory_item_expiry_idx',
+                condition=Q(expiry_date__isnull=False),
+            ),
         ]
     
     def __str__(self):
         return f"{self.item_name} - {self.quantity} {self.unit}"
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Direct quantity edits (not via a transaction) are recorded as balance snapshots
+        if 'quantity' in field_names:
+            instance._loaded_quantity = instance.quantity
+        return instance
+    
+    def refresh_from_db(self, using=None, fields=None, **kwargs):
+        super().refresh_from_db(using=using, fields=fields, **kwargs)
+        if fields is None or 'quantity' in fields:
+            self._loaded_quantity = self.quantity
+    
     def save(self, *args, **kwargs):
         # Automatically update status based on quantity
         if self.quantity <= 0:
@@ -63,10 +107,26 @@ class InventoryItem(models.Model):
             self.status = 'in_stock'
             
         # Check expiry date
-        if self.expiry_date and self.expiry_date < timezone.now().date():
+        if self.expiry_date and self.expiry_date < timezone.localdate():
             self.status = 'expired'
-            
-        super().save(*args, **kwargs)
+        
+        adding = self._state.adding
+        update_fields = kwargs.get('update_fields')
+        quantity_changed = (
+            adding or self.quantity != getattr(self, '_loaded_quantity', self.quantity)
+        ) and (update_fields is None or 'quantity' in update_fields)
+        
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if quantity_changed:
+                # Keeps the ledger replayable: balances as of any later date start here
+                InventoryBalanceSnapshot.objects.create(
+                    inventory_item=self,
+                    industry_id=self.industry_id,
+                    quantity=self.quantity,
+                    source='opening' if adding else 'edit',
+                )
+        self._loaded_quantity = self.quantity
 
 class InventoryTransaction(models.Model):
     TRANSACTION_TYPES = [
@@ -84,24 +144,75 @@ class InventoryTransaction(models.Model):
     
     class Meta:
         ordering = ['-transaction_date']
+        indexes = [
+            # Ledger replay after a snapshot and the monthly movement report
+            models.Index(fields=['inventory_item', 'transaction_date'], name='inventory_txn_item_date_idx'),
+        ]
     
     def __str__(self):
         return f"{self.get_transaction_type_display()} of {self.quantity} {self.inventory_item.unit} to {self.inventory_item.item_name}"
     
-    def save(self, *args, **kwargs):
-        # Update the inventory quantity based on transaction type
+    def quantity_expression(self):
+        """New item quantity as an SQL expression over the current row value."""
         if self.transaction_type == 'addition':
-            self.inventory_item.quantity += self.quantity
-        elif self.transaction_type == 'removal':
-            self.inventory_item.quantity -= self.quantity
-        elif self.transaction_type == 'adjustment':
-            # For adjustment, the quantity represents the new total
-            self.inventory_item.quantity = self.quantity
-        
-        # Save the inventory item to update its quantity and status
-        self.inventory_item.save()
-        
-        super().save(*args, **kwargs)
+            return F('quantity') + self.quantity
+        if self.transaction_type == 'removal':
+            return F('quantity') - self.quantity
+        # For adjustment, the quantity represents the new total
+        return Value(self.quantity)
+
+    def save(self, *args, **kwargs):
+        # Only a new transaction moves stock; editing history does not re-apply it
+        if self.pk is not None or self.transaction_type not in dict(self.TRANSACTION_TYPES):
+            return super().save(*args, **kwargs)
+
+        with transaction.atomic():
+            # One UPDATE: the row lock serializes concurrent movements and the
+            # increment is computed by Postgres, so no update is lost
+            new_quantity = self.quantity_expression()
+            InventoryItem.objects.filter(pk=self.inventory_item_id).update(
+                quantity=new_quantity,
+                status=inventory_status_case(quantity=new_quantity),
+                updated_at=timezone.now(),
+            )
+            super().save(*args, **kwargs)
+        self.inventory_item.refresh_from_db(fields=['quantity', 'status', 'updated_at'])
+
+class InventoryBalanceSnapshot(models.Model):
+    """
+    An item's quantity at a point in time. Balances as of a date start from
+    the nearest earlier snapshot and replay only the transactions after it.
+    Written periodically for every item (snapshot_inventory_balances), when an
+    item is created, and when its quantity is edited without a transaction.
+    """
+    SOURCE_CHOICES = [
+        ('scheduled', 'Scheduled'),
+        ('opening', 'Opening balance'),
+        ('edit', 'Direct edit'),
+    ]
+    
+    inventory_item = models.ForeignKey(InventoryItem, on_delete=models.CASCADE, related_name='balance_snapshots')
+    # Denormalized from the item for tenant filtering
+    industry = models.ForeignKey(
+        'users.Industry',
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='inventory_snapshots',
+    )
+    quantity = models.IntegerField()
+    taken_at = models.DateTimeField(default=timezone.now)
+    source = models.CharField(max_length=20, choices=SOURCE_CHOICES, default='scheduled')
+    
+    class Meta:
+        ordering = ['-taken_at']
+        indexes = [
+            # Nearest snapshot at or before a date, per item
+            models.Index(fields=['inventory_item', '-taken_at'], name='inventory_snapshot_item_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.inventory_item_id}: {self.quantity} @ {self.taken_at:%Y-%m-%d %H:%M}"
 
 class Stock(models.Model):
     """
@@ -45,6 +45,16 @@ class InventoryTransactionSerializer(serializers.ModelSerializer):
         validated_data['performed_by'] = user
         return super().create(validated_data)
 
+class InventoryTransactionLineSerializer(serializers.Serializer):
+    """One line of a bulk posting; items are resolved in one query by InventoryLedgerService"""
+    inventory_item = serializers.IntegerField(min_value=1)
+    transaction_type = serializers.ChoiceField(choices=InventoryTransaction.TRANSACTION_TYPES)
+    quantity = serializers.IntegerField()
+    notes = serializers.CharField(required=False, allow_blank=True, default='')
+
+class InventoryBulkTransactionSerializer(serializers.Serializer):
+    transactions = InventoryTransactionLineSerializer(many=True, allow_empty=False)
+
 class InventoryItemDetailSerializer(InventoryItemSerializer):
     transactions = InventoryTransactionSerializer(many=True, read_only=True)
     
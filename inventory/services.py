@@ -0,0 +1,351 @@
+from collections import Counter
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Case, F, IntegerField, Max, Min, OuterRef, Subquery, Value, When
+from django.utils import timezone
+from rest_framework import serializers
+import logging
+
+from users.multi_tenant_utils import filter_by_industry
+from .models import InventoryBalanceSnapshot, InventoryItem, InventoryTransaction, inventory_status_case
+
+logger = logging.getLogger(__name__)
+
+
+class InventoryLedgerService:
+    """
+    Posts many stock movements at once (warehouse stock-takes, receipts).
+
+    All lines are applied in one transaction: the touched items are locked in
+    id order, their quantities and statuses are rewritten by a single UPDATE
+    (one CASE branch per item), and the transaction rows are bulk inserted.
+    """
+
+    @staticmethod
+    def fold_movements(lines):
+        """
+        Collapse ordered movements into one change per item.
+
+        Returns:
+            dict item_id -> ('delta', n) for additions/removals only, or
+            ('set', n) once an adjustment fixed the total
+        """
+        changes = {}
+        for line in lines:
+            item_id = line['inventory_item']
+            kind, amount = changes.get(item_id, ('delta', 0))
+            if line['transaction_type'] == 'adjustment':
+                kind, amount = 'set', line['quantity']
+            elif line['transaction_type'] == 'addition':
+                amount += line['quantity']
+            else:
+                amount -= line['quantity']
+            changes[item_id] = (kind, amount)
+        return changes
+
+    @staticmethod
+    def post_transactions(lines, user):
+        """
+        Apply validated movement lines for `user`.
+
+        Args:
+            lines: [{'inventory_item': id, 'transaction_type', 'quantity', 'notes'}]
+            user: User posting the movements (must be able to see every item)
+
+        Returns:
+            (created transactions, updated items)
+
+        Raises:
+            serializers.ValidationError: too many lines or unknown/inaccessible items
+        """
+        max_lines = getattr(settings, 'INVENTORY_BULK_MAX_LINES', 1000)
+        if not lines:
+            raise serializers.ValidationError({'transactions': ["At least one transaction is required"]})
+        if len(lines) > max_lines:
+            raise serializers.ValidationError({
+                'transactions': [f"At most {max_lines} transactions can be posted at once, got {len(lines)}"]
+            })
+
+        changes = InventoryLedgerService.fold_movements(lines)
+        with transaction.atomic():
+            accessible = filter_by_industry(InventoryItem.objects.filter(pk__in=changes), user)
+            # Lock in id order so concurrent stock-takes cannot deadlock each other
+            locked = set(accessible.select_for_update().order_by('pk').values_list('pk', flat=True))
+            errors = [
+                {'inventory_item': [f"Inventory item {line['inventory_item']} not found"]}
+                if line['inventory_item'] not in locked else {}
+                for line in lines
+            ]
+            if any(errors):
+                raise serializers.ValidationError({'transactions': errors})
+
+            new_quantity = Case(
+                *[
+                    When(pk=item_id, then=F('quantity') + amount if kind == 'delta' else Value(amount))
+                    for item_id, (kind, amount) in changes.items()
+                ],
+                output_field=IntegerField(),
+            )
+            InventoryItem.objects.filter(pk__in=locked).update(
+                quantity=new_quantity,
+                status=inventory_status_case(quantity=new_quantity),
+                updated_at=timezone.now(),
+            )
+            # bulk_create skips InventoryTransaction.save(), which would apply them again
+            created = InventoryTransaction.objects.bulk_create([
+                InventoryTransaction(
+                    inventory_item_id=line['inventory_item'],
+                    transaction_type=line['transaction_type'],
+                    quantity=line['quantity'],
+                    notes=line.get('notes', ''),
+                    performed_by=user,
+                )
+                for line in lines
+            ])
+
+        logger.info(f"Posted {len(created)} inventory transactions over {len(changes)} items for user {user.pk}")
+        return created, list(InventoryItem.objects.filter(pk__in=locked).order_by('item_name'))
+
+
+class InventoryStatusService:
+    """
+    Keeps InventoryItem.status true without anyone editing the row.
+
+    Status depends on the date as well as the quantity (items expire), so it
+    is recomputed periodically with set-based UPDATE ... CASE statements that
+    touch only the rows whose stored status is stale.
+    """
+
+    WINDOW = 5000
+
+    @staticmethod
+    def refresh_statuses(industry_id=None, window=None):
+        """
+        Recompute status for all items (or one industry's), one UPDATE per id window.
+
+        Returns:
+            int: number of items whose status changed
+        """
+        window = window or InventoryStatusService.WINDOW
+        items = InventoryItem.objects.all()
+        if industry_id:
+            items = items.filter(industry_id=industry_id)
+        bounds = items.aggregate(first=Min('id'), last=Max('id'))
+        if bounds['first'] is None:
+            return 0
+
+        changed = 0
+        for start in range(bounds['first'], bounds['last'] + 1, window):
+            changed += items.filter(id__gte=start, id__lt=start + window).exclude(
+                status=inventory_status_case()
+            ).update(status=inventory_status_case(), updated_at=timezone.now())
+        return changed
+
+
+def refresh_inventory_status_job():
+    """
+    Background job: refresh item statuses, then schedule the next run after
+    INVENTORY_STATUS_REFRESH_INTERVAL seconds (start with refresh_inventory_status --schedule).
+    """
+    from jobs.runner import enqueue_once
+
+    interval = getattr(settings, 'INVENTORY_STATUS_REFRESH_INTERVAL', 3600)
+    if interval:
+        # Scheduled first so a failing run does not end the chain
+        enqueue_once(
+            refresh_inventory_status_job, queue='maintenance',
+            run_at=timezone.now() + timedelta(seconds=interval),
+        )
+    changed = InventoryStatusService.refresh_statuses()
+    logger.info(f"Inventory status refresh: {changed} items changed")
+
+
+class InventoryBalanceService:
+    """
+    Stock levels at past dates from the append-only transaction ledger.
+
+    A balance as of T starts from the item's latest InventoryBalanceSnapshot
+    at or before T and replays only the transactions between the two, so the
+    cost depends on the snapshot interval, not on the age of the ledger.
+    """
+
+    @staticmethod
+    def take_snapshots(industry_id=None):
+        """
+        Snapshot every item's current quantity with one INSERT ... SELECT.
+        Returns the number of snapshots written.
+
+        Items are locked (FOR UPDATE, in id order like post_transactions) and
+        each row is stamped with clock_timestamp() after its lock is taken, so
+        a movement still in flight is waited for and included, and any later
+        movement is stamped after the snapshot. balances_as_of() replays only
+        movements newer than the snapshot, so none is skipped or counted twice.
+        """
+        snapshot_table = InventoryBalanceSnapshot._meta.db_table
+        item_table = InventoryItem._meta.db_table
+        where, params = '', []
+        if industry_id:
+            where, params = 'WHERE industry_id = %s', [industry_id]
+        sql = f'''
+            WITH locked AS (
+                SELECT id, industry_id, quantity FROM "{item_table}" {where}
+                ORDER BY id
+                FOR UPDATE
+            )
+            INSERT INTO "{snapshot_table}" (inventory_item_id, industry_id, quantity, taken_at, source)
+            SELECT id, industry_id, quantity, clock_timestamp(), %s FROM locked
+        '''
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(sql, [*params, 'scheduled'])
+            return cursor.rowcount
+
+    @staticmethod
+    def balances_as_of(item_ids, as_of, inclusive=True):
+        """
+        Quantities of `item_ids` at datetime `as_of`, in two queries.
+        With inclusive=False, movements stamped exactly at `as_of` are left out.
+
+        Returns:
+            dict item_id -> {'quantity', 'snapshot_at', 'movements'}; quantity and
+            snapshot_at are None when no snapshot predates `as_of`
+        """
+        item_ids = list(item_ids)
+        until = 'lte' if inclusive else 'lt'
+        snapshots = {
+            snapshot.inventory_item_id: snapshot
+            for snapshot in InventoryBalanceSnapshot.objects.filter(
+                inventory_item_id__in=item_ids, **{f'taken_at__{until}': as_of}
+            ).order_by('inventory_item_id', '-taken_at').distinct('inventory_item_id')
+        }
+        nearest_snapshot = InventoryBalanceSnapshot.objects.filter(
+            inventory_item=OuterRef('inventory_item'), **{f'taken_at__{until}': as_of}
+        ).order_by('-taken_at').values('taken_at')[:1]
+        movements = list(
+            InventoryTransaction.objects.filter(
+                inventory_item_id__in=snapshots, **{f'transaction_date__{until}': as_of}
+            )
+            .annotate(snapshot_at=Subquery(nearest_snapshot))
+            .filter(transaction_date__gt=F('snapshot_at'))
+            .order_by('inventory_item_id', 'transaction_date', 'id')
+            .values('inventory_item', 'transaction_type', 'quantity')
+        )
+        changes = InventoryLedgerService.fold_movements(movements)
+        counts = Counter(movement['inventory_item'] for movement in movements)
+
+        balances = {}
+        for item_id in item_ids:
+            snapshot = snapshots.get(item_id)
+            if snapshot is None:
+                balances[item_id] = {'quantity': None, 'snapshot_at': None, 'movements': 0}
+                continue
+            kind, amount = changes.get(item_id, ('delta', 0))
+            balances[item_id] = {
+                'quantity': amount if kind == 'set' else snapshot.quantity + amount,
+                'snapshot_at': snapshot.taken_at,
+                'movements': counts[item_id],
+            }
+        return balances
+
+    @staticmethod
+    def movement_report(items, start, end):
+        """
+        Per item and month in [start, end): opening, added, removed, adjustments,
+        movements and closing balance, computed in one SQL statement.
+
+        `items` is an InventoryItem queryset already scoped to the user
+        (filter_by_industry). Its SQL is embedded as the ledger's item filter,
+        so the statement carries the same industry condition and bound
+        parameters as the API's other item queries.
+
+        Running balances use window functions: rows are grouped by the number
+        of adjustments seen so far (an adjustment resets the balance), and each
+        group's balance is its base plus a running SUM of signed quantities.
+        Months without movements are omitted.
+        """
+        items = items.order_by().values('id')
+        item_ids = list(items.values_list('id', flat=True))
+        if not item_ids:
+            return []
+        opening = InventoryBalanceService.balances_as_of(item_ids, start, inclusive=False)
+        item_ids_sql, item_ids_params = items.query.sql_with_params()
+        transaction_table = InventoryTransaction._meta.db_table
+        item_table = InventoryItem._meta.db_table
+        sql = f'''
+            WITH opening AS (
+                SELECT * FROM unnest(%s::bigint[], %s::integer[]) AS o(item_id, quantity)
+            ),
+            ledger AS (
+                SELECT t.id, t.inventory_item_id AS item_id, t.transaction_type, t.quantity, t.transaction_date,
+                       date_trunc('month', t.transaction_date AT TIME ZONE %s) AS month,
+                       COUNT(*) FILTER (WHERE t.transaction_type = 'adjustment') OVER (
+                           PARTITION BY t.inventory_item_id ORDER BY t.transaction_date, t.id
+                       ) AS reset_group
+                FROM "{transaction_table}" t
+                WHERE t.inventory_item_id IN ({item_ids_sql}) AND t.transaction_date >= %s AND t.transaction_date < %s
+            ),
+            balances AS (
+                SELECT l.*,
+                       CASE WHEN l.reset_group = 0 THEN o.quantity
+                            ELSE FIRST_VALUE(l.quantity) OVER (
+                                PARTITION BY l.item_id, l.reset_group ORDER BY l.transaction_date, l.id
+                            )
+                       END
+                       + SUM(CASE l.transaction_type WHEN 'addition' THEN l.quantity
+                                                     WHEN 'removal' THEN -l.quantity ELSE 0 END) OVER (
+                           PARTITION BY l.item_id, l.reset_group ORDER BY l.transaction_date, l.id
+                       ) AS balance_after
+                FROM ledger l LEFT JOIN opening o ON o.item_id = l.item_id
+            ),
+            monthly AS (
+                SELECT item_id, month,
+                       SUM(quantity) FILTER (WHERE transaction_type = 'addition') AS added,
+                       SUM(quantity) FILTER (WHERE transaction_type = 'removal') AS removed,
+                       COUNT(*) FILTER (WHERE transaction_type = 'adjustment') AS adjustments,
+                       COUNT(*) AS movements,
+                       (ARRAY_AGG(balance_after ORDER BY transaction_date DESC, id DESC))[1] AS closing
+                FROM balances
+                GROUP BY item_id, month
+            )
+            SELECT m.item_id, i.item_name, i.unit, m.month,
+                   COALESCE(LAG(m.closing) OVER (PARTITION BY m.item_id ORDER BY m.month), o.quantity) AS opening,
+                   COALESCE(m.added, 0), COALESCE(m.removed, 0), m.adjustments, m.movements, m.closing
+            FROM monthly m
+            JOIN "{item_table}" i ON i.id = m.item_id
+            LEFT JOIN opening o ON o.item_id = m.item_id
+            ORDER BY i.item_name, m.item_id, m.month
+        '''
+        known = [item_id for item_id in item_ids if opening[item_id]['quantity'] is not None]
+        params = [
+            known, [opening[item_id]['quantity'] for item_id in known],
+            settings.TIME_ZONE, *item_ids_params, start, end,
+        ]
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            rows = cursor.fetchall()
+
+        columns = ['item_id', 'item_name', 'unit', 'month', 'opening', 'added', 'removed', 'adjustments', 'movements', 'closing']
+        report = []
+        for row in rows:
+            entry = dict(zip(columns, row))
+            entry['month'] = entry['month'].strftime('%Y-%m')
+            report.append(entry)
+        return report
+
+
+def snapshot_inventory_balances_job():
+    """
+    Background job: snapshot every item's balance, then schedule the next run
+    after INVENTORY_SNAPSHOT_INTERVAL seconds (start with snapshot_inventory_balances --schedule).
+    """
+    from jobs.runner import enqueue_once
+
+    interval = getattr(settings, 'INVENTORY_SNAPSHOT_INTERVAL', 86400)
+    if interval:
+        enqueue_once(
+            snapshot_inventory_balances_job, queue='maintenance',
+            run_at=timezone.now() + timedelta(seconds=interval),
+        )
+    written = InventoryBalanceService.take_snapshots()
+    logger.info(f"Inventory balance snapshots: {written} written")
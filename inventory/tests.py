@@ -1,3 +1,163 @@
+from datetime import timedelta
+
 from django.test import TestCase
+from django.utils import timezone
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from rest_framework import status
+from users.models import Industry, Role
+from .models import InventoryBalanceSnapshot, InventoryItem, InventoryTransaction
+from .services import InventoryBalanceService, InventoryStatusService
+
+User = get_user_model()
+
+
+class InventoryTestBase(TestCase):
+    """An owner with two inventory items"""
+
+    def setUp(self):
+        self.industry = Industry.objects.create(name="Test Industry")
+        owner_role, _ = Role.objects.get_or_create(name='owner', defaults={'display_name': 'Owner'})
+        self.owner = User.objects.create_user(
+            username='owner1',
+            password='testpass123',
+            phone_number='9876543219',
+            role=owner_role,
+            industry=self.industry
+        )
+        self.seeds = InventoryItem.objects.create(
+            industry=self.industry, item_name='Seeds', quantity=10, unit='kg',
+            reorder_level=5, created_by=self.owner
+        )
+        self.urea = InventoryItem.objects.create(
+            industry=self.industry, item_name='Urea', quantity=3, unit='bag',
+            reorder_level=2, created_by=self.owner
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.owner)
+
+
+class InventoryTransactionTest(InventoryTestBase):
+    """Stock movements are applied in SQL, singly and in bulk"""
+
+    def test_transaction_updates_quantity_and_status(self):
+        InventoryTransaction.objects.create(
+            inventory_item=self.seeds, transaction_type='removal', quantity=6, performed_by=self.owner
+        )
+        self.seeds.refresh_from_db()
+        self.assertEqual(self.seeds.quantity, 4)
+        self.assertEqual(self.seeds.status, 'low_stock')
+
+    def test_stale_instance_does_not_lose_updates(self):
+        stale = InventoryItem.objects.get(pk=self.seeds.pk)
+        InventoryTransaction.objects.create(
+            inventory_item=self.seeds, transaction_type='addition', quantity=5, performed_by=self.owner
+        )
+        InventoryTransaction.objects.create(
+            inventory_item=stale, transaction_type='removal', quantity=2, performed_by=self.owner
+        )
+        self.seeds.refresh_from_db()
+        self.assertEqual(self.seeds.quantity, 13)
+
+    def test_bulk_post(self):
+        response = self.client.post('/api/transactions/bulk/', {
+            'transactions': [
+                {'inventory_item': self.seeds.id, 'transaction_type': 'addition', 'quantity': 5},
+                {'inventory_item': self.urea.id, 'transaction_type': 'removal', 'quantity': 3},
+                {'inventory_item': self.seeds.id, 'transaction_type': 'removal', 'quantity': 1},
+            ]
+        }, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED, response.data)
+        self.assertEqual(response.data['created'], 3)
+        self.seeds.refresh_from_db()
+        self.urea.refresh_from_db()
+        self.assertEqual(self.seeds.quantity, 14)
+        self.assertEqual((self.urea.quantity, self.urea.status), (0, 'out_of_stock'))
+        self.assertEqual(InventoryTransaction.objects.count(), 3)
+
+    def test_bulk_post_is_all_or_nothing(self):
+        response = self.client.post('/api/transactions/bulk/', {
+            'transactions': [
+                {'inventory_item': self.seeds.id, 'transaction_type': 'adjustment', 'quantity': 50},
+                {'inventory_item': 999999, 'transaction_type': 'addition', 'quantity': 1},
+            ]
+        }, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.seeds.refresh_from_db()
+        self.assertEqual(self.seeds.quantity, 10)
+        self.assertFalse(InventoryTransaction.objects.exists())
+
+    def test_refresh_statuses_marks_expired_and_restocked_items(self):
+        InventoryItem.objects.filter(pk=self.seeds.pk).update(expiry_date=timezone.localdate() - timedelta(days=1))
+        InventoryItem.objects.filter(pk=self.urea.pk).update(quantity=0)
+
+        self.assertEqual(InventoryStatusService.refresh_statuses(window=1), 2)
+        self.assertEqual(InventoryItem.objects.get(pk=self.seeds.pk).status, 'expired')
+        self.assertEqual(InventoryItem.objects.get(pk=self.urea.pk).status, 'out_of_stock')
+        # Nothing stale left to rewrite
+        self.assertEqual(InventoryStatusService.refresh_statuses(), 0)
+
+
+class InventoryLedgerTest(InventoryTestBase):
+    """Balances as of past dates replay the ledger from the nearest snapshot"""
+
+    def _move(self, when, transaction_type, quantity, item=None):
+        txn = InventoryTransaction.objects.create(
+            inventory_item=item or self.seeds, transaction_type=transaction_type,
+            quantity=quantity, performed_by=self.owner
+        )
+        InventoryTransaction.objects.filter(pk=txn.pk).update(transaction_date=when)
+
+    def setUp(self):
+        super().setUp()
+        self.t0 = timezone.now() - timedelta(days=90)
+        InventoryBalanceSnapshot.objects.all().update(taken_at=self.t0)
+        self._move(self.t0 + timedelta(days=1), 'addition', 5)       # 15
+        self._move(self.t0 + timedelta(days=2), 'removal', 3)        # 12
+        self._move(self.t0 + timedelta(days=40), 'adjustment', 20)   # 20
+        self._move(self.t0 + timedelta(days=41), 'removal', 4)       # 16
+
+    def test_balances_as_of(self):
+        balances = InventoryBalanceService.balances_as_of([self.seeds.id, self.urea.id], self.t0 + timedelta(days=10))
+        self.assertEqual(balances[self.seeds.id]['quantity'], 12)
+        self.assertEqual(balances[self.seeds.id]['movements'], 2)
+        self.assertEqual(balances[self.urea.id]['quantity'], 3)
+
+        later = InventoryBalanceService.balances_as_of([self.seeds.id], timezone.now())
+        self.assertEqual(later[self.seeds.id]['quantity'], 16)
+
+        before = InventoryBalanceService.balances_as_of([self.seeds.id], self.t0 - timedelta(days=1))
+        self.assertIsNone(before[self.seeds.id]['quantity'])
+
+    def test_snapshot_shortens_replay(self):
+        self.assertEqual(InventoryBalanceService.take_snapshots(), 2)
+        balances = InventoryBalanceService.balances_as_of([self.seeds.id], timezone.now())
+        self.assertEqual((balances[self.seeds.id]['quantity'], balances[self.seeds.id]['movements']), (16, 0))
+
+    def test_movement_report_closing_matches_balances(self):
+        start = self.t0 + timedelta(hours=1)
+        report = InventoryBalanceService.movement_report(InventoryItem.objects.filter(pk=self.seeds.pk), start, timezone.now())
+        self.assertEqual(sum(row['added'] for row in report), 5)
+        self.assertEqual(sum(row['removed'] for row in report), 7)
+        self.assertEqual(report[-1]['closing'], 16)
+        for previous, row in zip(report, report[1:]):
+            self.assertEqual(row['opening'], previous['closing'])
+
+    def test_movement_report_endpoint_is_scoped(self):
+        outsider = User.objects.create_user(
+            username='owner2', password='testpass123', phone_number='9876543218',
+            role=self.owner.role, industry=Industry.objects.create(name="Other Industry")
+        )
+        self.client.force_authenticate(user=outsider)
+        response = self.client.get('/api/inventory/movement-report/', {'items': self.seeds.id})
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        self.assertEqual(response.data['results'], [])
 
-# Create your tests here.
+    def test_as_of_endpoint(self):
+        day = (self.t0 + timedelta(days=10)).date()
+        response = self.client.get('/api/inventory/as-of/', {'date': day.isoformat(), 'items': self.seeds.id})
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        results = response.data.get('results', response.data)
+        self.assertEqual(results[0]['quantity'], 12)
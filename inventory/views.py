@@ -7,10 +7,14 @@ from .serializers import (
     InventoryItemSerializer, 
     InventoryItemDetailSerializer,
     InventoryTransactionSerializer,
+    InventoryBulkTransactionSerializer,
     StockSerializer
 )
+from .services import InventoryBalanceService, InventoryLedgerService
+from datetime import date, datetime, timedelta
 from django.db.models import Q
 from django.utils import timezone
+from django.utils.dateparse import parse_date
 from users.multi_tenant_utils import filter_by_industry, get_user_industry
 
 class IsAdminOrManager(permissions.BasePermission):
@@ -106,6 +110,7 @@ class InventoryItemViewSet(viewsets.ModelViewSet):
         
         if serializer.is_valid():
             serializer.save()
+            inventory_item.refresh_from_db()
             # Get the updated inventory item serializer
             item_serializer = self.get_serializer_class()(
                 inventory_item,
@@ -157,6 +162,89 @@ class InventoryItemViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
 
+    def _ledger_queryset(self):
+        """Items for ledger reports: tenant-scoped, every status (past balances ignore today's status)."""
+        queryset = filter_by_industry(InventoryItem.objects.all(), self.request.user)
+        category = self.request.query_params.get('category')
+        if category:
+            queryset = queryset.filter(category=category)
+        item_ids = self.request.query_params.get('items')
+        if item_ids:
+            try:
+                queryset = queryset.filter(id__in=[int(item_id) for item_id in item_ids.split(',')])
+            except ValueError:
+                queryset = queryset.none()
+        return queryset.order_by('item_name', 'id')
+    
+    @action(detail=False, methods=['get'], url_path='as-of')
+    def as_of(self, request):
+        """
+        Stock levels at the end of a past day: ?date=YYYY-MM-DD [&category=] [&items=1,2]
+        Each balance starts from the nearest snapshot and replays only later transactions.
+        """
+        day = parse_date(request.query_params.get('date', '') or '')
+        if day is None:
+            return Response({'detail': 'date is required as YYYY-MM-DD'}, status=status.HTTP_400_BAD_REQUEST)
+        # End of that day = start of the next one, exclusive
+        as_of = timezone.make_aware(datetime.combine(day + timedelta(days=1), datetime.min.time()))
+        
+        queryset = self._ledger_queryset()
+        page = self.paginate_queryset(queryset)
+        items = page if page is not None else list(queryset)
+        balances = InventoryBalanceService.balances_as_of([item.id for item in items], as_of, inclusive=False)
+        data = [
+            {
+                'id': item.id,
+                'item_name': item.item_name,
+                'unit': item.unit,
+                'category': item.category,
+                'quantity': balances[item.id]['quantity'],
+                'snapshot_at': balances[item.id]['snapshot_at'],
+                'movements_replayed': balances[item.id]['movements'],
+            }
+            for item in items
+        ]
+        if page is not None:
+            return self.get_paginated_response(data)
+        return Response({'date': day, 'results': data})
+    
+    @action(detail=False, methods=['get'], url_path='movement-report')
+    def movement_report(self, request):
+        """
+        Monthly stock movements per item: ?from=YYYY-MM&to=YYYY-MM [&category=] [&items=1,2]
+        Defaults to the last 12 months; at most 36 months per request.
+        """
+        today = timezone.localdate()
+        try:
+            end_month = self._parse_month(request.query_params.get('to')) or today.replace(day=1)
+            start_month = self._parse_month(request.query_params.get('from')) or self._add_months(end_month, -11)
+        except ValueError:
+            return Response({'detail': 'from/to must be YYYY-MM'}, status=status.HTTP_400_BAD_REQUEST)
+        if start_month > end_month:
+            return Response({'detail': 'from must not be after to'}, status=status.HTTP_400_BAD_REQUEST)
+        if self._add_months(start_month, 36) <= end_month:
+            return Response({'detail': 'At most 36 months per report'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        start = timezone.make_aware(datetime.combine(start_month, datetime.min.time()))
+        end = timezone.make_aware(datetime.combine(self._add_months(end_month, 1), datetime.min.time()))
+        report = InventoryBalanceService.movement_report(self._ledger_queryset(), start, end)
+        return Response({
+            'from': start_month.strftime('%Y-%m'),
+            'to': end_month.strftime('%Y-%m'),
+            'results': report,
+        })
+    
+    @staticmethod
+    def _parse_month(value):
+        if not value:
+            return None
+        return datetime.strptime(value, '%Y-%m').date()
+    
+    @staticmethod
+    def _add_months(month, count):
+        index = month.year * 12 + month.month - 1 + count
+        return date(index // 12, index % 12 + 1, 1)
+
 class InventoryTransactionViewSet(viewsets.ModelViewSet):
     """
     ViewSet for viewing and editing inventory transactions.
@@ -192,6 +280,23 @@ class InventoryTransactionViewSet(viewsets.ModelViewSet):
             queryset = queryset.filter(transaction_date__lte=end_date)
         
         return queryset
+    
+    @action(detail=False, methods=['post'], url_path='bulk')
+    def bulk(self, request):
+        """
+        Post many stock movements in one request (e.g. a warehouse stock-take).
+        Body: {"transactions": [{"inventory_item": 1, "transaction_type": "removal", "quantity": 5, "notes": ""}, ...]}
+        Lines apply in order; all succeed or none do.
+        """
+        serializer = InventoryBulkTransactionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        created, items = InventoryLedgerService.post_transactions(
+            serializer.validated_data['transactions'], request.user
+        )
+        return Response({
+            'created': len(created),
+            'items': InventoryItemSerializer(items, many=True, context={'request': request}).data,
+        }, status=status.HTTP_201_CREATED)
 
 class StockViewSet(viewsets.ModelViewSet):
     """
@@ -0,0 +1,20 @@
+from django.contrib import admin
+from django.utils import timezone
+from .models import Job
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'task', 'queue', 'status', 'attempts', 'max_attempts', 'run_at', 'finished_at')
+    list_filter = ('status', 'queue')
+    search_fields = ('task', 'last_error')
+    ordering = ('-created_at',)
+    readonly_fields = ('created_at', 'updated_at', 'finished_at', 'locked_by', 'locked_at')
+    actions = ['requeue_jobs']
+
+    @admin.action(description="Re-queue selected jobs")
+    def requeue_jobs(self, request, queryset):
+        updated = queryset.exclude(status='running').update(
+            status='queued', attempts=0, run_at=timezone.now(), last_error='', finished_at=None
+        )
+        self.message_user(request, f"{updated} job(s) re-queued.")
@@ -0,0 +1,133 @@
+"""
+Management command to run background job workers.
+Run: python manage.py run_workers --threads 4 [--queue otp --queue default]
+
+Each thread claims jobs with SELECT ... FOR UPDATE SKIP LOCKED, so several
+processes or machines can run this command against the same database.
+Stops cleanly on SIGTERM/SIGINT after the running jobs finish.
+"""
+import os
+import signal
+import socket
+import threading
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connection
+
+from jobs.runner import prune_finished_jobs, requeue_stale_jobs, run_once, update_queue_depth_metrics
+
+
+class Command(BaseCommand):
+    help = "Run background job workers (Postgres-backed, no broker required)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--threads',
+            type=int,
+            default=getattr(settings, 'JOBS_WORKER_THREADS', 2),
+            help='Number of worker threads (default: JOBS_WORKER_THREADS)',
+        )
+        parser.add_argument(
+            '--queue',
+            action='append',
+            dest='queues',
+            help='Queue to consume; repeat for several (default: all queues)',
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=getattr(settings, 'JOBS_POLL_INTERVAL', 2.0),
+            help='Seconds to sleep when no job is due (default: JOBS_POLL_INTERVAL)',
+        )
+        parser.add_argument(
+            '--burst',
+            action='store_true',
+            help='Exit once no job is due instead of polling forever',
+        )
+        parser.add_argument(
+            '--metrics-port',
+            type=int,
+            default=None,
+            help='Expose job metrics for Prometheus on this port',
+        )
+
+    def handle(self, *args, **options):
+        threads = max(options['threads'], 1)
+        queues = tuple(options['queues']) if options['queues'] else None
+        poll_interval = options['poll_interval']
+        burst = options['burst']
+
+        if options['metrics_port']:
+            from prometheus_client import start_http_server
+            start_http_server(options['metrics_port'])
+            self.stdout.write(f"Job metrics on :{options['metrics_port']}/metrics")
+
+        self.stop_event = threading.Event()
+        if threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGTERM, self._request_stop)
+            signal.signal(signal.SIGINT, self._request_stop)
+
+        worker_prefix = f"{socket.gethostname()}:{os.getpid()}"
+        workers = [
+            threading.Thread(
+                target=self._work,
+                args=(f"{worker_prefix}:{i}", queues, poll_interval, burst),
+                name=f"job-worker-{i}",
+                daemon=True,
+            )
+            for i in range(threads)
+        ]
+        self.stdout.write(self.style.SUCCESS(
+            f"Starting {threads} worker thread(s) on queue(s): {', '.join(queues) if queues else 'all'}"
+        ))
+        for worker in workers:
+            worker.start()
+
+        last_housekeeping = 0
+        while any(worker.is_alive() for worker in workers):
+            if time.monotonic() - last_housekeeping >= 60:
+                self._housekeeping()
+                last_housekeeping = time.monotonic()
+            for worker in workers:
+                worker.join(timeout=1)
+            if self.stop_event.is_set():
+                break
+
+        for worker in workers:
+            worker.join()
+        connection.close()
+        self.stdout.write(self.style.SUCCESS("Workers stopped"))
+
+    def _request_stop(self, signum, frame):
+        self.stdout.write("Stop requested, finishing running jobs...")
+        self.stop_event.set()
+
+    def _work(self, worker_id, queues, poll_interval, burst):
+        try:
+            while not self.stop_event.is_set():
+                close_old_connections()
+                try:
+                    ran = run_once(worker_id, queues=queues)
+                except Exception as e:
+                    self.stderr.write(f"[{worker_id}] error claiming jobs: {str(e)}")
+                    ran = False
+                if not ran:
+                    if burst:
+                        return
+                    self.stop_event.wait(poll_interval)
+        finally:
+            connection.close()
+
+    def _housekeeping(self):
+        try:
+            recovered = requeue_stale_jobs()
+            if recovered:
+                self.stdout.write(self.style.WARNING(f"Recovered {recovered} stale job(s)"))
+            prune_finished_jobs()
+            update_queue_depth_metrics()
+        except Exception as e:
+            self.stderr.write(f"Job housekeeping failed: {str(e)}")
+        finally:
+            close_old_connections()
@@ -0,0 +1,42 @@
+# Generated by Django 5.0.1 on 2026-10-19 10:30
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Job',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('queue', models.CharField(default='default', max_length=50)),
+                ('task', models.CharField(help_text='Dotted path of the callable to run', max_length=255)),
+                ('kwargs', models.JSONField(blank=True, default=dict, help_text='Keyword arguments passed to the task')),
+                ('status', models.CharField(choices=[('queued', 'Queued'), ('running', 'Running'), ('succeeded', 'Succeeded'), ('failed', 'Failed')], default='queued', max_length=20)),
+                ('priority', models.SmallIntegerField(default=0, help_text='Lower values run first')),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('max_attempts', models.PositiveIntegerField(default=3)),
+                ('run_at', models.DateTimeField(default=django.utils.timezone.now, help_text='Earliest time the job may run')),
+                ('locked_by', models.CharField(blank=True, max_length=100)),
+                ('locked_at', models.DateTimeField(blank=True, null=True)),
+                ('last_error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'ordering': ['priority', 'run_at'],
+                'indexes': [
+                    models.Index(condition=models.Q(('status', 'queued')), fields=['queue', 'priority', 'run_at'], name='jobs_job_ready_idx'),
+                    models.Index(fields=['status', 'locked_at'], name='jobs_job_status_locked_idx'),
+                ],
+            },
+        ),
+    ]
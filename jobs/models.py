@@ -0,0 +1,50 @@
+from django.db import models
+from django.db.models import Q
+from django.utils import timezone
+
+
+class Job(models.Model):
+    """
+    A unit of background work stored in Postgres.
+
+    Workers (`python manage.py run_workers`) claim queued rows with
+    SELECT ... FOR UPDATE SKIP LOCKED, so any number of worker threads or
+    machines can share the table without a broker.
+    """
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('succeeded', 'Succeeded'),
+        ('failed', 'Failed'),
+    ]
+
+    queue = models.CharField(max_length=50, default='default')
+    task = models.CharField(max_length=255, help_text="Dotted path of the callable to run")
+    kwargs = models.JSONField(default=dict, blank=True, help_text="Keyword arguments passed to the task")
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='queued')
+    priority = models.SmallIntegerField(default=0, help_text="Lower values run first")
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=3)
+    run_at = models.DateTimeField(default=timezone.now, help_text="Earliest time the job may run")
+    locked_by = models.CharField(max_length=100, blank=True)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['priority', 'run_at']
+        indexes = [
+            # Claim query: queued jobs of a queue, by priority and due time
+            models.Index(
+                fields=['queue', 'priority', 'run_at'],
+                name='jobs_job_ready_idx',
+                condition=Q(status='queued'),
+            ),
+            # Stale-lock recovery and pruning
+            models.Index(fields=['status', 'locked_at'], name='jobs_job_status_locked_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.task} [{self.status}] (#{self.pk})"
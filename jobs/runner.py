@@ -0,0 +1,220 @@
+"""
+Enqueue, claim and execute background jobs.
+
+    from jobs.runner import enqueue
+    enqueue('users.otp_delivery.send_otp_job', queue='otp', user_id=user.pk)
+
+Jobs are plain rows, so enqueueing inside a transaction only makes the job
+visible to workers once that transaction commits. Task callables receive the
+stored kwargs; an exception marks the attempt failed and the job is retried
+with exponential backoff until max_attempts is reached.
+"""
+import logging
+import threading
+import time
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+_local = threading.local()
+_metrics = None
+
+
+def _get_metrics():
+    global _metrics
+    if _metrics is None:
+        from prometheus_client import Counter, Gauge, Histogram
+
+        _metrics = {
+            'processed': Counter(
+                'jobs_processed_total',
+                'Background job attempts by task and outcome (succeeded, retried, failed).',
+                ['task', 'outcome'],
+            ),
+            'duration': Histogram(
+                'jobs_duration_seconds',
+                'Background job run time by task.',
+                ['task'],
+                buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0, float('inf')),
+            ),
+            'depth': Gauge(
+                'jobs_queue_depth',
+                'Jobs per queue and status.',
+                ['queue', 'status'],
+            ),
+        }
+    return _metrics
+
+
+def current_job():
+    """The Job being executed by this thread, or None outside a worker."""
+    return getattr(_local, 'job', None)
+
+
+def enqueue(task, queue='default', run_at=None, priority=0, max_attempts=None, **kwargs):
+    """
+    Store a job for the workers.
+
+    Args:
+        task: Callable or its dotted path; must be importable by the worker
+        queue: Queue name (workers can be started per queue)
+        run_at: Earliest run time (default: now)
+        priority: Lower runs first
+        max_attempts: Defaults to JOBS_MAX_ATTEMPTS
+        **kwargs: JSON-serializable keyword arguments for the task
+
+    Returns:
+        Job
+    """
+    if callable(task):
+        task = f"{task.__module__}.{task.__qualname__}"
+    return Job.objects.create(
+        task=task,
+        queue=queue,
+        kwargs=kwargs,
+        priority=priority,
+        run_at=run_at or timezone.now(),
+        max_attempts=max_attempts or getattr(settings, 'JOBS_MAX_ATTEMPTS', 3),
+    )
+
+
+def enqueue_once(task, queue='default', run_at=None, **kwargs):
+    """
+    enqueue() unless the same task is already waiting in `queue`.
+
+    Periodic jobs reschedule themselves through this, so starting a chain on
+    every deploy (or a duplicate slipping in) never multiplies the runs.
+    Returns the new or the already queued Job.
+    """
+    if callable(task):
+        task = f"{task.__module__}.{task.__qualname__}"
+    existing = Job.objects.filter(task=task, queue=queue, status='queued').order_by('run_at').first()
+    if existing is not None:
+        return existing
+    return enqueue(task, queue=queue, run_at=run_at, **kwargs)
+
+
+def retry_delay(attempts):
+    """Backoff before the next attempt: JOBS_RETRY_BACKOFF * 2^(attempts-1), capped."""
+    base = getattr(settings, 'JOBS_RETRY_BACKOFF', 10)
+    cap = getattr(settings, 'JOBS_RETRY_BACKOFF_MAX', 3600)
+    return timedelta(seconds=min(base * (2 ** max(attempts - 1, 0)), cap))
+
+
+def claim_jobs(worker_id, queues=None, limit=1):
+    """
+    Atomically claim up to `limit` due jobs from `queues` (all queues when None).
+    Rows locked by other workers are skipped rather than waited on.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        candidates = Job.objects.select_for_update(skip_locked=True).filter(status='queued', run_at__lte=now)
+        if queues:
+            candidates = candidates.filter(queue__in=queues)
+        jobs = list(candidates.order_by('priority', 'run_at')[:limit])
+        if not jobs:
+            return []
+        Job.objects.filter(pk__in=[job.pk for job in jobs]).update(
+            status='running', locked_by=worker_id, locked_at=now, attempts=F('attempts') + 1
+        )
+    for job in jobs:
+        job.status = 'running'
+        job.locked_by = worker_id
+        job.locked_at = now
+        job.attempts += 1
+    return jobs
+
+
+def execute_job(job):
+    """Run a claimed job and record its outcome. Returns the outcome string."""
+    metrics = _get_metrics()
+    _local.job = job
+    start = time.perf_counter()
+    try:
+        func = import_string(job.task)
+        func(**job.kwargs)
+    except Exception as e:
+        now = timezone.now()
+        error = ''.join(traceback.format_exception(type(e), e, e.__traceback__))[-5000:]
+        if job.attempts >= job.max_attempts:
+            outcome = 'failed'
+            fields = {'status': 'failed', 'finished_at': now}
+            logger.error(f"Job {job.pk} ({job.task}) failed after {job.attempts} attempts: {str(e)}")
+        else:
+            outcome = 'retried'
+            fields = {'status': 'queued', 'run_at': now + retry_delay(job.attempts)}
+            logger.warning(f"Job {job.pk} ({job.task}) attempt {job.attempts} failed, will retry: {str(e)}")
+        Job.objects.filter(pk=job.pk).update(locked_by='', locked_at=None, last_error=error, **fields)
+    else:
+        outcome = 'succeeded'
+        Job.objects.filter(pk=job.pk).update(
+            status='succeeded', finished_at=timezone.now(), locked_by='', locked_at=None, last_error=''
+        )
+    finally:
+        _local.job = None
+        metrics['duration'].labels(task=job.task).observe(time.perf_counter() - start)
+
+    metrics['processed'].labels(task=job.task, outcome=outcome).inc()
+    return outcome
+
+
+def run_once(worker_id, queues=None):
+    """Claim and execute one job. Returns False when nothing was due."""
+    jobs = claim_jobs(worker_id, queues=queues, limit=1)
+    for job in jobs:
+        execute_job(job)
+    return bool(jobs)
+
+
+def requeue_stale_jobs(timeout_seconds=None):
+    """
+    Recover jobs whose worker died mid-run (locked longer than JOBS_LOCK_TIMEOUT).
+    Returns the number of jobs re-queued or failed.
+    """
+    timeout_seconds = timeout_seconds or getattr(settings, 'JOBS_LOCK_TIMEOUT', 900)
+    cutoff = timezone.now() - timedelta(seconds=timeout_seconds)
+    stale = Job.objects.filter(status='running', locked_at__lt=cutoff)
+
+    failed = stale.filter(attempts__gte=F('max_attempts')).update(
+        status='failed', finished_at=timezone.now(), locked_by='', locked_at=None,
+        last_error='Worker lock expired',
+    )
+    requeued = stale.update(
+        status='queued', run_at=timezone.now(), locked_by='', locked_at=None,
+        last_error='Worker lock expired',
+    )
+    return failed + requeued
+
+
+def prune_finished_jobs(days=None):
+    """Delete succeeded jobs older than JOBS_KEEP_SUCCEEDED_DAYS. Failed jobs are kept."""
+    days = days or getattr(settings, 'JOBS_KEEP_SUCCEEDED_DAYS', 7)
+    cutoff = timezone.now() - timedelta(days=days)
+    deleted, _ = Job.objects.filter(status='succeeded', finished_at__lt=cutoff).delete()
+    return deleted
+
+
+def update_queue_depth_metrics():
+    from django.db.models import Count
+
+    depth = _get_metrics()['depth']
+    rows = Job.objects.filter(status__in=['queued', 'running']).values('queue', 'status').annotate(n=Count('id'))
+    seen = set()
+    for row in rows:
+        depth.labels(queue=row['queue'], status=row['status']).set(row['n'])
+        seen.add((row['queue'], row['status']))
+    # Reset series that drained to zero since the last update
+    for metric in depth.collect():
+        for sample in metric.samples:
+            key = (sample.labels.get('queue'), sample.labels.get('status'))
+            if key not in seen:
+                depth.labels(queue=key[0], status=key[1]).set(0)
@@ -0,0 +1,72 @@
+from datetime import timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+
+from .models import Job
+from .runner import enqueue, enqueue_once, retry_delay, run_once
+
+CALLS = []
+
+
+def record_call(value):
+    CALLS.append(value)
+
+
+def always_fail():
+    raise ValueError("boom")
+
+
+class JobRunnerTests(TestCase):
+    """Test cases for the Postgres-backed job runner"""
+
+    def setUp(self):
+        CALLS.clear()
+
+    def test_enqueued_job_runs_once(self):
+        job = enqueue(record_call, value=42)
+
+        self.assertTrue(run_once('test-worker'))
+        self.assertFalse(run_once('test-worker'))
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'succeeded')
+        self.assertEqual(job.attempts, 1)
+        self.assertEqual(CALLS, [42])
+
+    def test_failed_job_is_retried_with_backoff(self):
+        job = enqueue(always_fail, max_attempts=2)
+
+        run_once('test-worker')
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'queued')
+        self.assertGreater(job.run_at, timezone.now())
+        self.assertIn('boom', job.last_error)
+
+        # Not due yet
+        self.assertFalse(run_once('test-worker'))
+
+        Job.objects.filter(pk=job.pk).update(run_at=timezone.now() - timedelta(seconds=1))
+        run_once('test-worker')
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'failed')
+        self.assertEqual(job.attempts, 2)
+
+    def test_queue_filter(self):
+        enqueue(record_call, queue='otp', value='otp')
+
+        self.assertFalse(run_once('test-worker', queues=('default',)))
+        self.assertTrue(run_once('test-worker', queues=('otp',)))
+        self.assertEqual(CALLS, ['otp'])
+
+    def test_retry_delay_is_exponential(self):
+        self.assertEqual(retry_delay(2), retry_delay(1) * 2)
+
+    def test_enqueue_once_keeps_a_single_waiting_job(self):
+        first = enqueue_once(record_call, value=1)
+        second = enqueue_once(record_call, value=2)
+        self.assertEqual(first.pk, second.pk)
+
+        run_once('test-worker')
+        third = enqueue_once(record_call, value=3)
+        self.assertNotEqual(third.pk, first.pk)
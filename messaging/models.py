@@ -101,3 +101,40 @@ class Message(models.Model):
         """Check if message is read"""
         return self.read_at is not None
 
+
+class ArchivedMessage(models.Model):
+    """
+    Cold copy of Message rows moved out of the hot table by
+    MessageRetentionService: read messages after MESSAGE_RETENTION_DAYS, unread
+    ones after MESSAGE_UNREAD_RETENTION_DAYS. Kept ARCHIVE_RETENTION_DAYS.
+    """
+    original_id = models.BigIntegerField(help_text="Message.id before archiving")
+    conversation = models.ForeignKey(
+        Conversation,
+        on_delete=models.CASCADE,
+        related_name='archived_messages'
+    )
+    sender = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='archived_sent_messages'
+    )
+    content = models.TextField()
+    read_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['conversation', 'created_at'], name='messaging_archmsg_conv_idx'),
+            models.Index(fields=['archived_at'], name='messaging_archmsg_archived_idx'),
+        ]
+
+    def __str__(self):
+        return f"Archived message from user {self.sender_id} at {self.created_at}"
+
+    @property
+    def is_read(self):
+        return self.read_at is not None
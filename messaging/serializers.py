@@ -1,6 +1,6 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
-from .models import Message, Conversation
+from .models import ArchivedMessage, Message, Conversation
 
 User = get_user_model()
 
@@ -82,6 +82,23 @@ class MessageSerializer(serializers.ModelSerializer):
         return message
 
 
+
+class ArchivedMessageSerializer(serializers.ModelSerializer):
+    """Read-only archived message, shaped like MessageSerializer (id is the original message id)"""
+    id = serializers.IntegerField(source='original_id', read_only=True)
+    sender = UserBasicSerializer(read_only=True)
+    is_read = serializers.BooleanField(read_only=True)
+    archived = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ArchivedMessage
+        fields = ['id', 'conversation', 'sender', 'content',
+                  'read_at', 'is_read', 'created_at', 'updated_at', 'archived']
+        read_only_fields = fields
+
+    def get_archived(self, obj):
+        return True
+
 class ConversationSerializer(serializers.ModelSerializer):
     """Serializer for Conversation model"""
     participant1 = UserBasicSerializer(read_only=True)
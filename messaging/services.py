@@ -0,0 +1,50 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+import logging
+
+from users.retention_utils import apply_archive_policy
+from .models import ArchivedMessage, Message
+
+logger = logging.getLogger(__name__)
+
+
+class MessageRetentionService:
+    """
+    Moves old chat messages to ArchivedMessage in keyset batches
+    (users.retention_utils): read ones after MESSAGE_RETENTION_DAYS, unread
+    ones after MESSAGE_UNREAD_RETENTION_DAYS.
+    """
+
+    COLUMNS = ['conversation_id', 'sender_id', 'content', 'read_at', 'created_at', 'updated_at']
+    WHERE = '(read_at IS NOT NULL AND created_at < %s) OR created_at < %s'
+
+    @staticmethod
+    def apply(batch_size=None, pause=0, dry_run=False):
+        """{'archived': n, 'pruned': n}; see apply_archive_policy()."""
+        days = (
+            getattr(settings, 'MESSAGE_RETENTION_DAYS', 180),
+            getattr(settings, 'MESSAGE_UNREAD_RETENTION_DAYS', 365),
+        )
+        return apply_archive_policy(
+            Message, ArchivedMessage, MessageRetentionService.COLUMNS,
+            MessageRetentionService.WHERE, days, batch_size, pause, dry_run,
+        )
+
+
+def archive_messages_job():
+    """
+    Background job: archive old messages, then schedule the next run after
+    RETENTION_INTERVAL seconds (start with archive_messages --schedule).
+    """
+    from jobs.runner import enqueue_once
+
+    interval = getattr(settings, 'RETENTION_INTERVAL', 86400)
+    if interval:
+        # Scheduled first so a failing run does not end the chain
+        enqueue_once(
+            archive_messages_job, queue='maintenance',
+            run_at=timezone.now() + timedelta(seconds=interval),
+        )
+    MessageRetentionService.apply()
@@ -0,0 +1,27 @@
+from datetime import timedelta
+
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from .models import ArchivedMessage, Conversation, Message
+from .services import MessageRetentionService
+
+User = get_user_model()
+
+
+class MessageRetentionTest(TestCase):
+    """Old messages move to ArchivedMessage in batches"""
+
+    def test_apply_archives_expired_messages(self):
+        alice = User.objects.create_user(username='alice', password='testpass123', phone_number='9876543201')
+        bob = User.objects.create_user(username='bob', password='testpass123', phone_number='9876543202')
+        conversation, _ = Conversation.get_or_create_conversation(alice, bob)
+        now = timezone.now()
+        Message.objects.create(conversation=conversation, sender=alice, content='old', read_at=now)
+        Message.objects.create(conversation=conversation, sender=bob, content='new')
+        Message.objects.filter(content='old').update(created_at=now - timedelta(days=200))
+
+        self.assertEqual(MessageRetentionService.apply(batch_size=1)['archived'], 1)
+        archived = ArchivedMessage.objects.get()
+        self.assertEqual((archived.content, archived.conversation_id), ('old', conversation.id))
+        self.assertEqual(list(Message.objects.values_list('content', flat=True)), ['new'])
@@ -9,6 +9,7 @@ from django.contrib.auth import get_user_model
 from .models import Message, Conversation
 from .serializers import (
     MessageSerializer, 
+    ArchivedMessageSerializer,
     ConversationSerializer, 
     CreateMessageSerializer,
     UserBasicSerializer
@@ -88,7 +89,14 @@ class ConversationViewSet(viewsets.ModelViewSet):
         # User is a participant, return messages
         messages = conversation.messages.all()
         serializer = MessageSerializer(messages, many=True)
-        return Response(serializer.data)
+        if request.query_params.get('include_archived', '').lower() != 'true':
+            return Response(serializer.data)
+
+        # Older history moved out by the retention job (archive_messages)
+        archived = ArchivedMessageSerializer(
+            conversation.archived_messages.select_related('sender'), many=True
+        ).data
+        return Response(sorted([*archived, *serializer.data], key=lambda message: message['created_at']))
     
     @action(detail=True, methods=['post'], url_path='mark-read')
     def mark_read(self, request, pk=None):
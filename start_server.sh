@@ -27,6 +27,19 @@ python manage.py migrate --noinput
 echo '📁 Collecting static files...'
 python manage.py collectstatic --noinput
 
+# Background job workers (jobs app: OTP delivery, sync work). Set JOB_WORKERS_ENABLED=false
+# to run them as a separate process instead (python manage.py run_workers).
+if [ "${JOB_WORKERS_ENABLED:-true}" = "true" ]; then
+  echo '⚙️  Starting background job workers...'
+  python manage.py run_workers --threads "${JOBS_WORKER_THREADS:-2}" &
+  # Recurring maintenance jobs (no-op when already queued)
+  python manage.py refresh_inventory_status --schedule || echo '⚠️  Could not schedule inventory status refresh, continuing...'
+  python manage.py snapshot_inventory_balances --schedule || echo '⚠️  Could not schedule inventory snapshots, continuing...'
+  python manage.py schedule_equipment_maintenance --schedule || echo '⚠️  Could not schedule equipment maintenance, continuing...'
+  python manage.py archive_notifications --schedule || echo '⚠️  Could not schedule notification retention, continuing...'
+  python manage.py archive_messages --schedule || echo '⚠️  Could not schedule message retention, continuing...'
+fi
+
 echo '🌐 Starting Gunicorn server...'
 
 # PORT: Fly.io uses 8080, Render uses PORT from env, local default 8000
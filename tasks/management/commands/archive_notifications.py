@@ -0,0 +1,39 @@
+"""
+Management command to archive old notifications and prune old archives.
+Run: python manage.py archive_notifications [--batch-size 5000] [--pause 0.1] [--dry-run] [--schedule]
+
+Read notifications older than NOTIFICATION_RETENTION_DAYS (unread ones after
+NOTIFICATION_UNREAD_RETENTION_DAYS) move to tasks.ArchivedNotification.
+Archived rows are deleted after ARCHIVE_RETENTION_DAYS (0 keeps them). Rows
+move in short batches (one transaction each), so users are never blocked
+behind the run. --schedule instead queues the recurring background job (every
+RETENTION_INTERVAL seconds, picked up by run_workers); it is safe to run on
+every deploy.
+"""
+from django.core.management.base import BaseCommand
+
+from tasks.services import NotificationRetentionService, archive_notifications_job
+
+
+class Command(BaseCommand):
+    help = "Archive old notifications in batches and prune old archives, or schedule the recurring job"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, help='Rows per transaction (default RETENTION_BATCH_SIZE)')
+        parser.add_argument('--pause', type=float, default=0, help='Seconds to sleep between batches')
+        parser.add_argument('--dry-run', action='store_true', help='Only count the rows that would be archived')
+        parser.add_argument('--schedule', action='store_true', help='Queue the recurring job instead of running now')
+
+    def handle(self, *args, **options):
+        if options['schedule']:
+            from jobs.runner import enqueue_once
+
+            job = enqueue_once(archive_notifications_job, queue='maintenance')
+            self.stdout.write(self.style.SUCCESS(f"Notifications retention scheduled (job {job.pk}, due {job.run_at})"))
+            return
+
+        counts = NotificationRetentionService.apply(options.get('batch_size'), options['pause'], options['dry_run'])
+        verb = 'would be archived' if options['dry_run'] else 'archived'
+        self.stdout.write(self.style.SUCCESS(
+            f"Notifications: {counts['archived']} {verb}, {counts['pruned']} archived rows pruned"
+        ))
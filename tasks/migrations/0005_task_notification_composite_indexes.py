@@ -0,0 +1,29 @@
+# Generated by Django 5.0.1 on 2026-10-19 13:00
+
+from django.contrib.postgres.operations import AddIndexConcurrently, RemoveIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Build indexes without locking writes on these tables
+    atomic = False
+
+    dependencies = [
+        ('tasks', '0004_rename_tasks_notification_user_idx_tasks_notif_user_id_23b12d_idx_and_more'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='task',
+            index=models.Index(fields=['industry', 'assigned_to', 'status'], name='tasks_task_ind_assignee_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='notification',
+            index=models.Index(fields=['user', 'is_read', 'created_at'], name='tasks_notif_user_read_idx'),
+        ),
+        # Prefix of tasks_notif_user_read_idx
+        RemoveIndexConcurrently(
+            model_name='notification',
+            name='tasks_notif_user_id_9ee72a_idx',
+        ),
+    ]
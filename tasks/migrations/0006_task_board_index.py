@@ -0,0 +1,35 @@
+# Generated by Django 5.0.1 on 2026-10-19 20:00
+
+from django.contrib.postgres.operations import AddIndexConcurrently, RemoveIndexConcurrently
+from django.db import migrations, models
+
+# Tasks created through the API never had industry set; take it from the creator
+# so industry-scoped views (board, calendar) see them.
+BACKFILL_INDUSTRY_SQL = """
+UPDATE tasks_task t
+SET industry_id = u.industry_id
+FROM users_user u
+WHERE t.created_by_id = u.id AND t.industry_id IS NULL AND u.industry_id IS NOT NULL
+"""
+
+
+class Migration(migrations.Migration):
+    # Build indexes without locking writes on tasks
+    atomic = False
+
+    dependencies = [
+        ('tasks', '0005_task_notification_composite_indexes'),
+    ]
+
+    operations = [
+        migrations.RunSQL(BACKFILL_INDUSTRY_SQL, migrations.RunSQL.noop),
+        AddIndexConcurrently(
+            model_name='task',
+            index=models.Index(fields=['assigned_to', 'status', 'due_date'], name='tasks_task_assignee_due_idx'),
+        ),
+        # Prefix of tasks_task_assignee_due_idx
+        RemoveIndexConcurrently(
+            model_name='task',
+            name='tasks_task_assigne_ab55af_idx',
+        ),
+    ]
@@ -1,5 +1,6 @@
 from django.db import models
 from django.conf import settings
+from django.utils import timezone
 
 class Task(models.Model):
     STATUS_CHOICES = (
@@ -42,8 +43,10 @@ class Task(models.Model):
         indexes = [
             models.Index(fields=['status']),
             models.Index(fields=['priority']),
-            models.Index(fields=['assigned_to']),
             models.Index(fields=['due_date']),
+            models.Index(fields=['industry', 'assigned_to', 'status'], name='tasks_task_ind_assignee_idx'),
+            # Board columns and "my overdue": assignee + status, walked in due_date order (tasks.board)
+            models.Index(fields=['assigned_to', 'status', 'due_date'], name='tasks_task_assignee_due_idx'),
         ]
 
     def __str__(self):
@@ -53,6 +56,12 @@ class Task(models.Model):
         if self.status == 'completed' and not self.completed_at:
             from django.utils import timezone
             self.completed_at = timezone.now()
+        if self.industry_id is None:
+            # Calendar, board and cache invalidation are per industry: default to
+            # the creator's (or assignee's) industry on every write path
+            creator = self.created_by if self.created_by_id else None
+            assignee = self.assigned_to if self.assigned_to_id else None
+            self.industry_id = getattr(creator, 'industry_id', None) or getattr(assignee, 'industry_id', None)
         super().save(*args, **kwargs)
 
 class TaskComment(models.Model):
@@ -106,8 +115,40 @@ class Notification(models.Model):
         ordering = ['-created_at']
         indexes = [
             models.Index(fields=['user']),
-            models.Index(fields=['user', 'is_read']),
+            # Covers (user) and (user, is_read) lookups and the newest-first ordering
+            models.Index(fields=['user', 'is_read', 'created_at'], name='tasks_notif_user_read_idx'),
         ]
 
     def __str__(self):
-        return f"Notification for {self.user.username}: {self.message[:50]}" 
\ No newline at end of file
+        return f"Notification for {self.user.username}: {self.message[:50]}" 
+
+
+class ArchivedNotification(models.Model):
+    """
+    Cold copy of Notification rows moved out of the hot table by
+    NotificationRetentionService: read alerts after NOTIFICATION_RETENTION_DAYS,
+    unread ones after NOTIFICATION_UNREAD_RETENTION_DAYS. Kept
+    ARCHIVE_RETENTION_DAYS.
+    """
+    original_id = models.BigIntegerField(help_text="Notification.id before archiving")
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='archived_notifications',
+    )
+    message = models.TextField()
+    is_read = models.BooleanField(default=False)
+    created_at = models.DateTimeField()
+    # Plain id: the task may be deleted long before the archive is pruned
+    related_task_id = models.BigIntegerField(null=True, blank=True)
+    archived_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', 'created_at'], name='tasks_archnotif_user_idx'),
+            models.Index(fields=['archived_at'], name='tasks_archnotif_archived_idx'),
+        ]
+
+    def __str__(self):
+        return f"Archived notification for user {self.user_id}: {self.message[:50]}"
@@ -50,6 +50,19 @@ class TaskCreateSerializer(serializers.ModelSerializer):
         fields = ('title', 'description', 'status', 'priority',
                  'assigned_to_id', 'due_date')
 
+class TaskBulkAssignSerializer(serializers.ModelSerializer):
+    """One task template plus the users to assign a copy of it to."""
+    assigned_to_ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        write_only=True
+    )
+
+    class Meta:
+        model = Task
+        fields = ('title', 'description', 'status', 'priority',
+                 'due_date', 'assigned_to_ids')
+
 class TaskUpdateSerializer(serializers.ModelSerializer):
     class Meta:
         model = Task
@@ -0,0 +1,242 @@
+import base64
+import json
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Count, F, Q, Window
+from django.db.models.functions import RowNumber
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework import serializers
+import logging
+
+from users.multi_tenant_utils import get_user_industry
+from users.retention_utils import apply_archive_policy
+from .models import ArchivedNotification, Task, Notification
+
+logger = logging.getLogger(__name__)
+
+OPEN_STATUSES = ('pending', 'in_progress')
+
+
+def should_notify_task_assignment(industry, created_by, assigned_to):
+    """
+    Alert rule for a newly created task: only Grapes industry tasks created by
+    a field officer and assigned to a farmer notify the assignee. Roles are
+    read from user.role, so pass users with role already loaded in bulk paths.
+    """
+    if not assigned_to:
+        return False
+    if not industry or getattr(industry, 'crop_type', None) != 'grapes':
+        return False
+    if not (created_by and created_by.has_role('fieldofficer')):
+        return False
+    return assigned_to.has_role('farmer')
+
+
+def task_assignment_notification(task, assigned_to):
+    """Unsaved Notification for `task`'s assignee."""
+    return Notification(
+        user=assigned_to,
+        message=f"New task assigned: {task.title}",
+        related_task=task,
+    )
+
+
+class TaskBoardService:
+    """
+    Kanban-style task board: per-status counts and one column per status.
+
+    Counts are a single aggregate with a filtered COUNT per status. Columns are
+    ordered by (due_date, id) and paged with an opaque keyset cursor instead of
+    OFFSET, so "load more" stays an index range scan on
+    tasks_task_assignee_due_idx (assigned_to, status, due_date) however deep
+    the column is.
+    """
+
+    CARD_FIELDS = (
+        'id', 'title', 'status', 'priority', 'due_date',
+        'assigned_to_id', 'assigned_to__username', 'created_by_id',
+    )
+
+    @staticmethod
+    def encode_cursor(card):
+        raw = json.dumps([card['due_date'].isoformat(), card['id']])
+        return base64.urlsafe_b64encode(raw.encode()).decode()
+
+    @staticmethod
+    def decode_cursor(cursor):
+        try:
+            due_date, task_id = json.loads(base64.urlsafe_b64decode(cursor.encode()).decode())
+            due_date = parse_datetime(due_date)
+            task_id = int(task_id)
+        except (ValueError, TypeError, UnicodeDecodeError):
+            due_date = None
+        if due_date is None:
+            raise serializers.ValidationError({'cursor': 'Invalid cursor.'})
+        return due_date, task_id
+
+    @staticmethod
+    def counts(queryset):
+        """{'pending': n, ..., 'overdue': n, 'total': n} in one aggregate query."""
+        aggregates = {
+            status: Count('id', filter=Q(status=status)) for status, _ in Task.STATUS_CHOICES
+        }
+        aggregates['overdue'] = Count('id', filter=Q(status__in=OPEN_STATUSES, due_date__lt=timezone.now()))
+        aggregates['total'] = Count('id')
+        return queryset.order_by().aggregate(**aggregates)
+
+    @staticmethod
+    def columns(queryset, statuses, limit):
+        """
+        First page of every status column in one query (ROW_NUMBER per status).
+
+        Returns:
+            {status: {'results': [card, ...], 'next_cursor': str | None}}
+        """
+        rows = (
+            queryset.filter(status__in=statuses)
+            .annotate(position=Window(
+                RowNumber(),
+                partition_by=[F('status')],
+                order_by=[F('due_date').asc(), F('id').asc()],
+            ))
+            .filter(position__lte=limit + 1)
+            .order_by('status', 'due_date', 'id')
+            .values(*TaskBoardService.CARD_FIELDS)
+        )
+        cards = {status: [] for status in statuses}
+        for row in rows:
+            cards[row['status']].append(row)
+        return {status: TaskBoardService._page(column, limit) for status, column in cards.items()}
+
+    @staticmethod
+    def column(queryset, status, limit, cursor=None):
+        """One page of a status column, after `cursor` (from a previous page's next_cursor)."""
+        queryset = queryset.filter(status=status)
+        if cursor:
+            due_date, task_id = TaskBoardService.decode_cursor(cursor)
+            queryset = queryset.filter(Q(due_date__gt=due_date) | Q(due_date=due_date, id__gt=task_id))
+        rows = list(queryset.order_by('due_date', 'id').values(*TaskBoardService.CARD_FIELDS)[:limit + 1])
+        return TaskBoardService._page(rows, limit)
+
+    @staticmethod
+    def _page(rows, limit):
+        results = rows[:limit]
+        next_cursor = TaskBoardService.encode_cursor(results[-1]) if len(rows) > limit else None
+        return {'results': results, 'next_cursor': next_cursor}
+
+
+class TaskAssignmentService:
+    """
+    One task per assignee in a single request (e.g. a manager handing the same
+    spraying round to many farmers).
+
+    Assignees and their roles/industries come from one query, tasks and their
+    alerts are two bulk_create INSERTs, and the alert rule is the same one the
+    post_save signal applies to single tasks (should_notify_task_assignment).
+    bulk_create skips signals and save(), so completed_at and the calendar
+    cache invalidation are done here.
+    """
+
+    @staticmethod
+    def bulk_assign(data, assignee_ids, user):
+        """
+        Args:
+            data: validated task fields (title, description, status, priority, due_date)
+            assignee_ids: user ids, one task each (duplicates are ignored)
+            user: the creator
+
+        Returns:
+            (created tasks, notifications created)
+
+        Raises:
+            serializers.ValidationError: too many assignees, or unknown assignees / outside the user's industry
+        """
+        max_assignees = getattr(settings, 'TASK_BULK_MAX_ASSIGNEES', 1000)
+        assignee_ids = list(dict.fromkeys(assignee_ids))
+        if not assignee_ids:
+            raise serializers.ValidationError({'assigned_to_ids': ["At least one assignee is required"]})
+        if len(assignee_ids) > max_assignees:
+            raise serializers.ValidationError({
+                'assigned_to_ids': [f"At most {max_assignees} assignees per request, got {len(assignee_ids)}"]
+            })
+
+        industry = get_user_industry(user)
+        assignees = get_user_model().objects.filter(pk__in=assignee_ids).select_related('role', 'industry')
+        if industry is not None:
+            assignees = assignees.filter(industry=industry)
+        assignees = {assignee.pk: assignee for assignee in assignees}
+        missing = [pk for pk in assignee_ids if pk not in assignees]
+        if missing:
+            raise serializers.ValidationError({'assigned_to_ids': [f"Users not found: {missing}"]})
+
+        now = timezone.now()
+        tasks = [
+            Task(
+                **data,
+                industry=industry or assignees[pk].industry,
+                assigned_to=assignees[pk],
+                created_by=user,
+                completed_at=now if data.get('status') == 'completed' else None,
+            )
+            for pk in assignee_ids
+        ]
+        with transaction.atomic():
+            tasks = Task.objects.bulk_create(tasks)
+            notifications = [
+                task_assignment_notification(task, task.assigned_to)
+                for task in tasks
+                if should_notify_task_assignment(task.industry, user, task.assigned_to)
+            ]
+            Notification.objects.bulk_create(notifications)
+
+            from bookings.calendar import bump_calendar_version
+
+            industry_ids = {task.industry_id for task in tasks}
+            transaction.on_commit(lambda: bump_calendar_version(*industry_ids))
+
+        logger.info(f"User {user.id} assigned {len(tasks)} tasks ({len(notifications)} notifications)")
+        return tasks, len(notifications)
+
+
+class NotificationRetentionService:
+    """
+    Moves old alerts to ArchivedNotification in keyset batches
+    (users.retention_utils): read ones after NOTIFICATION_RETENTION_DAYS,
+    unread ones after NOTIFICATION_UNREAD_RETENTION_DAYS.
+    """
+
+    COLUMNS = ['user_id', 'message', 'is_read', 'created_at', 'related_task_id']
+    WHERE = '(is_read AND created_at < %s) OR created_at < %s'
+
+    @staticmethod
+    def apply(batch_size=None, pause=0, dry_run=False):
+        """{'archived': n, 'pruned': n}; see apply_archive_policy()."""
+        days = (
+            getattr(settings, 'NOTIFICATION_RETENTION_DAYS', 30),
+            getattr(settings, 'NOTIFICATION_UNREAD_RETENTION_DAYS', 180),
+        )
+        return apply_archive_policy(
+            Notification, ArchivedNotification, NotificationRetentionService.COLUMNS,
+            NotificationRetentionService.WHERE, days, batch_size, pause, dry_run,
+        )
+
+
+def archive_notifications_job():
+    """
+    Background job: archive old notifications, then schedule the next run after
+    RETENTION_INTERVAL seconds (start with archive_notifications --schedule).
+    """
+    from jobs.runner import enqueue_once
+
+    interval = getattr(settings, 'RETENTION_INTERVAL', 86400)
+    if interval:
+        # Scheduled first so a failing run does not end the chain
+        enqueue_once(
+            archive_notifications_job, queue='maintenance',
+            run_at=timezone.now() + timedelta(seconds=interval),
+        )
+    NotificationRetentionService.apply()
@@ -6,7 +6,8 @@ Does not affect other industries or roles.
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 
-from .models import Task, Notification
+from .models import Task
+from .services import should_notify_task_assignment, task_assignment_notification
 
 
 @receiver(post_save, sender=Task)
@@ -15,23 +16,9 @@ def create_notification_on_task_assignment(sender, instance, created, **kwargs):
     When a new task is created: if it is a Grapes industry task, created by a
     field officer, and assigned to a farmer, create one Notification for that farmer.
     Other industries (e.g. sugarcane) and other flows are unaffected.
+    Bulk assignment (TaskAssignmentService) applies the same rule without this signal.
     """
-    if not created:
+    if not created or not instance.assigned_to_id:
         return
-    if not instance.assigned_to_id:
-        return
-    # Only for Grapes industry
-    if not instance.industry or getattr(instance.industry, 'crop_type', None) != 'grapes':
-        return
-    # Creator must be field officer, assignee must be farmer
-    created_by = instance.created_by
-    assigned_to = instance.assigned_to
-    if not (created_by and created_by.has_role('fieldofficer')):
-        return
-    if not (assigned_to and assigned_to.has_role('farmer')):
-        return
-    Notification.objects.create(
-        user=assigned_to,
-        message=f"New task assigned: {instance.title}",
-        related_task=instance,
-    )
+    if should_notify_task_assignment(instance.industry, instance.created_by, instance.assigned_to):
+        task_assignment_notification(instance, instance.assigned_to).save()
@@ -0,0 +1,154 @@
+from datetime import timedelta
+
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework import status
+from users.models import Industry, Role
+from .models import Notification, Task
+
+User = get_user_model()
+
+
+class TaskBoardTest(TestCase):
+    """Board counts come from one aggregate; columns page by (due_date, id) cursors"""
+
+    def setUp(self):
+        self.industry = Industry.objects.create(name="Test Industry")
+        manager_role, _ = Role.objects.get_or_create(name='manager', defaults={'display_name': 'Manager'})
+        self.manager = User.objects.create_user(
+            username='manager1',
+            password='testpass123',
+            phone_number='9876543219',
+            role=manager_role,
+            industry=self.industry
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.manager)
+        now = timezone.now()
+        for i in range(5):
+            self._task(f'Pending {i}', 'pending', now + timedelta(days=i - 2))
+        self._task('Doing', 'in_progress', now + timedelta(days=1))
+        self._task('Done', 'completed', now - timedelta(days=3))
+        other_industry = Industry.objects.create(name="Other Industry")
+        Task.objects.create(
+            industry=other_industry, title='Elsewhere', description='-', status='pending',
+            created_by=self.manager, assigned_to=self.manager, due_date=now,
+        )
+
+    def _task(self, title, task_status, due_date):
+        return Task.objects.create(
+            industry=self.industry, title=title, description='-', status=task_status,
+            created_by=self.manager, assigned_to=self.manager, due_date=due_date,
+        )
+
+    def test_counts_and_first_pages(self):
+        response = self.client.get('/api/tasks/board/', {'limit': 2})
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        counts = response.data['counts']
+        self.assertEqual((counts['pending'], counts['in_progress'], counts['completed'], counts['cancelled']), (5, 1, 1, 0))
+        self.assertEqual((counts['overdue'], counts['total']), (2, 7))
+
+        pending = response.data['columns']['pending']
+        self.assertEqual([card['title'] for card in pending['results']], ['Pending 0', 'Pending 1'])
+        self.assertIsNotNone(pending['next_cursor'])
+        self.assertIsNone(response.data['columns']['in_progress']['next_cursor'])
+
+    def test_column_cursor_walks_to_the_end(self):
+        titles, cursor = [], None
+        while True:
+            params = {'status': 'pending', 'limit': 2, 'assigned_to': 'me'}
+            if cursor:
+                params['cursor'] = cursor
+            response = self.client.get('/api/tasks/board/', params)
+            self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+            titles += [card['title'] for card in response.data['results']]
+            cursor = response.data['next_cursor']
+            if not cursor:
+                break
+        self.assertEqual(titles, [f'Pending {i}' for i in range(5)])
+
+        response = self.client.get('/api/tasks/board/', {'status': 'pending', 'cursor': 'garbage'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class TaskBulkAssignTest(TestCase):
+    """Bulk assignment creates tasks and alerts in bulk with the single-task alert rule"""
+
+    def setUp(self):
+        self.industry = Industry.objects.create(name="Grapes Industry", crop_type='grapes')
+        officer_role, _ = Role.objects.get_or_create(name='fieldofficer', defaults={'display_name': 'Field Officer'})
+        farmer_role, _ = Role.objects.get_or_create(name='farmer', defaults={'display_name': 'Farmer'})
+        self.officer = User.objects.create_user(
+            username='officer1', password='testpass123', phone_number='9876543210',
+            role=officer_role, industry=self.industry
+        )
+        self.farmers = [
+            User.objects.create_user(
+                username=f'farmer{i}', password='testpass123', phone_number=f'987654320{i}',
+                role=farmer_role, industry=self.industry
+            )
+            for i in range(3)
+        ]
+        self.other_officer = User.objects.create_user(
+            username='officer2', password='testpass123', phone_number='9876543211',
+            role=officer_role, industry=self.industry
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.officer)
+
+    def test_bulk_assign_notifies_farmers_only(self):
+        assignees = [farmer.id for farmer in self.farmers] + [self.other_officer.id]
+        response = self.client.post('/api/tasks/bulk-assign/', {
+            'title': 'Spray round',
+            'description': 'Copper spray',
+            'priority': 'high',
+            'due_date': (timezone.now() + timedelta(days=2)).isoformat(),
+            'assigned_to_ids': assignees,
+        }, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED, response.data)
+        self.assertEqual((response.data['created'], response.data['notifications']), (4, 3))
+        self.assertEqual(Task.objects.filter(industry=self.industry, created_by=self.officer).count(), 4)
+        notification = Notification.objects.get(user=self.farmers[0])
+        self.assertEqual(notification.message, 'New task assigned: Spray round')
+        self.assertEqual(notification.related_task.assigned_to, self.farmers[0])
+
+    def test_unknown_assignee_creates_nothing(self):
+        response = self.client.post('/api/tasks/bulk-assign/', {
+            'title': 'Spray round',
+            'description': 'Copper spray',
+            'due_date': timezone.now().isoformat(),
+            'assigned_to_ids': [self.farmers[0].id, 999999],
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Task.objects.exists())
+
+
+class NotificationRetentionTest(TestCase):
+    """Old notifications move to ArchivedNotification in batches"""
+
+    def test_apply_archives_expired_notifications(self):
+        from .models import ArchivedNotification
+        from .services import NotificationRetentionService
+
+        alice = User.objects.create_user(username='alice', password='testpass123', phone_number='9876543201')
+        now = timezone.now()
+        for i in range(5):
+            Notification.objects.create(user=alice, message=f'old read {i}', is_read=True)
+        Notification.objects.create(user=alice, message='old unread')
+        Notification.objects.create(user=alice, message='ancient unread')
+        Notification.objects.create(user=alice, message='fresh read', is_read=True)
+        Notification.objects.filter(message__startswith='old').update(created_at=now - timedelta(days=60))
+        Notification.objects.filter(message='ancient unread').update(created_at=now - timedelta(days=400))
+
+        self.assertEqual(NotificationRetentionService.apply(dry_run=True)['archived'], 6)
+        self.assertEqual(NotificationRetentionService.apply(batch_size=2)['archived'], 6)
+        self.assertEqual(
+            set(Notification.objects.values_list('message', flat=True)), {'old unread', 'fresh read'}
+        )
+        self.assertEqual(ArchivedNotification.objects.filter(user=alice).count(), 6)
+
+        ArchivedNotification.objects.update(archived_at=now - timedelta(days=800))
+        self.assertEqual(NotificationRetentionService.apply()['pruned'], 6)
@@ -4,11 +4,13 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 from django.shortcuts import get_object_or_404
 from django.db.models import Q
+from django.utils import timezone
 from .models import Task, TaskComment, TaskAttachment, Notification
 from .serializers import (
     TaskSerializer,
     TaskCreateSerializer,
     TaskUpdateSerializer,
+    TaskBulkAssignSerializer,
     TaskCommentSerializer,
     TaskCommentCreateSerializer,
     TaskAttachmentSerializer,
@@ -16,6 +18,19 @@ from .serializers import (
     NotificationSerializer,
 )
 from .permissions import CanManageTasks, CanViewTasks, IsGrapesFarmerOrFieldOfficer
+from .services import TaskAssignmentService, TaskBoardService
+from users.multi_tenant_utils import get_user_industry
+
+BOARD_MAX_LIMIT = 100
+
+def visible_tasks(user):
+    """Tasks `user` may see: all for admins/managers, own and assigned for field officers, else assigned."""
+    if user.is_superuser or user.has_any_role(['admin', 'manager']):
+        return Task.objects.all()
+    elif user.has_role('fieldofficer'):
+        return Task.objects.filter(Q(assigned_to=user) | Q(created_by=user))
+    return Task.objects.filter(assigned_to=user)
+
 
 class TaskViewSet(viewsets.ModelViewSet):
     serializer_class = TaskSerializer
@@ -29,21 +44,82 @@ class TaskViewSet(viewsets.ModelViewSet):
         return TaskSerializer
 
     def get_permissions(self):
-        if self.action in ['create', 'destroy', 'update', 'partial_update']:
+        if self.action in ['create', 'destroy', 'update', 'partial_update', 'bulk_assign']:
             return [CanManageTasks()]
         return [CanViewTasks()]
 
     def get_queryset(self):
-        user = self.request.user
-        # Use has_any_role and has_role methods, plus is_superuser
-        if user.is_superuser or user.has_any_role(['admin', 'manager']):
-            return Task.objects.all()
-        elif user.has_role('fieldofficer'):
-            return Task.objects.filter(Q(assigned_to=user) | Q(created_by=user))
-        return Task.objects.filter(assigned_to=user)
+        return visible_tasks(self.request.user)
 
     def perform_create(self, serializer):
-        serializer.save(created_by=self.request.user)
+        user = self.request.user
+        # Tasks belong to the creator's industry (global admins: the assignee's)
+        industry = get_user_industry(user)
+        assignee = serializer.validated_data.get('assigned_to')
+        if industry is None and assignee is not None:
+            industry = assignee.industry
+        serializer.save(created_by=user, industry=industry)
+
+    @action(detail=False, methods=['post'], url_path='bulk-assign')
+    def bulk_assign(self, request):
+        """
+        Create one copy of a task per assignee in one request.
+        Body: {"title": "...", "description": "...", "due_date": "...", "priority": "high",
+               "assigned_to_ids": [12, 13, ...]}
+        All tasks are created or none are; Grapes field officer -> farmer
+        assignments notify each farmer as single task creation does.
+        """
+        serializer = TaskBulkAssignSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = dict(serializer.validated_data)
+        assignee_ids = data.pop('assigned_to_ids')
+        tasks, notified = TaskAssignmentService.bulk_assign(data, assignee_ids, request.user)
+        return Response({
+            'created': len(tasks),
+            'notifications': notified,
+            'tasks': [task.pk for task in tasks],
+        }, status=status.HTTP_201_CREATED)
+
+    @action(detail=False, methods=['get'])
+    def board(self, request):
+        """
+        GET /api/tasks/board/ - per-status counts and the first page of each status column.
+        GET /api/tasks/board/?status=pending&cursor=<next_cursor> - the next page of one column.
+
+        Filters: assigned_to=me|<user id>, overdue=true (open tasks past due),
+        limit=<cards per column, default 20, max 100>. Columns are ordered by due date.
+        """
+        queryset = self.get_queryset()
+        industry = get_user_industry(request.user)
+        if industry is not None:
+            queryset = queryset.filter(industry=industry)
+
+        assigned_to = request.query_params.get('assigned_to')
+        if assigned_to == 'me':
+            queryset = queryset.filter(assigned_to=request.user)
+        elif assigned_to:
+            if not assigned_to.isdigit():
+                return Response({'error': 'assigned_to must be "me" or a user id'}, status=status.HTTP_400_BAD_REQUEST)
+            queryset = queryset.filter(assigned_to_id=int(assigned_to))
+        if request.query_params.get('overdue', '').lower() == 'true':
+            queryset = queryset.filter(status__in=('pending', 'in_progress'), due_date__lt=timezone.now())
+
+        try:
+            limit = min(max(int(request.query_params.get('limit', 20)), 1), BOARD_MAX_LIMIT)
+        except ValueError:
+            return Response({'error': 'limit must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+
+        column_status = request.query_params.get('status')
+        if column_status:
+            if column_status not in dict(Task.STATUS_CHOICES):
+                return Response({'error': 'Invalid status'}, status=status.HTTP_400_BAD_REQUEST)
+            page = TaskBoardService.column(queryset, column_status, limit, request.query_params.get('cursor'))
+            return Response({'status': column_status, **page})
+
+        return Response({
+            'counts': TaskBoardService.counts(queryset),
+            'columns': TaskBoardService.columns(queryset, [value for value, _ in Task.STATUS_CHOICES], limit),
+        })
 
     @action(detail=True, methods=['post'])
     def add_comment(self, request, pk=None):
@@ -0,0 +1,49 @@
+"""
+Request parsing and write-error helpers shared by the app APIs (bookings,
+equipment usage).
+"""
+from contextlib import contextmanager
+from datetime import datetime
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework import serializers
+
+
+def parse_moment(value):
+    """ISO datetime, or a date meaning its midnight (current timezone). None if invalid."""
+    if not value:
+        return None
+    try:
+        moment = parse_datetime(value)
+        if moment is None:
+            day = parse_date(value)
+            moment = datetime.combine(day, datetime.min.time()) if day else None
+    except ValueError:
+        return None
+    if moment is not None and timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+
+@contextmanager
+def constraint_write_errors(constraint_name, error):
+    """
+    Run a write atomically and surface model validation (save() running
+    full_clean) and a violation of `constraint_name`, when a concurrent request
+    wins the race, as DRF 400s instead of 500s. `error` is the 400 body for the
+    constraint violation.
+    """
+    try:
+        with transaction.atomic():
+            yield
+    except DjangoValidationError as e:
+        if hasattr(e, 'error_dict'):
+            raise serializers.ValidationError(e.message_dict)
+        raise serializers.ValidationError({'non_field_errors': e.messages})
+    except IntegrityError as e:
+        if constraint_name not in str(e):
+            raise
+        raise serializers.ValidationError(error)
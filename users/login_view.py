@@ -5,7 +5,7 @@ from rest_framework.parsers import JSONParser, FormParser, MultiPartParser
 from rest_framework_simplejwt.tokens import RefreshToken
 from django.contrib.auth import get_user_model, authenticate
 from django.core.mail import send_mail
-from .mailgun_service import MailgunEmailService
+from .otp_delivery import enqueue_otp_delivery
 from django.conf import settings
 from django.utils import timezone
 from django.views.decorators.csrf import csrf_exempt
@@ -245,20 +245,15 @@ class PasswordResetRequestView(APIView):
             user.password_reset_token_created_at = timezone.now()
             user.otp = otp_code
             user.otp_created_at = timezone.now()
-            user.otp_delivery_method = 'email'
-            user.save(update_fields=['password_reset_token', 'password_reset_token_created_at', 'otp', 'otp_created_at', 'otp_delivery_method'])
+            user.save(update_fields=['password_reset_token', 'password_reset_token_created_at', 'otp', 'otp_created_at'])
             
-            # Send OTP email via Mailgun
-            mailgun_service = MailgunEmailService()
-            result = mailgun_service.send_otp_email(user, otp_code, purpose='password_reset')
-            
-            if not result.get('success'):
-                logger.error(f"Failed to send password reset OTP via Mailgun: {result.get('error')}")
-                # Still return success to user for security (don't reveal email delivery failure)
+            # Deliver OTP in the background (WhatsApp -> email fallback, with retries).
+            # Delivery failures are recorded on the user row, never revealed to the caller.
+            enqueue_otp_delivery(user, purpose='password_reset')
             
             return Response({
                 'detail': 'If the email exists, a password reset OTP has been sent to your email.',
-                'message': 'Check your email for the OTP code. The OTP will expire in 10 minutes.'
+                'message': 'Check your email (or WhatsApp) for the OTP code. The OTP will expire in 10 minutes.'
             })
             
         except Exception as e:
@@ -4,6 +4,7 @@ Mailgun Email Service for sending OTP and other emails
 
 import requests
 from django.conf import settings
+from farm_management import http_client
 import logging
 
 logger = logging.getLogger(__name__)
@@ -52,7 +53,7 @@ class MailgunEmailService:
             if html_content:
                 data['html'] = html_content
             
-            response = requests.post(
+            response = http_client.post(
                 self.api_url,
                 auth=('api', self.api_key),
                 data=data,
@@ -0,0 +1,167 @@
+"""
+Management command to EXPLAIN ANALYZE the hot multi-tenant queries.
+Run: python manage.py explain_hot_queries [--industry-id 1] [--query tasks_for_assignee] [--plans]
+
+Each catalog entry mirrors a filter_by_industry / viewset query shape and names
+the composite index it is expected to use. Sample users (an owner, a field
+officer, their farmers) are picked from the chosen industry, so run it against
+a database with realistic data. Use this to verify the indexes after migrating.
+"""
+import json
+import re
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+
+User = get_user_model()
+
+
+def _users_by_industry_role(ctx):
+    return User.objects.filter(industry=ctx['industry'], role=ctx['farmer_role']).order_by('-date_joined')[:50]
+
+
+def _farmers_of_officer(ctx):
+    return User.objects.filter(
+        industry=ctx['industry'], role=ctx['farmer_role'], created_by=ctx['officer']
+    ).order_by('-date_joined')[:50]
+
+
+def _plots_of_farmers(ctx):
+    from farms.models import Plot
+
+    return Plot.objects.filter(industry=ctx['industry'], farmer__in=ctx['farmer_ids'])
+
+
+def _farms_of_farmers(ctx):
+    from farms.models import Farm
+
+    return Farm.objects.filter(industry=ctx['industry'], farm_owner__in=ctx['farmer_ids']).order_by('-created_at')[:50]
+
+
+def _tasks_for_assignee(ctx):
+    from tasks.models import Task
+
+    return Task.objects.filter(industry=ctx['industry'], assigned_to=ctx['officer'], status='pending')
+
+
+def _bookings_in_window(ctx):
+    from bookings.models import Booking
+    from bookings.services import BookingAvailabilityService
+
+    now = timezone.now()
+    return Booking.objects.filter(
+        industry=ctx['industry'], period__overlap=BookingAvailabilityService.window(now, now + timedelta(days=30))
+    ).order_by('start_date')
+
+
+def _unread_notifications(ctx):
+    from tasks.models import Notification
+
+    return Notification.objects.filter(user=ctx['farmer'], is_read=False).order_by('-created_at')[:20]
+
+
+# (name, builder, expected index)
+CATALOG = [
+    ('users_by_industry_role', _users_by_industry_role, 'users_user_industry_role_idx'),
+    ('farmers_of_officer', _farmers_of_officer, 'users_user_industry_role_idx'),
+    ('plots_of_farmers', _plots_of_farmers, 'farms_plot_industry_farmer_idx'),
+    ('farms_of_farmers', _farms_of_farmers, 'farms_farm_industry_owner_idx'),
+    ('tasks_for_assignee', _tasks_for_assignee, 'tasks_task_ind_assignee_idx'),
+    ('bookings_in_window', _bookings_in_window, 'bookings_industry_period_gist'),
+    ('unread_notifications', _unread_notifications, 'tasks_notif_user_read_idx'),
+]
+
+SEQ_SCAN_RE = re.compile(r'Seq Scan on (\w+)')
+INDEX_RE = re.compile(r'(?:Index Scan|Index Only Scan|Bitmap Index Scan)(?: Backward)? (?:using|on) (\w+)')
+EXECUTION_RE = re.compile(r'Execution Time: ([\d.]+) ms')
+
+
+class Command(BaseCommand):
+    help = "Run EXPLAIN ANALYZE over a catalog of hot multi-tenant queries and report their plans"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--industry-id', type=int, help='Industry to sample (default: the one with most users)')
+        parser.add_argument(
+            '--query', action='append', choices=[name for name, _, _ in CATALOG],
+            help='Only run these catalog entries (repeatable)',
+        )
+        parser.add_argument('--plans', action='store_true', help='Print the full plan of every query')
+        parser.add_argument('--json', action='store_true', help='Print the report as JSON')
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError('EXPLAIN ANALYZE catalog requires PostgreSQL')
+
+        ctx = self._sample_context(options.get('industry_id'))
+        selected = options.get('query')
+        report = []
+        for name, builder, expected_index in CATALOG:
+            if selected and name not in selected:
+                continue
+            plan = builder(ctx).explain(analyze=True, buffers=True)
+            indexes = INDEX_RE.findall(plan)
+            execution = EXECUTION_RE.search(plan)
+            report.append({
+                'query': name,
+                'expected_index': expected_index,
+                'uses_expected_index': expected_index in indexes,
+                'indexes': indexes,
+                'seq_scans': SEQ_SCAN_RE.findall(plan),
+                'execution_ms': float(execution.group(1)) if execution else None,
+                'plan': plan,
+            })
+
+        if options['json']:
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+
+        self.stdout.write(
+            f"Industry {ctx['industry'].pk} ({ctx['industry'].name}), "
+            f"field officer {ctx['officer'].pk if ctx['officer'] else '-'}, {len(ctx['farmer_ids'])} farmers\n"
+        )
+        for entry in report:
+            line = f"{entry['query']}: {entry['execution_ms']} ms, indexes={entry['indexes'] or '-'}"
+            if entry['uses_expected_index']:
+                self.stdout.write(self.style.SUCCESS(line))
+            else:
+                seq = f", seq scans={entry['seq_scans']}" if entry['seq_scans'] else ''
+                self.stdout.write(self.style.WARNING(f"{line}{seq} (expected {entry['expected_index']})"))
+            if options['plans']:
+                self.stdout.write(entry['plan'] + '\n')
+
+        missed = sum(1 for entry in report if not entry['uses_expected_index'])
+        if missed:
+            self.stdout.write(self.style.WARNING(
+                f"\n{missed} of {len(report)} queries did not use their index. "
+                "Small tables are often cheaper to scan; re-check after ANALYZE on realistic data."
+            ))
+
+    def _sample_context(self, industry_id):
+        from django.db.models import Count
+
+        from users.models import Industry, Role
+
+        industries = Industry.objects.all()
+        if industry_id:
+            industry = industries.filter(pk=industry_id).first()
+        else:
+            industry = industries.annotate(n=Count('users')).order_by('-n').first()
+        if industry is None:
+            raise CommandError('No industry found to sample')
+
+        farmer_role = Role.objects.filter(name='farmer').first()
+        officer = User.objects.filter(industry=industry, role__name='fieldofficer').order_by('-date_joined').first()
+        farmers = User.objects.filter(industry=industry, role=farmer_role)
+        if officer is not None:
+            farmers = farmers.filter(created_by=officer)
+        farmer_ids = list(farmers.order_by('-date_joined').values_list('id', flat=True)[:50])
+        return {
+            'industry': industry,
+            'farmer_role': farmer_role,
+            'officer': officer,
+            'farmer_ids': farmer_ids,
+            'farmer': User.objects.filter(pk=farmer_ids[0]).first() if farmer_ids else None,
+        }
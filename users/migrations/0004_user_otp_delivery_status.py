@@ -0,0 +1,33 @@
+# Generated by Django 5.0.1 on 2026-10-19 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0003_merge_0002_industry_crop_type_0002_user_aadhaar_number'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='otp_delivery_status',
+            field=models.CharField(blank=True, choices=[('pending', 'Pending'), ('sent', 'Sent'), ('failed', 'Failed')], help_text='Delivery status of the last OTP (set by the background sender)', max_length=20, null=True),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='otp_delivery_attempts',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='otp_delivery_error',
+            field=models.TextField(blank=True, default=''),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='otp_delivered_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
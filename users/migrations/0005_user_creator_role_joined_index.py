@@ -0,0 +1,17 @@
+# Generated by Django 5.0.1 on 2026-10-19 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0004_user_otp_delivery_status'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['created_by', 'role', 'date_joined'], name='users_user_creator_role_idx'),
+        ),
+    ]
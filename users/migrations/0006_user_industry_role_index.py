@@ -0,0 +1,20 @@
+# Generated by Django 5.0.1 on 2026-10-19 13:00
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Build indexes without locking writes on these tables
+    atomic = False
+
+    dependencies = [
+        ('users', '0005_user_creator_role_joined_index'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='user',
+            index=models.Index(fields=['industry', 'role', 'created_by', 'date_joined'], name='users_user_industry_role_idx'),
+        ),
+    ]
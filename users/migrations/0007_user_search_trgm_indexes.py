@@ -0,0 +1,39 @@
+# Generated by Django 5.0.1 on 2026-10-19 14:00
+
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.operations import AddIndexConcurrently, TrigramExtension
+from django.db import migrations
+from django.db.models.functions import Upper
+
+
+class Migration(migrations.Migration):
+    # Build indexes without locking writes on these tables
+    atomic = False
+
+    dependencies = [
+        ('users', '0006_user_industry_role_index'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        AddIndexConcurrently(
+            model_name='user',
+            index=GinIndex(OpClass(Upper('username'), name='gin_trgm_ops'), name='users_user_username_trgm'),
+        ),
+        AddIndexConcurrently(
+            model_name='user',
+            index=GinIndex(OpClass(Upper('first_name'), name='gin_trgm_ops'), name='users_user_first_name_trgm'),
+        ),
+        AddIndexConcurrently(
+            model_name='user',
+            index=GinIndex(OpClass(Upper('last_name'), name='gin_trgm_ops'), name='users_user_last_name_trgm'),
+        ),
+        AddIndexConcurrently(
+            model_name='user',
+            index=GinIndex(OpClass(Upper('phone_number'), name='gin_trgm_ops'), name='users_user_phone_trgm'),
+        ),
+        AddIndexConcurrently(
+            model_name='user',
+            index=GinIndex(OpClass(Upper('village'), name='gin_trgm_ops'), name='users_user_village_trgm'),
+        ),
+    ]
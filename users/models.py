@@ -1,6 +1,8 @@
 from django.contrib.auth.models import AbstractUser
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.core.exceptions import ValidationError
 from django.db import models
+from django.db.models.functions import Upper
 import re
 
 class Industry(models.Model):
@@ -119,6 +121,20 @@ class User(AbstractUser):
         blank=True,
         help_text="Method used to deliver the last OTP"
     )
+    otp_delivery_status = models.CharField(
+        max_length=20,
+        choices=[
+            ('pending', 'Pending'),
+            ('sent', 'Sent'),
+            ('failed', 'Failed'),
+        ],
+        null=True,
+        blank=True,
+        help_text="Delivery status of the last OTP (set by the background sender)"
+    )
+    otp_delivery_attempts = models.PositiveSmallIntegerField(default=0)
+    otp_delivery_error = models.TextField(blank=True, default='')
+    otp_delivered_at = models.DateTimeField(null=True, blank=True)
     
     # Password reset fields
     password_reset_token = models.CharField(max_length=100, null=True, blank=True)
@@ -148,6 +164,18 @@ class User(AbstractUser):
 
     class Meta:
         ordering = ['-date_joined']
+        indexes = [
+            # Recent farmers per field officer (plot auto-assignment)
+            models.Index(fields=['created_by', 'role', 'date_joined'], name='users_user_creator_role_idx'),
+            # filter_by_industry user lists: industry + role, optionally per creator, newest first
+            models.Index(fields=['industry', 'role', 'created_by', 'date_joined'], name='users_user_industry_role_idx'),
+            # Trigram indexes for ?q= search (users.search_utils)
+            GinIndex(OpClass(Upper('username'), name='gin_trgm_ops'), name='users_user_username_trgm'),
+            GinIndex(OpClass(Upper('first_name'), name='gin_trgm_ops'), name='users_user_first_name_trgm'),
+            GinIndex(OpClass(Upper('last_name'), name='gin_trgm_ops'), name='users_user_last_name_trgm'),
+            GinIndex(OpClass(Upper('phone_number'), name='gin_trgm_ops'), name='users_user_phone_trgm'),
+            GinIndex(OpClass(Upper('village'), name='gin_trgm_ops'), name='users_user_village_trgm'),
+        ]
 
     def __str__(self):
         role = self.role.name if self.role else "NoRole"
@@ -0,0 +1,153 @@
+"""
+Asynchronous OTP delivery.
+
+Views call enqueue_otp_delivery() and return immediately; the OTP is sent by a
+job worker (`python manage.py run_workers --queue otp`) through the
+WhatsApp -> email fallback chain, retried with backoff by the job runner, and
+the outcome is recorded on the user row (otp_delivery_status,
+otp_delivery_method, otp_delivery_attempts, otp_delivery_error, otp_delivered_at).
+"""
+import logging
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+def _record_status(user_id, **fields):
+    get_user_model().objects.filter(pk=user_id).update(**fields)
+
+
+def _send_whatsapp(user, otp_code):
+    if not getattr(settings, 'WHATSAPP_OTP_ENABLED', False) or not user.phone_number:
+        return None
+    if not getattr(settings, 'TWILIO_ACCOUNT_SID', '') or not getattr(settings, 'TWILIO_AUTH_TOKEN', ''):
+        return None
+
+    from .whatsapp_service import WhatsAppOTPService
+
+    if WhatsAppOTPService().send_otp(user.phone_number_formatted, otp_code, user_name=user.first_name or user.username):
+        return {'success': True}
+    return {'success': False, 'error': 'WhatsApp send failed'}
+
+
+def _send_email(user, otp_code, purpose):
+    if not user.email:
+        return None
+
+    from .mailgun_service import MailgunEmailService
+
+    return MailgunEmailService().send_otp_email(user, otp_code, purpose=purpose)
+
+
+def deliver_otp(user_id, otp_code, purpose='password_reset'):
+    """
+    Run the delivery chain once for a user: WhatsApp first (when enabled and
+    configured), then email when EMAIL_OTP_FALLBACK is on or WhatsApp is not
+    available.
+
+    Returns:
+        dict: {'success': bool, 'method': str or None, 'error': str or None,
+               'skipped': bool}
+    """
+    result = {'success': False, 'method': None, 'error': None, 'skipped': False}
+
+    user = get_user_model().objects.filter(pk=user_id).first()
+    if user is None or user.otp != otp_code:
+        # User deleted or a newer OTP was requested; nothing to send
+        result['skipped'] = True
+        return result
+
+    errors = []
+    whatsapp = _send_whatsapp(user, otp_code)
+    if whatsapp and whatsapp.get('success'):
+        result.update(success=True, method='whatsapp')
+        return result
+    if whatsapp:
+        errors.append(whatsapp.get('error'))
+
+    if whatsapp is None or getattr(settings, 'EMAIL_OTP_FALLBACK', True):
+        email = _send_email(user, otp_code, purpose)
+        if email and email.get('success'):
+            result.update(success=True, method='email')
+            return result
+        if email:
+            errors.append(email.get('error'))
+
+    result['error'] = '; '.join(e for e in errors if e) or 'No delivery channel available'
+    return result
+
+
+def send_otp_job(user_id, purpose='password_reset'):
+    """
+    Background job (jobs.runner): deliver the user's current OTP and record the
+    outcome. Raises on failure so the job runner retries with backoff; the
+    last attempt marks the delivery failed.
+    """
+    from jobs.runner import current_job
+
+    user = get_user_model().objects.filter(pk=user_id).only('otp').first()
+    if user is None or not user.otp:
+        # User deleted or OTP already consumed; nothing to send
+        return
+
+    job = current_job()
+    attempt = job.attempts if job else 1
+    result = deliver_otp(user_id, user.otp, purpose)
+    if result['skipped']:
+        return
+
+    if result['success']:
+        _record_status(
+            user_id,
+            otp_delivery_status='sent',
+            otp_delivery_method=result['method'],
+            otp_delivery_attempts=attempt,
+            otp_delivery_error='',
+            otp_delivered_at=timezone.now(),
+        )
+        logger.info(f"OTP for user {user_id} delivered via {result['method']} (attempt {attempt})")
+        return
+
+    final = job is None or attempt >= job.max_attempts
+    fields = {'otp_delivery_attempts': attempt, 'otp_delivery_error': result['error'] or ''}
+    if final:
+        fields['otp_delivery_status'] = 'failed'
+    _record_status(user_id, **fields)
+    raise RuntimeError(f"OTP delivery for user {user_id} failed: {result['error']}")
+
+
+def enqueue_otp_delivery(user, purpose='password_reset'):
+    """
+    Mark the user's OTP as pending and enqueue its delivery on the 'otp' job
+    queue. The OTP itself is not stored in the job; the worker sends whatever
+    OTP is current on the user row. With OTP_DELIVERY_ASYNC off the chain runs
+    once inline (useful in tests and management commands).
+    """
+    _record_status(
+        user.pk,
+        otp_delivery_status='pending',
+        otp_delivery_attempts=0,
+        otp_delivery_error='',
+        otp_delivered_at=None,
+    )
+
+    if not getattr(settings, 'OTP_DELIVERY_ASYNC', True):
+        try:
+            send_otp_job(user.pk, purpose)
+        except RuntimeError as e:
+            logger.error(str(e))
+        return
+
+    from jobs.runner import enqueue
+
+    enqueue(
+        send_otp_job,
+        queue='otp',
+        priority=-10,
+        max_attempts=getattr(settings, 'OTP_DELIVERY_MAX_ATTEMPTS', 3),
+        user_id=user.pk,
+        purpose=purpose,
+    )
@@ -0,0 +1,117 @@
+"""
+Shared batched archiving for append-heavy tables (used by tasks for
+Notification and messaging for Message).
+
+Old rows are moved to an archive table and archives are pruned after
+ARCHIVE_RETENTION_DAYS, so the hot tables and their indexes stay bounded by
+the retention window instead of growing forever.
+
+Each batch is one statement in its own short transaction:
+
+    WITH batch AS (SELECT id ... WHERE id > <last> AND <policy> ORDER BY id LIMIT n FOR UPDATE SKIP LOCKED),
+         moved AS (DELETE ... USING batch RETURNING ...)
+    INSERT INTO <archive> SELECT ... FROM moved
+
+Batches walk the primary key upwards (keyset), so a run is a single pass over
+the table; rows a user is touching right now are skipped and picked up by the
+next run rather than waited on.
+"""
+import logging
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+def _run_batches(sql, params, batch_size, pause):
+    """
+    Run a keyset batch statement until it runs dry. `sql` takes the last id
+    seen, then `params`, then the batch size, and returns (count, max id).
+    """
+    total, last_id = 0, 0
+    while True:
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(sql, [last_id, *params, batch_size])
+            count, max_id = cursor.fetchone()
+        total += count
+        if count < batch_size or max_id is None:
+            return total
+        last_id = max_id
+        if pause:
+            time.sleep(pause)
+
+
+def archive_rows(source, archive, columns, where, params, batch_size, pause=0):
+    """Move rows of `source` matching `where` into `archive`, `batch_size` rows per transaction."""
+    cols = ', '.join(columns)
+    sql = f'''
+        WITH batch AS (
+            SELECT id FROM "{source}"
+            WHERE id > %s AND ({where})
+            ORDER BY id LIMIT %s
+            FOR UPDATE SKIP LOCKED
+        ),
+        moved AS (
+            DELETE FROM "{source}" s USING batch WHERE s.id = batch.id
+            RETURNING s.id, {', '.join(f's.{c}' for c in columns)}
+        ),
+        archived AS (
+            INSERT INTO "{archive}" (original_id, {cols}, archived_at)
+            SELECT id, {cols}, now() FROM moved
+        )
+        SELECT COUNT(*), MAX(id) FROM moved
+    '''
+    return _run_batches(sql, params, batch_size, pause)
+
+
+def prune_rows(table, cutoff, batch_size, pause=0):
+    """Delete rows of an archive table archived before `cutoff`, in batches."""
+    sql = f'''
+        WITH batch AS (
+            SELECT id FROM "{table}"
+            WHERE id > %s AND (archived_at < %s)
+            ORDER BY id LIMIT %s
+            FOR UPDATE SKIP LOCKED
+        ),
+        deleted AS (
+            DELETE FROM "{table}" t USING batch WHERE t.id = batch.id RETURNING t.id
+        )
+        SELECT COUNT(*), MAX(id) FROM deleted
+    '''
+    return _run_batches(sql, [cutoff], batch_size, pause)
+
+
+def apply_archive_policy(source_model, archive_model, columns, where, days,
+                         batch_size=None, pause=0, dry_run=False):
+    """
+    Archive rows of `source_model` matching `where` and prune old archives.
+
+    Args:
+        columns: columns copied to `archive_model` (besides id -> original_id)
+        where: SQL condition with two %s cut-offs, read rows first, then all rows
+        days: (read, unread) retention in days, for the two cut-offs
+
+    Returns:
+        {'archived': n, 'pruned': n} (with dry_run, 'archived' is the number of
+        rows that would move)
+    """
+    batch_size = batch_size or getattr(settings, 'RETENTION_BATCH_SIZE', 5000)
+    keep_archive_days = getattr(settings, 'ARCHIVE_RETENTION_DAYS', 730)
+    source, archive = source_model._meta.db_table, archive_model._meta.db_table
+    now = timezone.now()
+    params = [now - timedelta(days=days[0]), now - timedelta(days=days[1])]
+    if dry_run:
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT COUNT(*) FROM "{source}" WHERE {where}', params)
+            return {'archived': cursor.fetchone()[0], 'pruned': 0}
+
+    archived = archive_rows(source, archive, columns, where, params, batch_size, pause)
+    pruned = 0
+    if keep_archive_days:
+        pruned = prune_rows(archive, now - timedelta(days=keep_archive_days), batch_size, pause)
+    logger.info(f"Retention {source}: {archived} archived, {pruned} archived rows pruned")
+    return {'archived': archived, 'pruned': pruned}
@@ -0,0 +1,47 @@
+"""
+Shared ranked text search for list endpoints (?q=, with ?search= kept as an alias).
+
+Matching is a case-insensitive substring match on each search field, which
+Django renders as UPPER(col::text) LIKE UPPER('%q%'). The fields carry pg_trgm
+GIN indexes on UPPER(col) (see the model Meta indexes), so Postgres answers
+the OR with a bitmap index scan instead of a sequential scan. Results are
+ordered by trigram word similarity, best match first.
+"""
+from django.contrib.postgres.search import TrigramWordSimilarity
+from django.db.models import Q
+from django.db.models.functions import Greatest
+
+SEARCH_PARAM = 'q'
+LEGACY_SEARCH_PARAM = 'search'
+MAX_QUERY_LENGTH = 100
+
+
+def get_search_query(request):
+    """The trimmed ?q= (or ?search=) value, or '' when absent."""
+    params = request.query_params
+    query = params.get(SEARCH_PARAM) or params.get(LEGACY_SEARCH_PARAM) or ''
+    return query.strip()[:MAX_QUERY_LENGTH]
+
+
+def ranked_search(queryset, query, fields):
+    """
+    Filter a queryset to rows where any of `fields` contains `query`, annotated
+    with `search_rank` and ordered by it (ties keep the queryset's ordering).
+
+    Args:
+        queryset: QuerySet to search (already tenant-filtered)
+        query: Search text; an empty query returns the queryset unchanged
+        fields: Field names or lookups spanning relations (e.g. 'farm_owner__username')
+    """
+    if not query:
+        return queryset
+
+    condition = Q()
+    for field in fields:
+        condition |= Q(**{f'{field}__icontains': query})
+
+    similarities = [TrigramWordSimilarity(query, field) for field in fields]
+    rank = Greatest(*similarities) if len(similarities) > 1 else similarities[0]
+
+    ordering = list(queryset.query.order_by) or list(queryset.model._meta.ordering)
+    return queryset.filter(condition).annotate(search_rank=rank).order_by('-search_rank', *ordering)
@@ -246,36 +246,42 @@ class FarmerDetailSerializer(UserSerializer):
         return plantation_data
     
     def get_agricultural_summary(self, obj):
-        """Get agricultural summary statistics"""
-        total_plots = obj.plots.count()
-        total_farms = obj.farms.count()
-        total_irrigations = sum(farm.irrigations.count() for farm in obj.farms.all())
-        
-        # Get unique irrigation types
-        irrigation_types = set()
-        for farm in obj.farms.all():
-            for irrigation in farm.irrigations.all():
-                if irrigation.irrigation_type:
-                    irrigation_types.add(irrigation.irrigation_type.get_name_display())
-        
-        # Get unique crop types
-        crop_types = set()
-        for farm in obj.farms.all():
-            if farm.crop_type and farm.crop_type.crop_type:
-                crop_types.add(farm.crop_type.crop_type)
-        
-        # Calculate total area
-        total_area = sum(float(farm.area_size) for farm in obj.farms.all() if farm.area_size)
+        """Get agricultural summary statistics (SQL aggregates over the stored derived columns)"""
+        from django.db.models import Count, Q, Sum
+        from farms.geometry import ACRE_M2
+        from farms.models import FarmIrrigation, IrrigationType
+
+        farm_totals = obj.farms.aggregate(
+            total_farms=Count('id'),
+            total_area=Sum('area_size'),
+            total_plants=Sum('plants_count'),
+        )
+        plot_totals = obj.plots.aggregate(
+            total_plots=Count('id'),
+            with_boundaries=Count('id', filter=Q(boundary__isnull=False)),
+            with_locations=Count('id', filter=Q(location__isnull=False)),
+            boundary_area_m2=Sum('boundary_area_m2'),
+        )
+        irrigations = FarmIrrigation.objects.filter(farm__farm_owner=obj)
+        irrigation_names = dict(IrrigationType._meta.get_field('name').flatchoices)
+        irrigation_types = irrigations.filter(irrigation_type__isnull=False).values_list(
+            'irrigation_type__name', flat=True
+        ).order_by().distinct()
+        crop_types = obj.farms.exclude(crop_type__crop_type__isnull=True).exclude(
+            crop_type__crop_type=''
+        ).values_list('crop_type__crop_type', flat=True).order_by().distinct()
         
         return {
-            'total_plots': total_plots,
-            'total_farms': total_farms,
-            'total_irrigations': total_irrigations,
-            'total_area_acres': round(total_area, 2),
-            'irrigation_types': list(irrigation_types),
+            'total_plots': plot_totals['total_plots'],
+            'total_farms': farm_totals['total_farms'],
+            'total_irrigations': irrigations.count(),
+            'total_area_acres': round(float(farm_totals['total_area'] or 0), 2),
+            'mapped_area_acres': round((plot_totals['boundary_area_m2'] or 0) / ACRE_M2, 2),
+            'total_plants': farm_totals['total_plants'] or 0,
+            'irrigation_types': [irrigation_names.get(name, name) for name in irrigation_types],
             'crop_types': list(crop_types),
-            'plots_with_boundaries': obj.plots.filter(boundary__isnull=False).count(),
-            'plots_with_locations': obj.plots.filter(location__isnull=False).count()
+            'plots_with_boundaries': plot_totals['with_boundaries'],
+            'plots_with_locations': plot_totals['with_locations']
         }
 
 class FieldOfficerWithFarmersSerializer(serializers.ModelSerializer):
@@ -108,3 +108,31 @@ class PhoneNumberAuthenticationTests(TestCase):
                 role=self.role
             )
 
+
+
+class RankedSearchTests(TestCase):
+    """Test cases for the shared ?q= search helper"""
+
+    def setUp(self):
+        role = Role.objects.create(name='farmer', display_name='Farmer')
+        self.exact = User.objects.create_user(
+            username='shirur', phone_number='9876500001', password='testpass123', role=role, village='Shirur'
+        )
+        self.partial = User.objects.create_user(
+            username='ramesh', phone_number='9876500002', password='testpass123', role=role, village='Shirurkasar'
+        )
+        User.objects.create_user(
+            username='other', phone_number='9876500003', password='testpass123', role=role, village='Baramati'
+        )
+
+    def test_filters_and_ranks_best_match_first(self):
+        from .search_utils import ranked_search
+
+        results = list(ranked_search(User.objects.all(), 'shirur', ['username', 'village']))
+        self.assertEqual(results, [self.exact, self.partial])
+
+    def test_empty_query_returns_queryset_unchanged(self):
+        from .search_utils import ranked_search
+
+        queryset = User.objects.all()
+        self.assertIs(ranked_search(queryset, '', ['username']), queryset)
@@ -19,6 +19,7 @@ from .serializers import (
 )
 from .permissions import IsManager, IsOwner
 from .multi_tenant_utils import filter_by_industry, get_accessible_users, get_user_industry
+from .search_utils import get_search_query, ranked_search
 
 User = get_user_model()
 
@@ -26,6 +27,7 @@ class UserViewSet(viewsets.ModelViewSet):
     queryset = User.objects.all()
     serializer_class = UserSerializer
     permission_classes = [permissions.IsAuthenticated]
+    search_fields = ['username', 'first_name', 'last_name', 'phone_number', 'village']
     
     def get_serializer_class(self):
         if self.action == 'create':
@@ -320,7 +322,10 @@ class UserViewSet(viewsets.ModelViewSet):
             except (ValueError, TypeError):
                 pass  # Invalid industry_id, ignore filter
         
-        return queryset.select_related('role', 'industry').order_by('-date_joined')
+        queryset = queryset.select_related('role', 'industry').order_by('-date_joined')
+
+        # Text search (?q=), best match first
+        return ranked_search(queryset, get_search_query(self.request), self.search_fields)
     
     @action(detail=False, methods=['get'], url_path='my-field-officers')
     def my_field_officers(self, request):
@@ -3,19 +3,43 @@ WhatsApp OTP Service for Farm Management Backend
 """
 
 from twilio.rest import Client
+from twilio.http.http_client import TwilioHttpClient
+from twilio.http.response import Response as TwilioResponse
 from django.conf import settings
 from django.core.mail import send_mail
+from farm_management import http_client
 import logging
 
 logger = logging.getLogger(__name__)
 
+
+class InstrumentedTwilioHttpClient(TwilioHttpClient):
+    """Twilio HTTP client that sends through the shared instrumented client"""
+    
+    def request(self, method, url, params=None, data=None, headers=None, auth=None,
+                timeout=None, allow_redirects=False):
+        response = http_client.request(
+            method,
+            url,
+            params=params,
+            data=data,
+            headers=headers,
+            auth=auth,
+            timeout=timeout or self.timeout or 10,
+            allow_redirects=allow_redirects,
+        )
+        self.last_response = TwilioResponse(int(response.status_code), response.text, response.headers)
+        return self.last_response
+
+
 class WhatsAppOTPService:
     """WhatsApp OTP sending service using Twilio"""
     
     def __init__(self):
         self.client = Client(
             settings.TWILIO_ACCOUNT_SID,
-            settings.TWILIO_AUTH_TOKEN
+            settings.TWILIO_AUTH_TOKEN,
+            http_client=InstrumentedTwilioHttpClient(timeout=10)
         )
         self.whatsapp_number = settings.TWILIO_WHATSAPP_NUMBER
     
@@ -132,8 +156,6 @@ class GupshupWhatsAppService:
             bool: True if successful, False otherwise
         """
         try:
-            import requests
-            
             # Remove + from phone number for Gupshup
             if phone_number.startswith('+'):
                 phone_number = phone_number[1:]
@@ -164,7 +186,7 @@ Thank you for using our services! 🌾"""
                 'src.name': 'FarmManagement'
             }
             
-            response = requests.post(url, headers=headers, data=data)
+            response = http_client.post(url, headers=headers, data=data, timeout=10)
             
             if response.status_code == 200:
                 logger.info(f"Gupshup WhatsApp OTP sent successfully to {phone_number}")
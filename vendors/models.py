@@ -1,4 +1,8 @@
-from django.db import models
+from decimal import Decimal
+
+from django.db import models, transaction
+from django.db.models import DecimalField, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
 from django.conf import settings
 from inventory.models import InventoryItem
 from .validators import validate_gstin  # add this import
@@ -127,10 +131,25 @@ class PurchaseOrder(models.Model):
     
     def calculate_total(self):
         """Calculate the total amount of the purchase order"""
-        total = sum(item.total_price for item in self.items.all())
-        self.total_amount = total
-        self.save(update_fields=['total_amount'])
-        return total
+        PurchaseOrder.refresh_totals([self.pk])
+        self.refresh_from_db(fields=['total_amount'])
+        return self.total_amount
+    
+    @staticmethod
+    def refresh_totals(order_ids):
+        """
+        Set total_amount = SUM(items.total_price) for the given orders in one
+        UPDATE, however many items they have. Returns the number of orders updated.
+        """
+        item_totals = PurchaseOrderItem.objects.filter(
+            purchase_order=OuterRef('pk')
+        ).order_by().values('purchase_order').annotate(total=Sum('total_price')).values('total')
+        return PurchaseOrder.objects.filter(pk__in=order_ids).update(
+            total_amount=Coalesce(
+                Subquery(item_totals), Value(Decimal('0')),
+                output_field=DecimalField(max_digits=12, decimal_places=2),
+            )
+        )
 
 class PurchaseOrderItem(models.Model):
     purchase_order = models.ForeignKey(PurchaseOrder, on_delete=models.CASCADE, related_name='items')
@@ -151,19 +170,27 @@ class PurchaseOrderItem(models.Model):
         item_display = self.item_name or (self.inventory_item.item_name if self.inventory_item else "Unknown")
         return f"{item_display} - {self.quantity if self.quantity else 'N/A'} units"
     
-    def save(self, *args, **kwargs):
-        # Calculate total price - use estimate_cost if available, otherwise quantity * unit_price
+    def compute_total_price(self):
+        # Use estimate_cost if available, otherwise quantity * unit_price
         if self.estimate_cost:
-            self.total_price = self.estimate_cost
-        elif self.unit_price and self.quantity:
-            self.total_price = self.quantity * self.unit_price
-        else:
-            self.total_price = 0
-        
-        super().save(*args, **kwargs)
+            return self.estimate_cost
+        if self.unit_price and self.quantity:
+            return self.quantity * self.unit_price
+        return 0
+    
+    def save(self, *args, **kwargs):
+        self.total_price = self.compute_total_price()
         
-        # Update the purchase order total
-        self.purchase_order.calculate_total()
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            # Update the purchase order total (one aggregate UPDATE)
+            PurchaseOrder.refresh_totals([self.purchase_order_id])
+    
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            result = super().delete(*args, **kwargs)
+            PurchaseOrder.refresh_totals([self.purchase_order_id])
+        return result
 
 class Order(models.Model):
     """
@@ -83,6 +83,27 @@ class PurchaseOrderItemSerializer(serializers.ModelSerializer):
         ]
 
 
+class PurchaseOrderItemLineSerializer(serializers.ModelSerializer):
+    """One line of a bulk add; inventory items are checked in one query by PurchaseOrderService"""
+    inventory_item = serializers.IntegerField(min_value=1, required=False, allow_null=True)
+
+    class Meta:
+        model = PurchaseOrderItem
+        fields = [
+            'inventory_item', 'item_name', 'year_of_make', 'estimate_cost',
+            'quantity', 'unit_price', 'remark', 'notes'
+        ]
+
+    def validate(self, attrs):
+        if not attrs.get('inventory_item') and not attrs.get('item_name'):
+            raise serializers.ValidationError("Either inventory_item or item_name is required")
+        return attrs
+
+
+class PurchaseOrderItemBulkSerializer(serializers.Serializer):
+    items = PurchaseOrderItemLineSerializer(many=True, allow_empty=False)
+
+
 class PurchaseOrderSerializer(serializers.ModelSerializer):
     created_by = UserSerializer(read_only=True)
     approved_by = UserSerializer(read_only=True)
@@ -0,0 +1,77 @@
+from django.conf import settings
+from django.db import transaction
+from rest_framework import serializers
+import logging
+
+from inventory.models import InventoryItem
+from users.multi_tenant_utils import filter_by_industry
+from .models import PurchaseOrder, PurchaseOrderItem
+
+logger = logging.getLogger(__name__)
+
+
+class PurchaseOrderService:
+    """
+    Builds purchase orders in constant round trips.
+
+    add_items() locks the order, checks every referenced inventory item with
+    one query, bulk inserts the lines and refreshes total_amount with one
+    aggregate UPDATE, however many lines the order (or the request) has.
+    """
+
+    @staticmethod
+    def add_items(purchase_order, lines, user):
+        """
+        Append validated lines to `purchase_order`.
+
+        Args:
+            purchase_order: PurchaseOrder the user can access
+            lines: [{'inventory_item': id or None, 'item_name', 'quantity', 'unit_price', 'estimate_cost', ...}]
+            user: User adding the lines (scopes the inventory item lookup)
+
+        Returns:
+            list of created PurchaseOrderItem
+
+        Raises:
+            serializers.ValidationError: too many lines or unknown/inaccessible inventory items
+        """
+        max_items = getattr(settings, 'PURCHASE_ORDER_BULK_MAX_ITEMS', 1000)
+        if len(lines) > max_items:
+            raise serializers.ValidationError({
+                'items': [f"At most {max_items} items can be added at once, got {len(lines)}"]
+            })
+
+        inventory_ids = {line['inventory_item'] for line in lines if line.get('inventory_item')}
+        known = set()
+        if inventory_ids:
+            known = set(
+                filter_by_industry(InventoryItem.objects.filter(pk__in=inventory_ids), user)
+                .values_list('pk', flat=True)
+            )
+        errors = [
+            {'inventory_item': [f"Inventory item {line['inventory_item']} not found"]}
+            if line.get('inventory_item') and line['inventory_item'] not in known else {}
+            for line in lines
+        ]
+        if any(errors):
+            raise serializers.ValidationError({'items': errors})
+
+        items = []
+        for line in lines:
+            item = PurchaseOrderItem(purchase_order=purchase_order, **{
+                key: value for key, value in line.items() if key != 'inventory_item'
+            })
+            item.inventory_item_id = line.get('inventory_item')
+            # bulk_create skips save(), so price each line here
+            item.total_price = item.compute_total_price()
+            items.append(item)
+
+        with transaction.atomic():
+            # Serialize concurrent additions so each total sees the other's lines
+            list(PurchaseOrder.objects.select_for_update().filter(pk=purchase_order.pk).values_list('pk', flat=True))
+            created = PurchaseOrderItem.objects.bulk_create(items)
+            PurchaseOrder.refresh_totals([purchase_order.pk])
+
+        purchase_order.refresh_from_db(fields=['total_amount'])
+        logger.info(f"Added {len(created)} items to purchase order {purchase_order.pk}")
+        return created
@@ -1,3 +1,83 @@
+from datetime import date
+from decimal import Decimal
+
 from django.test import TestCase
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from rest_framework import status
+from users.models import Industry, Role
+from .models import Vendor, PurchaseOrder, PurchaseOrderItem
+
+User = get_user_model()
+
+
+class PurchaseOrderTotalsTest(TestCase):
+    """Order totals are kept by one aggregate UPDATE per write"""
+
+    def setUp(self):
+        self.industry = Industry.objects.create(name="Test Industry")
+        owner_role, _ = Role.objects.get_or_create(name='owner', defaults={'display_name': 'Owner'})
+        self.owner = User.objects.create_user(
+            username='owner1',
+            password='testpass123',
+            phone_number='9876543219',
+            role=owner_role,
+            industry=self.industry
+        )
+        vendor = Vendor.objects.create(
+            industry=self.industry, vendor_name='Agro Supplies', email='agro@test.com',
+            phone='9876500000', address='Pune', created_by=self.owner
+        )
+        self.order = PurchaseOrder.objects.create(
+            vendor=vendor, order_number='PO-1', created_by=self.owner,
+            issue_date=date(2026, 1, 1), expected_delivery_date=date(2026, 1, 15)
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.owner)
+
+    def test_item_save_and_delete_refresh_total(self):
+        pipe = PurchaseOrderItem.objects.create(
+            purchase_order=self.order, item_name='Drip pipe', quantity=10, unit_price=Decimal('2.50')
+        )
+        PurchaseOrderItem.objects.create(purchase_order=self.order, item_name='Pump', estimate_cost=Decimal('100'))
+        self.order.refresh_from_db()
+        self.assertEqual(self.order.total_amount, Decimal('125.00'))
+
+        pipe.delete()
+        self.assertEqual(self.order.calculate_total(), Decimal('100.00'))
+
+    def test_add_items(self):
+        lines = [{'item_name': f'Valve {n}', 'quantity': 2, 'unit_price': '1.25'} for n in range(50)]
+        response = self.client.post(f'/api/purchase-orders/{self.order.id}/add-items/', {'items': lines}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED, response.data)
+        self.assertEqual(Decimal(response.data['total_amount']), Decimal('125.00'))
+        self.assertEqual(self.order.items.count(), 50)
+
+    def test_add_items_rejects_unknown_inventory_item(self):
+        response = self.client.post(f'/api/purchase-orders/{self.order.id}/add-items/', {
+            'items': [{'item_name': 'Valve', 'quantity': 1}, {'inventory_item': 999999, 'quantity': 1}]
+        }, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(self.order.items.exists())
+
+    def test_add_items_is_scoped_and_restricted(self):
+        other_industry = Industry.objects.create(name="Other Industry")
+        farmer_role, _ = Role.objects.get_or_create(name='farmer', defaults={'display_name': 'Farmer'})
+        outsider = User.objects.create_user(
+            username='owner2', password='testpass123', phone_number='9876543218',
+            role=self.owner.role, industry=other_industry
+        )
+        farmer = User.objects.create_user(
+            username='farmer1', password='testpass123', phone_number='9876543217',
+            role=farmer_role, industry=self.industry
+        )
+        url = f'/api/purchase-orders/{self.order.id}/add-items/'
+        payload = {'items': [{'item_name': 'Valve', 'quantity': 1, 'unit_price': '5'}]}
 
-# Create your tests here.
+        self.client.force_authenticate(user=outsider)
+        self.assertEqual(self.client.post(url, payload, format='json').status_code, status.HTTP_404_NOT_FOUND)
+        self.client.force_authenticate(user=farmer)
+        self.assertEqual(self.client.post(url, payload, format='json').status_code, status.HTTP_403_FORBIDDEN)
+        self.assertFalse(self.order.items.exists())
@@ -9,6 +9,7 @@ from .serializers import (
     PurchaseOrderSerializer, 
     PurchaseOrderDetailSerializer,
     PurchaseOrderItemSerializer,
+    PurchaseOrderItemBulkSerializer,
     VendorCommunicationSerializer,
     OrderSerializer,
     OrderCreateSerializer,
@@ -18,6 +19,7 @@ from .serializers import (
 from django.db.models import Q
 from django.utils import timezone
 from users.multi_tenant_utils import filter_by_industry, get_user_industry
+from .services import PurchaseOrderService
 
 class IsAdminOrManager(permissions.BasePermission):
     """
@@ -161,7 +163,7 @@ class PurchaseOrderViewSet(viewsets.ModelViewSet):
         """
         Instantiates and returns the list of permissions that this view requires.
         """
-        if self.action in ['create', 'update', 'partial_update', 'destroy']:
+        if self.action in ['create', 'update', 'partial_update', 'destroy', 'add_items']:
             return [permissions.IsAuthenticated(), IsAdminOrManager()]
         return [permissions.IsAuthenticated()]
     
@@ -171,7 +173,9 @@ class PurchaseOrderViewSet(viewsets.ModelViewSet):
         return PurchaseOrderSerializer
     
     def get_queryset(self):
-        queryset = PurchaseOrder.objects.all()
+        # Multi-tenant filtering by industry, through the order's vendor
+        vendors = filter_by_industry(Vendor.objects.all(), self.request.user)
+        queryset = PurchaseOrder.objects.filter(vendor__in=vendors)
         
         # Filter by vendor
         vendor_id = self.request.query_params.get('vendor')
@@ -221,6 +225,7 @@ class PurchaseOrderViewSet(viewsets.ModelViewSet):
         
         if serializer.is_valid():
             serializer.save()
+            purchase_order.refresh_from_db(fields=['total_amount'])
             # Get the updated purchase order serializer
             po_serializer = PurchaseOrderDetailSerializer(
                 purchase_order,
@@ -233,6 +238,24 @@ class PurchaseOrderViewSet(viewsets.ModelViewSet):
             status=status.HTTP_400_BAD_REQUEST
         )
     
+    @action(detail=True, methods=['post'], url_path='add-items')
+    def add_items(self, request, pk=None):
+        """
+        Add many items to this purchase order in one request.
+        Body: {"items": [{"item_name": "Drip pipe", "quantity": 100, "unit_price": "12.50"}, ...]}
+        All lines are added or none are; the order total is refreshed once.
+        """
+        purchase_order = self.get_object()
+        serializer = PurchaseOrderItemBulkSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        PurchaseOrderService.add_items(purchase_order, serializer.validated_data['items'], request.user)
+        
+        po_serializer = PurchaseOrderDetailSerializer(
+            purchase_order,
+            context={'request': request}
+        )
+        return Response(po_serializer.data, status=status.HTTP_201_CREATED)
+    
     @action(detail=True, methods=['post'])
     def approve(self, request, pk=None):
         """